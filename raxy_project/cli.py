@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import time
 from typing import List, Optional, Dict, Any
 
 import typer
@@ -23,6 +24,7 @@ from raxy.interfaces.services import (
 )
 from raxy.infrastructure.proxy import Proxy
 from raxy.infrastructure.database import LocalFileSystem, SQLiteRepository, SupabaseRepository
+from raxy.infrastructure.database.consulta import FiltroContas, listar_para_execucao
 
 # --- Configuração da Aplicação CLI ---
 app = typer.Typer(
@@ -33,8 +35,10 @@ app = typer.Typer(
 )
 proxy_app = typer.Typer(name="proxy", help="Gerenciar e testar proxies.")
 accounts_app = typer.Typer(name="accounts", help="Listar contas configuradas.")
+logs_app = typer.Typer(name="logs", help="Consultar logs estruturados.")
 app.add_typer(proxy_app, no_args_is_help=True)
 app.add_typer(accounts_app, no_args_is_help=True)
+app.add_typer(logs_app, no_args_is_help=True)
 
 # --- Instâncias Globais ---
 console = Console()
@@ -157,8 +161,8 @@ def run(
              repo = container.conta_repository() # Deve retornar SQLiteRepository
 
         try:
-            # Lista contas usando interface unificada IContaRepository
-            contas_para_executar = repo.listar()
+            # Lista contas lendo só as colunas usadas no farm
+            contas_para_executar = listar_para_execucao(repo)
             if not contas_para_executar:
                 console.print("[bold red] Nenhuma conta encontrada no banco de dados. Use 'raxy accounts import' para adicionar.[/bold red]")
                 raise typer.Exit(code=1)
@@ -178,51 +182,75 @@ def run(
 def import_accounts(
     file_path: str = typer.Argument(..., help="Caminho do arquivo users.txt (formato email:senha)."),
     target: str = typer.Option("local", help="Destino: 'local' (sqlite) ou 'cloud' (supabase)."),
+    batch: int = typer.Option(2000, "--batch", help="Contas por bloco (uma transação/upsert por bloco)."),
+    update_existing: bool = typer.Option(False, "--update-existing", help="Regrava contas já cadastradas (senha/perfil)."),
 ) -> None:
-    """Carrega contas do arquivo e salva no banco de dados selecionado."""
+    """Lê o arquivo em fluxo e salva as contas novas em blocos no banco selecionado."""
+    from raxy.infrastructure.database.importacao import ImportadorContas
+    
     console.print(f"[bold cyan]Importando contas de {file_path} para {target}...[/bold cyan]")
     
     fs = LocalFileSystem()
-    try:
-        contas = fs.import_accounts_from_file(file_path)
-    except Exception as e:
-        console.print(f"[bold red] Erro ao ler arquivo: {e}[/bold red]")
+    if not fs.is_file(file_path):
+        console.print(f"[bold red] Arquivo não encontrado: {file_path}[/bold red]")
         raise typer.Exit(code=1)
 
-    if not contas:
-        console.print("[yellow]Nenhuma conta válida encontrada no arquivo.[/yellow]")
-        return
-
     # Seleciona repositório
     if target.lower() in ("cloud", "supabase"):
-        from raxy.infrastructure.database import SupabaseRepository
         repo = SupabaseRepository()
     else:
-        from raxy.infrastructure.database import SQLiteRepository
         # Instancia repository sqlite padrão
         repo = SQLiteRepository()
 
-    # Salva
-    sucesso = 0
-    with typer.progressbar(contas, label="Salvando contas") as progress:
-        for conta in progress:
-            try:
-                repo.salvar(conta)
-                sucesso += 1
-            except Exception as e:
-                console.print(f"[red]Falha ao salvar {conta.email}: {e}[/red]")
+    importador = ImportadorContas(repo, lote=batch, atualizar_existentes=update_existing)
+    inicio = time.perf_counter()
+    try:
+        with typer.progressbar(length=fs.get_size(file_path), label="Importando") as progress:
+            lidos = 0
+            
+            def avancar(posicao: int) -> None:
+                nonlocal lidos
+                progress.update(posicao - lidos)
+                lidos = posicao
+            
+            resultado = importador.importar(fs.iter_accounts_from_file(file_path), progresso=avancar)
+            progress.update(progress.length - lidos)
+    except Exception as e:
+        console.print(f"[bold red] Erro ao ler arquivo: {e}[/bold red]")
+        raise typer.Exit(code=1)
 
-    console.print(f"[bold green]Importação concluída. {sucesso}/{len(contas)} contas salvas.[/bold green]")
+    for erro in resultado.erros[:20]:
+        console.print(f"[yellow]Linha {erro.numero}: {erro.motivo}[/yellow]")
+    if resultado.invalidas > 20:
+        console.print(f"[yellow]... e mais {resultado.invalidas - 20} linha(s) inválida(s).[/yellow]")
 
+    table = Table(title="Importação de Contas", show_header=True, header_style="bold magenta")
+    table.add_column("Métrica")
+    table.add_column("Valor", justify="right")
+    table.add_row("Linhas analisadas", str(resultado.linhas))
+    table.add_row("Contas gravadas", str(resultado.importadas))
+    table.add_row("Já cadastradas (ignoradas)", str(resultado.existentes))
+    table.add_row("Repetidas no arquivo", str(resultado.duplicadas_arquivo))
+    table.add_row("Inválidas", str(resultado.invalidas))
+    if resultado.falhas:
+        table.add_row("Falhas ao salvar", f"[red]{resultado.falhas}[/red]")
+    console.print(table)
+    console.print(f"[dim]Concluída em {time.perf_counter() - inicio:.1f}s[/dim]")
 
-@accounts_app.command("list", help="Lista as contas do banco de dados.")
+
+@accounts_app.command("list", help="Lista as contas do banco de dados (paginado, com filtros).")
 def list_accounts(
-    source: str = typer.Option("local", help="Fonte: 'local' (sqlite) ou 'cloud' (supabase).")
+    source: str = typer.Option("local", help="Fonte: 'local' (sqlite) ou 'cloud' (supabase)."),
+    limit: int = typer.Option(50, "--limit", help="Contas por página."),
+    cursor: Optional[str] = typer.Option(None, "--cursor", help="Cursor da página seguinte (exibido ao fim de cada página)."),
+    where: Optional[List[str]] = typer.Option(
+        None, "--where", help="Filtro campo<op>valor (repetível): status=active, pontos>=1000, ultima_farm<2026-10-01, ultima_farm=null."
+    ),
+    columns: str = typer.Option("email,id_perfil,proxy,pontos,ultima_farm", "--columns", help="Colunas exibidas ('*' para todas)."),
 ) -> None:
-    """Exibe as contas configuradas no banco de dados."""
+    """Exibe uma página das contas configuradas no banco de dados."""
     
     if source.lower() in ("cloud", "supabase"):
-        from raxy.infrastructure.database import SupabaseRepository
         repo = SupabaseRepository()
         title = "Contas Supabase (Cloud)"
     else:
@@ -232,42 +260,465 @@ def list_accounts(
         title = "Contas SQLite (Local)"
 
     try:
-        contas = repo.listar_contas()
+        filtros = FiltroContas.de_expressoes(where or [])
+        pagina = repo.consultar_contas(filtros, colunas=columns, limite=limit, cursor=cursor)
     except Exception as e:
         console.print(f"[bold red] Erro ao acessar banco: {e}[/bold red]")
-        return
+        raise typer.Exit(code=1)
 
-    if not contas:
+    if not pagina.itens:
         console.print(f"[yellow] Nenhuma conta encontrada em {source}.[/yellow]")
         return
 
+    colunas = list(pagina.itens[0].keys())
     table = Table(title=title, show_header=True, header_style="bold magenta")
-    table.add_column("Email")
-    table.add_column("ID do Perfil")
-    table.add_column("Proxy")
-    table.add_column("Pontos")
-    table.add_column("Última Farm")
-
-    for conta in contas:
-        # Adapter para lidar com dict ou objeto dependendo da implementação
-        # listar_contas retorna lista de dicts no sqlite, mas vamos garantir
-        if hasattr(conta, "to_dict"):
-             dados = conta.to_dict()
-        elif isinstance(conta, dict):
-             dados = conta
-        else:
-             continue
+    for coluna in colunas:
+        table.add_column(coluna, justify="right" if coluna == "pontos" else "left")
+    for dados in pagina.itens:
+        table.add_row(*("-" if dados.get(c) is None else str(dados.get(c)) for c in colunas))
+    console.print(table)
+
+    if pagina.proximo_cursor:
+        console.print(f"[dim]Próxima página: --cursor '{pagina.proximo_cursor}'[/dim]")
+
+
+@accounts_app.command("sync", help="Sincroniza contas entre o SQLite local e o Supabase (apenas o que mudou).")
+def sync_accounts(
+    direction: str = typer.Option("ambas", "--direction", help="ambas, receber (cloud → local) ou enviar (local → cloud)."),
+    conflict: str = typer.Option("recente", "--conflict", help="Conflitos: recente (updated_at mais novo), local ou remoto."),
+    batch: int = typer.Option(500, "--batch", help="Registros por página/lote (e por checkpoint)."),
+) -> None:
+    """Envia e recebe as alterações desde a última sincronização."""
+    from raxy.infrastructure.database.sync import SincronizadorContas
+    
+    if direction not in ("ambas", "receber", "enviar"):
+        console.print(f"[bold red] Direção inválida: {direction}[/bold red]")
+        raise typer.Exit(code=1)
+    
+    remoto = SupabaseRepository()._db_client
+    if remoto is None:
+        console.print("[bold red] Supabase não configurado (supabase_url/supabase_key).[/bold red]")
+        raise typer.Exit(code=1)
+    
+    local = get_container().conta_repository()
+    try:
+        sincronizador = SincronizadorContas(local, remoto, politica=conflict, lote=batch)
+        inicio = time.perf_counter()
+        resultado = sincronizador.sincronizar(direction)
+    except Exception as e:
+        console.print(f"[bold red] Sincronização interrompida: {e}[/bold red]")
+        console.print("[dim]O progresso foi salvo; execute novamente para continuar.[/dim]")
+        raise typer.Exit(code=1)
+    
+    table = Table(title="Sincronização de Contas", show_header=True, header_style="bold magenta")
+    table.add_column("Métrica")
+    table.add_column("Valor", justify="right")
+    table.add_row("Recebidas (cloud → local)", str(resultado.recebidas))
+    table.add_row("Removidas localmente", str(resultado.removidas_local))
+    table.add_row("Enviadas (local → cloud)", str(resultado.enviadas))
+    table.add_row("Removidas na cloud", str(resultado.removidas_remoto))
+    table.add_row("Conflitos", str(resultado.conflitos))
+    table.add_row("Sem alteração", str(resultado.ignoradas))
+    console.print(table)
+    console.print(f"[dim]Concluída em {time.perf_counter() - inicio:.1f}s[/dim]")
+
 
+@accounts_app.command("history", help="Mostra a evolução de pontos por dia ou semana (a partir dos agregados).")
+def history_accounts(
+    email: Optional[str] = typer.Option(None, "--email", help="Restringe a uma conta."),
+    days: int = typer.Option(14, "--days", help="Dias exibidos (a partir de hoje)."),
+    weekly: bool = typer.Option(False, "--weekly", help="Agrupa por semana."),
+) -> None:
+    """Exibe ganhos e totais por período sem percorrer o histórico completo."""
+    from datetime import date, timedelta
+    
+    historico = get_container().historico_pontos_repository()
+    periodo = "semanal" if weekly else "diario"
+    linhas = historico.agregados(periodo, desde=date.today() - timedelta(days=max(0, days - 1)), email=email)
+    if not linhas:
+        console.print("[yellow] Nenhum registro de pontos no período.[/yellow]")
+        return
+    
+    titulo = f"Pontos por {'semana' if weekly else 'dia'}" + (f" — {email}" if email else "")
+    table = Table(title=titulo, show_header=True, header_style="bold magenta")
+    table.add_column("Semana de" if weekly else "Dia")
+    table.add_column("Contas", justify="right")
+    table.add_column("Execuções", justify="right")
+    table.add_column("Ganhos", justify="right")
+    table.add_column("Total", justify="right")
+    for linha in linhas:
         table.add_row(
-            str(dados.get("email", "-")),
-            str(dados.get("id_perfil", dados.get("perfil", "-"))),
-            str(dados.get("proxy", "-")),
-            str(dados.get("pontos", "-")),
-            str(dados.get("ultima_farm", "-")),
+            linha["periodo"],
+            str(linha["contas"]),
+            str(linha["registros"]),
+            f"+{linha['ganhos']}",
+            str(linha["pontos_fim"]),
         )
     console.print(table)
 
 
+def _bench_escritas_farm(repo_factory, emails: List[str], threads: int, writes: int) -> Dict[str, Any]:
+    """Dispara ``threads`` workers gravando ``writes`` registros de farm cada."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    
+    repo = repo_factory()
+    erros = 0
+    tempo_workers = 0.0
+    lock = threading.Lock()
+    
+    def worker(indice: int) -> None:
+        nonlocal erros, tempo_workers
+        gasto = 0.0
+        for i in range(writes):
+            email = emails[(indice * writes + i) % len(emails)]
+            inicio_escrita = time.perf_counter()
+            try:
+                if repo.adicionar_registro_farm(email, i) is None:
+                    raise RuntimeError("registro não gravado")
+            except Exception:
+                with lock:
+                    erros += 1
+            gasto += time.perf_counter() - inicio_escrita
+        with lock:
+            tempo_workers += gasto
+    
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(threads)))
+    # O fechamento grava o que ainda estiver na fila: entra na medida
+    if hasattr(repo, "close"):
+        repo.close()
+    duracao = time.perf_counter() - inicio
+    return {"duracao": duracao, "erros": erros, "por_escrita": tempo_workers / max(1, threads * writes)}
+
+
+@accounts_app.command("bench", help="Mede escritas concorrentes de registros de farm no SQLite.")
+def bench_accounts(
+    threads: int = typer.Option(8, "--threads", help="Workers escrevendo em paralelo."),
+    writes: int = typer.Option(200, "--writes", help="Registros de farm por worker."),
+    accounts: int = typer.Option(500, "--accounts", help="Contas no banco temporário."),
+) -> None:
+    """Compara conexão por chamada, conexões por thread em WAL e a fila de gravação em lote."""
+    import sqlite3
+    import tempfile
+    from pathlib import Path
+    from types import SimpleNamespace
+    from raxy.infrastructure.database import WriteBehindFarmRepository
+    from raxy.infrastructure.database.sqlite_pool import SQLiteConnectionManager
+    
+    # Logs por escrita distorceriam a medida
+    descartar = lambda *args, **kwargs: None
+    silencioso = SimpleNamespace(debug=descartar, info=descartar, aviso=descartar, erro=descartar)
+    emails = [f"conta{i}@outlook.com" for i in range(max(1, accounts))]
+    
+    class _PorChamada(SQLiteRepository):
+        """Comportamento anterior: nova conexão, journal padrão, a cada chamada."""
+        
+        def __init__(self, db_path: str):
+            self.db_path = db_path
+            self.logger = silencioso
+            self._connections = SQLiteConnectionManager(db_path, wal=False)
+        
+        def _connection(self):
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            return conn
+    
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Modo")
+    table.add_column("Escritas/s", justify="right")
+    table.add_column("µs/escrita (worker)", justify="right")
+    table.add_column("Erros", justify="right")
+    
+    total = threads * writes
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome, factory in (
+            ("conexão por chamada", lambda caminho: _PorChamada(caminho)),
+            ("conexão por thread (WAL)", lambda caminho: SQLiteRepository(caminho, logger=silencioso)),
+            ("fila em lote (write-behind)", lambda caminho: WriteBehindFarmRepository(
+                SQLiteRepository(caminho, logger=silencioso), max_lote=200, intervalo_flush=0.2, logger=silencioso)),
+        ):
+            caminho = str(Path(tmp) / f"{len(table.rows)}.db")
+            semente = SQLiteRepository(caminho, logger=silencioso)
+            semente.salvar_varias([Conta(email=e, senha="x") for e in emails])
+            semente.close()
+            resultado = _bench_escritas_farm(lambda: factory(caminho), emails, threads, writes)
+            table.add_row(
+                nome,
+                f"{total / resultado['duracao']:,.0f}",
+                f"{resultado['por_escrita'] * 1e6:,.1f}",
+                str(resultado["erros"]),
+            )
+    
+    console.print(f"[dim]{threads} threads x {writes} escritas ({total} registros de farm)[/dim]")
+    console.print(table)
+
+
+def _pico_memoria_mb() -> Optional[float]:
+    """Pico de memória residente do processo em MB (``None`` fora de sistemas POSIX)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return pico / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+@accounts_app.command("bench-import", help="Mede a importação em fluxo de um arquivo grande de contas no SQLite.")
+def bench_import(
+    lines: int = typer.Option(1_000_000, "--lines", help="Contas únicas no arquivo gerado."),
+    duplicates: int = typer.Option(10, "--duplicates", help="Linhas repetidas acrescentadas ao arquivo."),
+    invalid: int = typer.Option(10, "--invalid", help="Linhas malformadas acrescentadas ao arquivo."),
+    batch: int = typer.Option(2000, "--batch", help="Contas por bloco."),
+) -> None:
+    """Importa o arquivo gerado num banco vazio e de novo com todas as contas já cadastradas."""
+    import tempfile
+    from pathlib import Path
+    from types import SimpleNamespace
+    from raxy.infrastructure.database.importacao import ImportadorContas, ler_contas
+
+    descartar = lambda *args, **kwargs: None
+    silencioso = SimpleNamespace(debug=descartar, info=descartar, aviso=descartar, erro=descartar)
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Cenário")
+    table.add_column("Tempo (s)", justify="right")
+    table.add_column("Linhas/s", justify="right")
+    table.add_column("Gravadas", justify="right")
+    table.add_column("Já cadastradas", justify="right")
+    table.add_column("Repetidas", justify="right")
+    table.add_column("Inválidas", justify="right")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        arquivo = Path(tmp) / "users.txt"
+        # Geração fora da medida, sem manter as linhas em memória
+        with arquivo.open("w", encoding="utf-8") as saida:
+            for i in range(lines):
+                saida.write(f"conta{i:07d}@outlook.com:Senha#{i:07d}\n")
+            for i in range(duplicates):
+                saida.write(f"conta{i * 7919 % max(1, lines):07d}@outlook.com:repetida\n")
+            for i in range(invalid):
+                saida.write(f"linha-malformada-{i}\n")
+        total = lines + duplicates + invalid
+
+        repo = SQLiteRepository(str(Path(tmp) / "raxy.db"), logger=silencioso)
+        try:
+            for nome in ("banco vazio", "todas já cadastradas"):
+                importador = ImportadorContas(repo, lote=batch, logger=silencioso)
+                inicio = time.perf_counter()
+                with arquivo.open("rb") as entrada:
+                    resultado = importador.importar(ler_contas(entrada))
+                duracao = time.perf_counter() - inicio
+                table.add_row(
+                    nome,
+                    f"{duracao:,.1f}",
+                    f"{total / duracao:,.0f}",
+                    f"{resultado.importadas:,}",
+                    f"{resultado.existentes:,}",
+                    f"{resultado.duplicadas_arquivo:,}",
+                    f"{resultado.invalidas:,}",
+                )
+        finally:
+            repo.close()
+        tamanho = arquivo.stat().st_size
+
+    pico = _pico_memoria_mb()
+    memoria = f", pico de memória {pico:,.0f} MB" if pico is not None else ""
+    console.print(f"[dim]{total:,} linhas ({tamanho / 1e6:,.1f} MB), blocos de {batch}{memoria}[/dim]")
+    console.print(table)
+
+
+def _bench_paralelo(operacao, threads: int) -> float:
+    """Roda ``operacao(indice_do_worker)`` em ``threads`` workers e retorna a duração total."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(operacao, range(threads)))
+    return time.perf_counter() - inicio
+
+
+@accounts_app.command("bench-profiles", help="Mede consultas e criações concorrentes de perfis do navegador.")
+def bench_profiles(
+    profiles: int = typer.Option(2000, "--profiles", help="Perfis no profiles.json inicial."),
+    threads: int = typer.Option(8, "--threads", help="Workers em paralelo."),
+    operations: int = typer.Option(50, "--operations", help="Consultas e criações por worker."),
+) -> None:
+    """Compara o profiles.json relido/regravado a cada chamada com o ProfileStore em memória."""
+    import tempfile
+    import threading
+    from pathlib import Path
+    from raxy.core import json_codec
+    from raxy.infrastructure.session.profile_store import ProfileStore
+
+    class _ArquivoPorChamada:
+        """Comportamento do Profiles do Botasaurus: o arquivo inteiro a cada chamada."""
+
+        def __init__(self, path: Path):
+            self.path = path
+            self._lock = threading.Lock()
+
+        def get(self, perfil: str):
+            return json_codec.load_file(self.path).get(perfil)
+
+        def criar(self, perfil: str, dados: Dict[str, Any]) -> None:
+            with self._lock:
+                todos = json_codec.load_file(self.path)
+                todos[perfil] = {"profile_id": perfil, **dados}
+                json_codec.dump_file(self.path, todos)
+
+    def com_store(path: Path):
+        store = ProfileStore(path)
+
+        def criar(perfil: str, dados: Dict[str, Any]) -> None:
+            # Como o garantir_perfil: só retorna com o perfil em disco
+            with store.lock(perfil):
+                ticket = store.set(perfil, dados)
+            store.aguardar_persistencia(ticket)
+
+        return store, criar
+
+    nomes = [f"conta{i}_at_outlook.com" for i in range(max(1, profiles))]
+    dados = {"UA": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)", "UA_MOBILE": None}
+    total = threads * operations
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Modo")
+    table.add_column("Consultas/s", justify="right")
+    table.add_column("Criações/s (em disco)", justify="right")
+    table.add_column("Perfis/flush", justify="right")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome in ("arquivo por chamada", "ProfileStore"):
+            path = Path(tmp) / f"{len(table.rows)}" / "profiles.json"
+            path.parent.mkdir()
+            json_codec.dump_file(path, {n: {"profile_id": n, **dados} for n in nomes})
+
+            if nome == "ProfileStore":
+                store, criar = com_store(path)
+                get = store.get
+            else:
+                store = _ArquivoPorChamada(path)
+                get, criar = store.get, store.criar
+
+            def consultar(worker: int) -> None:
+                for i in range(operations):
+                    get(nomes[(worker * operations + i) % len(nomes)])
+
+            def criar_novos(worker: int) -> None:
+                for i in range(operations):
+                    criar(f"novo{worker}-{i}_at_outlook.com", dados)
+
+            consultas = _bench_paralelo(consultar, threads)
+            criacoes = _bench_paralelo(criar_novos, threads)
+            if isinstance(store, ProfileStore):
+                store.close()
+                por_flush = f"{store.stats.media_lote:,.1f}"
+            else:
+                por_flush = "1"
+            table.add_row(nome, f"{total / consultas:,.0f}", f"{total / criacoes:,.0f}", por_flush)
+
+    console.print(
+        f"[dim]{profiles:,} perfis, {threads} threads x {operations} consultas e criações; "
+        f"no ProfileStore cada criação espera a janela de agrupamento e o fsync do lote[/dim]"
+    )
+    console.print(table)
+
+
+def _bench_consultas(repo, emails: List[str], threads: int, lookups: int, semente: Optional[int]) -> Dict[str, Any]:
+    """Dispara ``threads`` workers consultando ``lookups`` contas cada (distribuição de Pareto)."""
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+
+    rng = random.Random(semente)
+    alvos = [emails[min(len(emails), int(rng.paretovariate(1.2))) - 1] for _ in range(threads * lookups)]
+
+    def worker(indice: int) -> int:
+        return sum(repo.consultar_conta(email) is None for email in alvos[indice::threads])
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        erros = sum(pool.map(worker, range(threads)))
+    duracao = time.perf_counter() - inicio
+    return {"duracao": duracao, "erros": erros, "por_operacao": duracao * threads / max(1, len(alvos))}
+
+
+@accounts_app.command("bench-remote", help="Mede gravações e consultas de farm contra um banco remoto simulado.")
+def bench_remote(
+    accounts: int = typer.Option(100_000, "--accounts", help="Contas no banco simulado."),
+    threads: int = typer.Option(16, "--threads", help="Workers em paralelo."),
+    operations: int = typer.Option(50, "--operations", help="Gravações/consultas por worker."),
+    p50: float = typer.Option(40.0, "--p50", help="Latência mediana por requisição (ms)."),
+    p99: float = typer.Option(250.0, "--p99", help="Latência p99 por requisição (ms)."),
+    error_rate: float = typer.Option(0.01, "--error-rate", help="Fração de requisições com erro 5xx."),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Semente do sorteio de latências e falhas."),
+) -> None:
+    """Compara gravação direta, fila em lote, consulta direta e cache sobre o MockDatabaseClient."""
+    from types import SimpleNamespace
+    from raxy.infrastructure.database import (
+        CachedContaRepository,
+        MockDatabaseClient,
+        PerfilLatencia,
+        WriteBehindFarmRepository,
+    )
+
+    descartar = lambda *args, **kwargs: None
+    silencioso = SimpleNamespace(debug=descartar, info=descartar, aviso=descartar, erro=descartar)
+    emails = [f"conta{i}@outlook.com" for i in range(max(1, accounts))]
+    perfil = PerfilLatencia(p50=p50 / 1000, p99=p99 / 1000, taxa_erro=error_rate, semente=seed)
+
+    # Banco populado sem latência; o perfil vale só para a medida
+    cliente = MockDatabaseClient()
+    cliente.upsert_rows("contas", [{"email": e, "senha": "x", "pontos": 0} for e in emails], on_conflict="email")
+    cliente.definir_perfil(perfil)
+    base = SupabaseRepository(logger=silencioso, db_client=cliente)
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Modo")
+    table.add_column("Operações/s", justify="right")
+    table.add_column("ms/operação (worker)", justify="right")
+    table.add_column("Requisições", justify="right")
+    table.add_column("Erros", justify="right")
+
+    total = threads * operations
+    fila: List[WriteBehindFarmRepository] = []
+
+    def com_fila():
+        fila.append(WriteBehindFarmRepository(base, max_lote=200, intervalo_flush=0.2, logger=silencioso))
+        return fila[-1]
+
+    cenarios = (
+        ("gravação direta", lambda: _bench_escritas_farm(lambda: base, emails, threads, operations)),
+        ("gravação em lote (write-behind)", lambda: _bench_escritas_farm(com_fila, emails, threads, operations)),
+        ("consulta direta", lambda: _bench_consultas(base, emails, threads, operations, seed)),
+        ("consulta com cache", lambda: _bench_consultas(
+            CachedContaRepository(base, max_itens=1024, nome="bench"), emails, threads, operations, seed)),
+    )
+    for nome, medir in cenarios:
+        requisicoes = cliente.requisicoes
+        resultado = medir()
+        erros = resultado["erros"] + sum(repo.stats.falhas for repo in fila)
+        fila.clear()
+        por_operacao = resultado.get("por_operacao", resultado.get("por_escrita", 0.0))
+        table.add_row(
+            nome,
+            f"{total / resultado['duracao']:,.0f}",
+            f"{por_operacao * 1e3:,.2f}",
+            f"{cliente.requisicoes - requisicoes:,}",
+            str(erros),
+        )
+
+    console.print(
+        f"[dim]{accounts:,} contas, {threads} threads x {operations} operações; "
+        f"p50 {p50:g} ms, p99 {p99:g} ms, {error_rate:.1%} de erros ({cliente.falhas_injetadas} injetados)[/dim]"
+    )
+    console.print(table)
+
+
 @proxy_app.command("test", help="Testa a conectividade dos proxies.")
 def test_proxies(
     threads: int = typer.Option(10, help="Número de workers para os testes."),
@@ -377,5 +828,298 @@ def clear_cache(
         raise typer.Exit(code=1)
 
 
+def _parse_instante(valor: Optional[str]) -> Optional[float]:
+    """Converte '1h', '30m', '2d' (relativo a agora) ou data ISO em epoch."""
+    if not valor:
+        return None
+    from datetime import datetime
+    from raxy.core.logging.rotation import parse_duration
+    
+    duracao = parse_duration(valor)
+    if duracao is not None:
+        return time.time() - duracao
+    try:
+        return datetime.fromisoformat(valor).timestamp()
+    except ValueError:
+        console.print(f"[bold red] Instante inválido: {valor} (use ex.: 1h, 30m, 2d ou 2026-01-31T12:00)[/bold red]")
+        raise typer.Exit(code=1)
+
+
+@logs_app.command("query", help="Consulta o sink estruturado usando o índice (sem varrer os arquivos).")
+def query_logs(
+    conta: Optional[str] = typer.Option(None, "--conta", help="Email da conta."),
+    proxy: Optional[str] = typer.Option(None, "--proxy", help="Identificador do proxy."),
+    since: Optional[str] = typer.Option(None, "--since", help="Início: relativo (1h, 30m, 2d) ou ISO."),
+    until: Optional[str] = typer.Option(None, "--until", help="Fim: relativo (1h, 30m, 2d) ou ISO."),
+    level: str = typer.Option("DEBUG", "--level", help="Nível mínimo (DEBUG, INFO, WARNING, ERROR...)."),
+    limit: Optional[int] = typer.Option(200, "--limit", help="Máximo de registros exibidos."),
+    directory: Optional[str] = typer.Option(None, "--dir", help="Diretório dos segmentos (padrão: logging.diretorio_estruturado)."),
+    as_json: bool = typer.Option(False, "--json", help="Imprime cada registro como JSON (uma linha por registro)."),
+) -> None:
+    """Busca registros por conta, proxy, nível e intervalo de tempo."""
+    from pathlib import Path
+    from datetime import datetime
+    from raxy.core import json_codec
+    from raxy.core.config import LEVEL_NAMES, LEVEL_VALUES
+    from raxy.core.logging.structured import StructuredLogReader
+    
+    nivel = LEVEL_VALUES.get(level.upper())
+    if nivel is None:
+        console.print(f"[bold red] Nível inválido: {level}[/bold red]")
+        raise typer.Exit(code=1)
+    
+    diretorio = Path(directory) if directory else get_config().logging.diretorio_estruturado
+    if not diretorio or not Path(diretorio).exists():
+        console.print("[yellow] Sink estruturado não encontrado. Configure logging.diretorio_estruturado ou use --dir.[/yellow]")
+        raise typer.Exit(code=1)
+    
+    reader = StructuredLogReader(diretorio)
+    registros = reader.query(
+        conta=conta,
+        proxy=proxy,
+        min_level=nivel,
+        since=_parse_instante(since),
+        until=_parse_instante(until),
+        limit=limit,
+    )
+    
+    if as_json:
+        for registro in registros:
+            typer.echo(json_codec.dumps(registro, default=str))
+        return
+    
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Horário")
+    table.add_column("Nível")
+    table.add_column("Conta")
+    table.add_column("Proxy")
+    table.add_column("Mensagem", overflow="fold")
+    
+    for registro in registros:
+        mensagem = str(registro.get("msg", ""))
+        if "exc" in registro:
+            mensagem += f" [{registro['exc'].get('type')}: {registro['exc'].get('message')}]"
+        table.add_row(
+            datetime.fromtimestamp(registro.get("ts", 0)).strftime("%Y-%m-%d %H:%M:%S"),
+            LEVEL_NAMES.get(registro.get("lv"), str(registro.get("lv"))),
+            str(registro.get("conta", "-")),
+            str(registro.get("proxy", "-")),
+            mensagem,
+        )
+    
+    console.print(table)
+    stats = reader.stats
+    console.print(
+        f"[dim]{stats.matches} registro(s) | {stats.blocks_read}/{stats.blocks_total} blocos lidos "
+        f"em {stats.segments} segmento(s) | {stats.bytes_read / 1024:.1f} KB[/dim]"
+    )
+
+
+
+def _registros_bench(quantidade: int) -> List[Dict[str, Any]]:
+    """Registros no formato dos emitidos pelo AccountProcessor durante um farm."""
+    from datetime import datetime, timedelta
+    from raxy.core.config import LEVEL_VALUES
+    from raxy.core.logging.context import snapshot
+    
+    modelos = [
+        (LEVEL_VALUES["INFO"], "Salvando dados no banco: {email} - 4321 pts", {}),
+        (LEVEL_VALUES["DEBUG"], "Ação 'rewards' concluída com sucesso", {}),
+        (LEVEL_VALUES["WARNING"], "Ação 'bing' falhou", {"erro": "Timeout ao carregar o dashboard de pontos"}),
+        (LEVEL_VALUES["ERROR"], "Falha na sessão", {"error": "Sessão expirada", "tentativa": 2}),
+        (LEVEL_VALUES["SUCCESS"], "Conta processada", {"pontos": {"inicial": 1200, "final": 1500}, "acoes": ["login", "rewards", "bing"]}),
+    ]
+    base = dict(snapshot())
+    inicio = datetime.now()
+    registros = []
+    for i in range(quantidade):
+        nivel, mensagem, extra = modelos[i % len(modelos)]
+        email = f"conta{i % 200}@outlook.com"
+        registros.append({
+            "level": nivel,
+            "message": mensagem.format(email=email),
+            # ~50 registros por segundo de relógio
+            "timestamp": inicio + timedelta(milliseconds=20 * i),
+            "context": {
+                **base,
+                "conta": email,
+                "proxy": f"br-sp-{i % 12:02d}",
+                "file": "executor_service.py",
+                "path": "raxy/services/executor_service.py",
+                "line": 214,
+                "function": "processar",
+                "class": "AccountProcessor",
+                "module": "raxy.services.executor_service",
+                **extra,
+            },
+        })
+    return registros
+
+
+@logs_app.command("bench", help="Mede a vazão dos formatadores com registros típicos do farm.")
+def bench_logs(
+    records: int = typer.Option(20000, "--records", help="Registros por rodada."),
+    repeat: int = typer.Option(5, "--repeat", help="Rodadas (vale a melhor)."),
+) -> None:
+    """Formata registros sintéticos com cada formatador e mostra registros/s."""
+    from raxy.core.logging.formatters import ConsoleFormatter, FileFormatter, JSONFormatter
+    
+    registros = _registros_bench(records)
+    formatadores = {
+        "console (cores)": ConsoleFormatter(use_colors=True),
+        "console (compacto)": ConsoleFormatter(use_colors=False, compact=True),
+        "arquivo": FileFormatter(include_context=True),
+        "json": JSONFormatter(),
+    }
+    
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Formatador")
+    table.add_column("Registros/s", justify="right")
+    table.add_column("µs/registro", justify="right")
+    
+    for nome, formatador in formatadores.items():
+        melhor = float("inf")
+        for _ in range(max(1, repeat)):
+            inicio = time.perf_counter()
+            for r in registros:
+                formatador.format(r["level"], r["message"], r["timestamp"], r["context"])
+            melhor = min(melhor, time.perf_counter() - inicio)
+        table.add_row(nome, f"{len(registros) / melhor:,.0f}", f"{melhor / len(registros) * 1e6:.2f}")
+
+    console.print(table)
+
+
+def _logger_bench(handler) -> ILoggingService:
+    """RaxyLogger só com ``handler`` (sem console nem arquivo)."""
+    from raxy.core.config import LoggerConfig
+    from raxy.core.logging.logger import RaxyLogger
+
+    logger = RaxyLogger(LoggerConfig(arquivo_log=None))
+    for padrao in list(logger.handlers):
+        logger.remove_handler(padrao)
+    logger.add_handler(handler)
+    return logger
+
+
+@logs_app.command("bench-caller", help="Mede o custo de localizar o chamador de cada registro.")
+def bench_caller(
+    records: int = typer.Option(20000, "--records", help="Chamadas por rodada."),
+    repeat: int = typer.Option(5, "--repeat", help="Rodadas (vale a melhor)."),
+) -> None:
+    """Compara a busca por inspect com o cache por code object e mede o logger de ponta a ponta."""
+    import inspect
+    import io
+    import os
+    from raxy.core.config import LEVEL_VALUES
+    from raxy.core.logging.context import find_caller
+    from raxy.core.logging.formatters import ConsoleFormatter, FileFormatter
+    from raxy.core.logging.handlers import ConsoleHandler
+
+    def por_inspect() -> Dict[str, Any]:
+        """Busca anterior: getframeinfo lê o código-fonte e getmodule varre sys.modules."""
+        frame = inspect.currentframe().f_back
+        try:
+            info = inspect.getframeinfo(frame)
+            modulo = inspect.getmodule(frame)
+            return {
+                "file": os.path.basename(info.filename),
+                "line": info.lineno,
+                "function": info.function,
+                "module": modulo.__name__ if modulo else None,
+            }
+        finally:
+            del frame
+
+    def logger_com(formatador, nivel: str = "INFO"):
+        return _logger_bench(ConsoleHandler(stream=io.StringIO(), formatter=formatador, level=LEVEL_VALUES[nivel]))
+
+    arquivo = logger_com(FileFormatter(include_context=True))
+    compacto = logger_com(ConsoleFormatter(use_colors=False, compact=True))
+
+    cenarios = (
+        ("busca por inspect (anterior)", por_inspect),
+        ("find_caller (cache por code object)", find_caller),
+        ("log no arquivo (com localização)", lambda: arquivo.info("Conta processada", conta="conta1@outlook.com")),
+        ("log no console compacto (sem localização)", lambda: compacto.info("Conta processada", conta="conta1@outlook.com")),
+        ("debug desativado", lambda: arquivo.debug("Ação 'rewards' concluída com sucesso")),
+    )
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Caso")
+    table.add_column("Chamadas/s", justify="right")
+    table.add_column("µs/chamada", justify="right")
+
+    for nome, chamada in cenarios:
+        melhor = float("inf")
+        for _ in range(max(1, repeat)):
+            inicio = time.perf_counter()
+            for _ in range(records):
+                chamada()
+            melhor = min(melhor, time.perf_counter() - inicio)
+        table.add_row(nome, f"{records / melhor:,.0f}", f"{melhor / records * 1e6:.2f}")
+
+    console.print(table)
+
+
+@logs_app.command("bench-pipeline", help="Teste de carga do log em arquivo: modos de escrita e políticas de backpressure.")
+def bench_pipeline(
+    records: int = typer.Option(200_000, "--records", help="Registros no total (metade DEBUG)."),
+    threads: int = typer.Option(8, "--threads", help="Threads produzindo registros."),
+    capacity: int = typer.Option(2000, "--capacity", help="Tamanho da fila (async e lote)."),
+) -> None:
+    """Mede registros/s de ponta a ponta (até o close) e quantas linhas chegaram ao arquivo."""
+    import tempfile
+    import threading
+    from pathlib import Path
+    from raxy.core.config import LEVEL_VALUES
+    from raxy.core.logging.formatters import FileFormatter
+    from raxy.core.logging.handlers import AsyncHandler, BatchingHandler, FileHandler
+
+    registros = _registros_bench(records)
+    for i, registro in enumerate(registros):
+        registro["level"] = LEVEL_VALUES["DEBUG"] if i % 2 else LEVEL_VALUES["INFO"]
+
+    cenarios = [
+        ("direto", "block", lambda arquivo: arquivo),
+        ("async", "-", lambda arquivo: AsyncHandler(arquivo, queue_size=capacity)),
+    ]
+    for politica in BatchingHandler.POLICIES:
+        cenarios.append(("lote", politica, lambda arquivo, politica=politica: BatchingHandler(
+            arquivo, capacity=capacity, policy=politica)))
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Modo")
+    table.add_column("Política")
+    table.add_column("Registros/s", justify="right")
+    table.add_column("Linhas no arquivo", justify="right")
+    table.add_column("Descartes informados", justify="right")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for modo, politica, montar in cenarios:
+            caminho = Path(tmp) / f"{len(table.rows)}.log"
+            handler = montar(FileHandler(caminho, formatter=FileFormatter(include_context=True)))
+
+            def produzir(indice: int) -> None:
+                for registro in registros[indice::threads]:
+                    handler.handle(registro)
+
+            produtores = [threading.Thread(target=produzir, args=(i,)) for i in range(threads)]
+            inicio = time.perf_counter()
+            for produtor in produtores:
+                produtor.start()
+            for produtor in produtores:
+                produtor.join()
+            # close drena a fila (lote) ou abandona o que restou (async)
+            handler.close()
+            duracao = time.perf_counter() - inicio
+
+            with caminho.open("rb") as arquivo:
+                linhas = sum(1 for _ in arquivo)
+            descartes = f"{handler.stats()['dropped']:,}" if isinstance(handler, BatchingHandler) else "-"
+            table.add_row(modo, politica, f"{records / duracao:,.0f}", f"{linhas:,}", descartes)
+
+    console.print(f"[dim]{records:,} registros ({threads} threads), fila de {capacity}; meta: 50.000 registros/s[/dim]")
+    console.print(table)
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
@@ -19,7 +19,13 @@ from raxy.core.config import AppConfig, ExecutorConfig, get_config
 # (Interfaces removidas pois não são usadas diretamente no container, apenas as implementações)
 
 # Implementações
-from raxy.infrastructure.database import SQLiteRepository, SupabaseRepository
+from raxy.infrastructure.database import (
+    SQLiteRepository,
+    SupabaseRepository,
+    WriteBehindFarmRepository,
+    CachedContaRepository,
+    SQLiteHistoricoPontuacaoRepository,
+)
 from raxy.services.executor_service import ExecutorEmLote
 from raxy.core.logging import get_logger
 from raxy.infrastructure.api.rewards_data_api import RewardsDataAPI
@@ -34,6 +40,28 @@ from raxy.models import InfraServices
 
 
 
+def _repositorio_cache(repositorio, executor: ExecutorConfig):
+    """Coloca o cache de consultas de conta na frente do repositório, se habilitado."""
+    if executor.db_cache_size <= 0:
+        return repositorio
+    return CachedContaRepository(
+        repositorio,
+        max_itens=executor.db_cache_size,
+        ttl=executor.db_cache_ttl
+    )
+
+
+def _repositorio_farm(repositorio, executor: ExecutorConfig):
+    """Coloca a fila de gravação em lote na frente do repositório de farm, se habilitada."""
+    if executor.db_batch_size <= 0:
+        return repositorio
+    return WriteBehindFarmRepository(
+        repositorio,
+        max_lote=executor.db_batch_size,
+        intervalo_flush=executor.db_flush_interval
+    )
+
+
 class ApplicationContainer(containers.DeclarativeContainer):
     """
     Container de injeção de dependências da aplicação.
@@ -113,14 +141,26 @@ class ApplicationContainer(containers.DeclarativeContainer):
     )
 
     database_repository = providers.Singleton(
-        lambda config, sqlite_repo: SupabaseRepository(
-            url=config.api.supabase_url,
-            key=config.api.supabase_key
-        ) if config.api.has_supabase else sqlite_repo,
+        lambda config, sqlite_repo: _repositorio_farm(
+            _repositorio_cache(
+                SupabaseRepository(
+                    url=config.api.supabase_url,
+                    key=config.api.supabase_key
+                ) if config.api.has_supabase else sqlite_repo,
+                config.executor
+            ),
+            config.executor
+        ),
         config=config,
         sqlite_repo=conta_repository
     )
     
+    # Histórico de pontuação (local, mesmo arquivo das contas)
+    historico_pontos_repository = providers.Singleton(
+        SQLiteHistoricoPontuacaoRepository,
+        db_path="raxy.db"
+    )
+    
     # Serviços de Negócio
     dashboard_service = providers.Singleton(
         LiveDashboardService,
@@ -139,7 +179,8 @@ class ApplicationContainer(containers.DeclarativeContainer):
         proxy_manager=proxy_service,
         logger=base_logger,
         mail_tm_service=mail_tm_service,
-        dashboard=dashboard_service
+        dashboard=dashboard_service,
+        historico_pontos=historico_pontos_repository
     )
     
     # Configuração de proxy
@@ -30,6 +30,10 @@ VALID_ACTIONS: Set[str] = {"login", "rewards", "bing", "flyout", "email"}
 # Ambientes válidos
 VALID_ENVIRONMENTS: Set[str] = {"dev", "staging", "prod"}
 
+# Modos de escrita do arquivo de log e políticas de backpressure do modo em lote
+VALID_LOG_FILE_MODES: Set[str] = {"lote", "async", "direto"}
+VALID_LOG_BACKPRESSURE: Set[str] = {"block", "drop_debug", "sample"}
+
 # Seletores CSS padrão
 DEFAULT_SELECTORS: Dict[str, str] = {
     # Login
@@ -139,13 +143,28 @@ class LoggerConfig:
         mostrar_tempo: Se deve mostrar timestamp
         mostrar_localizacao: Se deve mostrar arquivo/linha/função
         usar_cores: Se deve usar cores no console
-        rotacao_arquivo: Configuração de rotação (ex: "100 MB", "1 day")
-        retencao_arquivo: Tempo de retenção dos logs (ex: "7 days")
-        compressao_arquivo: Tipo de compressão (ex: "zip", "gz")
+        rotacao_arquivo: Configuração de rotação por tamanho e/ou tempo (ex: "100 MB", "1 day", "100 MB, 1 day")
+        retencao_arquivo: Retenção dos rotacionados por idade ou quantidade (ex: "7 days", "10 files")
+        compressao_arquivo: Compressão dos rotacionados ("gz", "zstd", "zip" ou None)
+        limite_disco_logs: Orçamento total de disco do log e seus rotacionados (ex: "1 GB")
+        diretorio_estruturado: Diretório do sink estruturado (NDJSON + índice); None desativa
+        segmento_estruturado: Tamanho de cada segmento estruturado (ex: "64 MB")
+        max_segmentos_estruturados: Segmentos estruturados mantidos
         diretorio_erros: Diretório para logs de erro
         formato_detalhado: Se deve usar formato detalhado
         max_workers: Número máximo de workers para processamento async
         buffer_size: Tamanho do buffer de logs
+        debug_log_estatico: Se o @debug_log decide na decoração (sem wrapper com DEBUG desligado)
+        modo_arquivo: Escrita do arquivo: "lote" (thread única com commits em grupo),
+            "async" (fila + um write por registro) ou "direto" (síncrono)
+        politica_backpressure: Fila cheia no modo lote: "block", "drop_debug" ou "sample"
+        lote_tamanho: Registros por lote antes de forçar a escrita
+        lote_intervalo: Tempo máximo (s) que um registro espera na fila
+        amostragem_backpressure: Na política "sample", mantém 1 a cada N registros abaixo de WARNING
+        limite_por_origem: Registros por segundo por ponto de chamada (0 desativa)
+        rajada_por_origem: Rajada permitida por ponto de chamada antes do limite
+        janela_repeticao: Segundos em que a repetição da última mensagem de um ponto é suprimida (0 desativa)
+        amostragem_por_nivel: Fração mantida por nível (ex: {"DEBUG": 0.1})
     """
     
     # Identificação
@@ -159,7 +178,13 @@ class LoggerConfig:
     sobrescrever_arquivo: bool = False
     rotacao_arquivo: Optional[str] = "100 MB"
     retencao_arquivo: Optional[str] = "7 days"
-    compressao_arquivo: Optional[str] = "zip"
+    compressao_arquivo: Optional[str] = "gz"
+    limite_disco_logs: Optional[str] = None
+    
+    # Sink estruturado (consultável com "cli.py logs query")
+    diretorio_estruturado: Optional[Path] = None
+    segmento_estruturado: str = "64 MB"
+    max_segmentos_estruturados: int = 50
     
     # Formatação
     mostrar_tempo: bool = True
@@ -173,6 +198,18 @@ class LoggerConfig:
     # Performance
     max_workers: int = 2
     buffer_size: int = 1000
+    debug_log_estatico: bool = False
+    modo_arquivo: str = "lote"
+    politica_backpressure: str = "block"
+    lote_tamanho: int = 256
+    lote_intervalo: float = 0.2
+    amostragem_backpressure: int = 10
+    
+    # Limitação de mensagens repetitivas (laços de retentativa)
+    limite_por_origem: float = 0.0
+    rajada_por_origem: int = 20
+    janela_repeticao: float = 0.0
+    amostragem_por_nivel: Dict[str, float] = field(default_factory=dict)
     
     # Limites
     max_message_length: int = 10000
@@ -185,7 +222,7 @@ class LoggerConfig:
         result = {}
         for key, value in data.items():
             if key in cls.__annotations__:
-                if key in ("arquivo_log", "diretorio_erros") and value is not None:
+                if key in ("arquivo_log", "diretorio_erros", "diretorio_estruturado") and value is not None:
                     result[key] = Path(value)
                 else:
                     result[key] = value
@@ -217,12 +254,43 @@ class LoggerConfig:
             raise InvalidConfigException("buffer_size deve ser >= 10", details={"buffer_size": self.buffer_size})
         if self.max_message_length < 100:
             raise InvalidConfigException("max_message_length deve ser >= 100", details={"max_message_length": self.max_message_length})
+        if self.modo_arquivo not in VALID_LOG_FILE_MODES:
+            raise InvalidConfigException(
+                f"modo_arquivo inválido: {self.modo_arquivo}",
+                details={"modo_arquivo": self.modo_arquivo, "validos": sorted(VALID_LOG_FILE_MODES)}
+            )
+        if self.politica_backpressure not in VALID_LOG_BACKPRESSURE:
+            raise InvalidConfigException(
+                f"politica_backpressure inválida: {self.politica_backpressure}",
+                details={"politica_backpressure": self.politica_backpressure, "validas": sorted(VALID_LOG_BACKPRESSURE)}
+            )
+        if self.lote_tamanho < 1:
+            raise InvalidConfigException("lote_tamanho deve ser >= 1", details={"lote_tamanho": self.lote_tamanho})
+        if self.lote_intervalo <= 0:
+            raise InvalidConfigException("lote_intervalo deve ser > 0", details={"lote_intervalo": self.lote_intervalo})
+        if self.amostragem_backpressure < 1:
+            raise InvalidConfigException("amostragem_backpressure deve ser >= 1", details={"amostragem_backpressure": self.amostragem_backpressure})
+        if self.limite_por_origem < 0 or self.janela_repeticao < 0:
+            raise InvalidConfigException(
+                "limite_por_origem e janela_repeticao devem ser >= 0",
+                details={"limite_por_origem": self.limite_por_origem, "janela_repeticao": self.janela_repeticao}
+            )
+        if self.rajada_por_origem < 1:
+            raise InvalidConfigException("rajada_por_origem deve ser >= 1", details={"rajada_por_origem": self.rajada_por_origem})
+        for nivel, fracao in self.amostragem_por_nivel.items():
+            if str(nivel).upper() not in LEVEL_VALUES or not 0 < fracao <= 1:
+                raise InvalidConfigException(
+                    f"amostragem_por_nivel inválida: {nivel}={fracao}",
+                    details={"nivel": nivel, "fracao": fracao, "niveis_validos": list(LEVEL_VALUES)}
+                )
         
         # Cria diretórios se necessário
         if self.arquivo_log:
             self.arquivo_log.parent.mkdir(parents=True, exist_ok=True)
         if self.diretorio_erros:
             self.diretorio_erros.mkdir(parents=True, exist_ok=True)
+        if self.diretorio_estruturado:
+            self.diretorio_estruturado.mkdir(parents=True, exist_ok=True)
     
     def nivel_minimo_valor(self) -> int:
         """
@@ -246,6 +314,12 @@ class ExecutorConfig:
         retry_attempts: Número de tentativas em caso de erro
         timeout: Timeout para cada tarefa (segundos)
         debug: Modo debug ativo
+        metrics_file: Arquivo de métricas no formato texto do Prometheus, gravado ao fim da execução
+        metrics_port: Porta do endpoint local /metrics (0 desativa)
+        db_batch_size: Resultados de farm por lote de gravação (0 grava cada resultado na hora)
+        db_flush_interval: Espera máxima (segundos) de um resultado antes de ser gravado
+        db_cache_size: Contas mantidas no cache de consultas (0 desativa)
+        db_cache_ttl: Validade (segundos) de uma conta no cache de consultas
     """
 
     users_file: str = "users.txt"
@@ -257,10 +331,21 @@ class ExecutorConfig:
     timeout: int = 300
     debug: bool = False
     enable_dashboard: bool = True
+    metrics_file: Optional[str] = None
+    metrics_port: int = 0
+    db_batch_size: int = 50
+    db_flush_interval: float = 1.0
+    db_cache_size: int = 1024
+    db_cache_ttl: float = 60.0
 
     def __post_init__(self):
         """Valida a configuração."""
         validate_positive_int(self.max_workers, "max_workers")
+        validate_positive_int(self.metrics_port, "metrics_port", min_value=0)
+        validate_positive_int(self.db_batch_size, "db_batch_size", min_value=0)
+        validate_positive_float(self.db_flush_interval, "db_flush_interval", min_value=0.0)
+        validate_positive_int(self.db_cache_size, "db_cache_size", min_value=0)
+        validate_positive_float(self.db_cache_ttl, "db_cache_ttl", min_value=0.0)
         validate_positive_int(self.retry_attempts, "retry_attempts", min_value=0)
         validate_positive_int(self.timeout, "timeout", min_value=0)
         validate_not_empty(self.actions, "actions")
@@ -391,6 +476,10 @@ class APIConfig:
     Attributes:
         supabase_url: URL do Supabase
         supabase_key: Chave de API do Supabase
+        supabase_chunk_size: Registros por requisição de upsert em massa
+        supabase_page_size: Registros por página nas leituras paginadas
+        supabase_max_workers: Requisições de upsert simultâneas
+        supabase_max_retries: Retentativas (com backoff exponencial) por requisição
         default_timeout: Timeout padrão para APIs (segundos)
         rewards: Configuração da API de Rewards
         bing_suggestion: Configuração da API de Bing Suggestion
@@ -412,13 +501,21 @@ class APIConfig:
 
     supabase_url: str = ""
     supabase_key: str = ""
+    supabase_chunk_size: int = 500
+    supabase_page_size: int = 1000
+    supabase_max_workers: int = 4
+    supabase_max_retries: int = 4
     default_timeout: int = 30
     rewards: Optional[RewardsAPIConfig] = None
     bing_suggestion: Optional[BingSuggestionAPIConfig] = None
     mail_tm: Optional[MailTmAPIConfig] = None
     
     def __post_init__(self):
-        """Inicializa sub-configurações de APIs."""
+        """Valida a configuração e inicializa sub-configurações de APIs."""
+        validate_positive_int(self.supabase_chunk_size, "supabase_chunk_size")
+        validate_positive_int(self.supabase_page_size, "supabase_page_size")
+        validate_positive_int(self.supabase_max_workers, "supabase_max_workers")
+        validate_positive_int(self.supabase_max_retries, "supabase_max_retries", min_value=0)
         if self.rewards is None:
             self.rewards = RewardsAPIConfig()
         if self.bing_suggestion is None:
@@ -472,6 +569,42 @@ class APIConfig:
         return cls(**result)
 
 
+@dataclass
+class ResourceBlockingConfig:
+    """
+    Configuração do bloqueio de recursos nos navegadores de login.
+
+    Os tipos seguem os ResourceType do CDP em minúsculas (image, font, media,
+    stylesheet, ...). Um tipo em ``tipos_permitidos`` nunca é bloqueado, mesmo
+    que também apareça em ``tipos_bloqueados``.
+
+    Attributes:
+        enabled: Ativa o bloqueio de recursos
+        tipos_bloqueados: Tipos de recurso bloqueados
+        tipos_permitidos: Tipos de recurso sempre permitidos (vence o bloqueio)
+        urls_bloqueadas: Padrões de URL extras bloqueados (curingas ``*`` do CDP)
+        tamanho_medio_kb: Tamanho médio estimado por tipo, usado para estimar economia
+    """
+
+    enabled: bool = True
+    tipos_bloqueados: List[str] = field(default_factory=lambda: ["image", "font", "media"])
+    tipos_permitidos: List[str] = field(default_factory=list)
+    urls_bloqueadas: List[str] = field(default_factory=list)
+    tamanho_medio_kb: Dict[str, int] = field(default_factory=lambda: {
+        "image": 25, "font": 40, "media": 300, "stylesheet": 20,
+    })
+
+    def __post_init__(self):
+        """Normaliza os tipos para minúsculas."""
+        self.tipos_bloqueados = [t.strip().lower() for t in self.tipos_bloqueados if t and t.strip()]
+        self.tipos_permitidos = [t.strip().lower() for t in self.tipos_permitidos if t and t.strip()]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> ResourceBlockingConfig:
+        """Cria instância a partir de dicionário."""
+        return cls(**{k: v for k, v in data.items() if k in cls.__annotations__})
+
+
 @dataclass
 class SessionConfig:
     """
@@ -489,6 +622,8 @@ class SessionConfig:
         verify_email_title: Título da página de verificação de email
         protect_account_title: Título da página de proteção de conta
         selectors: Seletores CSS para elementos da página
+        network_capture_capacity: Máximo de respostas de rede retidas pelo inspetor
+        resource_blocking: Bloqueio de recursos (imagens, fontes, mídia) no login
     """
 
     softwares_padrao: List[str] = field(default_factory=lambda: ["edge"])
@@ -508,11 +643,18 @@ class SessionConfig:
     verify_email_title: str = "verify your email"
     protect_account_title: str = "let's protect your account"
     selectors: Dict[str, str] = field(default_factory=dict)
+    network_capture_capacity: int = 500
+    resource_blocking: Optional[ResourceBlockingConfig] = None
 
     def __post_init__(self):
         """Valida a configuração."""
+        if self.resource_blocking is None:
+            self.resource_blocking = ResourceBlockingConfig()
+        elif isinstance(self.resource_blocking, dict):
+            self.resource_blocking = ResourceBlockingConfig.from_dict(self.resource_blocking)
         validate_positive_int(self.max_login_attempts, "max_login_attempts")
         validate_positive_int(self.ua_limit, "ua_limit")
+        validate_positive_int(self.network_capture_capacity, "network_capture_capacity")
         
         # Define seletores padrão se não fornecidos
         if not self.selectors:
@@ -804,6 +946,7 @@ class ConfigLoader:
                 "bing_url": "https://www.bing.com",
                 "bing_flyout_url": "https://www.bing.com/rewards/panelflyout?channel=bingflyout&partnerId=BingRewards&isDarkMode=1&requestedLayout=onboarding&form=rwfobc",
                 "max_login_attempts": 5,
+                "network_capture_capacity": 500,
                 "selectors": DEFAULT_SELECTORS
             },
             "bingflyout": {
@@ -872,6 +1015,14 @@ class ConfigLoader:
             executor["max_workers"] = int(max_workers)
         if actions := os.getenv("RAXY_ACTIONS"):
             executor["actions"] = [a.strip() for a in actions.split(",")]
+        if metrics_file := os.getenv("RAXY_METRICS_FILE"):
+            executor["metrics_file"] = metrics_file
+        if metrics_port := os.getenv("RAXY_METRICS_PORT"):
+            executor["metrics_port"] = int(metrics_port)
+        if db_batch_size := os.getenv("RAXY_DB_BATCH_SIZE"):
+            executor["db_batch_size"] = int(db_batch_size)
+        if db_cache_size := os.getenv("RAXY_DB_CACHE_SIZE"):
+            executor["db_cache_size"] = int(db_cache_size)
     
     @classmethod
     def _apply_proxy_env_vars(cls, data: Dict[str, Any]) -> None:
@@ -922,9 +1073,27 @@ class ConfigLoader:
         if log_compression := os.getenv("RAXY_LOG_COMPRESSION") or os.getenv("LOG_COMPRESSION"):
             logging["compressao_arquivo"] = log_compression
         
+        if log_budget := os.getenv("RAXY_LOG_DISK_BUDGET"):
+            logging["limite_disco_logs"] = log_budget
+        
         # Diretório de erros
         if error_dir := os.getenv("RAXY_LOG_ERROR_DIR") or os.getenv("LOG_ERROR_DIR"):
             logging["diretorio_erros"] = error_dir
+        
+        if structured_dir := os.getenv("RAXY_LOG_STRUCTURED_DIR"):
+            logging["diretorio_estruturado"] = structured_dir
+        
+        if log_mode := os.getenv("RAXY_LOG_FILE_MODE"):
+            logging["modo_arquivo"] = log_mode.lower()
+        
+        if log_backpressure := os.getenv("RAXY_LOG_BACKPRESSURE"):
+            logging["politica_backpressure"] = log_backpressure.lower()
+        
+        if rate_limit := os.getenv("RAXY_LOG_RATE_LIMIT"):
+            logging["limite_por_origem"] = float(rate_limit)
+        
+        if debug_log_static := os.getenv("RAXY_DEBUG_LOG_STATIC"):
+            logging["debug_log_estatico"] = debug_log_static.lower() in ("true", "1", "yes", "on")
 
     @classmethod
     def _build_config(cls, data: Dict[str, Any]) -> AppConfig:
@@ -1136,6 +1305,7 @@ __all__ = [
     "MailTmAPIConfig",
     "APIConfig",
     "SessionConfig",
+    "ResourceBlockingConfig",
     "BingFlyoutConfig",
     "AppConfig",
     "ConfigLoader",
@@ -0,0 +1,131 @@
+"""
+Extração de campos de HTML em uma única passada.
+
+Compila vários padrões em uma só expressão regular com grupos nomeados e
+percorre o HTML cru uma única vez, sem montar árvore DOM. Pensado para
+páginas grandes das quais só precisamos de poucos valores (tokens, IDs
+embutidos em scripts); quem chama decide se recorre ao BeautifulSoup
+quando algum campo não é encontrado.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+PatternSpec = Union[str, Sequence[str]]
+
+# Conteúdo de cada <script> (texto cru: o HTML não decodifica entidades ali)
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>(.*?)</script\s*>", re.DOTALL | re.IGNORECASE)
+
+
+class HTMLFieldScanner:
+    """
+    Varredor de campos baseado em uma regex combinada.
+
+    Cada campo é descrito por um ou mais padrões com exatamente um grupo de
+    captura. Para cada campo vale a primeira ocorrência no documento, e a
+    varredura para assim que todos os campos foram encontrados.
+
+    Example:
+        >>> scanner = HTMLFieldScanner({"userId": json_string_field("userId")})
+        >>> scanner.scan('<script>{"userId":"abc"}</script>')
+        {'userId': 'abc'}
+    """
+
+    def __init__(self, fields: Mapping[str, PatternSpec], *, flags: int = 0):
+        """
+        Args:
+            fields: Mapeamento nome do campo -> padrão (ou lista de padrões alternativos)
+            flags: Flags de compilação aplicadas à expressão combinada
+        """
+        if not fields:
+            raise ValueError("Informe ao menos um campo para o scanner")
+
+        self._group_to_field: Dict[str, str] = {}
+        alternatives = []
+        for field_name, spec in fields.items():
+            patterns = (spec,) if isinstance(spec, str) else tuple(spec)
+            for pattern in patterns:
+                if re.compile(pattern).groups != 1:
+                    raise ValueError(f"Padrão do campo '{field_name}' deve ter exatamente um grupo")
+                group = f"f{len(self._group_to_field)}"
+                self._group_to_field[group] = field_name
+                # Converte o único grupo de captura em grupo nomeado
+                named = re.sub(r"(?<!\\)\((?!\?)", f"(?P<{group}>", pattern, count=1)
+                alternatives.append(f"(?:{named})")
+
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self._regex = re.compile("|".join(alternatives), flags)
+
+    def scan(self, html: Optional[str], fields: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        Percorre o HTML uma vez e retorna os campos encontrados.
+
+        Args:
+            html: Documento HTML cru
+            fields: Subconjunto de campos desejados (padrão: todos)
+
+        Returns:
+            Dict[str, str]: Campos encontrados (ausentes não aparecem)
+        """
+        found: Dict[str, str] = {}
+        if not html:
+            return found
+
+        wanted = set(fields) if fields is not None else set(self.fields)
+        group_to_field = self._group_to_field
+        for match in self._regex.finditer(html):
+            field_name = group_to_field[match.lastgroup]
+            if field_name in wanted and field_name not in found:
+                found[field_name] = match.group(match.lastgroup)
+                if len(found) == len(wanted):
+                    break
+        return found
+
+    def scan_scripts(self, html: Optional[str], fields: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        Como :meth:`scan`, mas só dentro do conteúdo dos ``<script>``.
+
+        Ocorrências em atributos, comentários ou texto da página são
+        ignoradas. Os scripts são percorridos em ordem e a varredura para
+        assim que todos os campos foram encontrados.
+
+        Args:
+            html: Documento HTML cru
+            fields: Subconjunto de campos desejados (padrão: todos)
+
+        Returns:
+            Dict[str, str]: Campos encontrados (ausentes não aparecem)
+        """
+        found: Dict[str, str] = {}
+        if not html:
+            return found
+
+        wanted = set(fields) if fields is not None else set(self.fields)
+        for script in _SCRIPT_RE.finditer(html):
+            found.update(self.scan(script.group(1), wanted.difference(found)))
+            if len(found) == len(wanted):
+                break
+        return found
+
+
+def json_string_field(key: str) -> str:
+    """Padrão para ``"key": "valor"`` embutido em JSON/JS inline."""
+    return rf'"{re.escape(key)}"\s*:\s*"([^"]+)"'
+
+
+def input_value_field(name: str) -> Tuple[str, str]:
+    """
+    Padrões para o ``value`` de um ``<input name=...>`` em qualquer ordem de atributos.
+
+    Os atributos exigem espaço antes: ``data-name=``/``data-value=`` não casam.
+    """
+    quoted = re.escape(name)
+    return (
+        rf'<input\b[^>]*?\sname=["\']{quoted}["\'][^>]*?\svalue=["\']([^"\']*)["\']',
+        rf'<input\b[^>]*?\svalue=["\']([^"\']*)["\'][^>]*?\sname=["\']{quoted}["\']',
+    )
+
+
+__all__ = ["HTMLFieldScanner", "json_string_field", "input_value_field"]
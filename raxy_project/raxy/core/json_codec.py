@@ -0,0 +1,420 @@
+"""
+Camada de serialização JSON plugável do Raxy.
+
+Usa ``msgspec`` ou ``orjson`` quando instalados e recai para o módulo
+``json`` da biblioteca padrão caso contrário. Todos os backends levantam
+``json.JSONDecodeError`` em falhas de decodificação, de modo que o código
+chamador não precisa conhecer o backend ativo.
+
+O backend pode ser forçado pela variável de ambiente ``RAXY_JSON_BACKEND``
+(``msgspec``, ``orjson`` ou ``stdlib``) ou por :func:`set_codec`.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar, Union
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    _HAS_ORJSON = False
+
+try:
+    import msgspec
+    _HAS_MSGSPEC = True
+except ImportError:
+    msgspec = None
+    _HAS_MSGSPEC = False
+
+
+JSONDecodeError = json.JSONDecodeError
+JSONInput = Union[str, bytes, bytearray, memoryview]
+
+T = TypeVar("T")
+
+
+class JSONCodec(ABC):
+    """Interface comum dos backends de JSON."""
+
+    name: str = "base"
+
+    @abstractmethod
+    def loads(self, data: JSONInput) -> Any:
+        """
+        Decodifica um documento JSON.
+
+        Args:
+            data: Documento em texto ou bytes (UTF-8)
+
+        Returns:
+            Any: Objeto Python decodificado
+
+        Raises:
+            json.JSONDecodeError: Se o documento for inválido
+        """
+
+    @abstractmethod
+    def dumps_bytes(
+        self,
+        obj: Any,
+        *,
+        indent: bool = False,
+        default: Optional[Callable[[Any], Any]] = None,
+    ) -> bytes:
+        """
+        Serializa um objeto para JSON em bytes UTF-8.
+
+        Args:
+            obj: Objeto a serializar
+            indent: Se deve indentar com 2 espaços
+            default: Conversor para tipos não suportados nativamente
+
+        Returns:
+            bytes: Documento JSON
+        """
+
+    def dumps(
+        self,
+        obj: Any,
+        *,
+        indent: bool = False,
+        default: Optional[Callable[[Any], Any]] = None,
+    ) -> str:
+        """Serializa um objeto para JSON em texto (sem escapar não-ASCII)."""
+        return self.dumps_bytes(obj, indent=indent, default=default).decode("utf-8")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} backend={self.name}>"
+
+
+class StdlibJSONCodec(JSONCodec):
+    """Backend baseado no módulo ``json`` da biblioteca padrão."""
+
+    name = "stdlib"
+
+    def loads(self, data: JSONInput) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(
+        self,
+        obj: Any,
+        *,
+        indent: bool = False,
+        default: Optional[Callable[[Any], Any]] = None,
+    ) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None, default=default)
+
+    def dumps_bytes(
+        self,
+        obj: Any,
+        *,
+        indent: bool = False,
+        default: Optional[Callable[[Any], Any]] = None,
+    ) -> bytes:
+        return self.dumps(obj, indent=indent, default=default).encode("utf-8")
+
+
+def _tem_nao_finito(obj: Any) -> bool:
+    """Indica se há NaN/Infinity em algum float do objeto (dicts, listas e tuplas)."""
+    tipo = type(obj)
+    if tipo is dict:
+        valores = obj.values()
+    elif tipo is list or tipo is tuple:
+        valores = obj
+    elif isinstance(obj, float):
+        return not math.isfinite(obj)
+    elif isinstance(obj, dict):
+        valores = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        valores = obj
+    else:
+        return False
+    for valor in valores:
+        # Atalho para os tipos escalares comuns antes da chamada recursiva
+        tipo = type(valor)
+        if valor is None or tipo is str or tipo is int or tipo is bool:
+            continue
+        if tipo is float:
+            if not math.isfinite(valor):
+                return True
+        elif _tem_nao_finito(valor):
+            return True
+    return False
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Backend baseado em ``orjson``.
+
+    Onde o orjson diverge do stdlib, recai para ele: inteiros além de 64
+    bits (TypeError no orjson), ``NaN``/``Infinity`` (``null`` no orjson) e
+    documentos com esses literais na leitura. Na leitura, inteiros além de
+    64 bits ainda viram float.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if not _HAS_ORJSON:
+            raise ImportError("orjson não está instalado")
+        self._stdlib = StdlibJSONCodec()
+
+    def loads(self, data: JSONInput) -> Any:
+        # orjson.JSONDecodeError já é subclasse de json.JSONDecodeError
+        try:
+            return orjson.loads(data)
+        except JSONDecodeError:
+            # NaN/Infinity e números fora do double: o stdlib aceita (ou dá o erro dele)
+            return self._stdlib.loads(data)
+
+    def dumps_bytes(
+        self,
+        obj: Any,
+        *,
+        indent: bool = False,
+        default: Optional[Callable[[Any], Any]] = None,
+    ) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if default is not None:
+            # Como no stdlib: datetimes passam pelo default em vez do ISO nativo
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            raw = orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # Inteiro além de 64 bits (ou tipo sem conversor: o stdlib dá o mesmo erro)
+            return self._stdlib.dumps_bytes(obj, indent=indent, default=default)
+        # "null" é raro fora de None; só então procura NaN/Infinity convertidos
+        if b"null" in raw and _tem_nao_finito(obj):
+            return self._stdlib.dumps_bytes(obj, indent=indent, default=default)
+        return raw
+
+
+class MsgspecCodec(JSONCodec):
+    """
+    Backend baseado em ``msgspec.json``.
+
+    O msgspec não permite desviar tipos nativos para o ``default``:
+    ``datetime``/``date``/``time`` e ``UUID`` saem sempre em ISO 8601
+    (``2026-01-31T08:00:00``), e não como ``str()`` no stdlib/orjson.
+    """
+
+    name = "msgspec"
+
+    # Encoders guardados por ``default`` (limite contra conversores criados a cada chamada)
+    _MAX_ENCODERS = 32
+
+    def __init__(self) -> None:
+        if not _HAS_MSGSPEC:
+            raise ImportError("msgspec não está instalado")
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+        self._encoders: Dict[Callable[[Any], Any], Any] = {}
+
+    def _encoder_para(self, default: Optional[Callable[[Any], Any]]) -> Any:
+        if default is None:
+            return self._encoder
+        encoder = self._encoders.get(default)
+        if encoder is None:
+            if len(self._encoders) >= self._MAX_ENCODERS:
+                self._encoders.clear()
+            encoder = self._encoders[default] = msgspec.json.Encoder(enc_hook=default)
+        return encoder
+
+    def loads(self, data: JSONInput) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            doc = data if isinstance(data, str) else bytes(data).decode("utf-8", "replace")
+            raise JSONDecodeError(str(e), doc, 0) from e
+
+    def dumps_bytes(
+        self,
+        obj: Any,
+        *,
+        indent: bool = False,
+        default: Optional[Callable[[Any], Any]] = None,
+    ) -> bytes:
+        raw = self._encoder_para(default).encode(obj)
+        return msgspec.json.format(raw, indent=2) if indent else raw
+
+
+_CODEC_CLASSES: Dict[str, type] = {
+    "msgspec": MsgspecCodec,
+    "orjson": OrjsonCodec,
+    "stdlib": StdlibJSONCodec,
+}
+
+_codec: Optional[JSONCodec] = None
+_codec_lock = threading.Lock()
+
+
+def _create_default_codec() -> JSONCodec:
+    """Escolhe o backend: variável de ambiente, depois o mais rápido disponível."""
+    preferido = os.getenv("RAXY_JSON_BACKEND", "").strip().lower()
+    ordem = [preferido] if preferido in _CODEC_CLASSES else []
+    ordem.extend(["msgspec", "orjson", "stdlib"])
+
+    for nome in ordem:
+        try:
+            return _CODEC_CLASSES[nome]()
+        except ImportError:
+            continue
+    return StdlibJSONCodec()
+
+
+def get_codec() -> JSONCodec:
+    """
+    Obtém o codec JSON ativo (singleton).
+
+    Returns:
+        JSONCodec: Backend em uso
+    """
+    global _codec
+    if _codec is None:
+        with _codec_lock:
+            if _codec is None:
+                _codec = _create_default_codec()
+    return _codec
+
+
+def set_codec(codec: Union[JSONCodec, str]) -> JSONCodec:
+    """
+    Define o codec JSON ativo.
+
+    Args:
+        codec: Instância de JSONCodec ou nome do backend
+
+    Returns:
+        JSONCodec: Codec configurado
+
+    Raises:
+        ValueError: Se o nome do backend for desconhecido
+        ImportError: Se o backend não estiver instalado
+    """
+    global _codec
+    if isinstance(codec, str):
+        nome = codec.strip().lower()
+        if nome not in _CODEC_CLASSES:
+            raise ValueError(f"Backend JSON desconhecido: {codec}")
+        codec = _CODEC_CLASSES[nome]()
+    with _codec_lock:
+        _codec = codec
+    return codec
+
+
+def loads(data: JSONInput) -> Any:
+    """Decodifica JSON usando o codec ativo."""
+    return get_codec().loads(data)
+
+
+def dumps(
+    obj: Any,
+    *,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> str:
+    """Serializa para texto JSON usando o codec ativo."""
+    return get_codec().dumps(obj, indent=indent, default=default)
+
+
+def dumps_bytes(
+    obj: Any,
+    *,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """Serializa para bytes JSON usando o codec ativo."""
+    return get_codec().dumps_bytes(obj, indent=indent, default=default)
+
+
+def load_file(path: Union[str, Path]) -> Any:
+    """
+    Lê e decodifica um arquivo JSON.
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        Any: Conteúdo decodificado
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir
+        json.JSONDecodeError: Se o conteúdo for inválido
+    """
+    return get_codec().loads(Path(path).read_bytes())
+
+
+def dump_file(
+    path: Union[str, Path],
+    obj: Any,
+    *,
+    indent: bool = True,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> None:
+    """Serializa um objeto e grava em arquivo (UTF-8)."""
+    Path(path).write_bytes(get_codec().dumps_bytes(obj, indent=indent, default=default))
+
+
+class TypedDecoder(Generic[T]):
+    """
+    Decodificador tipado: bytes JSON -> objeto de domínio em uma única chamada.
+
+    Combina o codec ativo com uma função construtora, evitando que cada
+    chamador repita o par ``loads`` + montagem do modelo.
+
+    Example:
+        >>> decoder = TypedDecoder(RewardsDataParser.parse_dashboard)
+        >>> dashboard = decoder.decode(response.content)
+    """
+
+    def __init__(self, builder: Callable[[Any], T], *, codec: Optional[JSONCodec] = None):
+        """
+        Args:
+            builder: Função que monta o modelo a partir do JSON decodificado
+            codec: Codec fixo (padrão: codec ativo no momento da decodificação)
+        """
+        self._builder = builder
+        self._codec = codec
+
+    def decode(self, data: JSONInput) -> T:
+        """
+        Decodifica o documento e constrói o modelo.
+
+        Raises:
+            json.JSONDecodeError: Se o documento for inválido
+        """
+        codec = self._codec or get_codec()
+        return self._builder(codec.loads(data))
+
+    def build(self, obj: Any) -> T:
+        """Constrói o modelo a partir de dados já decodificados."""
+        return self._builder(obj)
+
+
+__all__ = [
+    "JSONCodec",
+    "StdlibJSONCodec",
+    "OrjsonCodec",
+    "MsgspecCodec",
+    "JSONDecodeError",
+    "TypedDecoder",
+    "get_codec",
+    "set_codec",
+    "loads",
+    "dumps",
+    "dumps_bytes",
+    "load_file",
+    "dump_file",
+]
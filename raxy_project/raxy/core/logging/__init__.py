@@ -10,6 +10,7 @@ from .logger import RaxyLogger
 from .context import LogContext
 from .formatters import LogFormatter
 from .handlers import LogHandler
+from .filters import RateLimitFilter
 from .debug_decorator import debug_log, debug
 
 # Singleton do logger principal
@@ -33,6 +34,7 @@ __all__ = [
     "LogContext",
     "LogFormatter",
     "LogHandler",
+    "RateLimitFilter",
     "get_logger",
     "log",
     "debug_log",
@@ -3,20 +3,257 @@ Gerenciamento de contexto para logs.
 
 Fornece funcionalidades para adicionar contexto aos logs,
 permitindo rastreamento detalhado e correlação de eventos.
+
+O contexto fica em ``contextvars`` (correto por thread e por tarefa
+asyncio) como uma cadeia persistente de nós imutáveis: entrar num escopo é
+O(1) e os registros recebem um snapshot congelado e compartilhado em vez de
+uma cópia do contexto.
 """
 
 from __future__ import annotations
 
-import inspect
+import os
+import sys
 import threading
 from contextlib import contextmanager
-from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Any, Dict, Optional
+from contextvars import ContextVar
+from types import CodeType, FrameType
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 from uuid import uuid4
 
 
-@dataclass
+class CodeInfo(NamedTuple):
+    """Metadados estáticos de um code object (calculados uma vez)."""
+    file: str
+    path: str
+    function: str
+    module: Optional[str]
+    class_name: Optional[str]
+    internal: bool
+
+
+# Pacote do próprio logging: frames dele são pulados ao procurar o chamador
+_LOGGING_PACKAGE = __name__.rsplit(".", 1)[0]
+
+# Cache de metadados por code object. Leituras sem lock: no pior caso duas
+# threads calculam a mesma entrada, com o mesmo resultado.
+_CODE_INFO_CACHE: Dict[CodeType, CodeInfo] = {}
+
+
+def _code_info(frame: FrameType) -> CodeInfo:
+    """Obtém (do cache) os metadados do code object do frame."""
+    code = frame.f_code
+    info = _CODE_INFO_CACHE.get(code)
+    # A igualdade de code objects ignora co_filename: funções idênticas na
+    # mesma linha de arquivos diferentes cairiam na mesma entrada
+    if info is None or info.path != code.co_filename:
+        module = frame.f_globals.get("__name__")
+        # co_qualname (3.11+) traz "Classe.metodo" sem precisar olhar f_locals
+        qualname = getattr(code, "co_qualname", None)
+        class_name = None
+        if qualname and "." in qualname:
+            owner = qualname.rsplit(".", 1)[0]
+            if not owner.endswith(">"):
+                class_name = owner.rsplit(".", 1)[-1]
+        internal = isinstance(module, str) and (
+            module == _LOGGING_PACKAGE or module.startswith(_LOGGING_PACKAGE + ".")
+        )
+        info = CodeInfo(
+            file=os.path.basename(code.co_filename),
+            path=code.co_filename,
+            function=code.co_name,
+            module=module,
+            class_name=class_name,
+            internal=internal,
+        )
+        _CODE_INFO_CACHE[code] = info
+    return info
+
+
+def _class_from_locals(frame: FrameType) -> Optional[str]:
+    """Fallback para Python < 3.11 (sem co_qualname)."""
+    local_vars = frame.f_locals
+    if "self" in local_vars:
+        return local_vars["self"].__class__.__name__
+    if "cls" in local_vars:
+        return getattr(local_vars["cls"], "__name__", None)
+    return None
+
+
+def frame_info(frame: FrameType) -> Dict[str, Any]:
+    """
+    Monta as informações de localização de um frame.
+    
+    Só a linha é lida do frame; o resto vem do cache por code object,
+    sem acessar código-fonte em disco.
+    
+    Args:
+        frame: Frame do chamador
+        
+    Returns:
+        Dict[str, Any]: file, path, line, function, class e module
+    """
+    info = _code_info(frame)
+    class_name = info.class_name
+    if class_name is None and not hasattr(frame.f_code, "co_qualname"):
+        class_name = _class_from_locals(frame)
+    return {
+        'file': info.file,
+        'path': info.path,
+        'line': frame.f_lineno,
+        'function': info.function,
+        'class': class_name,
+        'module': info.module,
+    }
+
+
+def find_caller(skip: int = 1) -> Dict[str, Any]:
+    """
+    Localiza o primeiro frame fora do pacote de logging.
+    
+    Args:
+        skip: Frames a pular a partir de quem chamou esta função
+        
+    Returns:
+        Dict[str, Any]: Informações do chamador (vazio se não encontrado)
+    """
+    try:
+        frame: Optional[FrameType] = sys._getframe(skip + 1)
+    except ValueError:
+        return {}
+    try:
+        while frame is not None and _code_info(frame).internal:
+            frame = frame.f_back
+        return frame_info(frame) if frame is not None else {}
+    except Exception:
+        return {}
+    finally:
+        del frame
+
+
+def call_site(skip: int = 1) -> Tuple[str, int]:
+    """
+    Versão enxuta de :func:`find_caller`: só caminho e linha do chamador.
+
+    Usada como chave por ponto de chamada sem montar o dicionário completo.
+
+    Returns:
+        Tuple[str, int]: (caminho, linha), ou ("", 0) se não encontrado
+    """
+    try:
+        frame: Optional[FrameType] = sys._getframe(skip + 1)
+    except ValueError:
+        return ("", 0)
+    try:
+        while frame is not None and _code_info(frame).internal:
+            frame = frame.f_back
+        return (frame.f_code.co_filename, frame.f_lineno) if frame is not None else ("", 0)
+    finally:
+        del frame
+
+
+# Marca de remoção dentro de um nó (clear de chaves específicas)
+_REMOVED = object()
+
+# Acima dessa profundidade, um novo nó é achatado para manter buscas curtas
+_MAX_DEPTH = 32
+
+# Campos tradicionais do contexto; o resto aparece em ``metadata``
+_FIELDS = ("correlation_id", "session_id", "user_id", "operation")
+
+
+class ContextSnapshot(dict):
+    """
+    Cópia congelada do contexto em um instante.
+
+    É um ``dict`` (serializa e desempacota normalmente), mas recusa
+    alterações: registros de log referenciam o mesmo snapshot em vez de
+    copiar o contexto a cada chamada.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("ContextSnapshot é imutável")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (ContextSnapshot, (dict(self),))
+
+
+class _ContextNode:
+    """
+    Nó imutável de uma cadeia persistente de contexto.
+
+    Cada ``set``/``scope`` cria um filho apontando para o nó atual (O(1));
+    o achatamento em :class:`ContextSnapshot` é feito uma vez por nó, na
+    primeira vez que um registro precisa dele, e reaproveitado depois.
+    """
+
+    __slots__ = ("parent", "values", "depth", "_snapshot")
+
+    def __init__(self, parent: Optional["_ContextNode"], values: Dict[str, Any]):
+        self.parent = parent
+        self.values = values
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self._snapshot: Optional[ContextSnapshot] = None
+
+    def child(self, values: Dict[str, Any]) -> "_ContextNode":
+        """Novo nó com ``values`` por cima deste."""
+        if not values:
+            return self
+        if self.depth >= _MAX_DEPTH:
+            merged = dict(self.snapshot())
+            for key, value in values.items():
+                if value is _REMOVED:
+                    merged.pop(key, None)
+                else:
+                    merged[key] = value
+            return _ContextNode(None, merged)
+        return _ContextNode(self, values)
+
+    def lookup(self, key: str, default: Any = None) -> Any:
+        """Valor mais recente da chave na cadeia."""
+        node: Optional[_ContextNode] = self
+        while node is not None:
+            if key in node.values:
+                value = node.values[key]
+                return default if value is _REMOVED else value
+            node = node.parent
+        return default
+
+    def snapshot(self) -> ContextSnapshot:
+        """Contexto achatado (memoizado; corridas produzem o mesmo resultado)."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            base = dict(self.parent.snapshot()) if self.parent is not None else {}
+            for key, value in self.values.items():
+                if value is _REMOVED:
+                    base.pop(key, None)
+                else:
+                    base[key] = value
+            snapshot = self._snapshot = ContextSnapshot(base)
+        return snapshot
+
+
+def _new_root(**values: Any) -> _ContextNode:
+    return _ContextNode(None, {"correlation_id": str(uuid4())[:8], **values})
+
+
+# Contexto base: usado por threads/tarefas que ainda não definiram nada
+_root = _new_root()
+_root_lock = threading.Lock()
+
+# Contexto corrente por thread e por tarefa asyncio (tarefas herdam uma cópia ao serem criadas)
+_current: ContextVar[Optional[_ContextNode]] = ContextVar("raxy_log_context", default=None)
+
+
+def _node() -> _ContextNode:
+    return _current.get() or _root
+
+
 class LogContext:
     """
     Contexto de execução para logs.
@@ -24,21 +261,41 @@ class LogContext:
     Gerencia informações contextuais que são anexadas aos logs,
     permitindo melhor rastreabilidade e debugging.
     
+    É uma visão do contexto corrente, guardado em ``contextvars``: cada
+    thread e cada tarefa asyncio enxerga o seu. Alterações criam um novo
+    nó imutável em vez de modificar o anterior, então snapshots já
+    entregues a registros de log nunca mudam.
+    
     Attributes:
         correlation_id: ID único para correlacionar logs relacionados
         session_id: ID da sessão atual
         user_id: ID do usuário (se aplicável)
         operation: Operação sendo executada
         metadata: Metadados adicionais
-        _local: Thread-local storage para contextos específicos
     """
     
-    correlation_id: str = field(default_factory=lambda: str(uuid4())[:8])
-    session_id: Optional[str] = None
-    user_id: Optional[str] = None
-    operation: Optional[str] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    _local: threading.local = field(default_factory=threading.local, repr=False)
+    __slots__ = ()
+    
+    @property
+    def correlation_id(self) -> Optional[str]:
+        return _node().lookup("correlation_id")
+    
+    @property
+    def session_id(self) -> Optional[str]:
+        return _node().lookup("session_id")
+    
+    @property
+    def user_id(self) -> Optional[str]:
+        return _node().lookup("user_id")
+    
+    @property
+    def operation(self) -> Optional[str]:
+        return _node().lookup("operation")
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Valores além dos campos tradicionais (cópia)."""
+        return {k: v for k, v in self.to_dict().items() if k not in _FIELDS}
     
     def set(self, **kwargs: Any) -> None:
         """
@@ -47,12 +304,9 @@ class LogContext:
         Args:
             **kwargs: Pares chave-valor para adicionar ao contexto
         """
-        for key, value in kwargs.items():
-            if value is not None:
-                if hasattr(self, key) and not key.startswith('_'):
-                    setattr(self, key, value)
-                else:
-                    self.metadata[key] = value
+        values = {key: value for key, value in kwargs.items() if value is not None}
+        if values:
+            _current.set(_node().child(values))
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -65,27 +319,19 @@ class LogContext:
         Returns:
             Any: Valor encontrado ou default
         """
-        if hasattr(self, key) and not key.startswith('_'):
-            return getattr(self, key, default)
-        return self.metadata.get(key, default)
+        return _node().lookup(key, default)
     
     def clear(self, *keys: str) -> None:
         """
         Remove valores do contexto.
         
         Args:
-            *keys: Chaves para remover. Se vazio, limpa tudo
+            *keys: Chaves para remover. Se vazio, limpa tudo (mantém o correlation_id)
         """
         if not keys:
-            self.metadata.clear()
-            self.session_id = None
-            self.user_id = None
-            self.operation = None
+            _current.set(_ContextNode(None, {"correlation_id": self.correlation_id}))
         else:
-            for key in keys:
-                if hasattr(self, key) and not key.startswith('_'):
-                    setattr(self, key, None)
-                self.metadata.pop(key, None)
+            _current.set(_node().child({key: _REMOVED for key in keys}))
     
     @contextmanager
     def scope(self, **kwargs: Any):
@@ -98,47 +344,27 @@ class LogContext:
         Yields:
             LogContext: Self com valores temporários
         """
-        old_values = {}
-        
-        # Salva valores antigos
-        for key, value in kwargs.items():
-            old_values[key] = self.get(key)
-        
-        # Define novos valores
-        self.set(**kwargs)
-        
+        previous = _current.get()
+        token = _current.set(_node().child(
+            {key: value for key, value in kwargs.items() if value is not None}
+        ))
         try:
             yield self
         finally:
-            # Restaura valores antigos
-            for key, value in old_values.items():
-                if value is None and key in self.metadata:
-                    del self.metadata[key]
-                else:
-                    self.set(**{key: value})
+            try:
+                _current.reset(token)
+            except ValueError:
+                # Saída em outro contexto (ex.: gerador retomado em outra tarefa)
+                _current.set(previous)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self) -> ContextSnapshot:
         """
-        Converte contexto para dicionário.
+        Retorna o contexto atual.
         
         Returns:
-            Dict[str, Any]: Representação em dicionário
+            ContextSnapshot: Snapshot imutável (compartilhado, não copiar para ler)
         """
-        result = {
-            'correlation_id': self.correlation_id,
-        }
-        
-        if self.session_id:
-            result['session_id'] = self.session_id
-        if self.user_id:
-            result['user_id'] = self.user_id
-        if self.operation:
-            result['operation'] = self.operation
-        
-        # Adiciona metadados
-        result.update(self.metadata)
-        
-        return result
+        return _node().snapshot()
     
     def get_caller_info(self, depth: int = 3) -> Dict[str, Any]:
         """
@@ -150,39 +376,10 @@ class LogContext:
         Returns:
             Dict[str, Any]: Informações do chamador
         """
+        frame = None
         try:
-            frame = inspect.currentframe()
-            if frame is None:
-                return {}
-            
-            # Navega pelos frames
-            for _ in range(depth):
-                frame = frame.f_back
-                if frame is None:
-                    break
-            
-            if frame is None:
-                return {}
-            
-            info = inspect.getframeinfo(frame)
-            code = frame.f_code
-            
-            # Tenta obter a classe
-            class_name = None
-            if 'self' in frame.f_locals:
-                class_name = frame.f_locals['self'].__class__.__name__
-            elif 'cls' in frame.f_locals:
-                class_name = frame.f_locals['cls'].__name__
-            
-            return {
-                'file': Path(info.filename).name,
-                'path': info.filename,
-                'line': info.lineno,
-                'function': code.co_name,
-                'class': class_name,
-                'module': inspect.getmodule(frame).__name__ if inspect.getmodule(frame) else None,
-            }
-            
+            frame = sys._getframe(depth)
+            return frame_info(frame)
         except Exception:
             return {}
         finally:
@@ -201,108 +398,54 @@ class LogContext:
             items.append(f"user={self.user_id}")
         if self.operation:
             items.append(f"op={self.operation}")
-        if self.metadata:
-            items.append(f"meta={len(self.metadata)}")
+        metadata = self.metadata
+        if metadata:
+            items.append(f"meta={len(metadata)}")
         
         return f"LogContext({', '.join(items)})"
 
 
-class ContextManager:
-    """
-    Gerenciador global de contextos.
-    
-    Mantém um contexto por thread e permite herança de contextos.
-    """
-    
-    def __init__(self):
-        """Inicializa o gerenciador."""
-        self._contexts: Dict[int, LogContext] = {}
-        self._lock = threading.RLock()
-        self._default_context = LogContext()
-    
-    def get_context(self) -> LogContext:
-        """
-        Obtém contexto da thread atual.
-        
-        Returns:
-            LogContext: Contexto da thread ou default
-        """
-        thread_id = threading.get_ident()
-        
-        with self._lock:
-            if thread_id not in self._contexts:
-                # Cria novo contexto herdando do default
-                self._contexts[thread_id] = LogContext(
-                    correlation_id=self._default_context.correlation_id,
-                    session_id=self._default_context.session_id,
-                    user_id=self._default_context.user_id,
-                    operation=self._default_context.operation,
-                    metadata=dict(self._default_context.metadata)
-                )
-            
-            return self._contexts[thread_id]
-    
-    def set_context(self, context: LogContext) -> None:
-        """
-        Define contexto para thread atual.
-        
-        Args:
-            context: Contexto a ser definido
-        """
-        thread_id = threading.get_ident()
-        
-        with self._lock:
-            self._contexts[thread_id] = context
-    
-    def clear_context(self) -> None:
-        """Remove contexto da thread atual."""
-        thread_id = threading.get_ident()
-        
-        with self._lock:
-            self._contexts.pop(thread_id, None)
-    
-    def set_default(self, **kwargs: Any) -> None:
-        """
-        Define valores no contexto default.
-        
-        Args:
-            **kwargs: Valores para o contexto default
-        """
-        with self._lock:
-            self._default_context.set(**kwargs)
-    
-    @contextmanager
-    def context_scope(self, **kwargs: Any):
-        """
-        Cria escopo temporário de contexto.
-        
-        Args:
-            **kwargs: Valores temporários
-            
-        Yields:
-            LogContext: Contexto com valores temporários
-        """
-        context = self.get_context()
-        with context.scope(**kwargs):
-            yield context
-
-
-# Instância global do gerenciador
-_context_manager = ContextManager()
+# Visão única: o estado vive na ContextVar, não no objeto
+_log_context = LogContext()
 
 
 def get_context() -> LogContext:
     """Obtém contexto atual."""
-    return _context_manager.get_context()
+    return _log_context
+
+
+def snapshot() -> ContextSnapshot:
+    """Snapshot imutável do contexto atual (sem cópia se nada mudou)."""
+    return _node().snapshot()
 
 
 def set_context(**kwargs: Any) -> None:
     """Define valores no contexto atual."""
-    _context_manager.get_context().set(**kwargs)
+    _log_context.set(**kwargs)
+
+
+def clear_context() -> None:
+    """Volta o contexto atual ao contexto base."""
+    _current.set(None)
+
+
+def set_default(**kwargs: Any) -> None:
+    """
+    Define valores no contexto base.
+    
+    Afeta threads e tarefas que ainda não alteraram o próprio contexto.
+    
+    Args:
+        **kwargs: Valores para o contexto base
+    """
+    global _root
+    values = {key: value for key, value in kwargs.items() if value is not None}
+    with _root_lock:
+        _root = _ContextNode(None, {**_root.snapshot(), **values})
 
 
 @contextmanager
 def context_scope(**kwargs: Any):
     """Cria escopo temporário de contexto."""
-    with _context_manager.context_scope(**kwargs) as ctx:
+    with _log_context.scope(**kwargs) as ctx:
         yield ctx
@@ -2,19 +2,30 @@
 Decorator de debug automático para logging de métodos.
 
 Fornece logging automático de entrada/saída de métodos com contexto inteligente.
+
+O nível DEBUG é verificado a cada chamada antes de qualquer formatação; com
+``LoggerConfig.debug_log_estatico`` a decisão é tomada uma única vez (na
+primeira chamada, para não carregar a configuração durante imports) e, com
+DEBUG desligado, as chamadas seguintes vão direto ao método original.
 """
 
 from __future__ import annotations
 
 import functools
-import inspect
 import time
 from typing import Any, Callable, Optional, TypeVar
 
+from raxy.core.config import LEVEL_VALUES
+from raxy.core.metrics import Histogram, get_metrics
 from raxy.interfaces.services import ILoggingService
 
 F = TypeVar('F', bound=Callable[..., Any])
 
+# Histograma (por função) das durações medidas pelo decorator
+DURATION_METRIC = "debug_log.duration"
+
+_DEBUG = LEVEL_VALUES["DEBUG"]
+
 
 def debug_log(
     enabled: bool = True,
@@ -56,16 +67,49 @@ def debug_log(
         # Logs gerados:
         # DEBUG: → processar_dados()
         # DEBUG: ← processar_dados() [2.34s]
+    
+    Com ``log_duration`` as durações também vão para o histograma
+    ``debug_log.duration`` do registro de métricas, mesmo com DEBUG desligado.
     """
     def decorator(func: F) -> F:
         if not enabled:
             return func
         
+        # Série guardada entre chamadas; obtida de novo após MetricsRegistry.reset()
+        histogram: Optional[Histogram] = None
+        geracao = -1
+        # None até a primeira chamada; True quando o modo estático desligou o wrapper
+        desativado: Optional[bool] = None
+        
+        def observar(duracao: float) -> None:
+            nonlocal histogram, geracao
+            metrics = get_metrics()
+            if histogram is None or geracao != metrics.geracao:
+                geracao = metrics.geracao
+                histogram = metrics.histogram(DURATION_METRIC, function=func.__qualname__)
+            histogram.observe(duracao)
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            nonlocal desativado
+            if desativado is None:
+                desativado = _desativado_estaticamente()
+            if desativado:
+                return func(*args, **kwargs)
+            
             # Obtém logger (tenta do self/cls, senão usa global)
             logger = _get_logger(args)
             
+            # DEBUG desligado: nenhuma formatação, no máximo a medição de tempo
+            if not _debug_ativo(logger):
+                if not log_duration:
+                    return func(*args, **kwargs)
+                start_time = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    observar(time.perf_counter() - start_time)
+            
             # Nome completo do método
             func_name = _get_func_full_name(func, args)
             
@@ -78,12 +122,11 @@ def debug_log(
             logger.debug(f"→ {func_name}({args_str})")
             
             # Executa método com timing
-            start_time = time.time()
-            exception_occurred = False
+            start_time = time.perf_counter()
             
             try:
                 result = func(*args, **kwargs)
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 
                 # Log de saída (sucesso)
                 result_str = ""
@@ -92,6 +135,7 @@ def debug_log(
                 
                 duration_str = ""
                 if log_duration:
+                    observar(duration)
                     duration_str = f" [{duration:.3f}s]"
                 
                 logger.debug(f"← {func_name}(){result_str}{duration_str}")
@@ -99,12 +143,12 @@ def debug_log(
                 return result
                 
             except Exception as e:
-                exception_occurred = True
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 
                 # Log de saída (erro)
                 duration_str = ""
                 if log_duration:
+                    observar(duration)
                     duration_str = f" [{duration:.3f}s]"
                 
                 logger.debug(
@@ -117,6 +161,30 @@ def debug_log(
     return decorator
 
 
+def _desativado_estaticamente() -> bool:
+    """
+    Verifica se o decorator deve ser ignorado de vez.
+    
+    Só vale com ``logging.debug_log_estatico`` ligado e nível mínimo acima
+    de DEBUG; mudanças de nível posteriores não religam o wrapper (nem as
+    métricas de duração).
+    """
+    try:
+        from raxy.core.config import get_config
+        config = get_config().logging
+    except Exception:
+        return False
+    return bool(config.debug_log_estatico) and config.nivel_minimo_valor() > _DEBUG
+
+
+def _debug_ativo(logger: ILoggingService) -> bool:
+    """Verifica se o logger registraria mensagens DEBUG."""
+    try:
+        return logger.is_enabled_for(_DEBUG)
+    except Exception:
+        return True
+
+
 def _get_logger(args: tuple) -> ILoggingService:
     """Obtém logger do self/cls ou usa global."""
     # Tenta obter do self (métodos de instância)
@@ -128,8 +196,8 @@ def _get_logger(args: tuple) -> ILoggingService:
         return args[0]._logger
     
     # Usa logger global (importação tardia para evitar circular)
-    from raxy.core.logging.logger import RaxyLogger
-    return RaxyLogger()
+    from raxy.core.logging import get_logger
+    return get_logger()
 
 
 def _get_func_full_name(func: Callable, args: tuple) -> str:
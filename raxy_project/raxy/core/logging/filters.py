@@ -0,0 +1,250 @@
+"""
+Filtros de limitação para mensagens repetitivas.
+
+Laços de retentativa (polling de email, ciclos de pesquisa, teste de
+proxies) podem emitir a mesma mensagem milhares de vezes. O
+:class:`RateLimitFilter` limita cada ponto de chamada com um token bucket,
+colapsa repetições idênticas e aplica amostragem por nível. Quando um
+ponto volta a passar, o registro sai anotado com quantos foram suprimidos
+("mensagem anterior repetida N vezes"); pontos que silenciaram antes disso
+têm o resumo emitido no flush/close do logger (:meth:`RateLimitFilter.drain_summaries`).
+
+É um filtro comum de :class:`~raxy.core.logging.handlers.LogHandler`::
+
+    handler = ConsoleHandler(filters=[RateLimitFilter(rate=1.0, burst=5)])
+
+Cada handler deve ter sua própria instância: o estado é por handler.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .context import call_site
+from raxy.core.config import LEVEL_VALUES
+
+SiteKey = Tuple[str, int, int]
+
+
+@dataclass
+class _SiteState:
+    """Estado de um ponto de chamada."""
+    tokens: float
+    updated: float
+    last_message: Optional[str] = None
+    last_passed: float = 0.0
+    last_suppressed: Optional[str] = None
+    seen: int = 0
+    suppressed: int = 0
+
+
+@dataclass
+class RateLimitStats:
+    """Contadores do filtro."""
+    passed: int = 0
+    rate_limited: int = 0
+    duplicates: int = 0
+    sampled_out: int = 0
+    summarized: int = 0
+
+    @property
+    def suppressed(self) -> int:
+        """Total de registros descartados."""
+        return self.rate_limited + self.duplicates + self.sampled_out
+
+
+class RateLimitFilter:
+    """
+    Token bucket por ponto de chamada, deduplicação e amostragem por nível.
+
+    A chave do ponto de chamada é (arquivo, linha, nível). Se o registro já
+    traz ``path``/``line`` no contexto, eles são usados; senão o primeiro
+    frame fora do pacote de logging é consultado (só arquivo e linha).
+
+    Registros a partir de ``min_protected_level`` (padrão ERROR) nunca são
+    limitados nem amostrados, apenas deduplicados.
+
+    Example:
+        >>> filtro = RateLimitFilter(rate=0.5, burst=3, sample={"DEBUG": 0.1})
+        >>> handler = FileHandler("raxy.log", filters=[filtro])
+        >>> filtro.stats()["rate_limited"]
+        0
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: int = 10,
+        dedup_window: float = 0.0,
+        sample: Optional[Mapping[str, float]] = None,
+        min_protected_level: int = LEVEL_VALUES["ERROR"],
+        max_sites: int = 4096,
+    ):
+        """
+        Inicializa o filtro.
+
+        Args:
+            rate: Registros por segundo por ponto de chamada (0 = sem limite)
+            burst: Capacidade do bucket (rajada permitida)
+            dedup_window: Segundos em que uma mensagem idêntica à última emitida do ponto é suprimida (0 = desativado)
+            sample: Fração mantida por nível, ex.: ``{"DEBUG": 0.1}``
+            min_protected_level: Nível a partir do qual não há limite nem amostragem
+            max_sites: Pontos de chamada acompanhados antes de descartar os mais antigos
+        """
+        self.rate = max(0.0, float(rate))
+        self.burst = max(1, int(burst))
+        self.dedup_window = max(0.0, float(dedup_window))
+        self.min_protected_level = min_protected_level
+        self.max_sites = max(1, max_sites)
+        # Amostragem determinística: mantém 1 a cada N registros do ponto
+        self._sample_every: Dict[int, int] = {}
+        for nome, fracao in (sample or {}).items():
+            nivel = LEVEL_VALUES.get(str(nome).upper())
+            if nivel is not None and 0 < fracao < 1:
+                self._sample_every[nivel] = max(1, round(1 / fracao))
+        self._sites: Dict[SiteKey, _SiteState] = {}
+        self._stats = RateLimitStats()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Se o filtro tem alguma regra ligada."""
+        return bool(self.rate or self.dedup_window or self._sample_every)
+
+    def _site(self, record: Dict[str, Any], level: int) -> SiteKey:
+        context = record.get('context') or {}
+        path = context.get('path')
+        if path:
+            return (path, context.get('line', 0), level)
+        path, line = call_site(2)
+        if not path:
+            # Sem frame utilizável: a própria mensagem identifica a origem
+            return (str(record.get('message', '')), 0, level)
+        return (path, line, level)
+
+    def __call__(self, record: Dict[str, Any]) -> Any:
+        """
+        Decide se o registro passa.
+
+        Returns:
+            False se suprimido; o registro (anotado com as supressões
+            anteriores, quando houver) se passou
+        """
+        level = record.get('level', 0)
+        message = record.get('message')
+        now = time.monotonic()
+        key = self._site(record, level)
+
+        with self._lock:
+            state = self._sites.get(key)
+            if state is None:
+                if len(self._sites) >= self.max_sites:
+                    # Dicionário preserva inserção: remove o ponto mais antigo
+                    self._sites.pop(next(iter(self._sites)))
+                state = self._sites[key] = _SiteState(tokens=float(self.burst), updated=now)
+
+            state.seen += 1
+            reason = self._check(state, level, message, now)
+            if reason is not None:
+                state.suppressed += 1
+                state.last_suppressed = message
+                setattr(self._stats, reason, getattr(self._stats, reason) + 1)
+                return False
+
+            self._stats.passed += 1
+            state.last_message = message
+            state.last_passed = now
+            repeated = state.suppressed
+            state.suppressed = 0
+            if repeated:
+                self._stats.summarized += 1
+
+        if not repeated:
+            return True
+        # O registro é compartilhado entre handlers: a anotação vai numa cópia
+        return {
+            **record,
+            'message': f"{message} (mensagem anterior repetida {repeated} vezes)",
+            'context': {**(record.get('context') or {}), 'suprimidas': repeated},
+        }
+
+    def _check(self, state: _SiteState, level: int, message: Optional[str], now: float) -> Optional[str]:
+        """Retorna o motivo da supressão (nome do contador) ou None."""
+        if (self.dedup_window and message == state.last_message
+                and now - state.last_passed <= self.dedup_window):
+            return "duplicates"
+
+        if level >= self.min_protected_level:
+            return None
+
+        every = self._sample_every.get(level)
+        if every and (state.seen - 1) % every:
+            return "sampled_out"
+
+        if self.rate:
+            state.tokens = min(self.burst, state.tokens + (now - state.updated) * self.rate)
+            state.updated = now
+            if state.tokens < 1:
+                return "rate_limited"
+            state.tokens -= 1
+        return None
+
+    def drain_summaries(self) -> List[Dict[str, Any]]:
+        """
+        Resume as supressões pendentes, uma entrada por ponto de chamada.
+
+        O resumo normalmente sai anotado no próximo registro aprovado do
+        ponto; se o ponto silenciou, só sairia aqui. Zera as pendências.
+
+        Returns:
+            List[Dict[str, Any]]: Registros prontos para emitir (sem passar pelo filtro)
+        """
+        summaries = []
+        with self._lock:
+            for (path, line, level), state in self._sites.items():
+                if not state.suppressed:
+                    continue
+                context: Dict[str, Any] = {'suprimidas': state.suppressed}
+                if line:
+                    context.update(path=path, line=line)
+                summaries.append({
+                    'timestamp': datetime.now(),
+                    'level': level,
+                    'message': f"{state.last_suppressed} (mensagem repetida mais {state.suppressed} vezes)",
+                    'context': context,
+                })
+                state.suppressed = 0
+            self._stats.summarized += len(summaries)
+        return summaries
+
+    def pending(self) -> Dict[str, int]:
+        """Supressões ainda não resumidas, por ``arquivo:linha``."""
+        with self._lock:
+            return {f"{path}:{line}": state.suppressed
+                    for (path, line, _), state in self._sites.items() if state.suppressed}
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores acumulados do filtro."""
+        with self._lock:
+            return {
+                "passed": self._stats.passed,
+                "rate_limited": self._stats.rate_limited,
+                "duplicates": self._stats.duplicates,
+                "sampled_out": self._stats.sampled_out,
+                "suppressed": self._stats.suppressed,
+                "summarized": self._stats.summarized,
+                "sites": len(self._sites),
+            }
+
+    def reset(self) -> None:
+        """Descarta o estado e os contadores."""
+        with self._lock:
+            self._sites.clear()
+            self._stats = RateLimitStats()
+
+
+__all__ = ["RateLimitFilter", "RateLimitStats"]
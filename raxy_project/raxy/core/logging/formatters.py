@@ -6,14 +6,77 @@ Define diferentes formatadores para diversos outputs (console, arquivo, JSON, et
 
 from __future__ import annotations
 
-import json
 import traceback
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from raxy.core import json_codec
 from raxy.core.config import LEVEL_NAMES
 
+# Campos de localização (exibidos à parte, fora do contexto)
+_LOCATION_KEYS = frozenset(('file', 'path', 'line', 'function', 'class', 'module'))
+_FILE_SKIP_KEYS = _LOCATION_KEYS | {'thread'}
+_FILE_LOCATION_ORDER = ('module', 'class', 'function', 'line')
+
+
+class _TimestampCache:
+    """
+    Texto do timestamp com cache por segundo.
+    
+    Registros do mesmo segundo só diferem nas frações; o ``strftime`` roda
+    uma vez por segundo. O par (chave, texto) é trocado numa única
+    atribuição, então o cache pode ser compartilhado entre threads.
+    """
+    
+    __slots__ = ('_fmt', '_cached')
+    
+    def __init__(self, fmt: str = '%Y-%m-%d %H:%M:%S'):
+        self._fmt = fmt
+        self._cached = (None, '')
+    
+    def seconds(self, timestamp: datetime) -> str:
+        """Timestamp até os segundos."""
+        key = (timestamp.second, timestamp.minute, timestamp.hour,
+               timestamp.day, timestamp.month, timestamp.year)
+        cached = self._cached
+        if cached[0] != key:
+            cached = self._cached = (key, timestamp.strftime(self._fmt))
+        return cached[1]
+    
+    def millis(self, timestamp: datetime) -> str:
+        """``AAAA-MM-DD HH:MM:SS.mmm``."""
+        return f"{self.seconds(timestamp)}.{timestamp.microsecond // 1000:03d}"
+
+
+# Valores de contexto se repetem muito (conta, proxy, correlation_id): o repr
+# das strings curtas fica em cache, limpo ao atingir o limite
+_REPR_CACHE: Dict[str, str] = {}
+_REPR_CACHE_MAX = 4096
+
+
+def _short_repr(value: Any) -> str:
+    """repr com strings longas truncadas (despacho pelo tipo exato primeiro)."""
+    if type(value) is str:
+        cached = _REPR_CACHE.get(value)
+        if cached is None:
+            cached = repr(value if len(value) <= 50 else value[:47] + '...')
+            if len(value) <= 256:
+                if len(_REPR_CACHE) >= _REPR_CACHE_MAX:
+                    _REPR_CACHE.clear()
+                _REPR_CACHE[value] = cached
+        return cached
+    if isinstance(value, str):
+        return repr(value if len(value) <= 50 else value[:47] + '...')
+    return repr(value)
+
+
+def _json_default(value: Any) -> Any:
+    """Tipos que o backend JSON não conhece: objetos viram seu ``__dict__``, o resto ``str``."""
+    if hasattr(value, '__dict__'):
+        return value.__dict__
+    return str(value)
+
 
 class LogFormatter(ABC):
     """
@@ -21,8 +84,14 @@ class LogFormatter(ABC):
     
     Define o contrato para formatação de mensagens de log
     em diferentes formatos e destinos.
+    
+    Attributes:
+        uses_location: Se o formatador exibe arquivo/linha/função. Quando
+            False, o logger não precisa inspecionar a pilha para ele.
     """
     
+    uses_location: bool = True
+    
     @abstractmethod
     def format(
         self,
@@ -95,6 +164,30 @@ class ConsoleFormatter(LogFormatter):
         self.show_time = show_time
         self.show_location = show_location
         self.compact = compact
+        
+        # Prefixos por nível e moldura do timestamp calculados uma vez;
+        # para mudar as opções, crie outro formatador
+        self._timestamps = _TimestampCache()
+        self._time_open = self.DIM if use_colors else ''
+        self._time_close = f"{self.RESET} " if use_colors else ' '
+        self._tail = self.RESET if use_colors else ''
+        self._styles: Dict[int, tuple] = {level: self._build_style(level) for level in LEVEL_NAMES}
+    
+    @property
+    def uses_location(self) -> bool:
+        """Localização só aparece no modo detalhado."""
+        return self.show_location and not self.compact
+    
+    def _build_style(self, level: int) -> tuple:
+        """Monta (símbolo, nível) do nível, já com as cores."""
+        symbol = self.SYMBOLS.get(level, '')
+        head = f"{symbol} " if symbol and not self.compact else ''
+        level_name = LEVEL_NAMES.get(level, 'UNKNOWN').ljust(8)
+        if self.use_colors:
+            color = self.COLORS.get(level, '')
+            # A cor do nível segue pelo resto da linha
+            return head, f"{color}{self.BOLD}{level_name}{self.RESET}{color}"
+        return head, level_name
     
     def format(
         self,
@@ -105,79 +198,46 @@ class ConsoleFormatter(LogFormatter):
         exception: Optional[Exception] = None
     ) -> str:
         """Formata mensagem para console."""
-        parts = []
-        
-        # Determina cor
-        color = self.COLORS.get(level, '') if self.use_colors else ''
-        is_success = level == 25  # Nível SUCCESS
-        
-        # Símbolo
-        symbol = self.SYMBOLS.get(level, '')
-        if symbol and not self.compact:
-            parts.append(f"{symbol} ")
+        style = self._styles.get(level)
+        if style is None:
+            style = self._styles[level] = self._build_style(level)
+        head, level_part = style
         
         # Timestamp (sem cor para não interferir)
+        time_part = ''
         if self.show_time:
-            time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-            if self.use_colors:
-                parts.append(f"{self.DIM}{time_str}{self.RESET} ")
-            else:
-                parts.append(f"{time_str} ")
-        
-        # Inicia cor para o resto da linha (se for sucesso, verde em tudo)
-        if self.use_colors:
-            parts.append(color)
-        
-        # Nível
-        level_name = LEVEL_NAMES.get(level, 'UNKNOWN').ljust(8)
-        if self.use_colors:
-            parts.append(f"{self.BOLD}{level_name}{self.RESET}{color}")
-        else:
-            parts.append(level_name)
+            time_part = f"{self._time_open}{self._timestamps.millis(timestamp)}{self._time_close}"
         
         # Localização
+        location = ''
         if self.show_location and not self.compact:
             file_info = context.get('file', '')
             line_info = context.get('line', '')
             func_info = context.get('function', '')
-            
             if file_info or line_info or func_info:
                 location = f" [{file_info}:{line_info}:{func_info}]"
-                parts.append(location)
-        
-        # Separador
-        parts.append(" | ")
-        
-        # Mensagem principal
-        parts.append(message)
         
         # Contexto adicional (compacto)
+        extra = ''
         if self.compact and context:
-            # Filtra campos internos
-            extra = {k: v for k, v in context.items() 
-                    if not k.startswith('_') and k not in ['file', 'line', 'function', 'class', 'module']}
+            extra = self._format_context(context)
             if extra:
-                parts.append(f" | {self._format_context(extra)}")
+                extra = f" | {extra}"
         
-        # Reset de cor
-        if self.use_colors:
-            parts.append(self.RESET)
+        result = f"{head}{time_part}{level_part}{location} | {message}{extra}{self._tail}"
         
         # Exceção
         if exception:
-            parts.append('\n')
-            parts.append(self._format_exception(exception))
+            result = f"{result}\n{self._format_exception(exception)}"
         
-        return ''.join(parts)
+        return result
     
     def _format_context(self, context: Dict[str, Any]) -> str:
-        """Formata contexto de forma compacta."""
-        items = []
-        for key, value in context.items():
-            if isinstance(value, str) and len(value) > 50:
-                value = value[:47] + '...'
-            items.append(f"{key}={repr(value)}")
-        return ', '.join(items)
+        """Formata contexto de forma compacta (sem campos internos e de localização)."""
+        return ', '.join(
+            f"{key}={_short_repr(value)}" for key, value in context.items()
+            if key not in _LOCATION_KEYS and not key.startswith('_')
+        )
     
     def _format_exception(self, exception: Exception) -> str:
         """Formata exceção com traceback."""
@@ -214,6 +274,8 @@ class FileFormatter(LogFormatter):
         """
         self.include_context = include_context
         self.separator = separator
+        self._timestamps = _TimestampCache()
+        self._labels = {level: name.ljust(8) for level, name in LEVEL_NAMES.items()}
     
     def format(
         self,
@@ -224,39 +286,31 @@ class FileFormatter(LogFormatter):
         exception: Optional[Exception] = None
     ) -> str:
         """Formata mensagem para arquivo."""
-        parts = []
-        
-        # Timestamp
-        parts.append(timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3])
-        
-        # Nível
-        level_name = LEVEL_NAMES.get(level, 'UNKNOWN')
-        parts.append(level_name.ljust(8))
+        parts = [
+            self._timestamps.millis(timestamp),
+            self._labels.get(level) or LEVEL_NAMES.get(level, 'UNKNOWN').ljust(8),
+        ]
         
         # Thread (se disponível)
         if 'thread' in context:
             parts.append(f"[{context['thread']}]")
         
         # Localização
-        location_parts = []
-        for key in ['module', 'class', 'function', 'line']:
-            if key in context and context[key]:
-                location_parts.append(str(context[key]))
-        
-        if location_parts:
-            parts.append(':'.join(location_parts))
+        location = [str(value) for key in _FILE_LOCATION_ORDER if (value := context.get(key))]
+        if location:
+            parts.append(':'.join(location))
         
         # Mensagem
         parts.append(message)
         
         # Contexto adicional
         if self.include_context:
-            extra = {k: v for k, v in context.items()
-                    if not k.startswith('_') and 
-                    k not in ['file', 'line', 'function', 'class', 'module', 'thread']}
+            extra = ', '.join(
+                f"{key}={value}" for key, value in context.items()
+                if key not in _FILE_SKIP_KEYS and not key.startswith('_')
+            )
             if extra:
-                context_str = ', '.join(f"{k}={v}" for k, v in extra.items())
-                parts.append(f"[{context_str}]")
+                parts.append(f"[{extra}]")
         
         result = self.separator.join(parts)
         
@@ -288,6 +342,14 @@ class JSONFormatter(LogFormatter):
         """
         self.pretty = pretty
         self.include_traceback = include_traceback
+        self._timestamps = _TimestampCache('%Y-%m-%dT%H:%M:%S')
+    
+    def _isoformat(self, timestamp: datetime) -> str:
+        """Equivalente a ``timestamp.isoformat()`` com cache por segundo."""
+        if timestamp.tzinfo is not None:
+            return timestamp.isoformat()
+        seconds = self._timestamps.seconds(timestamp)
+        return f"{seconds}.{timestamp.microsecond:06d}" if timestamp.microsecond else seconds
     
     def format(
         self,
@@ -299,7 +361,7 @@ class JSONFormatter(LogFormatter):
     ) -> str:
         """Formata mensagem como JSON."""
         log_dict = {
-            'timestamp': timestamp.isoformat(),
+            'timestamp': self._isoformat(timestamp),
             'level': level,
             'level_name': LEVEL_NAMES.get(level, 'UNKNOWN'),
             'message': message,
@@ -312,10 +374,10 @@ class JSONFormatter(LogFormatter):
             extra = {}
             
             for key, value in context.items():
-                if key in ['file', 'path', 'line', 'function', 'class', 'module']:
+                if key in _LOCATION_KEYS:
                     location[key] = value
                 elif not key.startswith('_'):
-                    extra[key] = self._serialize_value(value)
+                    extra[key] = value
             
             if location:
                 log_dict['location'] = location
@@ -335,24 +397,10 @@ class JSONFormatter(LogFormatter):
                 )
                 log_dict['exception']['traceback'] = tb_lines
         
-        # Serializa para JSON
-        if self.pretty:
-            return json.dumps(log_dict, indent=2, ensure_ascii=False, default=str)
-        else:
-            return json.dumps(log_dict, ensure_ascii=False, default=str)
-    
-    def _serialize_value(self, value: Any) -> Any:
-        """Serializa valor para JSON."""
-        if isinstance(value, (str, int, float, bool)) or value is None:
-            return value
-        elif isinstance(value, (list, tuple)):
-            return [self._serialize_value(v) for v in value]
-        elif isinstance(value, dict):
-            return {k: self._serialize_value(v) for k, v in value.items()}
-        elif hasattr(value, '__dict__'):
-            return self._serialize_value(value.__dict__)
-        else:
-            return str(value)
+        # Serializa para JSON: o backend (orjson/msgspec quando instalados)
+        # percorre os tipos nativos; só o que ele não conhece passa pelo default.
+        # Datetimes do contexto: str() no stdlib/orjson, ISO 8601 no msgspec
+        return json_codec.dumps(log_dict, indent=self.pretty, default=_json_default)
 
 
 class ErrorFormatter(LogFormatter):
@@ -7,7 +7,10 @@ Define diferentes handlers para enviar logs para diversos destinos
 
 from __future__ import annotations
 
+import os
 import sys
+import time
+import atexit
 import queue
 import threading
 from abc import ABC, abstractmethod
@@ -17,6 +20,7 @@ from typing import Any, Dict, Optional, List
 from collections import deque
 
 from .formatters import LogFormatter, ConsoleFormatter, FileFormatter
+from .rotation import RotationPolicy, RotationWorker, active_since, normalize_compression, rotated_name
 
 
 class LogHandler(ABC):
@@ -28,7 +32,8 @@ class LogHandler(ABC):
     """
     
     def __init__(self, formatter: Optional[LogFormatter] = None,
-                 level: int = 0, filters: Optional[List] = None):
+                 level: int = 0, filters: Optional[List] = None,
+                 include_caller: Optional[bool] = None):
         """
         Inicializa o handler.
         
@@ -36,12 +41,22 @@ class LogHandler(ABC):
             formatter: Formatador a ser usado
             level: Nível mínimo para processar
             filters: Lista de filtros
+            include_caller: Se os registros devem trazer arquivo/linha/função
+                (padrão: o que o formatador exibir)
         """
         self.formatter = formatter or ConsoleFormatter()
         self.level = level
         self.filters = filters or []
+        self.include_caller = include_caller
         self._lock = threading.RLock()
     
+    @property
+    def wants_caller_info(self) -> bool:
+        """Se este handler usa as informações do chamador."""
+        if self.include_caller is not None:
+            return self.include_caller
+        return getattr(self.formatter, 'uses_location', True)
+    
     def should_handle(self, level: int) -> bool:
         """
         Verifica se deve processar o nível.
@@ -54,20 +69,26 @@ class LogHandler(ABC):
         """
         return level >= self.level
     
-    def apply_filters(self, record: Dict[str, Any]) -> bool:
+    def apply_filters(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Aplica filtros ao registro.
         
+        Um filtro retorna falso para descartar, verdadeiro para manter ou um
+        novo dicionário para substituir o registro (ex.: anotado).
+        
         Args:
             record: Registro de log
             
         Returns:
-            bool: True se passou pelos filtros
+            Optional[Dict[str, Any]]: Registro a emitir, ou None se descartado
         """
         for filter_func in self.filters:
-            if not filter_func(record):
-                return False
-        return True
+            result = filter_func(record)
+            if not result:
+                return None
+            if isinstance(result, dict):
+                record = result
+        return record
     
     @abstractmethod
     def emit(self, record: Dict[str, Any]) -> None:
@@ -79,6 +100,19 @@ class LogHandler(ABC):
         """
         pass
     
+    def emit_batch(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Emite vários registros de uma vez.
+        
+        Handlers com I/O caro sobrescrevem para escrever o lote numa única
+        operação; o padrão apenas emite um a um.
+        
+        Args:
+            records: Registros já aprovados por nível e filtros
+        """
+        for record in records:
+            self.emit(record)
+    
     def handle(self, record: Dict[str, Any]) -> None:
         """
         Processa o registro de log.
@@ -92,7 +126,8 @@ class LogHandler(ABC):
         if not self.should_handle(level):
             return
         
-        if not self.apply_filters(record):
+        record = self.apply_filters(record)
+        if record is None:
             return
         
         # Emite o registro
@@ -103,6 +138,24 @@ class LogHandler(ABC):
             # Fallback para stderr em caso de erro
             print(f"Erro no handler: {e}", file=sys.stderr)
     
+    def emit_summaries(self) -> None:
+        """
+        Emite os resumos pendentes dos filtros (ex.: supressões do RateLimitFilter).
+        
+        Os resumos não passam pelos filtros de novo: senão seriam suprimidos
+        pelo mesmo limite que resumem.
+        """
+        for filter_func in self.filters:
+            drain = getattr(filter_func, 'drain_summaries', None)
+            if drain is None:
+                continue
+            for record in drain():
+                try:
+                    with self._lock:
+                        self.emit(record)
+                except Exception as e:
+                    print(f"Erro no handler: {e}", file=sys.stderr)
+    
     def flush(self) -> None:
         """Força escrita de buffers pendentes."""
         pass
@@ -120,7 +173,8 @@ class ConsoleHandler(LogHandler):
     """
     
     def __init__(self, stream=None, formatter: Optional[LogFormatter] = None,
-                 level: int = 0, use_stderr: bool = False):
+                 level: int = 0, use_stderr: bool = False,
+                 filters: Optional[List] = None):
         """
         Inicializa o handler.
         
@@ -129,8 +183,9 @@ class ConsoleHandler(LogHandler):
             formatter: Formatador a usar
             level: Nível mínimo
             use_stderr: Se deve usar stderr ao invés de stdout
+            filters: Lista de filtros
         """
-        super().__init__(formatter or ConsoleFormatter(), level)
+        super().__init__(formatter or ConsoleFormatter(), level, filters)
         self.stream = stream or (sys.stderr if use_stderr else sys.stdout)
     
     def emit(self, record: Dict[str, Any]) -> None:
@@ -164,12 +219,18 @@ class FileHandler(LogHandler):
     """
     Handler para saída em arquivo.
     
-    Envia logs para arquivo com suporte a rotação.
+    Envia logs para arquivo com suporte a rotação por tamanho e/ou tempo.
+    A rotação só renomeia o arquivo ativo (``raxy.AAAAMMDD-HHMMSS.log``);
+    compressão e retenção ficam com o RotationWorker, em segundo plano.
     """
     
     def __init__(self, filename: str | Path, formatter: Optional[LogFormatter] = None,
                  level: int = 0, mode: str = 'a', encoding: str = 'utf-8',
-                 max_bytes: int = 0, backup_count: int = 0):
+                 max_bytes: int = 0, backup_count: int = 0,
+                 rotate_interval: float = 0, compression: Optional[str] = None,
+                 retention_seconds: Optional[float] = None,
+                 max_total_bytes: Optional[int] = None,
+                 filters: Optional[List] = None):
         """
         Inicializa o handler.
         
@@ -180,60 +241,78 @@ class FileHandler(LogHandler):
             mode: Modo de abertura ('a' ou 'w')
             encoding: Encoding do arquivo
             max_bytes: Tamanho máximo antes de rotacionar (0 = sem limite)
-            backup_count: Número de backups a manter
+            backup_count: Número de arquivos rotacionados a manter (0 = sem limite)
+            rotate_interval: Rotaciona a cada N segundos (0 = desativado)
+            compression: Compressão dos rotacionados (gzip, zstd, zip ou None)
+            retention_seconds: Idade máxima dos rotacionados
+            max_total_bytes: Orçamento de disco somando ativo e rotacionados
+            filters: Lista de filtros
         """
-        super().__init__(formatter or FileFormatter(), level)
+        super().__init__(formatter or FileFormatter(), level, filters)
         self.filename = Path(filename)
         self.mode = mode
         self.encoding = encoding
         self.max_bytes = max_bytes
         self.backup_count = backup_count
+        self.rotate_interval = rotate_interval
+        self.policy = RotationPolicy(
+            compression=normalize_compression(compression),
+            backup_count=backup_count,
+            retention_seconds=retention_seconds,
+            max_total_bytes=max_total_bytes,
+        )
         self._file = None
+        self._size = 0
+        self._next_rollover = float('inf')
         self._open()
+        
+        # Arquivos deixados por execuções anteriores entram na retenção desde já
+        if self._has_maintenance():
+            RotationWorker.instance().submit(self.filename, self.policy)
+    
+    def _has_maintenance(self) -> bool:
+        policy = self.policy
+        return bool(policy.compression or policy.backup_count or
+                    policy.retention_seconds or policy.max_total_bytes)
     
-    def _open(self) -> None:
+    def _open(self, mode: Optional[str] = None) -> None:
         """Abre o arquivo para escrita."""
         # Cria diretório se necessário
         self.filename.parent.mkdir(parents=True, exist_ok=True)
         
-        # Abre arquivo
-        self._file = open(self.filename, self.mode, encoding=self.encoding)
+        # Abre em binário: as linhas já chegam codificadas e o tamanho sai do próprio write
+        self._file = open(self.filename, (mode or self.mode) + 'b')
+        self._size = self._file.tell() if 'a' in (mode or self.mode) else 0
+        
+        if self.rotate_interval > 0:
+            # Conta a partir do início do arquivo ativo, não da abertura:
+            # processos curtos que reabrem o log também rotacionam
+            inicio = active_since(self.filename) if self._size else None
+            self._next_rollover = (inicio or time.time()) + self.rotate_interval
     
     def _should_rotate(self) -> bool:
-        """Verifica se deve rotacionar o arquivo."""
-        if self.max_bytes <= 0:
-            return False
-        
-        try:
-            return self.filename.stat().st_size >= self.max_bytes
-        except:
-            return False
+        """Verifica se deve rotacionar (contadores em memória, sem stat por registro)."""
+        if self.max_bytes > 0 and self._size >= self.max_bytes:
+            return True
+        return self._next_rollover <= time.time()
     
     def _rotate(self) -> None:
-        """Rotaciona o arquivo."""
+        """Renomeia o arquivo ativo, reabre e agenda compressão/retenção."""
         if self._file:
             self._file.close()
+            self._file = None
         
-        # Renomeia arquivos antigos
-        for i in range(self.backup_count - 1, 0, -1):
-            old_name = self.filename.with_suffix(f'.{i}{self.filename.suffix}')
-            new_name = self.filename.with_suffix(f'.{i+1}{self.filename.suffix}')
-            
-            if old_name.exists():
-                if new_name.exists():
-                    new_name.unlink()
-                old_name.rename(new_name)
-        
-        # Renomeia arquivo atual
-        if self.backup_count > 0:
-            backup_name = self.filename.with_suffix(f'.1{self.filename.suffix}')
-            if backup_name.exists():
-                backup_name.unlink()
-            if self.filename.exists():
-                self.filename.rename(backup_name)
-        
-        # Reabre arquivo
-        self._open()
+        try:
+            if self.filename.exists() and self.filename.stat().st_size > 0:
+                os.replace(self.filename, rotated_name(self.filename))
+        except OSError as e:
+            print(f"Erro ao rotacionar log: {e}", file=sys.stderr)
+        
+        # Reabre arquivo (sempre em append: o antigo já foi preservado)
+        self._open('a')
+        
+        if self._has_maintenance():
+            RotationWorker.instance().submit(self.filename, self.policy)
     
     def emit(self, record: Dict[str, Any]) -> None:
         """Emite registro para arquivo."""
@@ -255,12 +334,47 @@ class FileHandler(LogHandler):
             )
             
             # Escreve no arquivo
-            self._file.write(formatted + '\n')
+            data = (formatted + '\n').encode(self.encoding)
+            self._file.write(data)
             self._file.flush()
+            self._size += len(data)
             
         except Exception as e:
             print(f"Erro ao escrever log: {e}", file=sys.stderr)
     
+    def emit_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Formata o lote e grava com um único write/flush."""
+        with self._lock:
+            if not self._file:
+                self._open()
+            
+            if self._should_rotate():
+                self._rotate()
+            
+            lines = []
+            for record in records:
+                try:
+                    lines.append(self.formatter.format(
+                        level=record['level'],
+                        message=record['message'],
+                        timestamp=record['timestamp'],
+                        context=record.get('context', {}),
+                        exception=record.get('exception')
+                    ))
+                except Exception as e:
+                    print(f"Erro ao formatar log: {e}", file=sys.stderr)
+            
+            if not lines:
+                return
+            
+            try:
+                data = ('\n'.join(lines) + '\n').encode(self.encoding)
+                self._file.write(data)
+                self._file.flush()
+                self._size += len(data)
+            except Exception as e:
+                print(f"Erro ao escrever log: {e}", file=sys.stderr)
+    
     def flush(self) -> None:
         """Força flush do arquivo."""
         if self._file:
@@ -296,6 +410,7 @@ class BufferedHandler(LogHandler):
             filters=target_handler.filters
         )
         self.target = target_handler
+        self.include_caller = target_handler.include_caller
         self.buffer_size = buffer_size
         self.flush_interval = flush_interval
         self.buffer: deque = deque(maxlen=buffer_size)
@@ -363,6 +478,7 @@ class AsyncHandler(LogHandler):
             filters=target_handler.filters
         )
         self.target = target_handler
+        self.include_caller = target_handler.include_caller
         self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
         self._thread = None
         self._stop_event = threading.Event()
@@ -422,6 +538,225 @@ class AsyncHandler(LogHandler):
         self.target.close()
 
 
+class BatchingHandler(LogHandler):
+    """
+    Handler em lote com uma única thread escritora.
+    
+    Os produtores só enfileiram o registro; a thread escritora formata e
+    grava em lotes (commit em grupo), ao atingir ``batch_size`` registros ou
+    após ``flush_interval`` segundos, o que ocorrer primeiro.
+    
+    Com a fila cheia, aplica a política de backpressure:
+    
+    - ``block``: o produtor espera espaço (nenhum registro é perdido)
+    - ``drop_debug``: descarta DEBUG (o novo ou o mais antigo da fila);
+      níveis acima esperam como em ``block``
+    - ``sample``: abaixo de WARNING mantém 1 a cada ``sample_every``
+      registros; WARNING ou acima espera como em ``block``
+    
+    Descartes são informados no próprio arquivo, num registro WARNING.
+    """
+    
+    POLICIES = ("block", "drop_debug", "sample")
+    
+    _DEBUG = 10
+    _WARNING = 30
+    
+    def __init__(self, target_handler: LogHandler, batch_size: int = 256,
+                 flush_interval: float = 0.2, capacity: int = 2000,
+                 policy: str = "block", sample_every: int = 10):
+        """
+        Inicializa o handler.
+        
+        Args:
+            target_handler: Handler de destino (recebe ``emit_batch``)
+            batch_size: Registros por lote antes de forçar a escrita
+            flush_interval: Tempo máximo (s) que um registro espera na fila
+            capacity: Tamanho máximo da fila
+            policy: Política de backpressure (block, drop_debug, sample)
+            sample_every: Fator de amostragem da política ``sample``
+        """
+        if policy not in self.POLICIES:
+            from raxy.core.exceptions import InvalidConfigException
+            raise InvalidConfigException(
+                f"Política de backpressure inválida: {policy}",
+                details={"policy": policy, "validas": list(self.POLICIES)}
+            )
+        
+        super().__init__(
+            formatter=target_handler.formatter,
+            level=target_handler.level,
+            filters=target_handler.filters
+        )
+        self.target = target_handler
+        self.include_caller = target_handler.include_caller
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.capacity = max(self.batch_size, capacity)
+        self.policy = policy
+        self.sample_every = max(1, sample_every)
+        
+        self._pending: deque = deque()
+        self._cond = threading.Condition()
+        self._writing = False
+        self._flush_requested = False
+        self._closed = False
+        
+        # Estatísticas
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._dropped_reported = 0
+        self._sample_counter = 0
+        
+        self._thread = threading.Thread(target=self._worker, name="raxy-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def handle(self, record: Dict[str, Any]) -> None:
+        """Processa o registro (sem o lock do handler: a fila tem o seu)."""
+        if not self.should_handle(record.get('level', 0)):
+            return
+        record = self.apply_filters(record)
+        if record is None:
+            return
+        try:
+            self.emit(record)
+        except Exception as e:
+            print(f"Erro no handler: {e}", file=sys.stderr)
+    
+    def emit(self, record: Dict[str, Any]) -> None:
+        """Enfileira o registro aplicando a política de backpressure."""
+        with self._cond:
+            while len(self._pending) >= self.capacity:
+                if self._closed or not self._make_room(record):
+                    self.dropped += 1
+                    return
+            if self._closed:
+                self.dropped += 1
+                return
+            
+            self._pending.append(record)
+            self.enqueued += 1
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+    
+    def _make_room(self, record: Dict[str, Any]) -> bool:
+        """
+        Trata a fila cheia (chamado com ``_cond`` adquirido).
+        
+        Returns:
+            bool: False se o registro deve ser descartado
+        """
+        level = record.get('level', 0)
+        
+        if self.policy == "drop_debug":
+            if level <= self._DEBUG:
+                return False
+            for index, queued in enumerate(self._pending):
+                if queued.get('level', 0) <= self._DEBUG:
+                    del self._pending[index]
+                    self.dropped += 1
+                    return True
+        
+        elif self.policy == "sample" and level < self._WARNING:
+            self._sample_counter += 1
+            if self._sample_counter % self.sample_every:
+                return False
+        
+        # block (ou sem DEBUG para descartar / registro amostrado): espera espaço
+        self._cond.wait()
+        return True
+    
+    def _worker(self) -> None:
+        """Thread escritora: coleta lotes e grava no handler de destino."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed and not self._flush_requested:
+                    self._cond.wait()
+                
+                # Janela de agrupamento: espera o lote encher ou o intervalo vencer
+                if not self._closed and not self._flush_requested:
+                    self._cond.wait_for(
+                        lambda: len(self._pending) >= self.batch_size or self._closed or self._flush_requested,
+                        timeout=self.flush_interval
+                    )
+                
+                batch = list(self._pending)
+                self._pending.clear()
+                dropped = self.dropped - self._dropped_reported
+                self._dropped_reported = self.dropped
+                self._writing = True
+                stop = self._closed
+                # Libera produtores bloqueados pela fila cheia
+                self._cond.notify_all()
+            
+            if dropped:
+                batch.append(self._drop_record(dropped))
+            
+            if batch:
+                try:
+                    self.target.emit_batch(batch)
+                except Exception as e:
+                    print(f"Erro no writer de log: {e}", file=sys.stderr)
+            
+            with self._cond:
+                self._writing = False
+                self.written += len(batch)
+                self.batches += 1 if batch else 0
+                if not self._pending:
+                    self._flush_requested = False
+                self._cond.notify_all()
+                if stop and not self._pending:
+                    return
+    
+    def _drop_record(self, count: int) -> Dict[str, Any]:
+        """Registro informando descartes por backpressure."""
+        return {
+            'timestamp': datetime.now(),
+            'level': self._WARNING,
+            'message': f"{count} registro(s) de log descartado(s) por backpressure ({self.policy})",
+            'context': {'dropped': count, 'policy': self.policy},
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas do pipeline."""
+        with self._cond:
+            return {
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'batches': self.batches,
+                'pending': len(self._pending),
+            }
+    
+    def flush(self, timeout: Optional[float] = 10.0) -> None:
+        """Aguarda a gravação de tudo que já foi enfileirado."""
+        with self._cond:
+            if self._closed and not self._thread.is_alive():
+                return
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: not self._pending and not self._writing, timeout=timeout)
+        self.target.flush()
+    
+    def close(self) -> None:
+        """Drena a fila, encerra a thread escritora e fecha o destino."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        
+        self._thread.join(timeout=10)
+        self.target.close()
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+
+
 class MultiHandler(LogHandler):
     """
     Handler que distribui logs para múltiplos handlers.
@@ -440,6 +775,13 @@ class MultiHandler(LogHandler):
         super().__init__(level=level)
         self.handlers = handlers
     
+    @property
+    def wants_caller_info(self) -> bool:
+        """Basta um dos handlers precisar do chamador."""
+        if self.include_caller is not None:
+            return self.include_caller
+        return any(handler.wants_caller_info for handler in self.handlers)
+    
     def emit(self, record: Dict[str, Any]) -> None:
         """Emite para todos os handlers."""
         for handler in self.handlers:
@@ -448,6 +790,11 @@ class MultiHandler(LogHandler):
             except Exception as e:
                 print(f"Erro em handler: {e}", file=sys.stderr)
     
+    def emit_summaries(self) -> None:
+        """Resumos pendentes de todos os handlers."""
+        for handler in self.handlers:
+            handler.emit_summaries()
+    
     def flush(self) -> None:
         """Flush em todos os handlers."""
         for handler in self.handlers:
@@ -7,23 +7,44 @@ do sistema de logging (handlers, formatadores, contexto, etc).
 
 from __future__ import annotations
 
+import atexit
+import re
 import sys
 import time
 import traceback
 from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from raxy.interfaces.services import ILoggingService
 
 from raxy.core.config import LoggerConfig, LEVEL_VALUES
-from .context import get_context, context_scope
+from raxy.core.exceptions import InvalidConfigException
+from .context import context_scope, find_caller, snapshot as context_snapshot
+from .filters import RateLimitFilter
+from .rotation import parse_duration, parse_size
+from .structured import StructuredLogHandler
 from .formatters import ConsoleFormatter, FileFormatter, JSONFormatter, ErrorFormatter
 from .handlers import (
     LogHandler, ConsoleHandler, FileHandler,
-    BufferedHandler, AsyncHandler, MultiHandler
+    BufferedHandler, AsyncHandler, BatchingHandler, MultiHandler
 )
 
+# Mensagem pronta ou função que a produz (avaliada só se o registro for emitido)
+Mensagem = Union[str, Callable[[], str]]
+
+_DEBUG = LEVEL_VALUES["DEBUG"]
+_INFO = LEVEL_VALUES["INFO"]
+_SUCCESS = LEVEL_VALUES["SUCCESS"]
+_WARNING = LEVEL_VALUES["WARNING"]
+_ERROR = LEVEL_VALUES["ERROR"]
+_CRITICAL = LEVEL_VALUES["CRITICAL"]
+# Acima de qualquer nível: nenhum handler ativo
+_DISABLED = _CRITICAL + 1
+
+# Retenção por quantidade de arquivos rotacionados ("10 files", "5 arquivos")
+_RETENCAO_QUANTIDADE = re.compile(r"^(\d+)\s*(files?|arquivos?)$")
+
 
 class RaxyLogger(ILoggingService):
     """
@@ -45,7 +66,69 @@ class RaxyLogger(ILoggingService):
         
         self.handlers: List[LogHandler] = []
         self._disabled_handlers: List[LogHandler] = []
+        self._rate_filters: List[RateLimitFilter] = []
+        self._min_level = _DISABLED
         self._setup_handlers()
+        self._refresh_min_level()
+        
+        # Registrado depois dos handlers: roda antes do close deles no atexit
+        if self._rate_filters:
+            atexit.register(self.flush)
+    
+    def _refresh_min_level(self) -> None:
+        """
+        Recalcula o menor nível aceito pelos handlers.
+        
+        Deve ser chamado sempre que handlers ou seus níveis mudam; é o que
+        permite descartar chamadas de níveis desativados sem montar registro.
+        """
+        self._min_level = min((h.level for h in self.handlers), default=_DISABLED)
+    
+    def is_enabled_for(self, nivel: str | int) -> bool:
+        """
+        Indica se algum handler registraria mensagens do nível.
+        
+        Args:
+            nivel: Nome (DEBUG, INFO, ...) ou valor numérico do nível
+            
+        Returns:
+            bool: True se o nível está ativo
+        """
+        if isinstance(nivel, str):
+            nivel = LEVEL_VALUES.get(nivel.upper(), _INFO)
+        return nivel >= self._min_level
+    
+    def _rate_limit_filters(self) -> List[RateLimitFilter]:
+        """
+        Cria o filtro de mensagens repetitivas de um handler (se configurado).
+        
+        Cada handler recebe sua própria instância, pois o filtro guarda
+        estado por ponto de chamada.
+        """
+        filtro = RateLimitFilter(
+            rate=self.config.limite_por_origem,
+            burst=self.config.rajada_por_origem,
+            dedup_window=self.config.janela_repeticao,
+            sample=self.config.amostragem_por_nivel
+        )
+        if not filtro.active:
+            return []
+        self._rate_filters.append(filtro)
+        return [filtro]
+    
+    def rate_limit_stats(self) -> Dict[str, int]:
+        """
+        Soma os contadores dos filtros de mensagens repetitivas.
+        
+        Returns:
+            Dict[str, int]: passed, rate_limited, duplicates, sampled_out, suppressed e summarized
+        """
+        total: Dict[str, int] = {}
+        for filtro in self._rate_filters:
+            for chave, valor in filtro.stats().items():
+                if chave != "sites":
+                    total[chave] = total.get(chave, 0) + valor
+        return total
     
     def _setup_handlers(self) -> None:
         """Configura handlers baseado na configuração."""
@@ -59,7 +142,8 @@ class RaxyLogger(ILoggingService):
         console_handler = ConsoleHandler(
             formatter=console_formatter,
             level=LEVEL_VALUES.get(self.config.nivel_minimo, 20),
-            use_stderr=True
+            use_stderr=True,
+            filters=self._rate_limit_filters()
         )
         
         # Console não usa buffer para garantir mensagens imediatas
@@ -72,17 +156,47 @@ class RaxyLogger(ILoggingService):
                 filename=self.config.arquivo_log,
                 formatter=file_formatter,
                 level=LEVEL_VALUES.get(self.config.nivel_minimo, 20),
-                mode='w' if self.config.sobrescrever_arquivo else 'a'
+                mode='w' if self.config.sobrescrever_arquivo else 'a',
+                filters=self._rate_limit_filters(),
+                **self._rotation_options()
             )
             
-            # Torna assíncrono para não bloquear
-            file_handler = AsyncHandler(
-                target_handler=file_handler,
-                queue_size=self.config.buffer_size * 2
-            )
+            # Tira o I/O de disco das threads que logam
+            modo = self.config.modo_arquivo
+            if modo == "lote":
+                file_handler = BatchingHandler(
+                    target_handler=file_handler,
+                    batch_size=self.config.lote_tamanho,
+                    flush_interval=self.config.lote_intervalo,
+                    capacity=self.config.buffer_size * 2,
+                    policy=self.config.politica_backpressure,
+                    sample_every=self.config.amostragem_backpressure
+                )
+            elif modo == "async":
+                file_handler = AsyncHandler(
+                    target_handler=file_handler,
+                    queue_size=self.config.buffer_size * 2
+                )
             
             self.handlers.append(file_handler)
         
+        # Sink estruturado indexado (se configurado)
+        if self.config.diretorio_estruturado:
+            structured_handler = StructuredLogHandler(
+                directory=self.config.diretorio_estruturado,
+                level=LEVEL_VALUES.get(self.config.nivel_minimo, 20),
+                segment_bytes=parse_size(self.config.segmento_estruturado) or 64 * 1024 * 1024,
+                max_segments=self.config.max_segmentos_estruturados
+            )
+            self.handlers.append(BatchingHandler(
+                target_handler=structured_handler,
+                batch_size=self.config.lote_tamanho,
+                flush_interval=self.config.lote_intervalo,
+                capacity=self.config.buffer_size * 2,
+                policy=self.config.politica_backpressure,
+                sample_every=self.config.amostragem_backpressure
+            ))
+        
         # Handler de erros (se configurado)
         if self.config.diretorio_erros:
             error_formatter = ErrorFormatter()
@@ -95,32 +209,85 @@ class RaxyLogger(ILoggingService):
             )
             self.handlers.append(error_handler)
     
-    def _log(self, level: str, message: str, **kwargs: Any) -> None:
+    def _rotation_options(self) -> Dict[str, Any]:
+        """
+        Traduz rotação/retenção/compressão da configuração para o FileHandler.
+        
+        ``rotacao_arquivo`` aceita tamanho, duração ou ambos separados por
+        vírgula; ``retencao_arquivo`` aceita duração ou quantidade ("10 files").
+        """
+        options: Dict[str, Any] = {
+            'compression': self.config.compressao_arquivo,
+            'max_total_bytes': parse_size(self.config.limite_disco_logs),
+        }
+        
+        for spec in (self.config.rotacao_arquivo or "").split(','):
+            if (size := parse_size(spec)) is not None:
+                options['max_bytes'] = size
+            elif (interval := parse_duration(spec)) is not None:
+                options['rotate_interval'] = interval
+        
+        retencao = (self.config.retencao_arquivo or "").strip().lower()
+        if retencao:
+            if quantidade := _RETENCAO_QUANTIDADE.match(retencao):
+                options['backup_count'] = int(quantidade.group(1))
+            elif (segundos := parse_duration(retencao)) is not None:
+                options['retention_seconds'] = segundos
+            else:
+                raise InvalidConfigException(
+                    f"retencao_arquivo inválida: {self.config.retencao_arquivo!r} "
+                    f"(use uma duração, ex.: \"7 days\", ou quantidade, ex.: \"10 files\")",
+                    details={"retencao_arquivo": self.config.retencao_arquivo},
+                )
+        
+        return options
+    
+    def _log(self, level: str | int, message: Mensagem, **kwargs: Any) -> None:
         """
         Método interno para logging.
         
+        O registro (timestamp, contexto, localização, exceção) só é montado
+        depois de saber que ao menos um handler vai recebê-lo.
+        
         Args:
-            level: Nível do log
-            message: Mensagem principal
+            level: Nível do log (nome ou valor numérico)
+            message: Mensagem principal ou função que a produz
             **kwargs: Dados adicionais
         """
         # Obtém valor numérico do nível
-        level_value = LEVEL_VALUES.get(level.upper(), 20)
+        if isinstance(level, str):
+            level_value = LEVEL_VALUES.get(level.upper(), _INFO)
+        else:
+            level_value = level
+        
+        if level_value < self._min_level:
+            return
+        
+        targets = [h for h in self.handlers if h.should_handle(level_value)]
+        if not targets:
+            return
+        
+        # Localização só é calculada se algum handler que vai receber o registro a exibe
+        caller_info: Dict[str, Any] = {}
+        for handler in targets:
+            if handler.wants_caller_info:
+                caller_info = find_caller()
+                break
         
-        # Obtém contexto atual
-        ctx = get_context()
-        caller_info = ctx.get_caller_info(depth=4)
+        if callable(message):
+            message = message()
+        
+        # Snapshot imutável do contexto: sem dados extras, o registro o referencia direto
+        context = context_snapshot()
+        if caller_info or kwargs:
+            context = {**context, **caller_info, **kwargs}
         
         # Monta registro
         record = {
             'timestamp': datetime.now(),
             'level': level_value,
             'message': message,
-            'context': {
-                **ctx.to_dict(),
-                **caller_info,
-                **kwargs
-            }
+            'context': context
         }
         
         # Processa exceção se presente
@@ -132,7 +299,7 @@ class RaxyLogger(ILoggingService):
                 record['exception'] = exc_info[1]
         
         # Envia para handlers
-        for handler in self.handlers:
+        for handler in targets:
             try:
                 handler.handle(record)
             except Exception as e:
@@ -141,38 +308,49 @@ class RaxyLogger(ILoggingService):
     
     # Implementação da interface ILoggingService
     
-    def debug(self, mensagem: str, **dados: Any) -> None:
+    # Cada método testa o nível antes de qualquer outra coisa: chamadas de
+    # níveis desativados custam uma comparação.
+    
+    def debug(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra mensagem de depuração."""
-        self._log("DEBUG", mensagem, **dados)
+        if _DEBUG >= self._min_level:
+            self._log(_DEBUG, mensagem, **dados)
     
-    def info(self, mensagem: str, **dados: Any) -> None:
+    def info(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra mensagem informativa."""
-        self._log("INFO", mensagem, **dados)
+        if _INFO >= self._min_level:
+            self._log(_INFO, mensagem, **dados)
     
-    def sucesso(self, mensagem: str, **dados: Any) -> None:
+    def sucesso(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra mensagem de sucesso."""
         # Não adiciona emoji, o formatador já faz isso
-        self._log("SUCCESS", mensagem, **dados)
+        if _SUCCESS >= self._min_level:
+            self._log(_SUCCESS, mensagem, **dados)
     
-    def aviso(self, mensagem: str, **dados: Any) -> None:
+    def aviso(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra uma advertência."""
-        self._log("WARNING", mensagem, **dados)
+        if _WARNING >= self._min_level:
+            self._log(_WARNING, mensagem, **dados)
     
-    def erro(self, mensagem: str, **dados: Any) -> None:
+    def erro(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra um erro."""
+        if _ERROR < self._min_level:
+            return
         # Captura exceção atual se disponível
         if 'exc_info' not in dados:
             dados['exc_info'] = True
         
-        self._log("ERROR", mensagem, **dados)
+        self._log(_ERROR, mensagem, **dados)
     
-    def critico(self, mensagem: str, **dados: Any) -> None:
+    def critico(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra um erro crítico."""
+        if _CRITICAL < self._min_level:
+            return
         # Captura exceção atual se disponível
         if 'exc_info' not in dados:
             dados['exc_info'] = True
         
-        self._log("CRITICAL", mensagem, **dados)
+        self._log(_CRITICAL, mensagem, **dados)
     
     def com_contexto(self, **dados: Any) -> ILoggingService:
         """
@@ -218,15 +396,20 @@ class RaxyLogger(ILoggingService):
             self.sucesso(sucesso, **dados)
     
     def flush(self) -> None:
-        """Força escrita de todos os buffers."""
+        """Força escrita de todos os buffers, com os resumos de supressão pendentes."""
         for handler in self.handlers:
+            handler.emit_summaries()
             handler.flush()
     
     def close(self) -> None:
         """Fecha o logger e libera recursos."""
         for handler in self.handlers:
+            handler.emit_summaries()
             handler.close()
         self.handlers.clear()
+        self._refresh_min_level()
+        if self._rate_filters:
+            atexit.unregister(self.flush)
     
     def add_handler(self, handler: LogHandler) -> None:
         """
@@ -236,6 +419,7 @@ class RaxyLogger(ILoggingService):
             handler: Handler a adicionar
         """
         self.handlers.append(handler)
+        self._refresh_min_level()
     
     def remove_handler(self, handler: LogHandler) -> None:
         """
@@ -247,6 +431,7 @@ class RaxyLogger(ILoggingService):
         if handler in self.handlers:
             handler.close()
             self.handlers.remove(handler)
+            self._refresh_min_level()
     
     def set_level(self, level: str) -> None:
         """
@@ -266,6 +451,7 @@ class RaxyLogger(ILoggingService):
         # Atualiza handlers
         for handler in self.handlers:
             handler.level = level_value
+        self._refresh_min_level()
     
     def mute_console(self) -> None:
         """Desativa saída para console."""
@@ -286,6 +472,7 @@ class RaxyLogger(ILoggingService):
         for handler in handlers_to_remove:
             self.handlers.remove(handler)
             self._disabled_handlers.append(handler)
+        self._refresh_min_level()
 
     def unmute_console(self) -> None:
         """Reativa saída para console."""
@@ -294,6 +481,7 @@ class RaxyLogger(ILoggingService):
             if handler not in self.handlers:
                 self.handlers.append(handler)
         self._disabled_handlers.clear()
+        self._refresh_min_level()
 
 
 class ScopedLogger(ILoggingService):
@@ -318,29 +506,41 @@ class ScopedLogger(ILoggingService):
         """Mescla contexto com dados."""
         return {**self.context, **dados}
     
-    def debug(self, mensagem: str, **dados: Any) -> None:
+    # O nível é testado antes da mescla de contexto para não alocar à toa
+    
+    def debug(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra mensagem de depuração."""
-        self.parent.debug(mensagem, **self._merge_context(**dados))
+        if self.parent.is_enabled_for(_DEBUG):
+            self.parent.debug(mensagem, **self._merge_context(**dados))
     
-    def info(self, mensagem: str, **dados: Any) -> None:
+    def info(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra mensagem informativa."""
-        self.parent.info(mensagem, **self._merge_context(**dados))
+        if self.parent.is_enabled_for(_INFO):
+            self.parent.info(mensagem, **self._merge_context(**dados))
     
-    def sucesso(self, mensagem: str, **dados: Any) -> None:
+    def sucesso(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra mensagem de sucesso."""
-        self.parent.sucesso(mensagem, **self._merge_context(**dados))
+        if self.parent.is_enabled_for(_SUCCESS):
+            self.parent.sucesso(mensagem, **self._merge_context(**dados))
     
-    def aviso(self, mensagem: str, **dados: Any) -> None:
+    def aviso(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra uma advertência."""
-        self.parent.aviso(mensagem, **self._merge_context(**dados))
+        if self.parent.is_enabled_for(_WARNING):
+            self.parent.aviso(mensagem, **self._merge_context(**dados))
     
-    def erro(self, mensagem: str, **dados: Any) -> None:
+    def erro(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra um erro."""
-        self.parent.erro(mensagem, **self._merge_context(**dados))
+        if self.parent.is_enabled_for(_ERROR):
+            self.parent.erro(mensagem, **self._merge_context(**dados))
     
-    def critico(self, mensagem: str, **dados: Any) -> None:
+    def critico(self, mensagem: Mensagem, **dados: Any) -> None:
         """Registra um erro crítico."""
-        self.parent.critico(mensagem, **self._merge_context(**dados))
+        if self.parent.is_enabled_for(_CRITICAL):
+            self.parent.critico(mensagem, **self._merge_context(**dados))
+    
+    def is_enabled_for(self, nivel: str | int) -> bool:
+        """Indica se o nível está ativo no logger pai."""
+        return self.parent.is_enabled_for(nivel)
     
     def com_contexto(self, **dados: Any) -> ILoggingService:
         """Retorna um logger derivado com contexto adicional."""
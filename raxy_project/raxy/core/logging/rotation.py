@@ -0,0 +1,406 @@
+"""
+Rotação de arquivos de log em segundo plano.
+
+No caminho quente, o FileHandler apenas renomeia o arquivo ativo (operação
+barata) e agenda a manutenção. Uma thread dedicada comprime os arquivos
+rotacionados (gzip, zstd ou zip) e aplica retenção por quantidade, idade e
+orçamento total de disco.
+
+A manutenção é idempotente: arquivos rotacionados que ficaram sem
+compressão (ex.: processo encerrado no meio) são tratados na próxima vez.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import os
+import queue
+import re
+import shutil
+import sys
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import zstandard
+    _HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    _HAS_ZSTD = False
+
+
+# Extensão final por algoritmo de compressão
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "zip": ".zip"}
+
+_COMPRESSION_ALIASES = {
+    "gz": "gzip", "gzip": "gzip",
+    "zst": "zstd", "zstd": "zstd",
+    "zip": "zip",
+}
+
+_SIZE_UNITS = {"b": 1, "kb": 1024, "mb": 1024 ** 2, "gb": 1024 ** 3, "tb": 1024 ** 4}
+
+_TIME_UNITS = {
+    "s": 1, "sec": 1, "second": 1, "seconds": 1,
+    "m": 60, "min": 60, "minute": 60, "minutes": 60,
+    "h": 3600, "hour": 3600, "hours": 3600,
+    "d": 86400, "day": 86400, "days": 86400,
+    "w": 604800, "week": 604800, "weeks": 604800,
+}
+
+_SPEC_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]+)\s*$")
+
+_STAMP_FORMAT = "%Y%m%d-%H%M%S"
+
+# Um .tmp sem escrita há mais que isso é sobra de compressão interrompida
+# (outro processo no mesmo diretório pode estar comprimindo agora)
+STALE_TMP_SECONDS = 300.0
+
+
+def parse_size(spec: Optional[str]) -> Optional[int]:
+    """
+    Converte ``"100 MB"`` em bytes.
+
+    Returns:
+        Optional[int]: Bytes, ou None se ``spec`` não for um tamanho
+    """
+    if not spec:
+        return None
+    match = _SPEC_RE.match(str(spec))
+    if not match:
+        return None
+    unit = _SIZE_UNITS.get(match.group(2).lower())
+    return int(float(match.group(1)) * unit) if unit else None
+
+
+def parse_duration(spec: Optional[str]) -> Optional[float]:
+    """
+    Converte ``"1 day"``/``"12 hours"`` em segundos.
+
+    Returns:
+        Optional[float]: Segundos, ou None se ``spec`` não for uma duração
+    """
+    if not spec:
+        return None
+    match = _SPEC_RE.match(str(spec))
+    if not match:
+        return None
+    unit = _TIME_UNITS.get(match.group(2).lower())
+    return float(match.group(1)) * unit if unit else None
+
+
+def normalize_compression(spec: Optional[str]) -> Optional[str]:
+    """
+    Normaliza o nome do algoritmo (gz/gzip, zst/zstd, zip).
+
+    Sem ``zstandard`` instalado, zstd recai para gzip.
+    """
+    if not spec:
+        return None
+    nome = _COMPRESSION_ALIASES.get(str(spec).strip().lower())
+    if nome == "zstd" and not _HAS_ZSTD:
+        print("zstandard não instalado; logs rotacionados serão comprimidos com gzip", file=sys.stderr)
+        return "gzip"
+    return nome
+
+
+@dataclass(frozen=True)
+class RotationPolicy:
+    """
+    Política de manutenção dos arquivos rotacionados de um log.
+
+    Attributes:
+        compression: Algoritmo (gzip, zstd, zip) ou None
+        backup_count: Máximo de arquivos rotacionados (0 = sem limite)
+        retention_seconds: Idade máxima dos rotacionados (None = sem limite)
+        max_total_bytes: Orçamento de disco somando ativo e rotacionados (verificado a cada rotação)
+    """
+
+    compression: Optional[str] = None
+    backup_count: int = 0
+    retention_seconds: Optional[float] = None
+    max_total_bytes: Optional[int] = None
+
+
+def rotated_name(active: Path, now: Optional[datetime] = None) -> Path:
+    """Nome do arquivo rotacionado: ``raxy.20260101-120000.log`` (com sufixo se já existir)."""
+    stamp = (now or datetime.now()).strftime(_STAMP_FORMAT)
+    candidate = active.with_name(f"{active.stem}.{stamp}{active.suffix}")
+    index = 1
+    while candidate.exists() or _compressed_exists(candidate):
+        candidate = active.with_name(f"{active.stem}.{stamp}-{index}{active.suffix}")
+        index += 1
+    return candidate
+
+
+def _compressed_exists(path: Path) -> bool:
+    return any(path.with_name(path.name + suffix).exists() for suffix in COMPRESSION_SUFFIXES.values())
+
+
+def _rotated_pattern(active: Path) -> re.Pattern:
+    suffixes = "|".join(re.escape(s) for s in COMPRESSION_SUFFIXES.values())
+    return re.compile(
+        rf"^{re.escape(active.stem)}\.(?P<stamp>\d{{8}}-\d{{6}})(?:-\d+)?{re.escape(active.suffix)}(?:{suffixes})?$"
+    )
+
+
+def list_rotated(active: Path) -> List[Tuple[Path, os.stat_result]]:
+    """Arquivos rotacionados do log ativo, do mais antigo para o mais novo."""
+    pattern = _rotated_pattern(active)
+    found = []
+    try:
+        entries = list(os.scandir(active.parent))
+    except FileNotFoundError:
+        return []
+    for entry in entries:
+        if entry.is_file() and pattern.match(entry.name):
+            try:
+                found.append((Path(entry.path), entry.stat()))
+            except FileNotFoundError:
+                continue
+    found.sort(key=lambda item: (item[1].st_mtime, item[0].name))
+    return found
+
+
+def active_since(active: Path) -> Optional[float]:
+    """
+    Momento em que o log ativo começou a ser escrito.
+
+    Usa a data de criação quando o sistema a informa; senão, o carimbo da
+    rotação mais recente (o ativo nasce nela) e, sem histórico, o mtime.
+
+    Returns:
+        Optional[float]: Timestamp, ou None se o arquivo não existir
+    """
+    try:
+        stat = active.stat()
+    except FileNotFoundError:
+        return None
+    criado = getattr(stat, "st_birthtime", None)
+    if criado:
+        return criado
+
+    pattern = _rotated_pattern(active)
+    ultima = None
+    for path, _ in list_rotated(active):
+        try:
+            carimbo = datetime.strptime(pattern.match(path.name).group("stamp"), _STAMP_FORMAT).timestamp()
+        except ValueError:
+            continue
+        ultima = carimbo if ultima is None else max(ultima, carimbo)
+    return ultima if ultima is not None else stat.st_mtime
+
+
+def remove_stale_tmp(active: Path, max_age: float = STALE_TMP_SECONDS) -> List[Path]:
+    """
+    Remove temporários de compressões interrompidas (``*.log.gz.tmp``).
+
+    Args:
+        active: Arquivo de log ativo
+        max_age: Idade mínima (s) desde a última escrita no temporário
+
+    Returns:
+        List[Path]: Temporários removidos
+    """
+    pattern = _rotated_pattern(active)
+    limite = time.time() - max_age
+    removidos = []
+    try:
+        entries = list(os.scandir(active.parent))
+    except FileNotFoundError:
+        return []
+    for entry in entries:
+        if not (entry.name.endswith(".tmp") and pattern.match(entry.name[:-4])):
+            continue
+        try:
+            if entry.stat().st_mtime < limite:
+                os.unlink(entry.path)
+                removidos.append(Path(entry.path))
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            print(f"Erro ao remover temporário {entry.name}: {e}", file=sys.stderr)
+    return removidos
+
+
+def compress_file(path: Path, algorithm: str) -> Path:
+    """
+    Comprime ``path`` e remove o original.
+
+    Escreve num arquivo temporário e renomeia ao final, para nunca deixar
+    um comprimido truncado com o nome definitivo.
+
+    Returns:
+        Path: Caminho do arquivo comprimido
+    """
+    target = path.with_name(path.name + COMPRESSION_SUFFIXES[algorithm])
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        if algorithm == "gzip":
+            with open(path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        elif algorithm == "zstd":
+            compressor = zstandard.ZstdCompressor(level=3)
+            with open(path, "rb") as src, open(tmp, "wb") as dst:
+                compressor.copy_stream(src, dst)
+        else:
+            with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as dst:
+                dst.write(path, arcname=path.name)
+        stat = path.stat()
+        os.replace(tmp, target)
+        # Mantém o mtime original para a retenção por idade
+        os.utime(target, (stat.st_atime, stat.st_mtime))
+        path.unlink()
+    except Exception:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    return target
+
+
+def maintain(active: Path, policy: RotationPolicy) -> None:
+    """
+    Comprime rotacionados pendentes e aplica a retenção.
+
+    Temporários deixados por compressões interrompidas são removidos antes.
+
+    Args:
+        active: Arquivo de log ativo
+        policy: Política de manutenção
+    """
+    remove_stale_tmp(active)
+
+    if policy.compression:
+        suffixes = tuple(COMPRESSION_SUFFIXES.values())
+        for path, _ in list_rotated(active):
+            if not path.name.endswith(suffixes):
+                try:
+                    compress_file(path, policy.compression)
+                except Exception as e:
+                    print(f"Erro ao comprimir log {path.name}: {e}", file=sys.stderr)
+
+    rotated = list_rotated(active)
+    removals = set()
+
+    if policy.backup_count > 0 and len(rotated) > policy.backup_count:
+        removals.update(path for path, _ in rotated[: len(rotated) - policy.backup_count])
+
+    if policy.retention_seconds:
+        limite = time.time() - policy.retention_seconds
+        removals.update(path for path, stat in rotated if stat.st_mtime < limite)
+
+    if policy.max_total_bytes:
+        try:
+            total = active.stat().st_size
+        except FileNotFoundError:
+            total = 0
+        total += sum(stat.st_size for path, stat in rotated if path not in removals)
+        for path, stat in rotated:
+            if total <= policy.max_total_bytes:
+                break
+            if path not in removals:
+                removals.add(path)
+                total -= stat.st_size
+
+    for path in removals:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Erro ao remover log antigo {path.name}: {e}", file=sys.stderr)
+
+
+class RotationWorker:
+    """
+    Thread única que executa a manutenção dos logs rotacionados.
+
+    Pedidos para o mesmo arquivo são agrupados: enquanto um está na fila
+    (ainda não iniciado), novos pedidos para ele são ignorados.
+    """
+
+    _instance: Optional["RotationWorker"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[Optional[Tuple[Path, RotationPolicy]]]" = queue.Queue()
+        self._pending = set()
+        self._running = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="raxy-log-rotation", daemon=True)
+        self._thread.start()
+        atexit.register(self.drain, 5.0)
+
+    @classmethod
+    def instance(cls) -> "RotationWorker":
+        """Obtém o worker global."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def submit(self, active: Path, policy: RotationPolicy) -> None:
+        """Agenda a manutenção do log ``active``."""
+        with self._lock:
+            if active in self._pending:
+                return
+            self._pending.add(active)
+        self._queue.put((active, policy))
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Aguarda a conclusão das manutenções agendadas.
+
+        Returns:
+            bool: True se a fila esvaziou dentro do timeout
+        """
+        fim = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._pending and not self._running:
+                    return True
+            if fim is not None and time.monotonic() >= fim:
+                return False
+            time.sleep(0.01)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            active, policy = job
+            with self._lock:
+                # Sai de _pending antes de começar: rotações durante a execução agendam nova passada
+                self._pending.discard(active)
+                self._running += 1
+            try:
+                maintain(active, policy)
+            except Exception as e:
+                print(f"Erro na manutenção de logs: {e}", file=sys.stderr)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+
+__all__ = [
+    "RotationPolicy",
+    "RotationWorker",
+    "parse_size",
+    "parse_duration",
+    "normalize_compression",
+    "rotated_name",
+    "list_rotated",
+    "active_since",
+    "remove_stale_tmp",
+    "compress_file",
+    "maintain",
+]
@@ -0,0 +1,359 @@
+"""
+Sink de logs estruturados com índice lateral.
+
+Os registros são gravados em segmentos NDJSON (uma linha JSON por registro)
+agrupados em blocos. Para cada bloco, uma linha no índice lateral
+(``<segmento>.idx``) guarda offset, tamanho, intervalo de tempo, níveis
+presentes e as contas/proxies citados. Consultas leem só os índices e fazem
+``seek`` direto nos blocos que podem conter resultados, em vez de varrer
+todos os arquivos.
+
+Layout do diretório::
+
+    logs/structured/
+        seg-20260101-120000-0001.ndjson
+        seg-20260101-120000-0001.ndjson.idx
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from raxy.core import json_codec
+
+from .handlers import LogHandler
+
+SEGMENT_PREFIX = "seg-"
+SEGMENT_SUFFIX = ".ndjson"
+INDEX_SUFFIX = ".idx"
+
+# Chaves de contexto usadas para indexar conta e proxy
+ACCOUNT_KEYS = ("conta", "email")
+PROXY_KEYS = ("proxy", "proxy_id")
+
+# Campos de localização e internos que não vão para "ctx"
+_LOCATION_KEYS = frozenset(("file", "path", "line", "function", "class", "module"))
+
+
+def _first(context: Dict[str, Any], keys: tuple) -> Optional[str]:
+    for key in keys:
+        value = context.get(key)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+def _level_bit(level: int) -> int:
+    """Bit do nível na máscara do bloco (um bit por dezena: DEBUG=1, INFO=2, ...)."""
+    return 1 << max(0, min(level // 10, 30))
+
+
+def _mask_from(min_level: int) -> int:
+    """Máscara com os bits de todos os níveis >= ``min_level``."""
+    mask = 0
+    for bit in range(max(0, min_level // 10), 31):
+        mask |= 1 << bit
+    return mask
+
+
+class StructuredLogHandler(LogHandler):
+    """
+    Handler que grava registros estruturados com índice por bloco.
+
+    Cada chamada de ``emit_batch`` vira um bloco (até ``block_size``
+    registros); usado atrás do BatchingHandler, os blocos acompanham os
+    lotes do writer.
+    """
+
+    def __init__(self, directory: str | Path, level: int = 0,
+                 segment_bytes: int = 64 * 1024 * 1024, max_segments: int = 50,
+                 block_size: int = 512, include_caller: bool = False):
+        """
+        Inicializa o handler.
+
+        Args:
+            directory: Diretório dos segmentos
+            level: Nível mínimo
+            segment_bytes: Tamanho a partir do qual um novo segmento é aberto
+            max_segments: Segmentos mantidos (os mais antigos são removidos)
+            block_size: Máximo de registros por bloco indexado
+            include_caller: Se os registros devem trazer arquivo/linha/função
+        """
+        super().__init__(level=level, include_caller=include_caller)
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.block_size = max(1, block_size)
+        self._data = None
+        self._index = None
+        self._segment: Optional[Path] = None
+        self._offset = 0
+        self._seq = 0
+
+    # ========== Segmentos ==========
+
+    def _open_segment(self) -> None:
+        """Abre um novo segmento e seu índice."""
+        self._close_segment()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._seq += 1
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._segment = self.directory / f"{SEGMENT_PREFIX}{stamp}-{os.getpid()}-{self._seq:04d}{SEGMENT_SUFFIX}"
+        self._data = open(self._segment, "ab")
+        self._index = open(str(self._segment) + INDEX_SUFFIX, "ab")
+        self._offset = self._data.tell()
+        self._prune()
+
+    def _close_segment(self) -> None:
+        for handle in (self._data, self._index):
+            if handle:
+                handle.close()
+        self._data = self._index = None
+
+    def _prune(self) -> None:
+        """Remove os segmentos mais antigos além de ``max_segments``."""
+        if self.max_segments <= 0:
+            return
+        segments = sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"),
+                          key=lambda p: p.stat().st_mtime)
+        for old in segments[: max(0, len(segments) - self.max_segments)]:
+            for path in (old, Path(str(old) + INDEX_SUFFIX)):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    # ========== Escrita ==========
+
+    @staticmethod
+    def to_entry(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Converte um registro do logger na linha estruturada."""
+        context = record.get('context') or {}
+        timestamp = record.get('timestamp')
+        entry: Dict[str, Any] = {
+            'ts': timestamp.timestamp() if isinstance(timestamp, datetime) else time.time(),
+            'lv': record.get('level', 0),
+            'msg': record.get('message', ''),
+        }
+        conta = _first(context, ACCOUNT_KEYS)
+        if conta:
+            entry['conta'] = conta
+        proxy = _first(context, PROXY_KEYS)
+        if proxy:
+            entry['proxy'] = proxy
+        if context.get('function'):
+            entry['loc'] = f"{context.get('module')}:{context.get('function')}:{context.get('line')}"
+        extra = {k: v for k, v in context.items()
+                 if k not in _LOCATION_KEYS and not k.startswith('_') and k not in ('exc_info', 'exception')}
+        if extra:
+            entry['ctx'] = extra
+        exception = record.get('exception')
+        if exception is not None:
+            entry['exc'] = {
+                'type': type(exception).__name__,
+                'message': str(exception),
+                'traceback': ''.join(traceback.format_exception(
+                    type(exception), exception, exception.__traceback__)),
+            }
+        return entry
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        """Grava um único registro (um bloco)."""
+        self.emit_batch([record])
+
+    def emit_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Grava os registros em blocos e indexa cada bloco."""
+        with self._lock:
+            for start in range(0, len(records), self.block_size):
+                self._write_block(records[start:start + self.block_size])
+
+    def _write_block(self, records: List[Dict[str, Any]]) -> None:
+        if self._data is None or self._offset >= self.segment_bytes:
+            self._open_segment()
+
+        lines = []
+        contas = set()
+        proxies = set()
+        mask = 0
+        t0 = float('inf')
+        t1 = 0.0
+        for record in records:
+            try:
+                entry = self.to_entry(record)
+                lines.append(json_codec.dumps_bytes(entry, default=str))
+            except Exception as e:
+                print(f"Erro ao serializar log estruturado: {e}", file=sys.stderr)
+                continue
+            mask |= _level_bit(entry['lv'])
+            t0 = min(t0, entry['ts'])
+            t1 = max(t1, entry['ts'])
+            if 'conta' in entry:
+                contas.add(entry['conta'])
+            if 'proxy' in entry:
+                proxies.add(entry['proxy'])
+
+        if not lines:
+            return
+
+        data = b"\n".join(lines) + b"\n"
+        self._data.write(data)
+        self._data.flush()
+
+        # Índice só depois dos dados: um bloco indexado sempre existe no segmento
+        block = {'off': self._offset, 'len': len(data), 'n': len(lines),
+                 't0': t0, 't1': t1, 'lv': mask}
+        if contas:
+            block['contas'] = sorted(contas)
+        if proxies:
+            block['proxies'] = sorted(proxies)
+        self._index.write(json_codec.dumps_bytes(block) + b"\n")
+        self._index.flush()
+        self._offset += len(data)
+
+    def flush(self) -> None:
+        """Força flush dos arquivos."""
+        with self._lock:
+            for handle in (self._data, self._index):
+                if handle:
+                    handle.flush()
+
+    def close(self) -> None:
+        """Fecha o segmento atual."""
+        with self._lock:
+            self._close_segment()
+
+
+@dataclass
+class QueryStats:
+    """Estatísticas de uma consulta."""
+    segments: int = 0
+    blocks_total: int = 0
+    blocks_read: int = 0
+    bytes_read: int = 0
+    matches: int = 0
+
+
+class StructuredLogReader:
+    """
+    Consulta segmentos estruturados usando os índices laterais.
+
+    Example:
+        >>> reader = StructuredLogReader("logs/structured")
+        >>> for entry in reader.query(conta="a@b.com", min_level=40, since=time.time() - 3600):
+        ...     print(entry["msg"])
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.stats = QueryStats()
+
+    def segments(self) -> List[Path]:
+        """Segmentos em ordem cronológica."""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"),
+                      key=lambda p: (p.stat().st_mtime, p.name))
+
+    def query(
+        self,
+        conta: Optional[str] = None,
+        proxy: Optional[str] = None,
+        min_level: int = 0,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera registros que atendem aos filtros, em ordem cronológica.
+
+        Args:
+            conta: Email da conta
+            proxy: Identificador do proxy
+            min_level: Nível mínimo (numérico)
+            since: Timestamp (epoch) inicial
+            until: Timestamp (epoch) final
+            limit: Máximo de registros retornados
+
+        Yields:
+            Dict[str, Any]: Registro estruturado
+        """
+        self.stats = QueryStats()
+        level_mask = _mask_from(min_level) if min_level else 0
+
+        for segment in self.segments():
+            # Segmentos inteiramente anteriores ao intervalo nem têm o índice lido
+            if since is not None and segment.stat().st_mtime < since:
+                continue
+            self.stats.segments += 1
+            blocks = self._matching_blocks(segment, conta, proxy, level_mask, since, until)
+            if not blocks:
+                continue
+            with open(segment, "rb") as data:
+                for block in blocks:
+                    data.seek(block['off'])
+                    raw = data.read(block['len'])
+                    self.stats.blocks_read += 1
+                    self.stats.bytes_read += len(raw)
+                    for line in raw.splitlines():
+                        if not line:
+                            continue
+                        entry = json_codec.loads(line)
+                        if not self._matches(entry, conta, proxy, min_level, since, until):
+                            continue
+                        self.stats.matches += 1
+                        yield entry
+                        if limit is not None and self.stats.matches >= limit:
+                            return
+
+    def _matching_blocks(self, segment: Path, conta, proxy, level_mask, since, until) -> List[Dict[str, Any]]:
+        index = Path(str(segment) + INDEX_SUFFIX)
+        try:
+            raw = index.read_bytes()
+        except FileNotFoundError:
+            return []
+        blocks = []
+        for line in raw.splitlines():
+            if not line:
+                continue
+            try:
+                block = json_codec.loads(line)
+            except json_codec.JSONDecodeError:
+                # Linha parcial (processo interrompido durante a escrita)
+                continue
+            self.stats.blocks_total += 1
+            if since is not None and block['t1'] < since:
+                continue
+            if until is not None and block['t0'] > until:
+                continue
+            if level_mask and not block['lv'] & level_mask:
+                continue
+            if conta is not None and conta not in block.get('contas', ()):
+                continue
+            if proxy is not None and proxy not in block.get('proxies', ()):
+                continue
+            blocks.append(block)
+        return blocks
+
+    @staticmethod
+    def _matches(entry: Dict[str, Any], conta, proxy, min_level, since, until) -> bool:
+        if entry.get('lv', 0) < min_level:
+            return False
+        if conta is not None and entry.get('conta') != conta:
+            return False
+        if proxy is not None and entry.get('proxy') != proxy:
+            return False
+        if since is not None and entry.get('ts', 0) < since:
+            return False
+        if until is not None and entry.get('ts', 0) > until:
+            return False
+        return True
+
+
+__all__ = ["StructuredLogHandler", "StructuredLogReader", "QueryStats"]
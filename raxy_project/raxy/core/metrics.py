@@ -0,0 +1,424 @@
+"""
+Registro de métricas em memória do Raxy.
+
+Guarda contadores, gauges e distribuições de valores (ex.: durações de
+etapas) agregados por nome e rótulos, sem dependências externas. Pensado
+para ser barato no caminho quente: cada observação é uma atualização de
+contadores sob lock.
+
+Os histogramas usam buckets log-lineares no estilo HDR (erro relativo
+abaixo de 1%), o que permite p50/p95/p99 com memória constante por série.
+O registro pode ser exportado no formato texto do Prometheus, em arquivo
+(:meth:`MetricsRegistry.write_prometheus`) ou por um endpoint ``/metrics``
+local (:func:`serve_metrics`).
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Sub-buckets por potência de 2: largura relativa de 1/128 (< 0,8% de erro)
+_SUB_BUCKETS = 64
+
+# Quantis exportados e exibidos nos resumos
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    """Normaliza rótulos em uma chave hashável e ordenada."""
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _bucket_index(valor: float) -> int:
+    """Índice do bucket log-linear de um valor positivo."""
+    mantissa, expoente = math.frexp(valor)  # mantissa em [0.5, 1)
+    return expoente * _SUB_BUCKETS + int((mantissa - 0.5) * 2 * _SUB_BUCKETS)
+
+
+def _bucket_value(indice: int) -> float:
+    """Valor representativo (ponto médio) de um bucket."""
+    expoente, sub = divmod(indice, _SUB_BUCKETS)
+    largura = 0.5 / _SUB_BUCKETS
+    return math.ldexp(0.5 + (sub + 0.5) * largura, expoente)
+
+
+@dataclass
+class Histogram:
+    """
+    Distribuição de valores observados.
+
+    Attributes:
+        count: Quantidade de observações
+        total: Soma dos valores
+        minimo: Menor valor observado
+        maximo: Maior valor observado
+    """
+
+    count: int = 0
+    total: float = 0.0
+    minimo: float = float("inf")
+    maximo: float = 0.0
+    _buckets: Dict[int, int] = field(default_factory=dict, repr=False, compare=False)
+    _zeros: int = field(default=0, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def observe(self, valor: float) -> None:
+        """Registra uma observação."""
+        with self._lock:
+            self.count += 1
+            self.total += valor
+            if valor < self.minimo:
+                self.minimo = valor
+            if valor > self.maximo:
+                self.maximo = valor
+            if valor > 0:
+                indice = _bucket_index(valor)
+                self._buckets[indice] = self._buckets.get(indice, 0) + 1
+            else:
+                self._zeros += 1
+
+    @property
+    def media(self) -> float:
+        """Média dos valores observados."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Valor aproximado do quantil ``q`` (0 a 1).
+
+        Args:
+            q: Quantil desejado (ex.: 0.95)
+
+        Returns:
+            float: Valor do quantil (0.0 sem observações)
+        """
+        with self._lock:
+            return self._percentile(q)
+
+    def _percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        alvo = max(1, math.ceil(q * self.count))
+        acumulado = self._zeros
+        if acumulado >= alvo:
+            return 0.0
+        for indice in sorted(self._buckets):
+            acumulado += self._buckets[indice]
+            if acumulado >= alvo:
+                return min(max(_bucket_value(indice), self.minimo), self.maximo)
+        return self.maximo
+
+    def to_dict(self) -> Dict[str, float]:
+        """Converte para dicionário."""
+        with self._lock:
+            dados = {
+                "count": self.count,
+                "total": self.total,
+                "min": self.minimo if self.count else 0.0,
+                "max": self.maximo,
+                "mean": self.media,
+            }
+            for q in QUANTILES:
+                dados[f"p{int(q * 100)}"] = self._percentile(q)
+            return dados
+
+
+@dataclass
+class Counter:
+    """Contador monotônico."""
+
+    value: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def inc(self, valor: float = 1.0) -> None:
+        """Incrementa o contador."""
+        with self._lock:
+            self.value += valor
+
+
+@dataclass
+class Gauge:
+    """Valor instantâneo (pode subir e descer)."""
+
+    value: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def set(self, valor: float) -> None:
+        """Define o valor."""
+        with self._lock:
+            self.value = valor
+
+    def inc(self, valor: float = 1.0) -> None:
+        """Soma ao valor."""
+        with self._lock:
+            self.value += valor
+
+    def dec(self, valor: float = 1.0) -> None:
+        """Subtrai do valor."""
+        with self._lock:
+            self.value -= valor
+
+
+Metric = Union[Histogram, Counter, Gauge]
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas agrupadas por nome e rótulos.
+
+    Example:
+        >>> metrics = get_metrics()
+        >>> metrics.observe("debug_log.duration", 0.12, function="ExecutorEmLote.executar")
+        >>> metrics.histogram("debug_log.duration", function="ExecutorEmLote.executar").count
+        1
+        >>> with metrics.timer("conta.etapa.duracao", etapa="login"):
+        ...     fazer_login()
+        >>> metrics.inc("conta.etapa.total", etapa="login", status="ok")
+    """
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, Counter]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, Gauge]] = {}
+        self._lock = threading.Lock()
+        # Muda a cada reset: quem guarda uma série compara para obtê-la de novo
+        self.geracao = 0
+
+    def _get(self, store: Dict[str, Dict[LabelKey, Metric]], factory: type,
+             nome: str, labels: Dict[str, object]) -> Metric:
+        chave = _label_key(labels)
+        series = store.get(nome)
+        if series is not None:
+            metrica = series.get(chave)
+            if metrica is not None:
+                return metrica
+        with self._lock:
+            series = store.setdefault(nome, {})
+            metrica = series.get(chave)
+            if metrica is None:
+                metrica = series[chave] = factory()
+            return metrica
+
+    def histogram(self, nome: str, **labels: object) -> Histogram:
+        """
+        Obtém (criando se necessário) o histograma do nome/rótulos.
+
+        Args:
+            nome: Nome da métrica
+            **labels: Rótulos que identificam a série
+
+        Returns:
+            Histogram: Série correspondente
+        """
+        return self._get(self._histograms, Histogram, nome, labels)
+
+    def counter(self, nome: str, **labels: object) -> Counter:
+        """Obtém (criando se necessário) o contador do nome/rótulos."""
+        return self._get(self._counters, Counter, nome, labels)
+
+    def gauge(self, nome: str, **labels: object) -> Gauge:
+        """Obtém (criando se necessário) o gauge do nome/rótulos."""
+        return self._get(self._gauges, Gauge, nome, labels)
+
+    def observe(self, nome: str, valor: float, **labels: object) -> None:
+        """Registra uma observação no histograma do nome/rótulos."""
+        self.histogram(nome, **labels).observe(valor)
+
+    def inc(self, nome: str, valor: float = 1.0, **labels: object) -> None:
+        """Incrementa o contador do nome/rótulos."""
+        self.counter(nome, **labels).inc(valor)
+
+    def set_gauge(self, nome: str, valor: float, **labels: object) -> None:
+        """Define o gauge do nome/rótulos."""
+        self.gauge(nome, **labels).set(valor)
+
+    @contextmanager
+    def timer(self, nome: str, **labels: object) -> Iterator[None]:
+        """Mede a duração do bloco (segundos) no histograma, mesmo com exceção."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(nome, time.perf_counter() - inicio, **labels)
+
+    def snapshot(self, nome: Optional[str] = None) -> Dict[str, Dict[LabelKey, Dict[str, float]]]:
+        """
+        Retorna uma cópia dos valores atuais dos histogramas.
+
+        Args:
+            nome: Restringe a uma métrica (padrão: todas)
+        """
+        with self._lock:
+            nomes = [nome] if nome is not None else list(self._histograms)
+            series = {n: dict(self._histograms.get(n, {})) for n in nomes}
+        return {n: {k: h.to_dict() for k, h in s.items()} for n, s in series.items()}
+
+    def values(self, nome: str) -> Dict[LabelKey, float]:
+        """Valores atuais de um contador ou gauge, por rótulos."""
+        with self._lock:
+            series = dict(self._counters.get(nome) or self._gauges.get(nome) or {})
+        return {k: m.value for k, m in series.items()}
+
+    def reset(self) -> None:
+        """
+        Remove todas as métricas.
+
+        Séries obtidas antes deixam de ser exportadas; quem as guarda deve
+        obtê-las de novo quando ``geracao`` mudar.
+        """
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+            self.geracao += 1
+
+    # ========== Exportação ==========
+
+    def to_prometheus(self, prefix: str = "raxy") -> str:
+        """
+        Exporta no formato texto do Prometheus (0.0.4).
+
+        Histogramas saem como ``summary`` (quantis, ``_sum`` e ``_count``).
+        Nomes com pontos viram underscores: ``conta.etapa.duracao`` ->
+        ``raxy_conta_etapa_duracao``.
+        """
+        with self._lock:
+            grupos = [
+                ("counter", {n: dict(s) for n, s in self._counters.items()}),
+                ("gauge", {n: dict(s) for n, s in self._gauges.items()}),
+                ("summary", {n: dict(s) for n, s in self._histograms.items()}),
+            ]
+
+        linhas: List[str] = []
+        for tipo, metricas in grupos:
+            for nome in sorted(metricas):
+                nome_prom = _prom_name(prefix, nome)
+                linhas.append(f"# TYPE {nome_prom} {tipo}")
+                for chave, metrica in sorted(metricas[nome].items()):
+                    if tipo == "summary":
+                        dados = metrica.to_dict()
+                        for q in QUANTILES:
+                            rotulos = _prom_labels(chave + (("quantile", str(q)),))
+                            linhas.append(f"{nome_prom}{rotulos} {dados[f'p{int(q * 100)}']!r}")
+                        rotulos = _prom_labels(chave)
+                        linhas.append(f"{nome_prom}_sum{rotulos} {dados['total']!r}")
+                        linhas.append(f"{nome_prom}_count{rotulos} {dados['count']}")
+                    else:
+                        linhas.append(f"{nome_prom}{_prom_labels(chave)} {float(metrica.value)!r}")
+        return "\n".join(linhas) + "\n"
+
+    def write_prometheus(self, path: Union[str, Path], prefix: str = "raxy") -> Path:
+        """
+        Grava o texto do Prometheus em arquivo (atômico, para o textfile collector).
+
+        Returns:
+            Path: Caminho gravado
+        """
+        destino = Path(path)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".metrics-", suffix=".prom", dir=str(destino.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus(prefix))
+            os.replace(tmp, destino)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return destino
+
+
+_PROM_INVALID = re.compile(r"[^a-zA-Z0-9_:]")
+
+
+def _prom_name(prefix: str, nome: str) -> str:
+    nome = _PROM_INVALID.sub("_", nome)
+    return f"{prefix}_{nome}" if prefix else nome
+
+
+def _prom_labels(chave: LabelKey) -> str:
+    if not chave:
+        return ""
+    partes = []
+    for k, v in chave:
+        v = v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        partes.append(f'{_PROM_INVALID.sub("_", k)}="{v}"')
+    return "{" + ",".join(partes) + "}"
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Obtém o registro global de métricas."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1",
+                  registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """
+    Sobe um endpoint ``/metrics`` local numa thread daemon.
+
+    Args:
+        port: Porta (0 escolhe uma livre; veja ``server.server_address``)
+        host: Interface (padrão: só localhost)
+        registry: Registro exportado (padrão: o global)
+
+    Returns:
+        ThreadingHTTPServer: Servidor em execução (``shutdown()`` para parar)
+    """
+    fonte = registry or get_metrics()
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            corpo = fonte.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, format: str, *args: object) -> None:
+            # Sem log de acesso no stderr
+            pass
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="raxy-metrics-http", daemon=True).start()
+    return server
+
+
+__all__ = [
+    "Histogram",
+    "Counter",
+    "Gauge",
+    "MetricsRegistry",
+    "QUANTILES",
+    "get_metrics",
+    "serve_metrics",
+]
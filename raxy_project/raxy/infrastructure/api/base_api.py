@@ -4,10 +4,11 @@ Classe base para clientes de API.
 
 from __future__ import annotations
 
-import json
 from abc import ABC
 from typing import Any, Dict, Optional, List
 
+from raxy.core import json_codec
+from raxy.core.json_codec import TypedDecoder
 from raxy.interfaces.services import ILoggingService
 
 
@@ -52,9 +53,7 @@ class BaseAPIClient(ABC):
         """Carrega template JSON."""
         from raxy.core.config import get_config
         templates_dir = get_config().templates_dir
-        
-        with open(templates_dir / template_name, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return json_codec.load_file(templates_dir / template_name)
     
     @property
     def logger(self) -> ILoggingService:
@@ -146,17 +145,23 @@ class BaseAPIClient(ABC):
     def _parse_json(
         self,
         response: Any,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        decoder: Optional[TypedDecoder] = None
     ) -> Any:
         """
         Decodifica resposta JSON de forma segura.
         
+        Decodifica os bytes crus da resposta com o codec ativo (orjson/msgspec
+        quando disponíveis), recorrendo a ``response.json()`` apenas se a
+        resposta não expuser o corpo.
+        
         Args:
             response: Objeto de resposta
             context: Contexto para erro
+            decoder: Decodificador tipado que já monta o modelo (opcional)
             
         Returns:
-            Any: Dados decodificados
+            Any: Dados decodificados (ou o modelo construído pelo decoder)
             
         Raises:
             JSONParsingException: Se falha ao decodificar
@@ -164,8 +169,14 @@ class BaseAPIClient(ABC):
         from raxy.core.exceptions import JSONParsingException, wrap_exception
         
         try:
-            return response.json()
-        except json.JSONDecodeError as e:
+            body = getattr(response, "content", None)
+            if not isinstance(body, (bytes, bytearray, str)):
+                body = getattr(response, "text", None)
+            if isinstance(body, (bytes, bytearray, str)):
+                return decoder.decode(body) if decoder else json_codec.loads(body)
+            data = response.json()
+            return decoder.build(data) if decoder else data
+        except json_codec.JSONDecodeError as e:
             raise wrap_exception(
                 e, JSONParsingException,
                 "Erro ao decodificar resposta JSON",
@@ -181,7 +192,8 @@ class BaseAPIClient(ABC):
         check_error_words: bool = True,
         exception_type: type = Exception,
         error_message: str = "Erro na requisição API",
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        decoder: Optional[TypedDecoder] = None
     ) -> Any:
         """
         Método utilitário completo: executa -> valida -> parseia JSON.
@@ -194,9 +206,10 @@ class BaseAPIClient(ABC):
             exception_type: Tipo de exceção para envolver erros (ex: RewardsAPIException)
             error_message: Mensagem base para erros
             context: Dados extras para erro
+            decoder: Decodificador tipado para montar o modelo direto dos bytes
             
         Returns:
-            Any: Dados JSON parseados
+            Any: Dados JSON parseados (ou modelo, se ``decoder`` informado)
             
         Raises:
             exception_type: Se qualquer erro ocorrer
@@ -211,7 +224,7 @@ class BaseAPIClient(ABC):
             self._validate_response(response, context, check_error_words)
             
             # 3. Parse JSON
-            return self._parse_json(response, context)
+            return self._parse_json(response, context, decoder)
             
         except Exception as e:
             # Log exception details before wrapping
@@ -10,7 +10,6 @@ from __future__ import annotations
 from copy import deepcopy
 from typing import Dict, Any, List, Optional, Mapping, Iterable, Union
 import time
-import json
 
 from raxy.interfaces.services import IRewardsDataService, ILoggingService, ISessionManager
 from raxy.models.rewards import Promotion, DailySet, RewardsDashboard, CollectionResult, TaskResult, PunchCard
@@ -21,6 +20,7 @@ from raxy.core.exceptions import (
     wrap_exception,
 )
 from raxy.core.config import get_config
+from raxy.core.json_codec import TypedDecoder
 import random
 from raxy.core.logging import debug_log
 from .base_api import BaseAPIClient
@@ -198,6 +198,80 @@ class RewardsDataParser:
             debug_log(f"Erro ao parsear punch card: {e}")
             return PunchCard(name=str(item.get("name", "Error")), child_promotions=[])
 
+    @staticmethod
+    def parse_dashboard(response_data: Any) -> RewardsDashboard:
+        """
+        Monta o RewardsDashboard completo a partir da resposta decodificada.
+        
+        Inclui conjuntos diários, promoções extras, punch cards e status do usuário.
+        
+        Args:
+            response_data: JSON decodificado da API
+            
+        Returns:
+            RewardsDashboard: Dashboard estruturado
+        """
+        # 1. Dados Brutos e Validação
+        if response_data is None:
+            return RewardsDashboard(raw_data={"error": "No response data"})
+
+        if not isinstance(response_data, dict):
+            return RewardsDashboard(raw_data={"error": "Invalid response format"})
+            
+        dashboard_data = response_data.get("dashboard", {})
+        if not dashboard_data and "dashboard" not in response_data:
+             # Se a resposta for o próprio dashboard (caso raro mas possível em algumas APIs)
+             if "userStatus" in response_data:
+                 dashboard_data = response_data
+        
+        if not isinstance(dashboard_data, dict):
+             dashboard_data = {}
+
+        parse_promotion = RewardsDataParser.parse_promotion
+
+        # 2. Daily Sets
+        daily_sets = []
+        daily_raw = dashboard_data.get("dailySetPromotions")
+        if isinstance(daily_raw, dict):
+            for date_key, items in daily_raw.items():
+                if isinstance(items, list):
+                    promos = [parse_promotion(i, date_key) for i in items if isinstance(i, dict)]
+                    if promos:
+                        daily_sets.append(DailySet(date=date_key, promotions=promos))
+
+        # 3. More Promotions (e variações)
+        # promotionalItems também é exposto separadamente, como objetos próprios
+        more_promotions = []
+        promotional_items = []
+        for key in ("morePromotions", "promotionalItems", "streakBonusPromotions"):
+            items_list = dashboard_data.get(key)
+            if isinstance(items_list, list):
+                for item in items_list:
+                    if isinstance(item, dict):
+                        more_promotions.append(parse_promotion(item))
+                        if key == "promotionalItems":
+                            promotional_items.append(parse_promotion(item))
+        
+        # 4. Punch Cards
+        punch_cards = []
+        pc_list = dashboard_data.get("punchCards")
+        if isinstance(pc_list, list):
+            for item in pc_list:
+                if isinstance(item, dict):
+                    punch_cards.append(RewardsDataParser.parse_punch_card(item))
+
+        # 5. User Status
+        user_status = dashboard_data.get("userStatus", {})
+
+        return RewardsDashboard(
+            daily_sets=daily_sets,
+            more_promotions=more_promotions,
+            punch_cards=punch_cards,
+            promotional_items=promotional_items,
+            user_status=user_status,
+            raw_data=response_data
+        )
+
     @staticmethod
     def _to_int(value: Any) -> Optional[int]:
         """Converte valor para inteiro com segurança."""
@@ -214,6 +288,13 @@ class RewardsDataParser:
         return None
 
 
+# Decodificador tipado: bytes da resposta -> RewardsDashboard em uma chamada.
+# Fica junto do parser, não em raxy.models.rewards: os modelos não dependem
+# da infraestrutura, e o payload (camelCase, aninhado, com campos
+# normalizados) não mapeia direto nos dataclasses para um decode por esquema.
+DASHBOARD_DECODER: TypedDecoder[RewardsDashboard] = TypedDecoder(RewardsDataParser.parse_dashboard)
+
+
 class RewardsDataAPI(BaseAPIClient, IRewardsDataService):
     """
     Cliente de API para Microsoft Rewards.
@@ -252,75 +333,13 @@ class RewardsDataAPI(BaseAPIClient, IRewardsDataService):
         Inclui conjuntos diários, promoções extras, punch cards e status do usuário.
         """
         self.logger.debug("Obtendo dashboard completo")
-        response_data = self._fetch_dashboard(sessao, bypass_request_token)
-        
-        # 1. Dados Brutos e Validação
-        if response_data is None:
-            return RewardsDashboard(raw_data={"error": "No response data"})
-
-        if not isinstance(response_data, dict):
-            return RewardsDashboard(raw_data={"error": "Invalid response format"})
-            
-        dashboard_data = response_data.get("dashboard", {})
-        if not dashboard_data and "dashboard" not in response_data:
-             # Se a resposta for o próprio dashboard (caso raro mas possível em algumas APIs)
-             if "userStatus" in response_data:
-                 dashboard_data = response_data
-        
-        if not isinstance(dashboard_data, dict):
-             dashboard_data = {}
-
-        # 2. Daily Sets
-        daily_sets = []
-        for date_key, items in dashboard_data.get("dailySetPromotions", {}).items():
-            if isinstance(items, list):
-                promos = [self.parser.parse_promotion(i, date_key) for i in items if isinstance(i, dict)]
-                if promos:
-                    daily_sets.append(DailySet(date=date_key, promotions=promos))
-
-        # 3. More Promotions (e variações)
-        more_promotions = []
-        # Combina listas comuns de promoções extras
-        extra_keys = ["morePromotions", "promotionalItems", "streakBonusPromotions"] 
-        for key in extra_keys:
-            items_list = dashboard_data.get(key)
-            if isinstance(items_list, list):
-                for item in items_list:
-                    if isinstance(item, dict):
-                        more_promotions.append(self.parser.parse_promotion(item))
-        
-        # 4. Punch Cards
-        punch_cards = []
-        pc_list = dashboard_data.get("punchCards")
-        if isinstance(pc_list, list):
-            for item in pc_list:
-                if isinstance(item, dict):
-                    punch_cards.append(self.parser.parse_punch_card(item))
-        
-        # 5. Promotional Items (Separated specifically if needed, or included in more_promotions)
-        promotional_items = []
-        pi_list = dashboard_data.get("promotionalItems")
-        if isinstance(pi_list, list):
-             for item in pi_list:
-                 if isinstance(item, dict):
-                     promotional_items.append(self.parser.parse_promotion(item))
-
-        # 6. User Status
-        user_status = dashboard_data.get("userStatus", {})
+        dashboard = self._fetch_dashboard(sessao, bypass_request_token, decoder=DASHBOARD_DECODER)
 
         self.logger.info(
-            f"Dashboard processado: {len(daily_sets)} daily sets, "
-            f"{len(more_promotions)} extras, {len(punch_cards)} punch cards"
-        )
-        
-        return RewardsDashboard(
-            daily_sets=daily_sets,
-            more_promotions=more_promotions,
-            punch_cards=punch_cards,
-            promotional_items=promotional_items,
-            user_status=user_status,
-            raw_data=response_data
+            f"Dashboard processado: {len(dashboard.daily_sets)} daily sets, "
+            f"{len(dashboard.more_promotions)} extras, {len(dashboard.punch_cards)} punch cards"
         )
+        return dashboard
 
     @debug_log(log_result=False, log_duration=True)
     def pegar_recompensas(
@@ -382,15 +401,21 @@ class RewardsDataAPI(BaseAPIClient, IRewardsDataService):
                 else:
                     self._execute_promotion(sessao, template_base, promo, collection_result)
 
-    def _fetch_dashboard(self, sessao: ISessionManager, bypass_token: bool) -> Dict[str, Any]:
-        """Método interno para buscar o JSON do dashboard."""
+    def _fetch_dashboard(
+        self,
+        sessao: ISessionManager,
+        bypass_token: bool,
+        decoder: Optional[TypedDecoder] = None
+    ) -> Any:
+        """Método interno para buscar o JSON do dashboard (ou o modelo, com ``decoder``)."""
         return self.execute_template_and_parse(
             sessao=sessao,
             template=self.load_template(get_config().api.rewards.template_obter_pontos),
             bypass_request_token=bypass_token,
             exception_type=RewardsAPIException,
             error_message="Falha ao obter dados do Rewards",
-            context={"template": "rewards_obter_pontos"}
+            context={"template": "rewards_obter_pontos"},
+            decoder=decoder
         )
 
     def _execute_quiz(
@@ -2,8 +2,14 @@
 Infraestrutura de persistência (Banco de Dados e Sistema de Arquivos).
 """
 
-from .mock_database import MockDatabaseClient
+from .mock_database import MockDatabaseClient, PerfilLatencia
 from .sqlite import SQLiteRepository
+from .sqlite_pool import SQLiteConnectionManager
+from .write_behind import WriteBehindFarmRepository
+from .cache import CachedContaRepository
+from .historico_pontos import SQLiteHistoricoPontuacaoRepository
+from .bulk import BulkConfig, BulkOperationsMixin
+from .sync import SincronizadorContas, ResultadoSync
 from .supabase import SupabaseRepository, SupabaseDatabaseClient
 from .local_filesystem import LocalFileSystem
 from .mock_filesystem import MockFileSystem
@@ -11,7 +17,16 @@ from .mock_filesystem import MockFileSystem
 __all__ = [
     "SupabaseDatabaseClient",
     "MockDatabaseClient",
+    "PerfilLatencia",
     "SQLiteRepository",
+    "SQLiteConnectionManager",
+    "WriteBehindFarmRepository",
+    "CachedContaRepository",
+    "SQLiteHistoricoPontuacaoRepository",
+    "BulkConfig",
+    "BulkOperationsMixin",
+    "SincronizadorContas",
+    "ResultadoSync",
     "SupabaseRepository",
     "LocalFileSystem",
     "MockFileSystem",
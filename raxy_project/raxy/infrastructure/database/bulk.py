@@ -0,0 +1,245 @@
+"""
+Operações em massa sobre clientes de banco (upsert em blocos e leitura paginada).
+
+Um upsert único com a tabela inteira estoura o limite de payload do
+PostgREST, e um ``select *`` sem paginação estoura o limite de resposta.
+O :class:`BulkOperationsMixin` implementa, sobre duas primitivas do
+cliente (``upsert_rows`` e ``select_page``):
+
+- upsert em blocos de ``chunk_size``, com até ``max_workers`` requisições
+  simultâneas;
+- leitura paginada por chave (keyset: ``coluna > último valor``), que
+  não degrada nas páginas finais como ``OFFSET``;
+- consulta por lista de chaves (``coluna in (...)``) em blocos que cabem
+  na URL da requisição;
+- projeção de colunas;
+- retentativa com backoff exponencial e jitter em cada requisição.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+from raxy.core.exceptions import DatabaseException, wrap_exception
+
+T = TypeVar("T")
+
+# Valores por consulta ``in``: o filtro vai na URL do PostgREST
+IN_CHUNK_SIZE = 200
+
+
+@dataclass(frozen=True)
+class BulkConfig:
+    """
+    Parâmetros das operações em massa.
+
+    Attributes:
+        chunk_size: Registros por requisição de upsert
+        page_size: Registros por página de leitura
+        max_workers: Requisições de upsert simultâneas
+        max_retries: Retentativas por requisição após a primeira falha
+        backoff_base: Espera (segundos) antes da primeira retentativa
+        backoff_max: Espera máxima entre retentativas
+    """
+
+    chunk_size: int = 500
+    page_size: int = 1000
+    max_workers: int = 4
+    max_retries: int = 4
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+
+
+def em_blocos(itens: Iterable[T], tamanho: int) -> Iterator[List[T]]:
+    """Divide ``itens`` em listas de até ``tamanho`` elementos."""
+    bloco: List[T] = []
+    for item in itens:
+        bloco.append(item)
+        if len(bloco) >= tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def com_retentativa(
+    func: Callable[[], T],
+    *,
+    tentativas: int,
+    base: float,
+    maximo: float,
+    descricao: str = "operação",
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """
+    Executa ``func`` com backoff exponencial (jitter completo) entre falhas.
+
+    Args:
+        func: Operação sem argumentos
+        tentativas: Retentativas após a primeira falha
+        base: Espera antes da primeira retentativa
+        maximo: Teto da espera
+        descricao: Nome da operação nas mensagens de erro
+        sleep: Função de espera (substituível em simulações)
+
+    Returns:
+        O retorno de ``func``
+
+    Raises:
+        DatabaseException: Se todas as tentativas falharem
+    """
+    for tentativa in range(tentativas + 1):
+        try:
+            return func()
+        except Exception as e:
+            if tentativa >= tentativas:
+                raise wrap_exception(e, DatabaseException, f"Falha em {descricao} após {tentativa + 1} tentativa(s)")
+            sleep(random.uniform(0, min(maximo, base * (2 ** tentativa))))
+    raise AssertionError("inalcançável")
+
+
+class BulkOperationsMixin(ABC):
+    """
+    Upsert em blocos e leitura paginada para clientes de banco.
+
+    A classe que usa o mixin implementa as primitivas abstratas
+    ``upsert_rows``, ``select_page`` e ``select_in`` (que devem lançar
+    exceção em caso de falha) e pode redefinir ``bulk``.
+    """
+
+    bulk: BulkConfig = BulkConfig()
+
+    @abstractmethod
+    def upsert_rows(self, table: str, rows: Sequence[Dict[str, Any]], on_conflict: str) -> int:
+        """Upsert de um bloco numa única requisição; retorna registros gravados."""
+
+    @abstractmethod
+    def select_page(
+        self,
+        table: str,
+        columns: str,
+        filters: Optional[Dict[str, Any]],
+        order_by: str,
+        after: Any,
+        limit: int,
+        greater_than: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Uma página ordenada por ``order_by`` com valores maiores que ``after``.
+
+        ``greater_than`` restringe colunas a valores estritamente maiores
+        (ex.: ``{"updated_at": marca}`` nas leituras incrementais).
+        """
+
+    @abstractmethod
+    def select_in(self, table: str, columns: str, column: str, values: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Registros cuja ``column`` está em ``values`` (uma requisição)."""
+
+    def upsert_many(self, table: str, rows: Iterable[Dict[str, Any]], on_conflict: str) -> int:
+        """
+        Upsert em blocos, com requisições paralelas e retentativas.
+
+        Args:
+            table: Nome da tabela
+            rows: Registros
+            on_conflict: Coluna de conflito
+
+        Returns:
+            int: Registros gravados
+
+        Raises:
+            DatabaseException: Se algum bloco falhar após as retentativas
+        """
+        bulk = self.bulk
+        blocos = list(em_blocos(rows, max(1, bulk.chunk_size)))
+        if not blocos:
+            return 0
+
+        def enviar(bloco: List[Dict[str, Any]]) -> int:
+            return com_retentativa(
+                lambda: self.upsert_rows(table, bloco, on_conflict),
+                tentativas=bulk.max_retries,
+                base=bulk.backoff_base,
+                maximo=bulk.backoff_max,
+                descricao=f"upsert em {table}",
+            )
+
+        if len(blocos) == 1 or bulk.max_workers <= 1:
+            return sum(enviar(bloco) for bloco in blocos)
+        with ThreadPoolExecutor(max_workers=min(bulk.max_workers, len(blocos)),
+                                thread_name_prefix="raxy-bulk") as pool:
+            return sum(pool.map(enviar, blocos))
+
+    def select_many(
+        self,
+        table: str,
+        column: str,
+        values: Iterable[Any],
+        columns: str = "*",
+    ) -> List[Dict[str, Any]]:
+        """
+        Registros cuja ``column`` está em ``values``, em consultas de até ``IN_CHUNK_SIZE`` valores.
+
+        Returns:
+            List[Dict[str, Any]]: Registros encontrados
+
+        Raises:
+            DatabaseException: Se alguma consulta falhar após as retentativas
+        """
+        bulk = self.bulk
+        encontrados: List[Dict[str, Any]] = []
+        for bloco in em_blocos(values, IN_CHUNK_SIZE):
+            encontrados.extend(com_retentativa(
+                lambda: self.select_in(table, columns, column, bloco),
+                tentativas=bulk.max_retries,
+                base=bulk.backoff_base,
+                maximo=bulk.backoff_max,
+                descricao=f"consulta em {table}",
+            ))
+        return encontrados
+
+    def iter_select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: str = "email",
+        page_size: Optional[int] = None,
+        greater_than: Optional[Dict[str, Any]] = None,
+        after: Any = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera a tabela página a página, por chave (sem OFFSET).
+
+        ``order_by`` deve ser único (ex.: a chave primária); ele é incluído
+        na projeção automaticamente. ``after`` retoma uma leitura
+        interrompida a partir do último valor de ``order_by`` processado.
+
+        Yields:
+            Dict[str, Any]: Registro
+        """
+        bulk = self.bulk
+        limite = max(1, page_size or bulk.page_size)
+        if columns != "*" and order_by not in [c.strip() for c in columns.split(",")]:
+            columns = f"{columns},{order_by}"
+        ultimo: Any = after
+        while True:
+            pagina = com_retentativa(
+                lambda: self.select_page(table, columns, filters, order_by, ultimo, limite, greater_than),
+                tentativas=bulk.max_retries,
+                base=bulk.backoff_base,
+                maximo=bulk.backoff_max,
+                descricao=f"leitura de {table}",
+            )
+            yield from pagina
+            if len(pagina) < limite:
+                return
+            ultimo = pagina[-1][order_by]
+
+
+__all__ = ["BulkConfig", "BulkOperationsMixin", "em_blocos", "com_retentativa"]
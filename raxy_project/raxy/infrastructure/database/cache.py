@@ -0,0 +1,236 @@
+"""
+Cache de leitura (read-through) das consultas de conta.
+
+Cada ``consultar_conta`` custa uma ida ao banco: uma requisição HTTP no
+Supabase ou uma consulta no SQLite. O :class:`CachedContaRepository`
+envolve o repositório e guarda as contas consultadas em memória:
+
+- LRU limitado a ``max_itens``, com validade de ``ttl`` segundos;
+- escritas pelo wrapper (``salvar``, ``salvar_varias``, ``remover``,
+  ``adicionar_registro_farm``...) invalidam as contas afetadas antes de
+  retornar;
+- acertos e falhas vão para o registro de métricas (``db.cache.*``),
+  inclusive a taxa de acerto.
+
+Escritas feitas direto no repositório envolvido (ou por outro processo)
+só aparecem após o ``ttl``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional, Sequence, Tuple
+
+from raxy.interfaces.database import IDatabaseRepository
+from raxy.core.metrics import get_metrics
+from .write_behind import RegistroFarm, gravar_registros
+
+# Métricas do cache (rótulo cache=<nome>)
+CACHE_LOOKUPS_METRIC = "db.cache.consultas"    # contador, rótulo resultado (acerto/falha)
+CACHE_HIT_RATIO_METRIC = "db.cache.taxa_acerto"  # gauge, 0..1
+CACHE_SIZE_METRIC = "db.cache.itens"             # gauge
+
+
+@dataclass
+class CacheStats:
+    """Contadores do cache."""
+    acertos: int = 0
+    falhas: int = 0
+    expirados: int = 0
+    descartados: int = 0
+    invalidacoes: int = 0
+
+    @property
+    def taxa_acerto(self) -> float:
+        """Fração das consultas atendidas pelo cache."""
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+
+def _copia(valor: Any) -> Any:
+    """Cópia rasa de registros mutáveis (``Conta`` é imutável e segue como está)."""
+    return dict(valor) if isinstance(valor, dict) else valor
+
+
+class CachedContaRepository(IDatabaseRepository):
+    """
+    Cache LRU com TTL na frente de um repositório de contas.
+
+    Example:
+        >>> repo = CachedContaRepository(SupabaseRepository(), max_itens=2048, ttl=120)
+        >>> repo.consultar_conta("a@b.com")  # vai ao banco
+        >>> repo.consultar_conta("a@b.com")  # memória
+        >>> repo.adicionar_registro_farm("a@b.com", 1500)  # invalida a conta
+    """
+
+    def __init__(
+        self,
+        repositorio: Any,
+        *,
+        max_itens: int = 1024,
+        ttl: float = 60.0,
+        nome: str = "contas",
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            repositorio: Repositório envolvido (IDatabaseRepository/IContaRepository)
+            max_itens: Contas mantidas (as menos usadas saem primeiro)
+            ttl: Validade (segundos) de cada conta em cache
+            nome: Rótulo ``cache`` das métricas
+        """
+        self.repositorio = repositorio
+        self.max_itens = max(1, max_itens)
+        self.ttl = max(0.0, ttl)
+        self.nome = nome
+        self.stats = CacheStats()
+
+        self._itens: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Avança a cada invalidação: leituras que começaram antes não entram no cache
+        self._geracao = 0
+
+    # ========== Leitura ==========
+
+    def consultar_conta(self, email: str) -> Mapping[str, Any] | None:
+        """Consulta a conta, pelo cache quando ainda válida."""
+        agora = time.monotonic()
+        with self._lock:
+            item = self._itens.get(email)
+            if item is not None and item[0] > agora:
+                self._itens.move_to_end(email)
+                self.stats.acertos += 1
+                valor = item[1]
+            else:
+                if item is not None:
+                    del self._itens[email]
+                    self.stats.expirados += 1
+                self.stats.falhas += 1
+                valor = None
+            geracao = self._geracao
+        self._registrar(acerto=item is not None and valor is not None)
+        if valor is not None:
+            return _copia(valor)
+
+        valor = self.repositorio.consultar_conta(email)
+        # None pode ser falha de rede no Supabase: não é guardado
+        if valor is not None:
+            with self._lock:
+                if geracao == self._geracao:
+                    self._itens[email] = (time.monotonic() + self.ttl, valor)
+                    self._itens.move_to_end(email)
+                    while len(self._itens) > self.max_itens:
+                        self._itens.popitem(last=False)
+                        self.stats.descartados += 1
+                tamanho = len(self._itens)
+            get_metrics().set_gauge(CACHE_SIZE_METRIC, tamanho, cache=self.nome)
+        return _copia(valor)
+
+    def _registrar(self, acerto: bool) -> None:
+        """Atualiza as métricas de consulta."""
+        metrics = get_metrics()
+        metrics.inc(CACHE_LOOKUPS_METRIC, cache=self.nome, resultado="acerto" if acerto else "falha")
+        metrics.set_gauge(CACHE_HIT_RATIO_METRIC, self.stats.taxa_acerto, cache=self.nome)
+
+    # ========== Escrita (invalidação) ==========
+
+    def invalidar(self, emails: Optional[Iterable[str]] = None) -> None:
+        """
+        Remove contas do cache.
+
+        Args:
+            emails: Contas a remover (padrão: todas)
+        """
+        with self._lock:
+            self._geracao += 1
+            if emails is None:
+                self.stats.invalidacoes += len(self._itens)
+                self._itens.clear()
+            else:
+                for email in emails:
+                    if self._itens.pop(email, None) is not None:
+                        self.stats.invalidacoes += 1
+            tamanho = len(self._itens)
+        get_metrics().set_gauge(CACHE_SIZE_METRIC, tamanho, cache=self.nome)
+
+    def salvar(self, conta):
+        """Salva a conta e a invalida no cache."""
+        try:
+            return self.repositorio.salvar(conta)
+        finally:
+            self.invalidar([conta.email])
+
+    def salvar_varias(self, contas: Sequence[Any]) -> Sequence[Any]:
+        """Salva as contas e as invalida no cache."""
+        try:
+            return self.repositorio.salvar_varias(contas)
+        finally:
+            self.invalidar([c.email for c in contas])
+
+    def salvar_conta(self, email: str, *args: Any, **kwargs: Any) -> Mapping[str, Any] | None:
+        """Salva a conta e a invalida no cache."""
+        try:
+            return self.repositorio.salvar_conta(email, *args, **kwargs)
+        finally:
+            self.invalidar([email])
+
+    def remover(self, conta) -> None:
+        """Remove a conta do banco e do cache."""
+        try:
+            self.repositorio.remover(conta)
+        finally:
+            self.invalidar([conta.email])
+
+    def adicionar_registro_farm(self, email: str, pontos: int) -> Mapping[str, Any] | None:
+        """Grava o resultado de farm e invalida a conta no cache."""
+        try:
+            return self.repositorio.adicionar_registro_farm(email, pontos)
+        finally:
+            self.invalidar([email])
+
+    def adicionar_registros_farm(self, registros: Sequence[RegistroFarm]) -> int:
+        """
+        Grava resultados de farm e invalida as contas no cache.
+
+        Em lote se o repositório envolvido suportar; senão, um registro
+        por vez (ver ``gravar_registros``).
+        """
+        try:
+            return gravar_registros(self.repositorio, registros)
+        finally:
+            self.invalidar([r.email for r in registros])
+
+    def aplicar_remotas(self, upserts: Sequence[Mapping[str, Any]], remocoes: Sequence[str]) -> None:
+        """Aplica alterações da sincronização e invalida as contas no cache."""
+        try:
+            self.repositorio.aplicar_remotas(upserts, remocoes)
+        finally:
+            self.invalidar([row["email"] for row in upserts] + list(remocoes))
+
+    def gravar_carimbos(self, carimbos: Sequence[Mapping[str, Any]], enviados: Mapping[str, Any]) -> None:
+        """Grava os carimbos remotos da sincronização e invalida as contas no cache."""
+        try:
+            self.repositorio.gravar_carimbos(carimbos, enviados)
+        finally:
+            self.invalidar(list(enviados))
+
+    def listar_contas(self) -> Sequence[Mapping[str, Any]]:
+        """Lista as contas do repositório (sem passar pelo cache)."""
+        return self.repositorio.listar_contas()
+
+    def __getattr__(self, nome: str) -> Any:
+        # Demais operações (listar, consultar_contas, flush...) vão direto ao repositório
+        if nome in ("repositorio", "_itens", "_lock"):
+            raise AttributeError(nome)
+        return getattr(self.repositorio, nome)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._itens)
+
+
+__all__ = ["CachedContaRepository", "CacheStats"]
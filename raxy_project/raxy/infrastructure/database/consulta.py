@@ -0,0 +1,198 @@
+"""
+Consulta paginada e filtrada de contas.
+
+Listar a tabela inteira (``listar_contas``) não escala: a memória e o tempo
+crescem com o número de contas mesmo quando só uma fração interessa. Os
+repositórios oferecem ``consultar_contas``, que devolve uma página por
+cursor (o último email da página anterior, ordem por chave primária) com
+filtros por condição e projeção de colunas.
+
+Filtros vêm de :class:`FiltroContas` ou de expressões ``campo<op>valor``
+(``--where`` na CLI), por exemplo ``status=active``, ``pontos>=5000`` ou
+``ultima_farm<2026-10-01``. ``null`` compara com ausência de valor
+(``ultima_farm=null``: contas nunca farmadas).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from raxy.models import Conta
+from raxy.core.exceptions import ValidationException
+
+# Colunas que ``Conta.from_dict`` lê (projeção usada pelo executor)
+COLUNAS_CONTA = ("email", "senha", "id_perfil", "email_backup", "senha_email_backup", "pontos", "ultima_farm")
+
+# Campos filtráveis e o tipo do valor
+CAMPOS_FILTRO = {"email": str, "status": str, "pontos": int, "ultima_farm": str}
+OPERADORES = ("!=", ">=", "<=", "=", ">", "<")
+
+_EXPRESSAO = re.compile(r"^\s*([a-z_]+)\s*(!=|>=|<=|=|>|<)\s*(.*?)\s*$")
+
+
+@dataclass(frozen=True)
+class Condicao:
+    """Condição ``campo operador valor`` (valor None compara com NULL)."""
+    campo: str
+    operador: str
+    valor: Any
+
+    def __post_init__(self):
+        if self.campo not in CAMPOS_FILTRO:
+            raise ValidationException(
+                f"Campo não filtrável: {self.campo}", details={"validos": sorted(CAMPOS_FILTRO)}
+            )
+        if self.operador not in OPERADORES:
+            raise ValidationException(f"Operador inválido: {self.operador}", details={"validos": list(OPERADORES)})
+        if self.valor is None and self.operador not in ("=", "!="):
+            raise ValidationException(f"null só aceita = ou != ({self.campo})")
+
+
+@dataclass(frozen=True)
+class FiltroContas:
+    """
+    Filtros de consulta de contas (todas as condições precisam valer).
+
+    Example:
+        >>> FiltroContas.de(status="active", pontos_min=1000, farm_antes="2026-10-18")
+        >>> FiltroContas.de_expressoes(["status=active", "ultima_farm=null"])
+    """
+    condicoes: Tuple[Condicao, ...] = ()
+
+    @classmethod
+    def de(
+        cls,
+        status: Optional[str] = None,
+        pontos_min: Optional[int] = None,
+        pontos_max: Optional[int] = None,
+        farm_desde: Optional[str] = None,
+        farm_antes: Optional[str] = None,
+    ) -> FiltroContas:
+        """
+        Monta os filtros mais comuns.
+
+        Args:
+            status: Status exato
+            pontos_min: Pontos maiores ou iguais
+            pontos_max: Pontos menores ou iguais
+            farm_desde: ``ultima_farm`` a partir deste instante (inclusive)
+            farm_antes: ``ultima_farm`` antes deste instante
+        """
+        condicoes = []
+        if status is not None:
+            condicoes.append(Condicao("status", "=", status))
+        if pontos_min is not None:
+            condicoes.append(Condicao("pontos", ">=", pontos_min))
+        if pontos_max is not None:
+            condicoes.append(Condicao("pontos", "<=", pontos_max))
+        if farm_desde is not None:
+            condicoes.append(Condicao("ultima_farm", ">=", farm_desde))
+        if farm_antes is not None:
+            condicoes.append(Condicao("ultima_farm", "<", farm_antes))
+        return cls(tuple(condicoes))
+
+    @classmethod
+    def de_expressoes(cls, expressoes: Iterable[str]) -> FiltroContas:
+        """
+        Converte expressões ``campo<op>valor`` em filtros.
+
+        Raises:
+            ValidationException: Se alguma expressão for inválida
+        """
+        return cls(tuple(parse_condicao(expressao) for expressao in expressoes))
+
+    def __bool__(self) -> bool:
+        return bool(self.condicoes)
+
+    def para_sql(self) -> Tuple[str, List[Any]]:
+        """Cláusula ``WHERE`` (sem a palavra-chave) e parâmetros."""
+        partes, params = [], []
+        for c in self.condicoes:
+            if c.valor is None:
+                partes.append(f"{c.campo} IS {'NOT ' if c.operador == '!=' else ''}NULL")
+            else:
+                partes.append(f"{c.campo} {c.operador} ?")
+                params.append(c.valor)
+        return " AND ".join(partes), params
+
+
+def parse_condicao(expressao: str) -> Condicao:
+    """
+    Converte ``campo<op>valor`` em :class:`Condicao`.
+
+    Raises:
+        ValidationException: Se a expressão, o campo ou o valor forem inválidos
+    """
+    match = _EXPRESSAO.match(expressao)
+    if not match:
+        raise ValidationException(
+            f"Filtro inválido: {expressao!r} (use campo<op>valor, ex.: pontos>=1000)",
+            details={"operadores": list(OPERADORES)},
+        )
+    campo, operador, bruto = match.groups()
+    if bruto.lower() == "null":
+        return Condicao(campo, operador, None)
+    tipo = CAMPOS_FILTRO.get(campo, str)
+    try:
+        valor = tipo(bruto)
+    except ValueError:
+        raise ValidationException(f"Valor inválido para {campo}: {bruto!r}")
+    return Condicao(campo, operador, valor)
+
+
+@dataclass
+class PaginaContas:
+    """
+    Página de uma consulta de contas.
+
+    Attributes:
+        itens: Registros da página (apenas as colunas pedidas)
+        proximo_cursor: Cursor da página seguinte (None na última página)
+    """
+    itens: List[Dict[str, Any]] = field(default_factory=list)
+    proximo_cursor: Optional[str] = None
+
+
+def validar_colunas(colunas: str, disponiveis: Sequence[str]) -> List[str]:
+    """
+    Valida uma projeção ``"a,b,c"`` contra as colunas existentes.
+
+    ``email`` (chave do cursor) é sempre incluído.
+
+    Raises:
+        ValidationException: Se alguma coluna não existir
+    """
+    if colunas.strip() == "*":
+        return list(disponiveis)
+    pedidas = [c.strip() for c in colunas.split(",") if c.strip()]
+    desconhecidas = [c for c in pedidas if c not in disponiveis]
+    if desconhecidas:
+        raise ValidationException(
+            f"Coluna(s) desconhecida(s): {', '.join(desconhecidas)}", details={"validas": list(disponiveis)}
+        )
+    return pedidas if "email" in pedidas else ["email"] + pedidas
+
+
+def listar_para_execucao(repositorio: Any) -> List[Conta]:
+    """
+    Carrega as contas para o farm lendo só as colunas de ``Conta``.
+
+    Repositórios sem ``iterar_contas`` caem no ``listar()`` completo.
+    """
+    iterar = getattr(repositorio, "iterar_contas", None)
+    if iterar is None:
+        return repositorio.listar()
+    return list(iterar(colunas=",".join(COLUNAS_CONTA)))
+
+
+__all__ = [
+    "COLUNAS_CONTA",
+    "listar_para_execucao",
+    "Condicao",
+    "FiltroContas",
+    "PaginaContas",
+    "parse_condicao",
+    "validar_colunas",
+]
@@ -0,0 +1,322 @@
+"""
+Histórico de pontuação das contas (série temporal) no SQLite.
+
+``contas.pontos`` guarda apenas o último total e é sobrescrito a cada
+execução. Este módulo mantém, no mesmo arquivo de banco:
+
+- ``pontos_historico``: registros somente de inserção, agrupados por dia
+  (chave primária começando pelo dia, tabela ``WITHOUT ROWID``). Os
+  registros de um dia ficam contíguos no arquivo, então leituras e
+  descartes por período percorrem só os dias pedidos;
+- ``pontos_ultimo``: último total de cada conta (consulta por chave
+  primária, sem percorrer o histórico);
+- ``pontos_diario`` e ``pontos_semanal``: agregados por conta, atualizados
+  na mesma transação de cada registro. Gráficos de evolução leem esses
+  agregados em vez do histórico.
+
+``ganhos`` soma apenas aumentos de pontos entre registros consecutivos;
+quedas (resgates) não descontam.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TYPE_CHECKING
+
+from raxy.interfaces.database import IHistoricoPontuacaoRepository
+from raxy.core.exceptions import DatabaseException, wrap_exception
+from raxy.core.logging import get_logger
+from .sqlite_pool import SQLiteConnectionManager
+from .migracoes import Migracao, migrar
+
+if TYPE_CHECKING:  # pragma: no cover
+    from raxy.models import Conta
+    from .write_behind import RegistroFarm
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS pontos_historico (
+    dia TEXT NOT NULL,
+    email TEXT NOT NULL,
+    registrado_em TEXT NOT NULL,
+    pontos INTEGER NOT NULL,
+    ganhos INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dia, email, registrado_em)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_pontos_historico_email ON pontos_historico (email, registrado_em);
+CREATE TABLE IF NOT EXISTS pontos_ultimo (
+    email TEXT PRIMARY KEY,
+    pontos INTEGER NOT NULL,
+    registrado_em TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pontos_diario (
+    dia TEXT NOT NULL,
+    email TEXT NOT NULL,
+    pontos_inicio INTEGER NOT NULL,
+    pontos_fim INTEGER NOT NULL,
+    ganhos INTEGER NOT NULL DEFAULT 0,
+    registros INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dia, email)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pontos_semanal (
+    semana TEXT NOT NULL,
+    email TEXT NOT NULL,
+    pontos_inicio INTEGER NOT NULL,
+    pontos_fim INTEGER NOT NULL,
+    ganhos INTEGER NOT NULL DEFAULT 0,
+    registros INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (semana, email)
+) WITHOUT ROWID;
+"""
+
+# Agregado do período: o primeiro registro fixa o início, os seguintes avançam o fim
+_AGREGAR_SQL = """
+INSERT INTO {tabela} ({periodo}, email, pontos_inicio, pontos_fim, ganhos, registros)
+VALUES (?, ?, ?, ?, ?, 1)
+ON CONFLICT({periodo}, email) DO UPDATE SET
+    pontos_fim = excluded.pontos_fim,
+    ganhos = {tabela}.ganhos + excluded.ganhos,
+    registros = {tabela}.registros + 1
+"""
+
+_AGREGADOS = {"diario": ("pontos_diario", "dia"), "semanal": ("pontos_semanal", "semana")}
+
+
+def _criar_tabelas(conn) -> None:
+    for comando in _SCHEMA_SQL.split(";"):
+        if comando.strip():
+            conn.execute(comando)
+
+
+def _indice_email_dia(conn) -> None:
+    # Período de uma conta filtrado por dia: busca direta no índice, já em ordem cronológica
+    conn.execute("DROP INDEX IF EXISTS idx_pontos_historico_email")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_pontos_historico_email_dia "
+        "ON pontos_historico (email, dia, registrado_em)"
+    )
+
+
+# Esquema do histórico; novas alterações entram no fim, com a versão seguinte
+MIGRACOES_HISTORICO = (
+    Migracao(1, "histórico, último total e agregados diário/semanal", _criar_tabelas),
+    Migracao(2, "índice do histórico por conta e dia", _indice_email_dia),
+)
+
+
+def _instante(valor: Optional[datetime] = None) -> datetime:
+    """Instante em UTC (agora, se omitido)."""
+    if valor is None:
+        return datetime.now(timezone.utc)
+    return valor.replace(tzinfo=timezone.utc) if valor.tzinfo is None else valor.astimezone(timezone.utc)
+
+
+def _semana(dia: date) -> str:
+    """Segunda-feira da semana ISO do dia (``YYYY-MM-DD``)."""
+    return (dia - timedelta(days=dia.weekday())).isoformat()
+
+
+class SQLiteHistoricoPontuacaoRepository(IHistoricoPontuacaoRepository):
+    """
+    Histórico de pontuação em SQLite com agregados diários e semanais.
+
+    Example:
+        >>> historico = SQLiteHistoricoPontuacaoRepository("raxy.db")
+        >>> historico.registrar_pontos(conta, 15230)
+        >>> historico.obter_ultimo_total(conta)
+        15230
+        >>> historico.agregados("diario", desde=date(2026, 10, 1))
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = "raxy.db",
+        logger=None,
+        connections: Optional[SQLiteConnectionManager] = None,
+    ):
+        """
+        Inicializa o repositório.
+
+        Args:
+            db_path: Caminho do arquivo do banco
+            logger: Serviço de log
+            connections: Gerenciador de conexões a compartilhar (ex.: o do SQLiteRepository)
+        """
+        self.db_path = str(db_path)
+        self.logger = logger or get_logger()
+        # Conexões compartilhadas continuam sob responsabilidade de quem as criou
+        self._proprias = connections is None
+        self._connections = connections or SQLiteConnectionManager(self.db_path)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Aplica as migrações pendentes do histórico (ver ``migracoes``)."""
+        try:
+            migrar(self._connections.get(), "historico_pontos", MIGRACOES_HISTORICO, self.logger)
+        except DatabaseException:
+            raise
+        except Exception as e:
+            raise wrap_exception(e, DatabaseException, "Erro ao inicializar histórico de pontos no SQLite")
+
+    # ========== Escrita ==========
+
+    def registrar_pontos(self, conta: "Conta", pontos: int) -> None:
+        """Acrescenta o total atual da conta ao histórico."""
+        self._registrar([(conta.email, pontos, _instante())])
+
+    def registrar_varios(self, registros: Sequence["RegistroFarm"]) -> int:
+        """
+        Acrescenta vários totais numa única transação.
+
+        Args:
+            registros: Resultados de farm (ver ``write_behind``)
+
+        Returns:
+            int: Registros acrescentados
+        """
+        return self._registrar([(r.email, r.pontos, _instante(r.ultima_farm)) for r in registros])
+
+    def _registrar(self, itens: Sequence[tuple]) -> int:
+        inseridos = 0
+        try:
+            with self._connections.connection() as conn:
+                for email, pontos, quando in itens:
+                    registrado_em = quando.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+                    dia = quando.date()
+                    anterior = conn.execute(
+                        "SELECT pontos, registrado_em FROM pontos_ultimo WHERE email = ?", (email,)
+                    ).fetchone()
+                    if anterior is not None and registrado_em < anterior["registrado_em"]:
+                        # Fora de ordem: entra no histórico, mas não move o último total nem os agregados
+                        conn.execute(
+                            "INSERT OR IGNORE INTO pontos_historico (dia, email, registrado_em, pontos, ganhos) "
+                            "VALUES (?, ?, ?, ?, 0)",
+                            (dia.isoformat(), email, registrado_em, pontos),
+                        )
+                        continue
+                    ganhos = max(0, pontos - anterior["pontos"]) if anterior is not None else 0
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO pontos_historico (dia, email, registrado_em, pontos, ganhos) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (dia.isoformat(), email, registrado_em, pontos, ganhos),
+                    )
+                    if cursor.rowcount == 0:
+                        continue  # mesmo registro já gravado
+                    conn.execute(
+                        "INSERT INTO pontos_ultimo (email, pontos, registrado_em) VALUES (?, ?, ?) "
+                        "ON CONFLICT(email) DO UPDATE SET pontos = excluded.pontos, "
+                        "registrado_em = excluded.registrado_em",
+                        (email, pontos, registrado_em),
+                    )
+                    # O período começa no total anterior: o primeiro ganho do dia pertence ao dia
+                    inicio = anterior["pontos"] if anterior is not None else pontos
+                    conn.execute(_AGREGAR_SQL.format(tabela="pontos_diario", periodo="dia"),
+                                 (dia.isoformat(), email, inicio, pontos, ganhos))
+                    conn.execute(_AGREGAR_SQL.format(tabela="pontos_semanal", periodo="semana"),
+                                 (_semana(dia), email, inicio, pontos, ganhos))
+                    inseridos += 1
+        except Exception as e:
+            raise wrap_exception(e, DatabaseException, "Erro ao registrar histórico de pontos", registros=len(itens))
+        return inseridos
+
+    def podar(self, antes_de: date) -> int:
+        """
+        Descarta o histórico detalhado anterior a ``antes_de``.
+
+        Agregados e últimos totais são mantidos.
+
+        Returns:
+            int: Registros removidos
+        """
+        try:
+            with self._connections.connection() as conn:
+                return conn.execute("DELETE FROM pontos_historico WHERE dia < ?", (antes_de.isoformat(),)).rowcount
+        except Exception as e:
+            raise wrap_exception(e, DatabaseException, "Erro ao podar histórico de pontos", antes_de=str(antes_de))
+
+    # ========== Leitura ==========
+
+    def obter_ultimo_total(self, conta: "Conta") -> int | None:
+        """Último total registrado da conta (``None`` se nunca registrado)."""
+        with self._connections.connection() as conn:
+            row = conn.execute("SELECT pontos FROM pontos_ultimo WHERE email = ?", (conta.email,)).fetchone()
+            return row["pontos"] if row else None
+
+    def historico(
+        self,
+        email: str,
+        desde: Optional[date] = None,
+        ate: Optional[date] = None,
+    ) -> List[Mapping[str, Any]]:
+        """
+        Registros de uma conta em ordem cronológica.
+
+        Args:
+            email: Conta
+            desde: Primeiro dia (inclusive)
+            ate: Último dia (inclusive)
+        """
+        sql = "SELECT dia, registrado_em, pontos, ganhos FROM pontos_historico WHERE email = ?"
+        params: List[Any] = [email]
+        # Período por ``dia``, como na chave primária e na poda
+        if desde:
+            sql += " AND dia >= ?"
+            params.append(desde.isoformat())
+        if ate:
+            sql += " AND dia <= ?"
+            params.append(ate.isoformat())
+        with self._connections.connection() as conn:
+            # dia é a data UTC de registrado_em: mesma ordem, sem ordenar fora do índice
+            return [dict(row) for row in conn.execute(sql + " ORDER BY dia, registrado_em", params)]
+
+    def agregados(
+        self,
+        periodo: str = "diario",
+        desde: Optional[date] = None,
+        ate: Optional[date] = None,
+        email: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Evolução por dia ou semana, somando as contas (ou de uma conta).
+
+        Args:
+            periodo: ``diario`` ou ``semanal``
+            desde: Primeiro dia (inclusive)
+            ate: Último dia (inclusive)
+            email: Restringe a uma conta
+
+        Returns:
+            List[Dict[str, Any]]: Itens com ``periodo``, ``contas``, ``registros``, ``ganhos`` e ``pontos_fim``
+
+        Raises:
+            ValueError: Se o período for desconhecido
+        """
+        if periodo not in _AGREGADOS:
+            raise ValueError(f"Período inválido: {periodo} (use {', '.join(_AGREGADOS)})")
+        tabela, coluna = _AGREGADOS[periodo]
+        filtros, params = [], []
+        if desde:
+            filtros.append(f"{coluna} >= ?")
+            params.append(_semana(desde) if periodo == "semanal" else desde.isoformat())
+        if ate:
+            filtros.append(f"{coluna} <= ?")
+            params.append(ate.isoformat())
+        if email:
+            filtros.append("email = ?")
+            params.append(email)
+        where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+        sql = (
+            f"SELECT {coluna} AS periodo, COUNT(*) AS contas, SUM(registros) AS registros, "
+            f"SUM(ganhos) AS ganhos, SUM(pontos_fim) AS pontos_fim "
+            f"FROM {tabela} {where} GROUP BY {coluna} ORDER BY {coluna}"
+        )
+        with self._connections.connection() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def close(self) -> None:
+        """Fecha as conexões abertas pelo repositório (não as compartilhadas)."""
+        if self._proprias:
+            self._connections.close_all()
+
+
+__all__ = ["SQLiteHistoricoPontuacaoRepository"]
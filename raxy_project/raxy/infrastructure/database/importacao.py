@@ -0,0 +1,246 @@
+"""
+Importação de contas em fluxo (streaming) a partir de arquivos ``email:senha``.
+
+O arquivo é lido linha a linha em modo binário: a memória não cresce com o
+tamanho do arquivo e a posição em bytes serve de progresso. Cada linha vira
+um :class:`LinhaImportada` com a conta ou o motivo da rejeição.
+
+O :class:`ImportadorContas` consome essas linhas e:
+
+- descarta emails repetidos no próprio arquivo;
+- consulta o banco por bloco e pula as contas já cadastradas (ou as
+  atualiza, com ``atualizar_existentes``);
+- grava cada bloco com ``salvar_varias`` (uma transação no SQLite, upsert
+  em massa no Supabase).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Set
+
+from raxy.interfaces.database import IContaRepository
+from raxy.models import Conta
+from raxy.core.exceptions import DataValidationException
+from raxy.core.logging import get_logger
+from .bulk import em_blocos
+
+
+@dataclass(frozen=True)
+class LinhaImportada:
+    """
+    Linha do arquivo de importação já analisada.
+
+    Attributes:
+        numero: Número da linha (a partir de 1)
+        posicao: Bytes lidos até o fim da linha
+        conta: Conta analisada (None se a linha foi rejeitada)
+        erro: Motivo da rejeição
+    """
+    numero: int
+    posicao: int
+    conta: Optional[Conta] = None
+    erro: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ErroLinha:
+    """Linha rejeitada na importação."""
+    numero: int
+    motivo: str
+
+
+@dataclass
+class ResultadoImportacao:
+    """Totais de uma importação."""
+    linhas: int = 0
+    importadas: int = 0
+    duplicadas_arquivo: int = 0
+    existentes: int = 0
+    invalidas: int = 0
+    falhas: int = 0
+    erros: List[ErroLinha] = field(default_factory=list)
+
+
+_ID_PERFIL_INVALIDO = re.compile(r"[^a-z0-9._-]+")
+
+
+def gerar_id_perfil(email: str) -> str:
+    """Gera o ID de perfil a partir do email."""
+    return _ID_PERFIL_INVALIDO.sub("_", email.lower().replace("@", "_at_")).strip("_")
+
+
+def parse_linha_conta(linha: str) -> Conta:
+    """
+    Analisa uma linha ``email:senha``.
+
+    Args:
+        linha: Conteúdo da linha (sem quebra)
+
+    Returns:
+        Conta: Conta analisada
+
+    Raises:
+        DataValidationException: Se a linha não estiver no formato esperado
+    """
+    email, separador, senha = linha.partition(":")
+    if not separador:
+        raise DataValidationException("Formato inválido (esperado email:senha)")
+    email, senha = email.strip(), senha.strip()
+    if "@" not in email:
+        raise DataValidationException(f"Email inválido ({email})")
+    if not senha:
+        raise DataValidationException(f"Senha vazia ({email})")
+    return Conta(email=email, senha=senha, id_perfil=gerar_id_perfil(email))
+
+
+def ler_contas(arquivo: BinaryIO, encoding: str = "utf-8") -> Iterator[LinhaImportada]:
+    """
+    Lê contas de um arquivo binário, uma linha por vez.
+
+    Linhas vazias e comentários (``#``) são ignorados sem erro.
+
+    Args:
+        arquivo: Arquivo aberto em modo binário
+        encoding: Codificação do texto
+
+    Yields:
+        LinhaImportada: Conta ou erro de cada linha relevante
+    """
+    posicao = 0
+    for numero, bruta in enumerate(arquivo, start=1):
+        posicao += len(bruta)
+        try:
+            linha = bruta.decode(encoding).strip()
+        except UnicodeDecodeError:
+            yield LinhaImportada(numero, posicao, erro=f"Codificação inválida (esperado {encoding})")
+            continue
+        if not linha or linha.startswith("#"):
+            continue
+        try:
+            yield LinhaImportada(numero, posicao, conta=parse_linha_conta(linha))
+        except DataValidationException as e:
+            yield LinhaImportada(numero, posicao, erro=e.message)
+
+
+def _chave_email(email: str) -> bytes:
+    """
+    Chave do email para detectar repetições no arquivo.
+
+    Digest de 128 bits: tamanho fixo mesmo para emails longos e colisão
+    desprezível (nenhuma conta é descartada por engano). Compara o email
+    exato, como a chave primária e ``emails_existentes``.
+    """
+    return hashlib.blake2b(email.encode("utf-8"), digest_size=16).digest()
+
+
+class ImportadorContas:
+    """
+    Importa contas em blocos, sem carregar o arquivo inteiro.
+
+    Example:
+        >>> importador = ImportadorContas(SQLiteRepository(), lote=5000)
+        >>> resultado = importador.importar(LocalFileSystem().iter_accounts_from_file("users.txt"))
+        >>> resultado.importadas, resultado.existentes
+    """
+
+    def __init__(
+        self,
+        repositorio: IContaRepository,
+        *,
+        lote: int = 2000,
+        atualizar_existentes: bool = False,
+        max_erros: int = 100,
+        logger=None,
+    ):
+        """
+        Inicializa o importador.
+
+        Args:
+            repositorio: Repositório de destino
+            lote: Contas por bloco (uma transação/upsert por bloco)
+            atualizar_existentes: Se contas já cadastradas devem ser regravadas
+            max_erros: Linhas rejeitadas guardadas no resultado (as demais só são contadas)
+            logger: Serviço de log
+        """
+        self.repositorio = repositorio
+        self.lote = max(1, lote)
+        self.atualizar_existentes = atualizar_existentes
+        self.max_erros = max_erros
+        self.logger = logger or get_logger()
+
+    def importar(
+        self,
+        linhas: Iterable[LinhaImportada],
+        progresso: Optional[Callable[[int], None]] = None,
+    ) -> ResultadoImportacao:
+        """
+        Importa as contas das linhas analisadas.
+
+        Args:
+            linhas: Linhas de ``ler_contas``/``iter_accounts_from_file``
+            progresso: Chamado a cada bloco com a posição (bytes) já processada
+
+        Returns:
+            ResultadoImportacao: Totais e primeiras linhas rejeitadas
+        """
+        resultado = ResultadoImportacao()
+        vistos: Set[bytes] = set()
+
+        def contas_validas() -> Iterator[LinhaImportada]:
+            for linha in linhas:
+                resultado.linhas += 1
+                if linha.conta is None:
+                    resultado.invalidas += 1
+                    if len(resultado.erros) < self.max_erros:
+                        resultado.erros.append(ErroLinha(linha.numero, linha.erro or "linha inválida"))
+                    continue
+                chave = _chave_email(linha.conta.email)
+                if chave in vistos:
+                    resultado.duplicadas_arquivo += 1
+                    continue
+                vistos.add(chave)
+                yield linha
+
+        for bloco in em_blocos(contas_validas(), self.lote):
+            self._gravar_bloco([linha.conta for linha in bloco], resultado)
+            if progresso:
+                progresso(bloco[-1].posicao)
+
+        self.logger.info(
+            f"Importação concluída. {resultado.importadas} contas gravadas, "
+            f"{resultado.existentes} já existentes, {resultado.duplicadas_arquivo} repetidas, "
+            f"{resultado.invalidas} inválidas."
+        )
+        return resultado
+
+    def _gravar_bloco(self, contas: List[Conta], resultado: ResultadoImportacao) -> None:
+        consultar = getattr(self.repositorio, "emails_existentes", None)
+        if not self.atualizar_existentes and consultar is not None:
+            existentes = consultar([c.email for c in contas])
+            if existentes:
+                resultado.existentes += len(existentes)
+                contas = [c for c in contas if c.email not in existentes]
+        if not contas:
+            return
+        try:
+            self.repositorio.salvar_varias(contas)
+            resultado.importadas += len(contas)
+        except Exception as e:
+            resultado.falhas += len(contas)
+            self.logger.erro(
+                f"Falha ao salvar bloco de {len(contas)} contas ({contas[0].email}...)", exception=e
+            )
+
+
+__all__ = [
+    "ImportadorContas",
+    "ResultadoImportacao",
+    "LinhaImportada",
+    "ErroLinha",
+    "ler_contas",
+    "parse_linha_conta",
+    "gerar_id_perfil",
+]
@@ -8,13 +8,13 @@ from __future__ import annotations
 import os
 import shutil
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
 
 from raxy.interfaces.database import IFileSystem
 from raxy.models import Conta
 from raxy.core.logging import get_logger
-from raxy.core.exceptions import DataValidationException, FileRepositoryException, DataNotFoundException, wrap_exception
-import re
+from raxy.core.exceptions import FileRepositoryException, DataNotFoundException, wrap_exception
+from .importacao import LinhaImportada, ler_contas
 
 
 class LocalFileSystem(IFileSystem):
@@ -149,50 +149,50 @@ class LocalFileSystem(IFileSystem):
             return str(self._base_path.joinpath(*parts))
         return str(Path(*parts))
 
-    def import_accounts_from_file(self, path: str | Path) -> List[Conta]:
+    def iter_accounts_from_file(self, path: str | Path) -> Iterator[LinhaImportada]:
         """
-        Lê e analisa um arquivo de texto contendo contas (email:senha).
+        Lê um arquivo de contas (email:senha) linha a linha, sem carregá-lo inteiro.
         
         Args:
             path: Caminho do arquivo a ser importado.
             
-        Returns:
-            Lista de objetos Conta analisados.
+        Yields:
+            LinhaImportada: Conta ou erro de cada linha, com a posição em bytes.
+            
+        Raises:
+            DataNotFoundException: Se o arquivo não existir
+            FileRepositoryException: Se a leitura falhar
         """
         caminho = str(path)
         if not self.exists(caminho):
              raise DataNotFoundException(f"Arquivo não encontrado: {caminho}", details={"path": caminho})
 
-        logger = get_logger()
-        logger.debug(f"Importando contas de: {caminho}")
-
+        get_logger().debug(f"Importando contas de: {caminho}")
         try:
-            content = self.read_text(caminho)
-        except Exception as e:
+            with open(self._resolve_path(caminho), "rb") as arquivo:
+                yield from ler_contas(arquivo)
+        except OSError as e:
             raise wrap_exception(e, FileRepositoryException, "Erro ao ler arquivo de importação", path=caminho)
 
+    def import_accounts_from_file(self, path: str | Path) -> List[Conta]:
+        """
+        Lê e analisa um arquivo de texto contendo contas (email:senha).
+        
+        Para arquivos grandes prefira ``iter_accounts_from_file``.
+        
+        Args:
+            path: Caminho do arquivo a ser importado.
+            
+        Returns:
+            Lista de objetos Conta analisados.
+        """
+        logger = get_logger()
         contas = []
-        for i, line in enumerate(content.splitlines(), start=1):
-            line = line.strip()
-            if not line or line.startswith("#") or ":" not in line:
+        for linha in self.iter_accounts_from_file(path):
+            if linha.conta is None:
+                logger.aviso(f"Linha {linha.numero}: {linha.erro}")
                 continue
-
-            try:
-                parts = line.split(":", 1)
-                email = parts[0].strip()
-                senha = parts[1].strip()
-
-                if "@" not in email:
-                     logger.aviso(f"Linha {i}: Email inválido ignorado ({email})")
-                     continue
-
-                # Gera ID de perfil baseado no email se não existir lógica melhor
-                base = email.lower().replace("@", "_at_")
-                id_perfil = re.sub(r"[^a-z0-9._-]+", "_", base).strip("_")
-
-                contas.append(Conta(email=email, senha=senha, id_perfil=id_perfil))
-            except Exception as e:
-                logger.aviso(f"Linha {i}: Erro ao processar conta", erro=str(e))
+            contas.append(linha.conta)
 
         logger.info(f"Importação concluída. {len(contas)} contas analisadas.")
         return contas
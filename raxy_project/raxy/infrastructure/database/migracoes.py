@@ -0,0 +1,117 @@
+"""
+Migrações versionadas do esquema SQLite.
+
+Cada componente (``contas``, ``historico_pontos``) tem uma lista ordenada
+de :class:`Migracao` e a versão aplicada fica em ``schema_version``. Na
+abertura do repositório basta ler um inteiro: se já é a última versão,
+nada mais é executado. Caso contrário, as migrações pendentes rodam numa
+única transação (``BEGIN IMMEDIATE``), com a versão relida dentro dela,
+então dois processos abrindo o mesmo banco não aplicam nada duas vezes.
+
+Os passos são idempotentes (``IF NOT EXISTS``, colunas conferidas antes do
+``ALTER``): bancos criados antes do controle de versão, sem
+``schema_version``, passam por todos eles e só recebem o que falta.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from raxy.core.exceptions import DatabaseException, wrap_exception
+
+_SCHEMA_VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    componente TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL,
+    atualizado_em TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+)
+"""
+
+
+@dataclass(frozen=True)
+class Migracao:
+    """
+    Passo de migração.
+
+    Attributes:
+        versao: Versão do esquema após o passo (sequencial a partir de 1)
+        descricao: Descrição curta (vai para o log)
+        aplicar: Executa o passo na conexão (sem commit; não usar ``executescript``)
+    """
+    versao: int
+    descricao: str
+    aplicar: Callable[[sqlite3.Connection], None]
+
+
+def versao_atual(conn: sqlite3.Connection, componente: str) -> int:
+    """Versão aplicada do componente (0 se nunca migrado)."""
+    try:
+        row = conn.execute("SELECT versao FROM schema_version WHERE componente = ?", (componente,)).fetchone()
+    except sqlite3.OperationalError:
+        return 0  # banco anterior ao controle de versão
+    return row[0] if row else 0
+
+
+def migrar(
+    conn: sqlite3.Connection,
+    componente: str,
+    migracoes: Sequence[Migracao],
+    logger=None,
+) -> int:
+    """
+    Aplica as migrações pendentes do componente.
+
+    Args:
+        conn: Conexão (fora de transação)
+        componente: Nome do componente em ``schema_version``
+        migracoes: Passos em ordem crescente de versão
+        logger: Serviço de log
+
+    Returns:
+        int: Migrações aplicadas (0 no caminho rápido)
+
+    Raises:
+        DatabaseException: Se algum passo falhar (nada do lote é gravado)
+    """
+    alvo = migracoes[-1].versao
+    if versao_atual(conn, componente) >= alvo:
+        return 0
+
+    aplicadas = 0
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(_SCHEMA_VERSION_SQL)
+        # Relida sob o lock de escrita: outro processo pode ter migrado antes
+        atual = versao_atual(conn, componente)
+        for migracao in migracoes:
+            if migracao.versao <= atual:
+                continue
+            if logger:
+                logger.debug(f"Migrando BD ({componente}): v{migracao.versao} {migracao.descricao}")
+            migracao.aplicar(conn)
+            aplicadas += 1
+        conn.execute(
+            "INSERT INTO schema_version (componente, versao) VALUES (?, ?) "
+            "ON CONFLICT(componente) DO UPDATE SET versao = excluded.versao, "
+            "atualizado_em = strftime('%Y-%m-%dT%H:%M:%fZ', 'now')",
+            (componente, alvo),
+        )
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        raise wrap_exception(
+            e, DatabaseException, f"Erro ao migrar esquema do SQLite ({componente})", componente=componente, alvo=alvo
+        )
+    if aplicadas and logger:
+        logger.info(f"Esquema do BD ({componente}) atualizado para v{alvo} ({aplicadas} migração(ões))")
+    return aplicadas
+
+
+def colunas_tabela(conn: sqlite3.Connection, tabela: str) -> list:
+    """Nomes das colunas da tabela."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({tabela})")]
+
+
+__all__ = ["Migracao", "migrar", "versao_atual", "colunas_tabela"]
@@ -1,17 +1,87 @@
 """
-Mock Database Client para testes unitários.
+Mock Database Client para testes unitários e de carga.
 
 Implementação em memória que não toca banco de dados real.
+
+Colunas usadas em filtros (e a coluna de conflito do upsert) ganham um
+índice hash na primeira consulta, mantido a cada escrita: consultas por
+igualdade custam o tamanho do resultado, não o da tabela, e o mock serve
+para medir o executor com centenas de milhares de contas.
+
+Com um :class:`PerfilLatencia`, cada requisição espera uma latência
+sorteada (log-normal ajustada a p50/p99) e falha com a probabilidade
+configurada, como um 5xx do Supabase.
+
+Com ``carimbo``, a coluna informada é preenchida com o instante da
+gravação quando a escrita não a traz, como o trigger ``contas_touch`` do
+Supabase faz com ``updated_at``.
 """
 
 from __future__ import annotations
-from typing import Any, Dict, Optional, Sequence
+import heapq
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
 from copy import deepcopy
 
 from raxy.interfaces.database import IDatabaseClient
+from raxy.core.exceptions import DatabaseException, ValidationException
+from .bulk import BulkConfig, BulkOperationsMixin
+
+# Quantil 0,99 da normal padrão (ajuste da log-normal a p50/p99)
+_Z_P99 = 2.3263
+
+
+@dataclass(frozen=True)
+class PerfilLatencia:
+    """
+    Latência e falhas simuladas por requisição.
 
+    Attributes:
+        p50: Mediana da latência (segundos)
+        p99: Percentil 99 da latência (segundos)
+        taxa_erro: Fração das requisições que falham (0 a 1)
+        semente: Semente do sorteio (None para aleatório)
 
-class MockDatabaseClient(IDatabaseClient):
+    Example:
+        >>> PerfilLatencia.supabase()  # ~40 ms p50, ~250 ms p99, 1% de 5xx
+        >>> PerfilLatencia(p50=0.005, p99=0.02, taxa_erro=0.001, semente=42)
+    """
+    p50: float = 0.0
+    p99: float = 0.0
+    taxa_erro: float = 0.0
+    semente: Optional[int] = None
+
+    def __post_init__(self):
+        if self.p50 < 0 or self.p99 < self.p50:
+            raise ValidationException(
+                "Latência inválida (requer 0 <= p50 <= p99)", details={"p50": self.p50, "p99": self.p99}
+            )
+        if not 0.0 <= self.taxa_erro <= 1.0:
+            raise ValidationException("taxa_erro deve estar entre 0 e 1", details={"taxa_erro": self.taxa_erro})
+
+    @classmethod
+    def supabase(cls, taxa_erro: float = 0.01, semente: Optional[int] = None) -> PerfilLatencia:
+        """Perfil aproximado do Supabase acessado de outra região."""
+        return cls(p50=0.040, p99=0.250, taxa_erro=taxa_erro, semente=semente)
+
+    def sorteador(self) -> random.Random:
+        """Gerador de números aleatórios do perfil."""
+        return random.Random(self.semente)
+
+    def amostrar(self, rng: random.Random) -> float:
+        """Sorteia a latência de uma requisição (segundos)."""
+        if self.p50 <= 0:
+            return 0.0
+        sigma = math.log(self.p99 / self.p50) / _Z_P99
+        return rng.lognormvariate(math.log(self.p50), sigma) if sigma else self.p50
+
+
+class MockDatabaseClient(BulkOperationsMixin, IDatabaseClient):
     """
     Database mock para testes.
     
@@ -19,27 +89,54 @@ class MockDatabaseClient(IDatabaseClient):
     sem tocar banco real.
     
     Design Pattern: Test Double (Mock Object)
-    Uso: Testes unitários
+    Uso: Testes unitários e de carga
     
     Benefícios:
     - Execução instantânea (<1ms)
     - Zero conexão de rede
     - Determinístico
     - Isolamento perfeito entre testes
+    - Latência e falhas configuráveis (PerfilLatencia)
     """
     
-    def __init__(self):
-        """Inicializa database mock."""
+    def __init__(
+        self,
+        latencia: float = 0.0,
+        bulk: Optional[BulkConfig] = None,
+        perfil: Optional[PerfilLatencia] = None,
+        carimbo: Optional[str] = None,
+    ):
+        """
+        Inicializa database mock.
+    
+        Args:
+            latencia: Atraso fixo adicional (segundos) por requisição em massa
+            bulk: Parâmetros de upsert_many/iter_select
+            perfil: Latência e falhas sorteadas em todas as requisições
+            carimbo: Coluna carimbada pelo "servidor" nas escritas que não a informam
+        """
         # Estrutura: {table_name: {id: record}}
         self._tables: Dict[str, Dict[int, Dict[str, Any]]] = {}
         self._next_ids: Dict[str, int] = {}
+        # Índices hash: {table_name: {coluna: {valor: {ids}}}}
+        self._indices: Dict[str, Dict[str, Dict[Any, Set[int]]]] = {}
         self._is_healthy = True
+        self.latencia = latencia
+        self.bulk = bulk or BulkConfig()
+        self.perfil = perfil
+        self._rng = perfil.sorteador() if perfil else None
+        self.requisicoes = 0
+        self.falhas_injetadas = 0
+        self.carimbo = carimbo
+        self._ultimo_carimbo: Optional[datetime] = None
+        self._lock = threading.RLock()
     
     def _ensure_table(self, table: str) -> None:
         """Garante que tabela existe."""
         if table not in self._tables:
             self._tables[table] = {}
             self._next_ids[table] = 1
+            self._indices[table] = {}
     
     def _get_next_id(self, table: str) -> int:
         """Obtém próximo ID para tabela."""
@@ -54,6 +151,111 @@ class MockDatabaseClient(IDatabaseClient):
                 return False
         return True
     
+    # ========== Índices ==========
+    
+    def criar_indice(self, table: str, column: str) -> None:
+        """
+        Cria (se ainda não existir) o índice hash de uma coluna.
+    
+        Consultas criam os índices das colunas filtradas sozinhas; chamar
+        antes só antecipa o custo da construção.
+        """
+        with self._lock:
+            self._ensure_table(table)
+            if column in self._indices[table]:
+                return
+            indice: Dict[Any, Set[int]] = {}
+            for record_id, record in self._tables[table].items():
+                self._indexar_valor(indice, record_id, record, column)
+            self._indices[table][column] = indice
+    
+    @staticmethod
+    def _indexar_valor(indice: Dict[Any, Set[int]], record_id: int, record: Dict[str, Any], column: str) -> None:
+        if column not in record:
+            return
+        try:
+            indice.setdefault(record[column], set()).add(record_id)
+        except TypeError:
+            pass  # valor não hashable: só é encontrado por varredura
+    
+    def _indexar(self, table: str, record_id: int, record: Dict[str, Any]) -> None:
+        for column, indice in self._indices[table].items():
+            self._indexar_valor(indice, record_id, record, column)
+    
+    def _desindexar(self, table: str, record_id: int, record: Dict[str, Any]) -> None:
+        for column, indice in self._indices[table].items():
+            if column not in record:
+                continue
+            try:
+                ids = indice.get(record[column])
+            except TypeError:
+                continue
+            if ids is not None:
+                ids.discard(record_id)
+                if not ids:
+                    del indice[record[column]]
+    
+    def _ids_indexados(self, table: str, column: str, values: Iterable[Any]) -> Optional[List[int]]:
+        """IDs com ``column`` em ``values`` pelo índice (None se algum valor não for hashable)."""
+        self.criar_indice(table, column)
+        indice = self._indices[table][column]
+        ids: Set[int] = set()
+        try:
+            for value in values:
+                ids.update(indice.get(value, ()))
+        except TypeError:
+            return None
+        return sorted(ids)
+    
+    def _candidatos(self, table: str, filters: Optional[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """Registros que atendem aos filtros de igualdade, em ordem de inserção."""
+        registros = self._tables[table]
+        if not filters:
+            return registros.values()
+        melhor: Optional[List[int]] = None
+        for column, value in filters.items():
+            ids = self._ids_indexados(table, column, (value,))
+            if ids is not None and (melhor is None or len(ids) < len(melhor)):
+                melhor = ids
+        candidatos = registros.values() if melhor is None else (registros[i] for i in melhor)
+        return (r for r in candidatos if self._matches_filters(r, filters))
+    
+    @staticmethod
+    def _projetar(record: Dict[str, Any], columns: str) -> Dict[str, Any]:
+        """Copia o registro com as colunas pedidas."""
+        if columns == "*":
+            return deepcopy(record)
+        cols = {c.strip() for c in columns.split(",")}
+        return {k: deepcopy(v) for k, v in record.items() if k in cols}
+    
+    # ========== Simulação de latência e falhas ==========
+    
+    def _simular_requisicao(self, operacao: str, em_massa: bool = False) -> None:
+        """
+        Conta a requisição, espera a latência simulada (fora do lock) e injeta falhas.
+    
+        Raises:
+            DatabaseException: Falha sorteada pelo perfil (status 503)
+        """
+        atraso = self.latencia if em_massa else 0.0
+        falhou = False
+        with self._lock:
+            self.requisicoes += 1
+            if self.perfil is not None:
+                atraso += self.perfil.amostrar(self._rng)
+                falhou = self._rng.random() < self.perfil.taxa_erro
+                if falhou:
+                    self.falhas_injetadas += 1
+        if atraso:
+            time.sleep(atraso)
+        if falhou:
+            raise DatabaseException(
+                f"Erro 503 simulado em {operacao}", details={"status": 503, "operacao": operacao}
+            )
+    
+    # ========== Operações por registro ==========
+    # Como no SupabaseDatabaseClient, falhas viram None/[]/False
+    
     def upsert(
         self,
         table: str,
@@ -61,28 +263,51 @@ class MockDatabaseClient(IDatabaseClient):
         on_conflict: str
     ) -> Optional[Dict[str, Any]]:
         """Insere ou atualiza registro."""
+        try:
+            self._simular_requisicao("upsert")
+        except DatabaseException:
+            return None
+        with self._lock:
+            return deepcopy(self._upsert(table, data, on_conflict))
+    
+    def _carimbar(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Preenche a coluna de carimbo ausente (UTC, microssegundos, sempre crescente)."""
+        if not self.carimbo or self.carimbo in data:
+            return data
+        agora = datetime.now(timezone.utc)
+        if self._ultimo_carimbo and agora <= self._ultimo_carimbo:
+            agora = self._ultimo_carimbo + timedelta(microseconds=1)
+        self._ultimo_carimbo = agora
+        return {**data, self.carimbo: agora.strftime("%Y-%m-%dT%H:%M:%S.%fZ")}
+
+    def _upsert(self, table: str, data: Dict[str, Any], on_conflict: str) -> Dict[str, Any]:
         self._ensure_table(table)
-        
-        # Procura registro existente pelo campo de conflito
+        data = self._carimbar(data)
+    
+        # Procura registro existente pelo campo de conflito (índice)
         conflict_value = data.get(on_conflict)
         existing_id = None
-        
+    
         if conflict_value:
-            for record_id, record in self._tables[table].items():
-                if record.get(on_conflict) == conflict_value:
-                    existing_id = record_id
-                    break
-        
+            ids = self._ids_indexados(table, on_conflict, (conflict_value,))
+            if ids is None:
+                ids = [i for i, r in self._tables[table].items() if r.get(on_conflict) == conflict_value]
+            existing_id = ids[0] if ids else None
+    
         if existing_id:
             # Atualiza existente
-            self._tables[table][existing_id].update(data)
-            return deepcopy(self._tables[table][existing_id])
+            record = self._tables[table][existing_id]
+            self._desindexar(table, existing_id, record)
+            record.update(data)
+            self._indexar(table, existing_id, record)
+            return record
         else:
             # Insere novo
             new_id = self._get_next_id(table)
             record = {"id": new_id, **data}
             self._tables[table][new_id] = record
-            return deepcopy(record)
+            self._indexar(table, new_id, record)
+            return record
     
     def select(
         self,
@@ -92,27 +317,19 @@ class MockDatabaseClient(IDatabaseClient):
         limit: Optional[int] = None
     ) -> Sequence[Dict[str, Any]]:
         """Seleciona registros."""
-        self._ensure_table(table)
-        
-        results = []
-        
-        for record in self._tables[table].values():
-            if filters is None or self._matches_filters(record, filters):
-                # Copia registro
-                result = deepcopy(record)
-                
-                # Filtra colunas se necessário
-                if columns != "*":
-                    cols = [c.strip() for c in columns.split(",")]
-                    result = {k: v for k, v in result.items() if k in cols}
-                
-                results.append(result)
-                
+        try:
+            self._simular_requisicao("select")
+        except DatabaseException:
+            return []
+        with self._lock:
+            self._ensure_table(table)
+            results = []
+            for record in self._candidatos(table, filters):
+                results.append(self._projetar(record, columns))
                 # Aplica limite
                 if limit and len(results) >= limit:
                     break
-        
-        return results
+            return results
     
     def select_one(
         self,
@@ -131,17 +348,21 @@ class MockDatabaseClient(IDatabaseClient):
         filters: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
         """Atualiza registros."""
-        self._ensure_table(table)
-        
-        updated = None
-        
-        for record in self._tables[table].values():
-            if self._matches_filters(record, filters):
+        try:
+            self._simular_requisicao("update")
+        except DatabaseException:
+            return None
+        with self._lock:
+            self._ensure_table(table)
+            data = self._carimbar(data)
+            updated = None
+            for record in list(self._candidatos(table, filters)):
+                self._desindexar(table, record["id"], record)
                 record.update(data)
+                self._indexar(table, record["id"], record)
                 if updated is None:
                     updated = deepcopy(record)
-        
-        return updated
+            return updated
     
     def delete(
         self,
@@ -149,18 +370,64 @@ class MockDatabaseClient(IDatabaseClient):
         filters: Dict[str, Any]
     ) -> bool:
         """Remove registros."""
-        self._ensure_table(table)
-        
-        ids_to_remove = []
-        
-        for record_id, record in self._tables[table].items():
-            if self._matches_filters(record, filters):
-                ids_to_remove.append(record_id)
-        
-        for record_id in ids_to_remove:
-            del self._tables[table][record_id]
-        
-        return len(ids_to_remove) > 0
+        try:
+            self._simular_requisicao("delete")
+        except DatabaseException:
+            return False
+        with self._lock:
+            self._ensure_table(table)
+            removidos = list(self._candidatos(table, filters))
+            for record in removidos:
+                self._desindexar(table, record["id"], record)
+                del self._tables[table][record["id"]]
+            return len(removidos) > 0
+    
+    # ========== Primitivas das operações em massa ==========
+    # Falhas propagam (DatabaseException) para a retentativa do BulkOperationsMixin
+    
+    def upsert_rows(self, table: str, rows: Sequence[Dict[str, Any]], on_conflict: str) -> int:
+        """Upsert de um bloco (uma requisição simulada)."""
+        self._simular_requisicao("upsert_rows", em_massa=True)
+        with self._lock:
+            for row in rows:
+                self._upsert(table, row, on_conflict)
+        return len(rows)
+    
+    def select_page(
+        self,
+        table: str,
+        columns: str,
+        filters: Optional[Dict[str, Any]],
+        order_by: str,
+        after: Any,
+        limit: int,
+        greater_than: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Página ordenada por ``order_by`` com valores maiores que ``after``."""
+        self._simular_requisicao("select_page", em_massa=True)
+        with self._lock:
+            self._ensure_table(table)
+            candidatos = (
+                r for r in self._candidatos(table, filters)
+                if r.get(order_by) is not None
+                and (after is None or r[order_by] > after)
+                and all(r.get(k) is not None and r[k] > v for k, v in (greater_than or {}).items())
+            )
+            pagina = heapq.nsmallest(limit, candidatos, key=lambda r: r[order_by])
+            return [self._projetar(r, columns) for r in pagina]
+    
+    def select_in(self, table: str, columns: str, column: str, values: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Registros cuja ``column`` está em ``values`` (uma requisição simulada)."""
+        self._simular_requisicao("select_in", em_massa=True)
+        with self._lock:
+            self._ensure_table(table)
+            ids = self._ids_indexados(table, column, values)
+            if ids is None:
+                procurados = list(values)
+                registros = [r for r in self._tables[table].values() if r.get(column) in procurados]
+            else:
+                registros = [self._tables[table][i] for i in ids]
+            return [self._projetar(r, columns) for r in registros]
     
     def health_check(self) -> bool:
         """Verifica saúde (sempre True para mock)."""
@@ -170,14 +437,18 @@ class MockDatabaseClient(IDatabaseClient):
     
     def clear(self) -> None:
         """Limpa todos os dados (útil para testes)."""
-        self._tables.clear()
-        self._next_ids.clear()
+        with self._lock:
+            self._tables.clear()
+            self._next_ids.clear()
+            self._indices.clear()
     
     def clear_table(self, table: str) -> None:
         """Limpa uma tabela específica."""
-        if table in self._tables:
-            self._tables[table].clear()
-            self._next_ids[table] = 1
+        with self._lock:
+            if table in self._tables:
+                self._tables[table].clear()
+                self._next_ids[table] = 1
+                self._indices[table] = {}
     
     def get_all_tables(self) -> Dict[str, Dict[int, Dict[str, Any]]]:
         """Retorna todos os dados (útil para debugging)."""
@@ -194,3 +465,9 @@ class MockDatabaseClient(IDatabaseClient):
     def set_healthy(self) -> None:
         """Restaura DB saudável."""
         self._is_healthy = True
+    
+    def definir_perfil(self, perfil: Optional[PerfilLatencia]) -> None:
+        """Troca o perfil de latência/falhas (ex.: após popular as tabelas sem latência)."""
+        with self._lock:
+            self.perfil = perfil
+            self._rng = perfil.sorteador() if perfil else None
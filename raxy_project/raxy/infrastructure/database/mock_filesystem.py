@@ -7,11 +7,13 @@ permitindo testes rápidos e isolados.
 
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, List, Union, TYPE_CHECKING
+from io import BytesIO
+from typing import Dict, Iterator, List, Union, TYPE_CHECKING
 
 from raxy.interfaces.database import IFileSystem
 if TYPE_CHECKING:
     from raxy.models import Conta
+    from .importacao import LinhaImportada
 
 
 class MockFileSystem(IFileSystem):
@@ -266,6 +268,15 @@ class MockFileSystem(IFileSystem):
         """Retorna todos os diretórios (útil para debugging)."""
         return list(self._dirs)
 
+    def iter_accounts_from_file(self, path: str | Path) -> Iterator["LinhaImportada"]:
+        """Lê contas do arquivo em memória com o mesmo parser do filesystem local."""
+        from .importacao import ler_contas
+        
+        if not self.exists(path):
+            from raxy.core.exceptions import DataNotFoundException
+            raise DataNotFoundException(f"Arquivo não encontrado no mock: {path}")
+        yield from ler_contas(BytesIO(self.read_bytes(path)))
+
     def import_accounts_from_file(self, path: str | Path) -> List["Conta"]:
         """
         Mock da importação de contas.
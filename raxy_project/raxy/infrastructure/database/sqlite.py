@@ -7,13 +7,127 @@ from __future__ import annotations
 
 import sqlite3
 import json
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Mapping, Optional, Sequence, List
+from datetime import timezone
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, List, TYPE_CHECKING
 
 from raxy.interfaces.database import IDatabaseRepository, IContaRepository
 from raxy.models import Conta
 from raxy.core.exceptions import DatabaseException, wrap_exception
 from raxy.core.logging import get_logger
+from .sqlite_pool import SQLiteConnectionManager
+from .consulta import FiltroContas, PaginaContas, validar_colunas
+from .migracoes import Migracao, colunas_tabela, migrar
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .write_behind import RegistroFarm
+
+# Instante atual no formato de updated_at (UTC, milissegundos)
+_AGORA_SQL = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+# Chave em sync_estado que liga o log de alterações (gravada na primeira sincronização)
+_LOG_ATIVO = "log_ativo"
+_LOG_ATIVO_SQL = f"EXISTS (SELECT 1 FROM sync_estado WHERE chave = '{_LOG_ATIVO}')"
+
+
+def _criar_tabela_contas(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS contas (
+        email TEXT PRIMARY KEY,
+        senha TEXT NOT NULL,
+        id_perfil TEXT,
+        proxy TEXT,
+        email_backup TEXT,
+        senha_email_backup TEXT,
+        pontos INTEGER DEFAULT 0,
+        ultima_farm TIMESTAMP,
+        meta_diaria INTEGER DEFAULT 0,
+        status TEXT DEFAULT 'active',
+        dados_extras JSON,
+        updated_at TEXT,
+        versao INTEGER DEFAULT 0
+    )
+    """)
+
+
+def _colunas_email_backup(conn: sqlite3.Connection) -> None:
+    existentes = colunas_tabela(conn, "contas")
+    if "email_backup" not in existentes:
+        conn.execute("ALTER TABLE contas ADD COLUMN email_backup TEXT")
+    if "senha_email_backup" not in existentes:
+        conn.execute("ALTER TABLE contas ADD COLUMN senha_email_backup TEXT")
+
+
+def _colunas_sync(conn: sqlite3.Connection) -> None:
+    existentes = colunas_tabela(conn, "contas")
+    if "versao" not in existentes:
+        conn.execute("ALTER TABLE contas ADD COLUMN versao INTEGER DEFAULT 0")
+    if "updated_at" not in existentes:
+        conn.execute("ALTER TABLE contas ADD COLUMN updated_at TEXT")
+        conn.execute(f"UPDATE contas SET updated_at = {_AGORA_SQL} WHERE updated_at IS NULL")
+
+
+def _log_alteracoes(conn: sqlite3.Connection) -> None:
+    """
+    Log de alterações e estado da sincronização.
+
+    Triggers registram cada inserção, atualização e remoção em
+    ``contas_alteracoes`` e mantêm ``updated_at``/``versao``. Escritas que
+    já trazem ``updated_at`` (aplicadas pela sincronização) preservam o
+    valor recebido. Os triggers só agem com o log ativo (ver
+    ``ativar_log_alteracoes``): quem nunca sincronizou não paga o UPDATE
+    extra a cada escrita nem acumula um log que nenhum envio poda.
+    """
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS contas_alteracoes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT NOT NULL,
+        operacao TEXT NOT NULL
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS sync_estado (
+        chave TEXT PRIMARY KEY,
+        valor TEXT
+    )""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS contas_sync_insert AFTER INSERT ON contas
+    WHEN NEW.updated_at IS NULL AND {_LOG_ATIVO_SQL}
+    BEGIN
+        UPDATE contas SET updated_at = {_AGORA_SQL}, versao = 1 WHERE email = NEW.email;
+        INSERT INTO contas_alteracoes (email, operacao) VALUES (NEW.email, 'upsert');
+    END""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS contas_sync_update AFTER UPDATE ON contas
+    WHEN NEW.updated_at IS OLD.updated_at AND {_LOG_ATIVO_SQL}
+    BEGIN
+        UPDATE contas SET updated_at = {_AGORA_SQL}, versao = COALESCE(OLD.versao, 0) + 1
+        WHERE email = NEW.email;
+        INSERT INTO contas_alteracoes (email, operacao) VALUES (NEW.email, 'upsert');
+    END""")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS contas_sync_delete AFTER DELETE ON contas
+    WHEN {_LOG_ATIVO_SQL}
+    BEGIN
+        INSERT INTO contas_alteracoes (email, operacao) VALUES (OLD.email, 'delete');
+    END""")
+
+
+def _indices_consulta(conn: sqlite3.Connection) -> None:
+    # status com email: filtra já na ordem do cursor
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contas_status ON contas (status, email)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contas_ultima_farm ON contas (ultima_farm)")
+
+
+# Esquema de contas; novas alterações entram no fim, com a versão seguinte
+MIGRACOES_CONTAS = (
+    Migracao(1, "tabela contas", _criar_tabela_contas),
+    Migracao(2, "colunas email_backup/senha_email_backup", _colunas_email_backup),
+    Migracao(3, "colunas updated_at/versao", _colunas_sync),
+    Migracao(4, "log de alterações e triggers de sincronização", _log_alteracoes),
+    Migracao(5, "índices de status e ultima_farm", _indices_consulta),
+)
+
 
 class SQLiteRepository(IDatabaseRepository, IContaRepository):
     """
@@ -30,54 +144,170 @@ class SQLiteRepository(IDatabaseRepository, IContaRepository):
         """
         self.db_path = str(db_path)
         self.logger = logger or get_logger()
+        # Uma conexão por thread (WAL), reutilizada entre chamadas
+        self._connections = SQLiteConnectionManager(self.db_path)
         self._init_db()
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Cria uma conexão com o banco de dados."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Permite acesso por nome de coluna
-            return conn
-        except sqlite3.Error as e:
-            raise DatabaseException(f"Erro ao conectar ao banco SQLite: {e}", details={"path": self.db_path})
+        """Retorna a conexão da thread atual com o banco de dados."""
+        return self._connections.get()
+
+    def _connection(self):
+        """Transação na conexão da thread atual (commit ao sair, rollback em erro)."""
+        return self._connections.connection()
+
+    def close(self) -> None:
+        """Fecha as conexões abertas pelo repositório."""
+        self._connections.close_all()
 
     def _init_db(self):
-        """Inicializa o esquema do banco de dados se não existir."""
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS contas (
-            email TEXT PRIMARY KEY,
-            senha TEXT NOT NULL,
-            id_perfil TEXT,
-            proxy TEXT,
-            email_backup TEXT,
-            senha_email_backup TEXT,
-            pontos INTEGER DEFAULT 0,
-            ultima_farm TIMESTAMP,
-            meta_diaria INTEGER DEFAULT 0,
-            status TEXT DEFAULT 'active',
-            dados_extras JSON
-        );
-        """
+        """Aplica as migrações pendentes do esquema (ver ``migracoes``)."""
         try:
-            with self._get_connection() as conn:
-                conn.execute(create_table_sql)
-                
-                # Migration simples: verificar e adicionar colunas se faltarem
-                cursor = conn.execute("PRAGMA table_info(contas)")
-                colunas = [row["name"] for row in cursor.fetchall()]
-                
-                if "email_backup" not in colunas:
-                    self.logger.info("Migrando BD: Adicionando coluna email_backup")
-                    conn.execute("ALTER TABLE contas ADD COLUMN email_backup TEXT")
-                    
-                if "senha_email_backup" not in colunas:
-                    self.logger.info("Migrando BD: Adicionando coluna senha_email_backup")
-                    conn.execute("ALTER TABLE contas ADD COLUMN senha_email_backup TEXT")
-                
-                conn.commit()
+            migrar(self._get_connection(), "contas", MIGRACOES_CONTAS, self.logger)
+        except DatabaseException:
+            raise
         except Exception as e:
             raise wrap_exception(e, DatabaseException, "Erro ao inicializar schema do SQLite")
 
+    @cached_property
+    def _colunas(self) -> List[str]:
+        """Colunas da tabela ``contas`` (lidas na primeira consulta que projeta colunas)."""
+        return colunas_tabela(self._get_connection(), "contas")
+
+    # Suporte à sincronização (ver database.sync)
+
+    def ativar_log_alteracoes(self) -> bool:
+        """
+        Liga o log de alterações (chamado pela sincronização).
+
+        Até a primeira sincronização os triggers não registram nada. Na
+        ativação, todas as contas entram no log como alterações pendentes:
+        o primeiro envio as inclui. ``updated_at`` fica como está (ou
+        nulo), para que na primeira recepção a versão remota mais recente
+        prevaleça sobre cópias locais antigas.
+
+        Returns:
+            bool: True se o log foi ativado agora
+        """
+        if self.ler_estado_sync(_LOG_ATIVO) is not None:
+            return False
+        with self._connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM sync_estado WHERE chave = ?", (_LOG_ATIVO,)).fetchone():
+                return False
+            conn.execute("INSERT INTO contas_alteracoes (email, operacao) SELECT email, 'upsert' FROM contas")
+            conn.execute("INSERT INTO sync_estado (chave, valor) VALUES (?, ?)", (_LOG_ATIVO, "1"))
+        self.logger.info("Log de alterações ativado para sincronização")
+        return True
+
+    def ler_estado_sync(self, chave: str) -> Optional[str]:
+        """Lê um valor do estado da sincronização."""
+        with self._connection() as conn:
+            row = conn.execute("SELECT valor FROM sync_estado WHERE chave = ?", (chave,)).fetchone()
+            return row["valor"] if row else None
+
+    def gravar_estado_sync(self, valores: Mapping[str, Optional[str]]) -> None:
+        """Grava valores do estado da sincronização numa transação."""
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT INTO sync_estado (chave, valor) VALUES (?, ?) "
+                "ON CONFLICT(chave) DO UPDATE SET valor = excluded.valor",
+                list(valores.items()),
+            )
+
+    def alteracoes_desde(self, seq: int, limite: int) -> List[Mapping[str, Any]]:
+        """
+        Alterações locais posteriores a ``seq``, em ordem.
+
+        Returns:
+            List[Mapping[str, Any]]: Itens com ``seq``, ``email`` e ``operacao``
+        """
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT seq, email, operacao FROM contas_alteracoes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (seq, limite),
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+    def emails_alterados_desde(self, seq: int) -> set:
+        """Emails com alterações locais ainda não enviadas."""
+        with self._connection() as conn:
+            rows = conn.execute("SELECT DISTINCT email FROM contas_alteracoes WHERE seq > ?", (seq,)).fetchall()
+            return {row["email"] for row in rows}
+
+    def contas_por_email(self, emails: Sequence[str], colunas: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Linhas atuais das contas informadas (apenas as colunas pedidas)."""
+        resultado: Dict[str, Dict[str, Any]] = {}
+        selecao = ", ".join(colunas)
+        with self._connection() as conn:
+            # Limite de variáveis do SQLite: consulta em blocos
+            for inicio in range(0, len(emails), 500):
+                bloco = list(emails[inicio:inicio + 500])
+                marcadores = ", ".join("?" * len(bloco))
+                for row in conn.execute(f"SELECT {selecao} FROM contas WHERE email IN ({marcadores})", bloco):
+                    resultado[row["email"]] = dict(row)
+        return resultado
+
+    def aplicar_remotas(self, upserts: Sequence[Mapping[str, Any]], remocoes: Sequence[str]) -> None:
+        """
+        Aplica alterações recebidas do remoto numa única transação.
+
+        As linhas trazem o ``updated_at`` remoto (preservado pelos triggers).
+        Entradas que essas escritas geram no log são descartadas, para que
+        não voltem ao remoto no próximo envio.
+        """
+        with self._connection() as conn:
+            # Trava de escrita desde o início: nenhum outro escritor entre o seq e o fim
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            seq_inicial = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM contas_alteracoes").fetchone()[0]
+            if upserts:
+                colunas = list(upserts[0].keys())
+                atualizacao = ", ".join(f"{c} = excluded.{c}" for c in colunas if c != "email")
+                conn.executemany(
+                    f"INSERT INTO contas ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))}) "
+                    f"ON CONFLICT(email) DO UPDATE SET {atualizacao}",
+                    [tuple(row.get(c) for c in colunas) for row in upserts],
+                )
+            if remocoes:
+                conn.executemany("DELETE FROM contas WHERE email = ?", [(email,) for email in remocoes])
+            conn.execute("DELETE FROM contas_alteracoes WHERE seq > ?", (seq_inicial,))
+
+    def gravar_carimbos(
+        self,
+        carimbos: Sequence[Mapping[str, Any]],
+        enviados: Mapping[str, Optional[str]],
+    ) -> None:
+        """
+        Grava o ``updated_at``/``versao`` atribuídos pelo remoto a linhas enviadas.
+
+        Só atualiza contas cujo ``updated_at`` ainda é o enviado: uma edição
+        local feita durante o envio é mantida (e segue no log). Como o
+        ``updated_at`` muda, os triggers não registram essas escritas.
+
+        Args:
+            carimbos: Linhas remotas com ``email``, ``updated_at`` e ``versao``
+            enviados: ``updated_at`` local de cada conta no momento do envio
+        """
+        params = [
+            (row["updated_at"], row.get("versao"), row["email"], enviados[row["email"]])
+            for row in carimbos
+            if row["email"] in enviados and row.get("updated_at") != enviados[row["email"]]
+        ]
+        if not params:
+            return
+        with self._connection() as conn:
+            conn.executemany(
+                "UPDATE contas SET updated_at = ?, versao = ? WHERE email = ? AND updated_at IS ?",
+                params,
+            )
+
+    def podar_alteracoes(self, ate_seq: int) -> None:
+        """Remove do log as alterações já enviadas."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM contas_alteracoes WHERE seq <= ?", (ate_seq,))
+
 # IContaRepository implementation
 
     def listar(self) -> List[Conta]:
@@ -99,18 +329,25 @@ class SQLiteRepository(IDatabaseRepository, IContaRepository):
         return conta
 
     def salvar_varias(self, contas: Sequence[Conta]) -> Sequence[Conta]:
-        """Salva várias contas."""
+        """
+        Salva várias contas numa única transação.
+
+        ``updated_at``/``versao`` e o log de alterações (se ativo) são
+        gravados aqui em lote, em vez de um UPDATE extra por linha nos triggers.
+        """
         try:
-            with self._get_connection() as conn:
-                sql = """
-                INSERT INTO contas (email, senha, id_perfil, proxy, email_backup, senha_email_backup) 
-                VALUES (?, ?, ?, ?, ?, ?)
+            with self._connection() as conn:
+                sql = f"""
+                INSERT INTO contas (email, senha, id_perfil, proxy, email_backup, senha_email_backup, updated_at, versao) 
+                VALUES (?, ?, ?, ?, ?, ?, {_AGORA_SQL}, 1)
                 ON CONFLICT(email) DO UPDATE SET
                     senha = excluded.senha,
                     id_perfil = COALESCE(excluded.id_perfil, contas.id_perfil),
                     proxy = COALESCE(excluded.proxy, contas.proxy),
                     email_backup = COALESCE(excluded.email_backup, contas.email_backup),
-                    senha_email_backup = COALESCE(excluded.senha_email_backup, contas.senha_email_backup);
+                    senha_email_backup = COALESCE(excluded.senha_email_backup, contas.senha_email_backup),
+                    updated_at = excluded.updated_at,
+                    versao = COALESCE(contas.versao, 0) + 1;
                 """
                 params = [
                     (
@@ -124,16 +361,28 @@ class SQLiteRepository(IDatabaseRepository, IContaRepository):
                     for c in contas
                 ]
                 conn.executemany(sql, params)
+                if conn.execute(f"SELECT {_LOG_ATIVO_SQL}").fetchone()[0]:
+                    conn.executemany(
+                        "INSERT INTO contas_alteracoes (email, operacao) VALUES (?, 'upsert')",
+                        [(c.email,) for c in contas],
+                    )
                 conn.commit()
             return contas
         except Exception as e:
             raise wrap_exception(e, DatabaseException, "Erro ao salvar várias contas em lote")
 
+    def emails_existentes(self, emails: Sequence[str]) -> set:
+        """Emails (entre os informados) que já têm conta cadastrada."""
+        try:
+            return set(self.contas_por_email(emails, ("email",)))
+        except Exception as e:
+            raise wrap_exception(e, DatabaseException, "Erro ao consultar contas existentes", emails=len(emails))
+
     def remover(self, conta: Conta) -> None:
         """Remove uma conta."""
         sql = "DELETE FROM contas WHERE email = ?"
         try:
-            with self._get_connection() as conn:
+            with self._connection() as conn:
                 conn.execute(sql, (conta.email,))
                 conn.commit()
         except Exception as e:
@@ -159,7 +408,7 @@ class SQLiteRepository(IDatabaseRepository, IContaRepository):
         """
         
         try:
-            with self._get_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.execute(sql, (pontos, email))
                 # Verifica se atualizou algo
                 if cursor.rowcount == 0:
@@ -173,11 +422,36 @@ class SQLiteRepository(IDatabaseRepository, IContaRepository):
             self.logger.erro(f"Erro ao registrar farm SQLite: {e}")
             return None
 
+    def adicionar_registros_farm(self, registros: Sequence["RegistroFarm"]) -> int:
+        """
+        Grava vários resultados de farm numa única transação.
+
+        Args:
+            registros: Resultados enfileirados (ver ``write_behind``)
+
+        Returns:
+            int: Contas atualizadas
+        """
+        sql = "UPDATE contas SET pontos = ?, ultima_farm = ? WHERE email = ?"
+        # Mesmo formato de datetime('now'): UTC, sem fuso
+        params = [
+            (r.pontos, r.ultima_farm.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"), r.email)
+            for r in registros
+        ]
+        try:
+            with self._connection() as conn:
+                atualizadas = conn.executemany(sql, params).rowcount
+        except Exception as e:
+            raise wrap_exception(e, DatabaseException, "Erro ao gravar lote de farm no SQLite", registros=len(params))
+        if atualizadas < len(params):
+            self.logger.aviso(f"Lote de farm com {len(params) - atualizadas} conta(s) inexistente(s)")
+        return atualizadas
+
     def consultar_conta(self, email: str) -> Mapping[str, Any] | None:
         """Consulta conta pelo email."""
         sql = "SELECT * FROM contas WHERE email = ?"
         try:
-            with self._get_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.execute(sql, (email,))
                 row = cursor.fetchone()
                 if row:
@@ -187,11 +461,81 @@ class SQLiteRepository(IDatabaseRepository, IContaRepository):
             self.logger.erro(f"Erro ao consultar conta SQLite: {e}")
             return None
 
+    def consultar_contas(
+        self,
+        filtros: Optional[FiltroContas] = None,
+        colunas: str = "*",
+        limite: int = 100,
+        cursor: Optional[str] = None,
+    ) -> PaginaContas:
+        """
+        Uma página de contas em ordem de email, com filtros e projeção.
+
+        Args:
+            filtros: Condições (status, pontos, ultima_farm...)
+            colunas: Projeção, ex.: ``"email,pontos"`` (email sempre incluído)
+            limite: Contas por página
+            cursor: ``proximo_cursor`` da página anterior
+
+        Returns:
+            PaginaContas: Registros e cursor da próxima página
+
+        Raises:
+            ValidationException: Se colunas ou filtros forem inválidos
+            DatabaseException: Se a consulta falhar
+        """
+        selecao = validar_colunas(colunas, self._colunas)
+        limite = max(1, limite)
+        where, params = filtros.para_sql() if filtros else ("", [])
+        if cursor is not None:
+            where = f"{where} AND email > ?" if where else "email > ?"
+            params.append(cursor)
+        sql = f"SELECT {', '.join(selecao)} FROM contas"
+        if where:
+            sql += f" WHERE {where}"
+        # Uma linha a mais indica se existe próxima página
+        sql += " ORDER BY email LIMIT ?"
+        params.append(limite + 1)
+        try:
+            with self._connection() as conn:
+                rows = [dict(row) for row in conn.execute(sql, params)]
+        except Exception as e:
+            raise wrap_exception(e, DatabaseException, "Erro ao consultar contas SQLite", where=where)
+        if len(rows) > limite:
+            return PaginaContas(itens=rows[:limite], proximo_cursor=rows[limite - 1]["email"])
+        return PaginaContas(itens=rows)
+
+    def iterar_contas(
+        self,
+        colunas: str = "*",
+        filtros: Optional[FiltroContas] = None,
+        lote: int = 1000,
+    ) -> Iterator[Conta]:
+        """
+        Itera as contas página a página (sem carregar a tabela inteira).
+
+        Args:
+            colunas: Projeção, ex.: ``"email,senha,id_perfil"``
+            filtros: Condições de consulta
+            lote: Contas por página
+
+        Yields:
+            Conta: Conta lida
+        """
+        cursor = None
+        while True:
+            pagina = self.consultar_contas(filtros, colunas, lote, cursor)
+            for row in pagina.itens:
+                yield Conta.from_dict(row)
+            if pagina.proximo_cursor is None:
+                return
+            cursor = pagina.proximo_cursor
+
     def listar_contas(self) -> Sequence[Mapping[str, Any]]:
         """Lista todas as contas."""
         sql = "SELECT * FROM contas"
         try:
-            with self._get_connection() as conn:
+            with self._connection() as conn:
                 cursor = conn.execute(sql)
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
@@ -214,7 +558,7 @@ class SQLiteRepository(IDatabaseRepository, IContaRepository):
             senha_email_backup = COALESCE(excluded.senha_email_backup, contas.senha_email_backup);
         """
         try:
-            with self._get_connection() as conn:
+            with self._connection() as conn:
                 conn.execute(sql, (email, senha, id_perfil, proxy, email_backup, senha_email_backup))
                 conn.commit()
                 return self.consultar_conta(email)
@@ -0,0 +1,186 @@
+"""
+Conexões SQLite reutilizadas por thread.
+
+Abrir uma conexão a cada chamada custa caro (abertura do arquivo, leitura
+do esquema, cache de páginas vazio) e, no modo de journal padrão
+(rollback), escritores concorrentes esbarram em ``database is locked``.
+
+O :class:`SQLiteConnectionManager` mantém uma conexão por thread,
+configurada uma única vez com WAL, ``synchronous=NORMAL``, ``busy_timeout``
+e cache de páginas maior. Como a conexão vive entre chamadas, o cache de
+statements preparados do módulo ``sqlite3`` passa a valer.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from raxy.core.exceptions import DatabaseException
+
+# Padrões ajustados para o farm: muitos escritores curtos e concorrentes
+DEFAULT_BUSY_TIMEOUT_MS = 10_000
+DEFAULT_CACHE_SIZE_KB = 16 * 1024
+DEFAULT_CACHED_STATEMENTS = 256
+
+MEMORY_DB = ":memory:"
+
+
+class SQLiteConnectionManager:
+    """
+    Gerenciador de conexões SQLite por thread.
+
+    Cada thread recebe sua própria conexão (o ``sqlite3`` não permite
+    compartilhar uma conexão em uso simultâneo); as conexões são criadas
+    sob demanda e reutilizadas até ``close_all``. Após um ``fork`` o
+    processo filho abre conexões novas.
+
+    Bancos em memória não podem ser compartilhados entre conexões, então
+    usam uma conexão única serializada por lock.
+
+    Example:
+        >>> manager = SQLiteConnectionManager("raxy.db")
+        >>> with manager.connection() as conn:
+        ...     conn.execute("UPDATE contas SET pontos = ? WHERE email = ?", (10, "a@b.com"))
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        cache_size_kb: int = DEFAULT_CACHE_SIZE_KB,
+        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+        wal: bool = True,
+    ):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            db_path: Caminho do arquivo do banco (ou ``:memory:``)
+            busy_timeout_ms: Espera máxima por um lock antes de falhar
+            cache_size_kb: Cache de páginas por conexão
+            cached_statements: Statements preparados mantidos por conexão
+            wal: Se deve usar o journal WAL (leitores não bloqueiam escritores)
+        """
+        self.db_path = str(db_path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kb = cache_size_kb
+        self.cached_statements = cached_statements
+        self.wal = wal
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._pid = os.getpid()
+        self._memory = self.db_path == MEMORY_DB
+        self._shared: Optional[sqlite3.Connection] = None
+        self._shared_lock = threading.RLock()
+
+    # ========== Criação ==========
+
+    def _open(self) -> sqlite3.Connection:
+        """Abre e configura uma nova conexão."""
+        try:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.busy_timeout_ms / 1000,
+                cached_statements=self.cached_statements,
+                # Fechamento em close_all pode vir de outra thread
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            if self.wal and not self._memory:
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+        except sqlite3.Error as e:
+            raise DatabaseException(f"Erro ao conectar ao banco SQLite: {e}", details={"path": self.db_path})
+
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _check_fork(self) -> None:
+        """Descarta conexões herdadas do processo pai."""
+        pid = os.getpid()
+        if pid != self._pid:
+            with self._lock:
+                self._pid = pid
+                self._connections = []
+                self._shared = None
+                self._local = threading.local()
+
+    # ========== Acesso ==========
+
+    def get(self) -> sqlite3.Connection:
+        """
+        Retorna a conexão da thread atual (abre na primeira chamada).
+
+        Returns:
+            sqlite3.Connection: Conexão configurada
+        """
+        self._check_fork()
+        if self._memory:
+            if self._shared is None:
+                with self._shared_lock:
+                    if self._shared is None:
+                        self._shared = self._open()
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Transação na conexão da thread: commit ao sair, rollback em erro.
+
+        Yields:
+            sqlite3.Connection: Conexão da thread atual
+        """
+        conn = self.get()
+        if self._memory:
+            with self._shared_lock, conn:
+                yield conn
+        else:
+            with conn:
+                yield conn
+
+    # ========== Encerramento ==========
+
+    def close_thread(self) -> None:
+        """Fecha a conexão da thread atual (útil ao fim de workers)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def close_all(self) -> None:
+        """Fecha todas as conexões abertas por este gerenciador."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._shared = None
+            self._local = threading.local()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    @property
+    def open_connections(self) -> int:
+        """Quantidade de conexões abertas."""
+        with self._lock:
+            return len(self._connections)
+
+
+__all__ = ["SQLiteConnectionManager"]
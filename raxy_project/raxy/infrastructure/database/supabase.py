@@ -5,10 +5,11 @@ Repositório de banco de dados usando Supabase.
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Sequence, List
+from typing import Any, Dict, Iterator, Optional, Sequence, List, TYPE_CHECKING
 from datetime import datetime, timezone
 
 from supabase import create_client, Client
+from postgrest.types import ReturnMethod
 
 from raxy.interfaces.database import (
     IDatabaseRepository,
@@ -17,19 +18,27 @@ from raxy.interfaces.database import (
 )
 from raxy.interfaces.services import ILoggingService
 from raxy.models import Conta
-from raxy.core.exceptions import ValidationException, wrap_exception
+from raxy.core.exceptions import DatabaseException, ValidationException, wrap_exception
 from raxy.core.config import get_config
+from .bulk import BulkConfig, BulkOperationsMixin
+from .consulta import FiltroContas, PaginaContas
+from .sync import TOMBSTONE_COLUMN
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .write_behind import RegistroFarm
 
-class SupabaseDatabaseClient(IDatabaseClient):
+
+class SupabaseDatabaseClient(BulkOperationsMixin, IDatabaseClient):
     """
     Adapter para Supabase.
     
-    Implementa IDatabaseClient delegando para supabase-py.
+    Implementa IDatabaseClient delegando para supabase-py. Operações em
+    massa (``upsert_many``, ``iter_select``) vêm do BulkOperationsMixin.
     """
     
-    def __init__(self, url: str, key: str):
+    def __init__(self, url: str, key: str, bulk: Optional[BulkConfig] = None):
         self._client: Client = create_client(url, key)
+        self.bulk = bulk or BulkConfig()
     
     def upsert(self, table: str, data: Dict[str, Any], on_conflict: str) -> Optional[Dict[str, Any]]:
         try:
@@ -79,6 +88,32 @@ class SupabaseDatabaseClient(IDatabaseClient):
         except Exception:
             return False
 
+    # Primitivas das operações em massa: propagam exceções para a retentativa
+
+    def upsert_rows(self, table: str, rows: Sequence[Dict[str, Any]], on_conflict: str) -> int:
+        # Sem "representation": a resposta não precisa trazer os registros de volta
+        self._client.table(table).upsert(
+            list(rows), on_conflict=on_conflict, returning=ReturnMethod.minimal
+        ).execute()
+        return len(rows)
+
+    def select_page(self, table: str, columns: str, filters: Optional[Dict[str, Any]],
+                    order_by: str, after: Any, limit: int,
+                    greater_than: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        query = self._client.table(table).select(columns)
+        for key, value in (filters or {}).items():
+            query = query.eq(key, value)
+        for key, value in (greater_than or {}).items():
+            query = query.gt(key, value)
+        if after is not None:
+            query = query.gt(order_by, after)
+        response = query.order(order_by).limit(limit).execute()
+        return response.data or []
+
+    def select_in(self, table: str, columns: str, column: str, values: Sequence[Any]) -> List[Dict[str, Any]]:
+        response = self._client.table(table).select(columns).in_(column, list(values)).execute()
+        return response.data or []
+
     def health_check(self) -> bool:
         try:
             self._client.table("contas").select("email").limit(1).execute()
@@ -87,10 +122,24 @@ class SupabaseDatabaseClient(IDatabaseClient):
             return False
 
 
+# Código do Postgres para coluna inexistente (undefined_column)
+_COLUNA_INEXISTENTE = "42703"
+
+
 class SupabaseConfig:
     """Configuração para Supabase."""
     TABLE_CONTAS = "contas"
     
+    @classmethod
+    def bulk_from_config(cls) -> BulkConfig:
+        config = get_config().api
+        return BulkConfig(
+            chunk_size=config.supabase_chunk_size,
+            page_size=config.supabase_page_size,
+            max_workers=config.supabase_max_workers,
+            max_retries=config.supabase_max_retries,
+        )
+    
     @classmethod
     def from_config(cls) -> tuple[str, str]:
         config = get_config().api
@@ -126,10 +175,34 @@ class SupabaseRepository(IDatabaseRepository, IContaRepository):
             
             if url and key:
                 # Use local client class
-                db_client = SupabaseDatabaseClient(url, key)
+                db_client = SupabaseDatabaseClient(url, key, bulk=self.config.bulk_from_config())
                 self._logger.info("Cliente Supabase inicializado com sucesso")
         
         self._db_client = db_client
+        self._tem_tombstones: Optional[bool] = None
+
+    def _usa_tombstones(self) -> bool:
+        """
+        Indica se a tabela tem a coluna de tombstones da sincronização.
+
+        Tabelas nunca preparadas para ``accounts sync`` não têm
+        ``removido_em``; pedir a coluna nelas faz o PostgREST rejeitar a
+        consulta. A verificação é feita uma vez por repositório.
+
+        Raises:
+            DatabaseException: Se a verificação falhar por outro motivo
+        """
+        if self._tem_tombstones is None:
+            try:
+                self._db_client.select_page(
+                    self.config.TABLE_CONTAS, f"email,{TOMBSTONE_COLUMN}", None, "email", None, 1
+                )
+                self._tem_tombstones = True
+            except Exception as e:
+                if getattr(e, "code", None) != _COLUNA_INEXISTENTE:
+                    raise wrap_exception(e, DatabaseException, "Erro ao verificar colunas no Supabase")
+                self._tem_tombstones = False
+        return self._tem_tombstones
 
     # IContaRepository Implementation
 
@@ -149,14 +222,35 @@ class SupabaseRepository(IDatabaseRepository, IContaRepository):
         return conta
 
     def salvar_varias(self, contas: Sequence[Conta]) -> Sequence[Conta]:
+        """Upsert em blocos paralelos (ver BulkOperationsMixin)."""
         data = [c.to_dict() for c in contas]
-        self._db_client.upsert(
-            table=self.config.TABLE_CONTAS,
-            data=data,
-            on_conflict="email"
-        )
+        if isinstance(self._db_client, BulkOperationsMixin):
+            self._db_client.upsert_many(self.config.TABLE_CONTAS, data, on_conflict="email")
+        else:
+            self._db_client.upsert(
+                table=self.config.TABLE_CONTAS,
+                data=data,
+                on_conflict="email"
+            )
         return contas
 
+    def emails_existentes(self, emails: Sequence[str]) -> set:
+        """
+        Emails (entre os informados) que já têm conta cadastrada.
+
+        Raises:
+            DatabaseException: Se a consulta falhar
+        """
+        if not isinstance(self._db_client, BulkOperationsMixin):
+            return {email for email in emails if self.consultar_conta(email)}
+        tombstones = self._usa_tombstones()
+        rows = self._db_client.select_many(
+            self.config.TABLE_CONTAS, "email", emails,
+            columns=f"email,{TOMBSTONE_COLUMN}" if tombstones else "email",
+        )
+        # Tombstones (contas removidas) não contam como cadastradas
+        return {row["email"] for row in rows if not row.get(TOMBSTONE_COLUMN)}
+
     def remover(self, conta: Conta) -> None:
         self._db_client.delete(
             table=self.config.TABLE_CONTAS,
@@ -186,6 +280,36 @@ class SupabaseRepository(IDatabaseRepository, IContaRepository):
             self._logger.erro("Erro ao adicionar registro farm no Supabase", exception=e)
             return None
     
+    def adicionar_registros_farm(self, registros: Sequence["RegistroFarm"]) -> int:
+        """
+        Grava vários resultados de farm num único upsert.
+
+        Args:
+            registros: Resultados enfileirados (ver ``write_behind``)
+
+        Returns:
+            int: Registros enviados
+
+        Raises:
+            DatabaseException: Se o upsert falhar
+        """
+        data = [
+            {"email": r.email, "pontos": r.pontos, "ultima_farm": r.ultima_farm.astimezone(timezone.utc).isoformat()}
+            for r in registros
+        ]
+        if not data:
+            return 0
+        if isinstance(self._db_client, BulkOperationsMixin):
+            return self._db_client.upsert_many(self.config.TABLE_CONTAS, data, on_conflict="email")
+        result = self._db_client.upsert(
+            table=self.config.TABLE_CONTAS,
+            data=data,
+            on_conflict="email"
+        )
+        if result is None:
+            raise DatabaseException("Falha no upsert em lote de farm no Supabase", details={"registros": len(data)})
+        return len(data)
+
     def consultar_conta(self, email: str) -> Optional[Conta]:
         try:
             result = self._db_client.select_one(
@@ -200,11 +324,76 @@ class SupabaseRepository(IDatabaseRepository, IContaRepository):
 
     def listar_contas(self) -> List[Conta]:
         try:
-            results = self._db_client.select(
-                table=self.config.TABLE_CONTAS,
-                columns="*"
-            )
-            return [Conta.from_dict(r) for r in results]
+            return list(self.iterar_contas())
         except Exception as e:
             self._logger.erro("Erro ao listar contas no Supabase", exception=e)
             return []
+
+    def consultar_contas(
+        self,
+        filtros: Optional[FiltroContas] = None,
+        colunas: str = "*",
+        limite: int = 100,
+        cursor: Optional[str] = None,
+    ) -> PaginaContas:
+        """
+        Uma página de contas em ordem de email.
+
+        Apenas filtros de igualdade são enviados ao Supabase.
+
+        Raises:
+            ValidationException: Se houver filtros além de igualdade
+            DatabaseException: Se a consulta falhar
+        """
+        igualdades: Dict[str, Any] = {}
+        for condicao in (filtros.condicoes if filtros else ()):
+            if condicao.operador != "=" or condicao.valor is None:
+                raise ValidationException(
+                    "Consulta no Supabase aceita apenas filtros campo=valor",
+                    details={"filtro": f"{condicao.campo}{condicao.operador}{condicao.valor}"},
+                )
+            igualdades[condicao.campo] = condicao.valor
+        if not isinstance(self._db_client, BulkOperationsMixin):
+            raise ValidationException("Cliente de banco sem suporte a paginação")
+        
+        limite = max(1, limite)
+        projecao = colunas
+        extras: List[str] = []
+        if colunas.strip() != "*":
+            pedidas = [c.strip() for c in colunas.split(",") if c.strip()]
+            obrigatorias = ("email", TOMBSTONE_COLUMN) if self._usa_tombstones() else ("email",)
+            extras = [c for c in obrigatorias if c not in pedidas]
+            projecao = ",".join(pedidas + extras)
+        try:
+            rows = self._db_client.select_page(
+                self.config.TABLE_CONTAS, projecao, igualdades or None, "email", cursor, limite + 1
+            )
+        except Exception as e:
+            raise wrap_exception(e, DatabaseException, "Erro ao consultar contas no Supabase")
+        proximo = rows[limite - 1]["email"] if len(rows) > limite else None
+        # Tombstones da sincronização (contas removidas) não são listados
+        itens = [row for row in rows[:limite] if not row.get(TOMBSTONE_COLUMN)]
+        if TOMBSTONE_COLUMN in extras:
+            for row in itens:
+                row.pop(TOMBSTONE_COLUMN, None)
+        return PaginaContas(itens=itens, proximo_cursor=proximo)
+
+    def iterar_contas(self, colunas: str = "*") -> Iterator[Conta]:
+        """
+        Itera as contas página a página (sem carregar a tabela inteira).
+
+        Args:
+            colunas: Projeção, ex.: ``"email,pontos"`` (padrão: todas)
+
+        Yields:
+            Conta: Conta lida
+        """
+        if isinstance(self._db_client, BulkOperationsMixin):
+            rows = self._db_client.iter_select(self.config.TABLE_CONTAS, columns=colunas, order_by="email")
+        else:
+            rows = self._db_client.select(table=self.config.TABLE_CONTAS, columns=colunas)
+        for row in rows:
+            # Tombstones da sincronização (contas removidas) não são listados
+            if row.get(TOMBSTONE_COLUMN):
+                continue
+            yield Conta.from_dict(row)
@@ -0,0 +1,299 @@
+"""
+Sincronização incremental de contas entre SQLite (local) e Supabase (remoto).
+
+Em vez de listar tudo de um lado e regravar tudo do outro, cada lado
+informa só o que mudou:
+
+- local: triggers mantêm ``updated_at``/``versao`` e registram cada
+  alteração (inclusive remoções) em ``contas_alteracoes``; o envio lê o log
+  a partir do último ``seq`` enviado. O log só é ligado na primeira
+  sincronização, que trata todas as contas locais como alteradas;
+- remoto: a leitura pede apenas linhas com ``updated_at`` maior que a
+  marca d'água da última sincronização, paginando por email.
+  Remoções viajam como tombstones (``removido_em`` preenchido).
+  O envio não manda ``updated_at``/``versao``: o servidor carimba cada
+  linha (trigger ``contas_touch``) e o carimbo devolvido é gravado
+  localmente. Assim um cliente com relógio atrasado não envia linhas
+  abaixo da marca d'água de outro cliente.
+
+O progresso é gravado em ``sync_estado`` a cada página/lote, então uma
+sincronização interrompida continua de onde parou.
+
+Esquema esperado na tabela remota, além das colunas da conta::
+
+    alter table contas add column if not exists updated_at timestamptz default now();
+    alter table contas add column if not exists versao integer default 0;
+    alter table contas add column if not exists removido_em timestamptz;
+
+O trigger ``contas_touch`` está em ``docs/usage.md``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional
+
+from raxy.core.exceptions import ValidationException
+from raxy.core.logging import get_logger
+from .bulk import BulkOperationsMixin, em_blocos
+from .sqlite import SQLiteRepository
+
+# Colunas trocadas entre os lados (dados locais como meta_diaria/status não viajam)
+SYNC_COLUMNS = (
+    "email", "senha", "id_perfil", "proxy", "email_backup", "senha_email_backup",
+    "pontos", "ultima_farm", "updated_at", "versao",
+)
+TOMBSTONE_COLUMN = "removido_em"
+# Atribuídas pelo servidor a cada escrita; não vão no envio
+SERVER_COLUMNS = ("updated_at", "versao")
+
+# Regras de conflito quando os dois lados alteraram a mesma conta
+CONFLITO_RECENTE = "recente"  # vence o updated_at mais novo
+CONFLITO_LOCAL = "local"      # alterações locais pendentes prevalecem
+CONFLITO_REMOTO = "remoto"    # o remoto sempre prevalece
+POLITICAS_CONFLITO = (CONFLITO_RECENTE, CONFLITO_LOCAL, CONFLITO_REMOTO)
+
+# Chaves em sync_estado
+_PULL_MARCA = "pull_marca"
+_PULL_CURSOR = "pull_cursor"
+_PULL_MAXIMO = "pull_maximo"
+_PUSH_SEQ = "push_seq"
+
+
+def _parse_ts(valor: Any) -> Optional[datetime]:
+    """Converte timestamps do SQLite (``...Z``) e do PostgREST (``+00:00``) para datetime UTC."""
+    if not valor:
+        return None
+    if isinstance(valor, datetime):
+        dt = valor
+    else:
+        dt = datetime.fromisoformat(str(valor).replace("Z", "+00:00"))
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def _formatar_ts(dt: datetime) -> str:
+    """Formato de updated_at vindo do remoto (UTC, microssegundos, como o timestamptz)."""
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+@dataclass
+class ResultadoSync:
+    """Totais de uma sincronização."""
+    recebidas: int = 0
+    removidas_local: int = 0
+    enviadas: int = 0
+    removidas_remoto: int = 0
+    conflitos: int = 0
+    ignoradas: int = 0
+
+
+class SincronizadorContas:
+    """
+    Sincronização incremental e retomável entre o SQLite e um cliente remoto.
+
+    O cliente remoto é qualquer ``IDatabaseClient`` com operações em massa
+    (``SupabaseDatabaseClient`` ou ``MockDatabaseClient``).
+
+    Example:
+        >>> sync = SincronizadorContas(SQLiteRepository(), SupabaseRepository()._db_client)
+        >>> resultado = sync.sincronizar()
+        >>> resultado.enviadas, resultado.recebidas
+    """
+
+    def __init__(
+        self,
+        local: SQLiteRepository,
+        remoto: BulkOperationsMixin,
+        *,
+        tabela: str = "contas",
+        politica: str = CONFLITO_RECENTE,
+        lote: int = 500,
+        logger=None,
+    ):
+        """
+        Inicializa o sincronizador.
+
+        Args:
+            local: Repositório SQLite
+            remoto: Cliente remoto com operações em massa
+            tabela: Tabela remota
+            politica: Regra de conflito (recente, local ou remoto)
+            lote: Registros por página/lote (e por checkpoint)
+            logger: Serviço de log
+
+        Raises:
+            ValidationException: Se a política for desconhecida
+        """
+        if politica not in POLITICAS_CONFLITO:
+            raise ValidationException(
+                f"Política de conflito inválida: {politica}",
+                details={"validas": list(POLITICAS_CONFLITO)},
+            )
+        self.local = local
+        self.remoto = remoto
+        self.tabela = tabela
+        self.politica = politica
+        self.lote = max(1, lote)
+        self.logger = logger or get_logger()
+
+    def sincronizar(self, direcao: str = "ambas") -> ResultadoSync:
+        """
+        Executa a sincronização.
+
+        Recebe antes de enviar: conflitos são resolvidos localmente e o
+        envio só carrega o resultado.
+
+        Args:
+            direcao: ``ambas``, ``receber`` ou ``enviar``
+
+        Returns:
+            ResultadoSync: Totais da execução
+        """
+        resultado = ResultadoSync()
+        if direcao in ("ambas", "receber"):
+            self.receber(resultado)
+        if direcao in ("ambas", "enviar"):
+            self.enviar(resultado)
+        return resultado
+
+    # ========== Remoto -> local ==========
+
+    def receber(self, resultado: Optional[ResultadoSync] = None) -> ResultadoSync:
+        """Aplica localmente as linhas remotas alteradas desde a marca d'água."""
+        resultado = resultado or ResultadoSync()
+        self.local.ativar_log_alteracoes()
+        marca = self.local.ler_estado_sync(_PULL_MARCA)
+        # Passada interrompida: continua do último email aplicado
+        cursor = self.local.ler_estado_sync(_PULL_CURSOR)
+        maximo = self.local.ler_estado_sync(_PULL_MAXIMO) or marca
+
+        linhas = self.remoto.iter_select(
+            self.tabela,
+            columns=",".join(SYNC_COLUMNS + (TOMBSTONE_COLUMN,)),
+            order_by="email",
+            page_size=self.lote,
+            greater_than={"updated_at": marca} if marca else None,
+            after=cursor,
+        )
+        for pagina in em_blocos(linhas, self.lote):
+            self._aplicar_pagina(pagina, resultado)
+            maior = max((_parse_ts(r.get("updated_at")) for r in pagina if r.get("updated_at")), default=None)
+            if maior and (not maximo or maior > _parse_ts(maximo)):
+                maximo = _formatar_ts(maior)
+            self.local.gravar_estado_sync({_PULL_CURSOR: pagina[-1]["email"], _PULL_MAXIMO: maximo})
+
+        # Passada completa: a marca avança e o cursor é descartado
+        self.local.gravar_estado_sync({_PULL_MARCA: maximo, _PULL_CURSOR: None, _PULL_MAXIMO: None})
+        return resultado
+
+    def _aplicar_pagina(self, pagina: List[Mapping[str, Any]], resultado: ResultadoSync) -> None:
+        emails = [r["email"] for r in pagina]
+        atuais = self.local.contas_por_email(emails, ("email", "updated_at"))
+        pendentes = set()
+        if self.politica != CONFLITO_REMOTO:
+            seq = int(self.local.ler_estado_sync(_PUSH_SEQ) or 0)
+            pendentes = self.local.emails_alterados_desde(seq) & set(emails)
+
+        upserts: List[Dict[str, Any]] = []
+        remocoes: List[str] = []
+        for row in pagina:
+            email = row["email"]
+            local = atuais.get(email)
+            remoto_ts = _parse_ts(row.get("updated_at"))
+            local_ts = _parse_ts(local.get("updated_at")) if local else None
+            conflito = email in pendentes
+
+            if local_ts and remoto_ts and local_ts == remoto_ts:
+                resultado.ignoradas += 1  # já aplicada (eco de um envio anterior)
+                continue
+            if conflito:
+                resultado.conflitos += 1
+                if self.politica == CONFLITO_LOCAL:
+                    continue
+            if self.politica != CONFLITO_REMOTO and local_ts and (not remoto_ts or local_ts > remoto_ts):
+                # Local mais novo: mantém (se pendente, segue no próximo envio)
+                if not conflito:
+                    resultado.ignoradas += 1
+                continue
+
+            if row.get(TOMBSTONE_COLUMN):
+                if local:
+                    remocoes.append(email)
+                continue
+            dados = {c: row.get(c) for c in SYNC_COLUMNS}
+            dados["updated_at"] = _formatar_ts(remoto_ts or datetime.now(timezone.utc))
+            dados["senha"] = dados["senha"] or ""
+            upserts.append(dados)
+
+        if upserts or remocoes:
+            self.local.aplicar_remotas(upserts, remocoes)
+        resultado.recebidas += len(upserts)
+        resultado.removidas_local += len(remocoes)
+
+    # ========== Local -> remoto ==========
+
+    def enviar(self, resultado: Optional[ResultadoSync] = None) -> ResultadoSync:
+        """Envia ao remoto as alterações do log local ainda não enviadas."""
+        resultado = resultado or ResultadoSync()
+        self.local.ativar_log_alteracoes()
+        seq = int(self.local.ler_estado_sync(_PUSH_SEQ) or 0)
+        while True:
+            alteracoes = self.local.alteracoes_desde(seq, self.lote)
+            if not alteracoes:
+                break
+            # Vale a última operação de cada conta no lote
+            ultima: Dict[str, str] = {}
+            for item in alteracoes:
+                ultima[item["email"]] = item["operacao"]
+            atuais = self.local.contas_por_email(list(ultima), SYNC_COLUMNS)
+
+            upserts = [atuais[email] for email in ultima if email in atuais]
+            # Upsert seguido de remoção no mesmo lote: a linha já não existe, vira tombstone
+            removidas = [email for email in ultima if email not in atuais]
+            agora = _formatar_ts(datetime.now(timezone.utc))
+            tombstones = [{"email": email, "senha": "", TOMBSTONE_COLUMN: agora} for email in removidas]
+
+            # Lotes separados: o upsert em massa exige as mesmas colunas em todas as linhas
+            if upserts:
+                linhas = [
+                    {**{c: v for c, v in r.items() if c not in SERVER_COLUMNS}, TOMBSTONE_COLUMN: None}
+                    for r in upserts
+                ]
+                self.remoto.upsert_many(self.tabela, linhas, "email")
+                self._gravar_carimbos(upserts)
+            if tombstones:
+                self.remoto.upsert_many(self.tabela, tombstones, "email")
+
+            seq = alteracoes[-1]["seq"]
+            self.local.gravar_estado_sync({_PUSH_SEQ: str(seq)})
+            self.local.podar_alteracoes(seq)
+            resultado.enviadas += len(upserts)
+            resultado.removidas_remoto += len(tombstones)
+        return resultado
+
+    def _gravar_carimbos(self, enviadas: List[Mapping[str, Any]]) -> None:
+        """Lê os carimbos que o servidor deu às linhas enviadas e os grava localmente."""
+        carimbos = self.remoto.select_many(
+            self.tabela, "email", [r["email"] for r in enviadas], columns="email,updated_at,versao",
+        )
+        normalizados = [
+            {**row, "updated_at": _formatar_ts(_parse_ts(row["updated_at"]))}
+            for row in carimbos
+            if row.get("updated_at")
+        ]
+        self.local.gravar_carimbos(normalizados, {r["email"]: r.get("updated_at") for r in enviadas})
+
+    def pendentes(self) -> int:
+        """Alterações locais ainda não enviadas."""
+        seq = int(self.local.ler_estado_sync(_PUSH_SEQ) or 0)
+        return len(self.local.emails_alterados_desde(seq))
+
+
+__all__ = [
+    "SincronizadorContas",
+    "ResultadoSync",
+    "SYNC_COLUMNS",
+    "SERVER_COLUMNS",
+    "POLITICAS_CONFLITO",
+]
@@ -0,0 +1,255 @@
+"""
+Persistência em lote (write-behind) dos resultados de farm.
+
+Gravar cada resultado na hora custa uma transação com commit (SQLite) ou um
+upsert pela rede (Supabase) por conta, dentro do worker. O
+:class:`WriteBehindFarmRepository` envolve um ``IDatabaseRepository``:
+os workers apenas enfileiram o resultado e uma thread única grava os
+pendentes num único lote quando a fila atinge ``max_lote`` ou quando passa
+``intervalo_flush`` desde o primeiro pendente.
+
+Resultados da mesma conta ainda não gravados são agrupados (vale o último).
+Leituras pelo wrapper já enxergam os pendentes. No encerramento (``close``
+ou ``atexit``) tudo que restou é gravado.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from raxy.interfaces.database import IDatabaseRepository
+from raxy.core.logging import get_logger
+
+
+@dataclass(frozen=True)
+class RegistroFarm:
+    """Resultado de farm aguardando gravação."""
+    email: str
+    pontos: int
+    ultima_farm: datetime
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte para dicionário (formato do registro no banco)."""
+        return {"email": self.email, "pontos": self.pontos, "ultima_farm": self.ultima_farm.isoformat()}
+
+
+@dataclass
+class WriteBehindStats:
+    """Contadores da fila de gravação."""
+    enfileirados: int = 0
+    agrupados: int = 0
+    gravados: int = 0
+    lotes: int = 0
+    falhas: int = 0
+    tempo_gravacao_s: float = 0.0
+
+    @property
+    def media_lote(self) -> float:
+        """Registros gravados por lote, em média."""
+        return self.gravados / self.lotes if self.lotes else 0.0
+
+
+def gravar_registros(repo: IDatabaseRepository, registros: Sequence[RegistroFarm]) -> int:
+    """
+    Grava registros no repositório, em lote quando ele oferece suporte.
+
+    Repositórios com ``adicionar_registros_farm`` gravam tudo numa única
+    transação/requisição; os demais recebem uma chamada por registro.
+
+    Returns:
+        int: Registros gravados
+    """
+    em_lote = getattr(repo, "adicionar_registros_farm", None)
+    if em_lote is not None:
+        return em_lote(registros)
+    gravados = 0
+    for registro in registros:
+        if repo.adicionar_registro_farm(registro.email, registro.pontos) is not None:
+            gravados += 1
+    return gravados
+
+
+class WriteBehindFarmRepository(IDatabaseRepository):
+    """
+    Fila de gravação em lote na frente de um ``IDatabaseRepository``.
+
+    Example:
+        >>> repo = WriteBehindFarmRepository(SQLiteRepository("raxy.db"), max_lote=100)
+        >>> repo.adicionar_registro_farm("a@b.com", 1500)  # retorna em microssegundos
+        >>> repo.flush()  # grava os pendentes agora
+    """
+
+    def __init__(
+        self,
+        repositorio: IDatabaseRepository,
+        *,
+        max_lote: int = 50,
+        intervalo_flush: float = 1.0,
+        ler_apos_gravar: bool = False,
+        logger=None,
+    ):
+        """
+        Inicializa a fila.
+
+        Args:
+            repositorio: Repositório que recebe as gravações
+            max_lote: Pendentes que disparam um lote imediatamente
+            intervalo_flush: Espera máxima (segundos) de um pendente antes do lote
+            ler_apos_gravar: Se ``adicionar_registro_farm`` deve gravar e reler o registro (síncrono)
+            logger: Serviço de log
+        """
+        self.repositorio = repositorio
+        self.max_lote = max(1, max_lote)
+        self.intervalo_flush = max(0.0, intervalo_flush)
+        self.ler_apos_gravar = ler_apos_gravar
+        self.logger = logger or get_logger()
+        self.stats = WriteBehindStats()
+
+        self._pendentes: Dict[str, RegistroFarm] = {}
+        self._primeiro_pendente: Optional[float] = None
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._fechado = False
+        self._flusher = threading.Thread(target=self._loop_flusher, name="raxy-farm-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    # ========== Escrita ==========
+
+    def adicionar_registro_farm(self, email: str, pontos: int) -> Mapping[str, Any] | None:
+        """
+        Enfileira o resultado de farm da conta.
+
+        Returns:
+            O registro enfileirado (ou o registro relido do banco, com ``ler_apos_gravar``)
+        """
+        registro = RegistroFarm(email=email, pontos=pontos, ultima_farm=datetime.now(timezone.utc))
+        if self._fechado:
+            # Após o encerramento não há flusher: grava direto
+            gravar_registros(self.repositorio, [registro])
+            return self.repositorio.consultar_conta(email) if self.ler_apos_gravar else registro.to_dict()
+
+        with self._cond:
+            if email in self._pendentes:
+                self.stats.agrupados += 1
+            self._pendentes[email] = registro
+            self.stats.enfileirados += 1
+            if self._primeiro_pendente is None:
+                # Primeiro pendente: o flusher passa a contar o intervalo
+                self._primeiro_pendente = time.monotonic()
+                self._cond.notify()
+            elif len(self._pendentes) >= self.max_lote:
+                self._cond.notify()
+
+        if self.ler_apos_gravar:
+            self.flush()
+            return self.repositorio.consultar_conta(email)
+        return registro.to_dict()
+
+    def flush(self) -> int:
+        """
+        Grava imediatamente todos os pendentes.
+
+        Returns:
+            int: Registros gravados
+        """
+        with self._io_lock:
+            with self._cond:
+                lote = list(self._pendentes.values())
+                self._pendentes.clear()
+                self._primeiro_pendente = None
+            if not lote:
+                return 0
+
+            inicio = time.perf_counter()
+            try:
+                gravados = gravar_registros(self.repositorio, lote)
+            except Exception:
+                self.stats.falhas += 1
+                # Devolve à fila o que não foi substituído por um resultado mais novo
+                with self._cond:
+                    for registro in lote:
+                        self._pendentes.setdefault(registro.email, registro)
+                    if self._primeiro_pendente is None:
+                        self._primeiro_pendente = time.monotonic()
+                raise
+
+            self.stats.lotes += 1
+            self.stats.gravados += gravados
+            self.stats.tempo_gravacao_s += time.perf_counter() - inicio
+            return gravados
+
+    @property
+    def pendentes(self) -> int:
+        """Registros aguardando gravação."""
+        with self._cond:
+            return len(self._pendentes)
+
+    # ========== Leitura ==========
+
+    def consultar_conta(self, email: str) -> Mapping[str, Any] | None:
+        """Consulta a conta, com os pontos pendentes sobrepostos ao registro do banco."""
+        with self._cond:
+            pendente = self._pendentes.get(email)
+        dados = self.repositorio.consultar_conta(email)
+        if pendente is None or dados is None:
+            return dados
+        if hasattr(dados, "to_dict"):
+            dados = dados.to_dict()
+        return {**dados, "pontos": pendente.pontos, "ultima_farm": pendente.ultima_farm.isoformat()}
+
+    def listar_contas(self) -> Sequence[Mapping[str, Any]]:
+        """Grava os pendentes e lista as contas do repositório."""
+        self.flush()
+        return self.repositorio.listar_contas()
+
+    def __getattr__(self, nome: str) -> Any:
+        # Demais operações (salvar, listar, remover...) vão direto ao repositório
+        if nome == "repositorio":
+            raise AttributeError(nome)
+        return getattr(self.repositorio, nome)
+
+    # ========== Flusher ==========
+
+    def _loop_flusher(self) -> None:
+        while True:
+            with self._cond:
+                while not self._fechado:
+                    if len(self._pendentes) >= self.max_lote:
+                        break
+                    if self._primeiro_pendente is not None:
+                        restante = self._primeiro_pendente + self.intervalo_flush - time.monotonic()
+                        if restante <= 0:
+                            break
+                        self._cond.wait(restante)
+                    else:
+                        self._cond.wait()
+                if self._fechado:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.erro(f"Falha ao gravar lote de resultados de farm: {e}", exception=e)
+                # Evita laço quente enquanto o banco estiver indisponível
+                time.sleep(max(self.intervalo_flush, 0.5))
+
+    def close(self) -> None:
+        """Grava os pendentes e encerra o flusher."""
+        if self._fechado:
+            return
+        with self._cond:
+            self._fechado = True
+            self._cond.notify_all()
+        self._flusher.join(timeout=5.0)
+        try:
+            self.flush()
+        except Exception as e:
+            self.logger.erro(f"Resultados de farm não gravados no encerramento: {e}", exception=e)
+
+
+__all__ = ["WriteBehindFarmRepository", "WriteBehindStats", "RegistroFarm", "gravar_registros"]
@@ -24,6 +24,7 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 from raxy.interfaces.services import IProxyService
 from raxy.core.logging import debug_log, get_logger
+from raxy.core.metrics import get_metrics
 from raxy.interfaces.services.IProxyComponents import IProxyProcessManager, IProxyNetworkManager
 from raxy.models.proxy import Outbound, BridgeRuntime, ProxyItem, ProxyTestResult
 from .parser import parse_uri_to_outbound
@@ -38,6 +39,10 @@ from .storage import (
 
 __all__ = ["Proxy"]
 
+# Histograma (segundos) e contador (status ok/erro) dos testes de proxy
+PROXY_TEST_METRIC = "proxy.teste.duracao"
+PROXY_TEST_COUNT_METRIC = "proxy.teste.total"
+
 # Configuração de logging
 logger = get_logger()
 
@@ -349,8 +354,12 @@ class Proxy(IProxyService):
                     pass
                 entry.result.status = "TESTANDO"
 
+                inicio_teste = time.perf_counter()
                 result = self.network.test_outbound(raw, outbound, timeout=functional_timeout)
                 finished_at = time.time()
+                metrics = get_metrics()
+                metrics.observe(PROXY_TEST_METRIC, time.perf_counter() - inicio_teste)
+                metrics.inc(PROXY_TEST_COUNT_METRIC, status="ok" if result.get("functional") else "erro")
                 
                 # Update ProxyItem fields
                 entry.host = result.get("host") or entry.host
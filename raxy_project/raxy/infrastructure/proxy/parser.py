@@ -2,11 +2,11 @@
 from __future__ import annotations
 
 import base64
-import json
 import re
 from typing import Any, Dict, Optional
 from urllib.parse import parse_qs, unquote, urlparse, urlsplit
 
+from raxy.core import json_codec
 from raxy.models.proxy import Outbound
 
 
@@ -92,8 +92,8 @@ def parse_ss(uri: str) -> Outbound:
         text_preview = decoded_preview.strip()
         if text_preview.startswith('{') and text_preview.endswith('}'):
             try:
-                data_json = json.loads(text_preview)
-            except json.JSONDecodeError:
+                data_json = json_codec.loads(text_preview)
+            except json_codec.JSONDecodeError:
                 pass
             else:
                 if {
@@ -169,8 +169,8 @@ def parse_vmess(uri: str) -> Outbound:
     except Exception as exc:
         raise ValueError(f"Erro ao decodificar vmess://: {exc}") from exc
     try:
-        data = json.loads(decoded)
-    except json.JSONDecodeError as exc:
+        data = json_codec.loads(decoded)
+    except json_codec.JSONDecodeError as exc:
         raise ValueError(f"JSON inválido em vmess://: {exc}") from exc
     return vmess_outbound_from_dict(data)
 
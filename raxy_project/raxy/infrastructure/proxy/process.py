@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import json
 import os
 import shutil
 import socket
@@ -16,9 +15,14 @@ from typing import Any, Dict, Optional, Tuple, Generator, ContextManager
 
 from raxy.interfaces.services.IProxyComponents import IProxyProcessManager
 from raxy.models.proxy import Outbound
+from raxy.core import json_codec
 from raxy.core.logging import log
+from raxy.core.metrics import get_metrics
 from .parser import decode_bytes
 
+# Histograma (segundos) da criação de pontes Xray, rótulo status ok/erro
+BRIDGE_LAUNCH_METRIC = "proxy.ponte.inicio"
+
 
 class ProcessManager(IProxyProcessManager):
     def __init__(self) -> None:
@@ -141,16 +145,22 @@ class ProcessManager(IProxyProcessManager):
         self, xray_bin: str, cfg: Dict[str, Any], name: str
     ) -> Tuple[subprocess.Popen, Path]:
         """Inicializa o Xray com captura de stdout/stderr para melhor diagnóstico."""
-        tmpdir = Path(tempfile.mkdtemp(prefix=f"xray_{name}_"))
-        cfg_path = tmpdir / "config.json"
-        cfg_path.write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
-
-        proc = subprocess.Popen(
-            [xray_bin, "-config", str(cfg_path)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        return proc, cfg_path
+        inicio = time.perf_counter()
+        status = "erro"
+        try:
+            tmpdir = Path(tempfile.mkdtemp(prefix=f"xray_{name}_"))
+            cfg_path = tmpdir / "config.json"
+            json_codec.dump_file(cfg_path, cfg, indent=True)
+
+            proc = subprocess.Popen(
+                [xray_bin, "-config", str(cfg_path)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            status = "ok"
+            return proc, cfg_path
+        finally:
+            get_metrics().observe(BRIDGE_LAUNCH_METRIC, time.perf_counter() - inicio, status=status)
 
     @contextmanager
     def temporary_bridge(
@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import json
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from raxy.core import json_codec
 from raxy.models.proxy import Outbound, ProxyItem, ProxyTestResult
 
 DEFAULT_CACHE_FILENAME: str = "proxy_cache.json"
@@ -103,13 +103,13 @@ def apply_cached_entry(entry: ProxyItem, cached_result: ProxyTestResult) -> Prox
 def load_cache(cache_path: Path) -> Dict[str, ProxyTestResult]:
     """Carrega resultados persistidos anteriormente para acelerar novos testes."""
     try:
-        raw_cache = cache_path.read_text(encoding="utf-8")
+        raw_cache = cache_path.read_bytes()
     except (FileNotFoundError, OSError):
         return {}
 
     try:
-        data = json.loads(raw_cache)
-    except json.JSONDecodeError:
+        data = json_codec.loads(raw_cache)
+    except json_codec.JSONDecodeError:
         return {}
 
     if not isinstance(data, dict):
@@ -162,9 +162,6 @@ def save_cache(cache_path: Path, entries: List[ProxyItem]) -> None:
     }
 
     try:
-        cache_path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        json_codec.dump_file(cache_path, payload, indent=True)
     except OSError:
         pass
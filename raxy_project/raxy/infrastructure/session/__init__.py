@@ -12,11 +12,13 @@ from raxy.infrastructure.session.session_utils import (
     is_valid_email
 )
 from raxy.infrastructure.session.profile_manager import ProfileManager
+from raxy.infrastructure.session.profile_store import ProfileStore
 from raxy.infrastructure.session.browser_login_handler import BrowserLoginHandler
 from raxy.infrastructure.session.request_executor import RequestExecutor
 
 __all__ = [
     "ProfileManager", 
+    "ProfileStore",
     "BrowserLoginHandler",
     "RequestExecutor",
     "extract_request_verification_token",
@@ -5,6 +5,7 @@ Responsável por todo o fluxo de login no Microsoft Rewards.
 """
 
 from __future__ import annotations
+import re
 from typing import Any, Mapping, Optional
 from botasaurus.browser import Driver, Wait, browser
 from botasaurus.lang import Lang
@@ -13,6 +14,7 @@ from botasaurus.soupify import soupify
 from raxy.interfaces.webdrivers import IBrowserDriver
 from raxy.infrastructure.webdrivers import BotasaurusDriver
 from raxy.infrastructure.webdrivers.network_inspector import NetWork
+from raxy.infrastructure.webdrivers.resource_blocker import ResourceBlocker
 from raxy.infrastructure.session.session_utils import (
     extract_request_verification_token,
     normalize_credentials,
@@ -25,11 +27,18 @@ from raxy.core.exceptions import (
     LoginException,
     wrap_exception
 )
+from raxy.core.html_scan import HTMLFieldScanner
 from raxy.core.logging import get_logger, debug_log
 from raxy.core.config import get_config
 
 log = get_logger()
 
+# market: "br" dentro do <script id="portal-telemetry">, sem montar a árvore da página
+_MARKET_SCANNER = HTMLFieldScanner(
+    {"market": r'<script\b[^>]*\bid=["\']portal-telemetry["\'][^>]*>(?:(?!</script>).)*?market:\s*"(\w+)"'},
+    flags=re.DOTALL | re.IGNORECASE,
+)
+
 
 class BrowserLoginHandler:
     """
@@ -63,7 +72,7 @@ class BrowserLoginHandler:
             data: Dados adicionais (proxy_id, etc)
             
         Returns:
-            Dicionário com cookies, user-agent, token e driver
+            Dicionário com cookies, user-agent, token, driver e economia_recursos
             
         Raises:
             ProxyRotationRequiredException: Se rotação de proxy for necessária
@@ -83,25 +92,39 @@ class BrowserLoginHandler:
         
         registro.debug("Iniciando login no Rewards", proxy_id=proxy_id)
         
-        # Ativa modo humano e navega para Rewards
+        # Bloqueia imagens/fontes/mídia antes da primeira navegação
         session_cfg = get_config().session
+        adaptador = BotasaurusDriver(driver)
+        bloqueador = ResourceBlocker(session_cfg.resource_blocking)
+        if bloqueador.aplicar(adaptador):
+            registro.debug("Bloqueio de recursos ativo", tipos=bloqueador.tipos_bloqueados)
+        
+        # Ativa modo humano e navega para Rewards
         driver.enable_human_mode()
         driver.google_get(session_cfg.rewards_url)
         driver.short_random_sleep()
         
         # Verifica se já está logado
         if driver.run_js("return document.title").lower() == session_cfg.rewards_title:
-            return BrowserLoginHandler._processar_login_existente(driver, registro)
+            resultado = BrowserLoginHandler._processar_login_existente(driver, registro)
+        else:
+            # Executa fluxo de login
+            resultado = BrowserLoginHandler._executar_fluxo_login(driver, registro, proxy_id)
         
-        # Executa fluxo de login
-        return BrowserLoginHandler._executar_fluxo_login(driver, registro, proxy_id)
+        bloqueador.medir_pagina(adaptador)
+        resultado["economia_recursos"] = bloqueador.economia()
+        return resultado
     
     @staticmethod
-    def _extrair_market_do_rewards(html_soup) -> str:
+    def _extrair_market_do_rewards(html: Any) -> Optional[str]:
         """Extrai market da página Rewards via scraping do script portal-telemetry."""
         try:
-            import re
-            # Busca script específico pelo id
+            if isinstance(html, str):
+                market = _MARKET_SCANNER.scan(html).get("market")
+                if market:
+                    return market.lower()
+            # Fallback: busca script específico pelo id
+            html_soup = soupify(html)
             script = html_soup.find("script", {"id": "portal-telemetry"})
             if script and script.string:
                 # Regex para extrair: market: "br",
@@ -125,7 +148,7 @@ class BrowserLoginHandler:
             Dicionário com dados da sessão
         """
         registro.sucesso("Conta já autenticada")
-        html = soupify(driver)
+        html = driver.page_html
         
         # Valida market (país) detectado pelo Rewards
         expected_country = get_config().proxy.country.lower()
@@ -349,7 +372,7 @@ class BrowserLoginHandler:
         Returns:
             Dicionário com dados da sessão
         """
-        html = soupify(driver)
+        html = driver.page_html
         
         # Valida market (país) detectado pelo Rewards
         expected_country = get_config().proxy.country.lower()
@@ -8,7 +8,6 @@ from __future__ import annotations
 from typing import Optional, Any, Dict
 import time
 from random_user_agent.user_agent import UserAgent
-from botasaurus.profiles import Profiles
 
 from raxy.models.accounts import Conta
 from raxy.core.config import get_config
@@ -16,6 +15,7 @@ from raxy.core.exceptions import ProfileException, wrap_exception
 from raxy.core.logging import debug_log
 from raxy.interfaces.services import IMailTmService, ILoggingService
 from raxy.services.base_service import BaseService
+from .profile_store import ProfileStore
 
 
 class ProfileManager(BaseService):
@@ -34,6 +34,7 @@ class ProfileManager(BaseService):
         conta: Conta,
         mail_service: Optional[IMailTmService] = None,
         logger: Optional[ILoggingService] = None,
+        store: Optional[ProfileStore] = None,
     ):
         """
         Inicializa o gerenciador de perfis.
@@ -42,10 +43,12 @@ class ProfileManager(BaseService):
             conta: Conta associada ao perfil
             mail_service: Serviço de email temporário (opcional)
             logger: Serviço de logging (opcional)
+            store: Índice de perfis (padrão: ProfileStore global)
         """
         super().__init__(logger)
         self.conta = conta
         self._mail_service = mail_service
+        self._store = store
         
         # Provedor de User-Agent
         session_config = get_config().session
@@ -55,6 +58,13 @@ class ProfileManager(BaseService):
             operating_systems=session_config.get_sistemas_enums(),
         )
     
+    @property
+    def store(self) -> ProfileStore:
+        """Índice de perfis (carregado uma vez por processo)."""
+        if self._store is None:
+            self._store = ProfileStore.instance()
+        return self._store
+    
     @debug_log(log_args=True, log_result=False, log_duration=True)
     def garantir_perfil(self, perfil: str) -> list[str]:
         """
@@ -76,7 +86,7 @@ class ProfileManager(BaseService):
             )
         
         try:
-            perfil_data = Profiles.get_profile(perfil)
+            store = self.store
         except Exception as e:
             raise wrap_exception(
                 e, ProfileException, 
@@ -85,15 +95,24 @@ class ProfileManager(BaseService):
                 conta=self.conta.email
             )
         
-        if not perfil_data:
-            agente = self._criar_novo_perfil(perfil)
-        else:
-            agente = self._obter_ou_regenerar_ua(perfil, perfil_data)
+        with store.lock(perfil):
+            perfil_data = store.get(perfil)
+            if not perfil_data:
+                agente, ticket = self._criar_novo_perfil(perfil)
+            else:
+                agente, ticket = self._obter_ou_regenerar_ua(perfil, perfil_data)
+        
+        # O navegador lê o profiles.json ao iniciar: garante que a escrita chegou ao disco
+        if ticket is not None and not store.aguardar_persistencia(ticket):
+            raise ProfileException(
+                "Tempo esgotado ao persistir perfil",
+                details={"perfil": perfil, "conta": self.conta.email}
+            )
         
         # Retorna o argumento User-Agent no formato esperado pelo Botasaurus
         return [f"--user-agent={agente}"]
     
-    def _criar_novo_perfil(self, perfil: str) -> str:
+    def _criar_novo_perfil(self, perfil: str) -> tuple[str, int]:
         """
         Cria um novo perfil com User-Agent e credenciais.
         
@@ -101,7 +120,7 @@ class ProfileManager(BaseService):
             perfil: Nome do perfil
             
         Returns:
-            User-Agent gerado
+            Tupla (User-Agent gerado, ticket de persistência)
             
         Raises:
             ProfileException: Se houver erro ao criar perfil
@@ -119,8 +138,8 @@ class ProfileManager(BaseService):
             # 1. Gera um novo UA
             novo_ua = self._ua_provider.get_random_user_agent()
             
-            # 2. Persiste os dados no perfil
-            Profiles.set_profile(perfil, {
+            # 2. Persiste os dados no perfil (gravação em lote)
+            ticket = self.store.set(perfil, {
                 "UA": novo_ua, 
                 "email": self.conta.email, 
                 "senha": self.conta.senha,
@@ -128,7 +147,7 @@ class ProfileManager(BaseService):
             
             self.logger.sucesso(f"Novo perfil '{perfil}' criado com UA e credenciais salvas.")
             
-            return novo_ua
+            return novo_ua, ticket
             
         except Exception as e:
             raise wrap_exception(
@@ -138,7 +157,7 @@ class ProfileManager(BaseService):
                 conta=self.conta.email
             )
     
-    def _obter_ou_regenerar_ua(self, perfil: str, perfil_data: dict) -> str:
+    def _obter_ou_regenerar_ua(self, perfil: str, perfil_data: dict) -> tuple[str, Optional[int]]:
         """
         Obtém User-Agent do perfil ou regenera se necessário.
         
@@ -147,17 +166,18 @@ class ProfileManager(BaseService):
             perfil_data: Dados do perfil existente
             
         Returns:
-            User-Agent obtido ou regenerado
+            Tupla (User-Agent, ticket de persistência ou None se nada mudou)
         """
         agente = perfil_data.get("UA")
+        ticket = None
         
         if not agente:
             # Caso extremo: perfil existe mas UA foi perdido, regenera e salva.
             agente = self._ua_provider.get_random_user_agent()
-            Profiles.set_profile(perfil, {**perfil_data, "UA": agente})
+            ticket = self.store.set(perfil, {**perfil_data, "UA": agente})
             self.logger.aviso(f"User-Agent regenerado e salvo para o perfil '{perfil}'.")
         
-        return agente
+        return agente, ticket
     
     def garantir_mobile_ua(self, perfil: str) -> str:
         """
@@ -170,7 +190,7 @@ class ProfileManager(BaseService):
             User-Agent mobile
         """
         try:
-            perfil_data = Profiles.get_profile(perfil)
+            perfil_data = self.store.get(perfil) or {}
         except Exception:
             perfil_data = {}
             
@@ -200,10 +220,11 @@ class ProfileManager(BaseService):
                  # Fallback hardcoded caso lib nao tenha suporte ou falhe
                  ua_mobile = "Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Mobile Safari/537.36"
 
-            # Salva no perfil se existir
+            # Salva no perfil se existir (write-behind, não precisa esperar o disco)
             if perfil_data:
-                perfil_data["UA_MOBILE"] = ua_mobile
-                Profiles.set_profile(perfil, perfil_data)
+                with self.store.lock(perfil):
+                    atual = self.store.get(perfil) or perfil_data
+                    self.store.set(perfil, {**atual, "UA_MOBILE": ua_mobile})
                 self.logger.debug(f"UA Mobile gerado e salvo para '{perfil}': {ua_mobile}")
                 
         return ua_mobile
@@ -219,7 +240,7 @@ class ProfileManager(BaseService):
             Dicionário com dados do perfil
         """
         try:
-            return Profiles.get_profile(perfil) or {}
+            return self.store.get(perfil) or {}
         except Exception as e:
             self.logger.erro(f"Erro ao obter dados do perfil: {e}", perfil=perfil)
             return {}
@@ -0,0 +1,288 @@
+"""
+Índice em memória dos perfis do Botasaurus com persistência em lote.
+
+O ``Profiles`` do Botasaurus relê e regrava o ``profiles.json`` inteiro a cada
+``get_profile``/``set_profile``. Com muitas contas em paralelo isso vira um
+gargalo de I/O e de contenção. O ProfileStore carrega o arquivo uma vez,
+atende leituras da memória e grava alterações em lote (write-behind) por uma
+thread dedicada, de forma atômica (arquivo temporário + ``os.replace``).
+
+Quem precisa que o perfil esteja em disco antes de abrir o navegador (o
+driver lê o ``profiles.json`` ao iniciar) usa :meth:`ProfileStore.aguardar_persistencia`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from raxy.core import json_codec
+from raxy.core.exceptions import ProfileException, wrap_exception
+
+
+def _default_profiles_path() -> Path:
+    """Caminho do profiles.json usado pelo Botasaurus."""
+    from botasaurus_driver.driver_utils import relative_path
+    return Path(relative_path("profiles.json", 0))
+
+
+@dataclass
+class ProfileStoreStats:
+    """Contadores de uso do ProfileStore."""
+    leituras: int = 0
+    escritas: int = 0
+    flushes: int = 0
+    perfis_gravados: int = 0
+    tempo_flush_s: float = 0.0
+
+    @property
+    def media_lote(self) -> float:
+        """Perfis gravados por flush, em média."""
+        return self.perfis_gravados / self.flushes if self.flushes else 0.0
+
+
+class ProfileStore:
+    """
+    Índice de perfis em memória com locks por perfil e flusher em lote.
+
+    Example:
+        >>> store = ProfileStore.instance()
+        >>> with store.lock("perfil"):
+        ...     dados = store.get("perfil") or {}
+        ...     ticket = store.set("perfil", {**dados, "UA": ua})
+        >>> store.aguardar_persistencia(ticket)
+    """
+
+    _instance: Optional["ProfileStore"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path: Optional[Path] = None, *, intervalo_flush: float = 0.05):
+        """
+        Args:
+            path: Caminho do profiles.json (padrão: o do Botasaurus)
+            intervalo_flush: Janela de agrupamento de escritas, em segundos
+        """
+        self.path = Path(path) if path else _default_profiles_path()
+        self.intervalo_flush = intervalo_flush
+        self.stats = ProfileStoreStats()
+
+        self._dados: Dict[str, Dict[str, Any]] = {}
+        self._sujos: Dict[str, int] = {}
+        self._removidos: Dict[str, int] = {}
+        self._dados_lock = threading.Lock()
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+
+        # Gerações: cada escrita recebe um ticket; _persistido é o maior ticket já gravado
+        self._geracao = 0
+        self._persistido = 0
+        self._cond = threading.Condition()
+        self._sinal = threading.Event()
+        self._fechado = False
+        self._io_lock = threading.Lock()
+
+        self._carregar()
+        self._flusher = threading.Thread(target=self._loop_flusher, name="raxy-profile-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def instance(cls) -> "ProfileStore":
+        """Obtém o store global (carrega o arquivo na primeira chamada)."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def flush_instance(cls) -> None:
+        """Grava pendências do store global, se ele já foi criado."""
+        if cls._instance is not None:
+            cls._instance.flush()
+
+    # ========== Leitura ==========
+
+    def _carregar(self) -> None:
+        """Carrega o profiles.json para memória."""
+        try:
+            self._dados = self._ler_disco()
+        except Exception as e:
+            raise wrap_exception(e, ProfileException, "Erro ao carregar perfis", path=str(self.path))
+
+    def _ler_disco(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            dados = json_codec.load_file(self.path)
+        except FileNotFoundError:
+            return {}
+        return dados if isinstance(dados, dict) else {}
+
+    def get(self, perfil: str) -> Optional[Dict[str, Any]]:
+        """Retorna uma cópia dos dados do perfil (ou None)."""
+        with self._dados_lock:
+            self.stats.leituras += 1
+            dados = self._dados.get(perfil)
+            return dict(dados) if dados is not None else None
+
+    def __contains__(self, perfil: str) -> bool:
+        with self._dados_lock:
+            return perfil in self._dados
+
+    def __len__(self) -> int:
+        with self._dados_lock:
+            return len(self._dados)
+
+    # ========== Escrita ==========
+
+    @contextmanager
+    def lock(self, perfil: str) -> Iterator[None]:
+        """Lock exclusivo de um perfil (leitura-modificação-escrita sem corrida)."""
+        with self._locks_guard:
+            lock = self._locks.get(perfil)
+            if lock is None:
+                lock = self._locks[perfil] = threading.RLock()
+        with lock:
+            yield
+
+    def set(self, perfil: str, dados: Dict[str, Any]) -> int:
+        """
+        Atualiza o perfil em memória e agenda a gravação.
+
+        Mantém os mesmos campos de controle do Botasaurus
+        (``profile_id``, ``created_at``, ``updated_at``).
+
+        Returns:
+            int: Ticket para :meth:`aguardar_persistencia`
+        """
+        agora = datetime.now().isoformat()
+        registro = {"profile_id": perfil, **dados}
+        registro.setdefault("created_at", agora)
+        registro["updated_at"] = agora
+
+        with self._dados_lock:
+            self._geracao += 1
+            ticket = self._geracao
+            self._dados[perfil] = registro
+            self._sujos[perfil] = ticket
+            self._removidos.pop(perfil, None)
+            self.stats.escritas += 1
+        self._sinal.set()
+        return ticket
+
+    def remove(self, perfil: str) -> int:
+        """Remove o perfil e agenda a gravação."""
+        with self._dados_lock:
+            self._geracao += 1
+            ticket = self._geracao
+            self._dados.pop(perfil, None)
+            self._sujos.pop(perfil, None)
+            self._removidos[perfil] = ticket
+        self._sinal.set()
+        return ticket
+
+    def aguardar_persistencia(self, ticket: int, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Bloqueia até que a escrita do ticket esteja gravada em disco.
+
+        Returns:
+            bool: True se persistido dentro do timeout
+        """
+        self._sinal.set()
+        with self._cond:
+            return self._cond.wait_for(lambda: self._persistido >= ticket, timeout=timeout)
+
+    def flush(self) -> None:
+        """Grava imediatamente todas as alterações pendentes."""
+        with self._dados_lock:
+            ticket = self._geracao
+        if ticket > self._persistido:
+            self._gravar_lote()
+
+    # ========== Flusher ==========
+
+    def _loop_flusher(self) -> None:
+        while not self._fechado:
+            self._sinal.wait()
+            if self._fechado:
+                break
+            # Janela curta para agrupar escritas concorrentes no mesmo lote
+            time.sleep(self.intervalo_flush)
+            self._sinal.clear()
+            try:
+                self._gravar_lote()
+            except Exception:
+                # Mantém os itens sujos para a próxima tentativa
+                time.sleep(self.intervalo_flush)
+                self._sinal.set()
+
+    def _gravar_lote(self) -> None:
+        """Mescla as alterações pendentes com o arquivo em disco e grava atomicamente."""
+        with self._io_lock:
+            with self._dados_lock:
+                sujos = {perfil: dict(self._dados[perfil]) for perfil in self._sujos if perfil in self._dados}
+                removidos = list(self._removidos)
+                ticket = self._geracao
+                self._sujos.clear()
+                self._removidos.clear()
+
+            if sujos or removidos:
+                inicio = time.perf_counter()
+                # Relê o disco para não sobrescrever perfis alterados fora do store
+                try:
+                    em_disco = self._ler_disco()
+                    em_disco.update(sujos)
+                    for perfil in removidos:
+                        em_disco.pop(perfil, None)
+                    self._escrever_atomico(em_disco)
+                except Exception:
+                    # Devolve ao lote seguinte o que não foi sobrescrito nesse meio tempo
+                    with self._dados_lock:
+                        for perfil in sujos:
+                            self._sujos.setdefault(perfil, ticket)
+                        for perfil in removidos:
+                            if perfil not in self._dados:
+                                self._removidos.setdefault(perfil, ticket)
+                    raise
+
+                self.stats.flushes += 1
+                self.stats.perfis_gravados += len(sujos) + len(removidos)
+                self.stats.tempo_flush_s += time.perf_counter() - inicio
+
+            with self._cond:
+                self._persistido = max(self._persistido, ticket)
+                self._cond.notify_all()
+
+    def _escrever_atomico(self, dados: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".profiles-", suffix=".json", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json_codec.dumps_bytes(dados, indent=True))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def close(self) -> None:
+        """Grava pendências e encerra o flusher."""
+        if self._fechado:
+            return
+        self.flush()
+        self._fechado = True
+        self._sinal.set()
+
+
+__all__ = ["ProfileStore", "ProfileStoreStats"]
@@ -5,23 +5,29 @@ Responsável por executar templates de requisição com tratamento robusto.
 """
 
 from __future__ import annotations
-import json
 from pathlib import Path
 from typing import Any, Mapping, Optional, Dict
 import time
+from urllib.parse import urlsplit
 from botasaurus.request import Request, request
 
 from raxy.infrastructure.session.session_utils import replace_placeholders
+from raxy.core import json_codec
 from raxy.core.exceptions import (
     SessionException,
     ProxyRotationRequiredException,
     wrap_exception
 )
 from raxy.core.logging import debug_log
+from raxy.core.metrics import get_metrics
 from raxy.interfaces.services import ILoggingService
 from raxy.services.base_service import BaseService
 from raxy.models.proxy import ProxyItem
 
+# Histograma (segundos, rótulo template) e contador (rótulos template e status)
+TEMPLATE_DURATION_METRIC = "requisicao.template.duracao"
+TEMPLATE_COUNT_METRIC = "requisicao.template.total"
+
 
 class RequestExecutor(BaseService):
     """
@@ -86,6 +92,7 @@ class RequestExecutor(BaseService):
         """
         # Carrega o template
         template = self._carregar_template(template_path_or_dict)
+        nome_template = self._nome_template(template_path_or_dict, template)
         
         # Substitui placeholders
         if placeholders:
@@ -103,7 +110,30 @@ class RequestExecutor(BaseService):
         )
         
         # Executa a requisição
-        return self._executar_requisicao(args, proxy=proxy)
+        inicio = time.perf_counter()
+        status = "erro"
+        try:
+            resposta = self._executar_requisicao(args, proxy=proxy)
+            status = "ok"
+            return resposta
+        finally:
+            metrics = get_metrics()
+            metrics.observe(TEMPLATE_DURATION_METRIC, time.perf_counter() - inicio, template=nome_template)
+            metrics.inc(TEMPLATE_COUNT_METRIC, template=nome_template, status=status)
+    
+    @staticmethod
+    def _nome_template(origem: str | Path | Mapping[str, Any], template: Mapping[str, Any]) -> str:
+        """
+        Rótulo do template nas métricas.
+        
+        Arquivos usam o nome sem extensão; dicionários usam método, host e
+        caminho da URL (sem query e antes dos placeholders, para não gerar
+        uma série por conta).
+        """
+        if isinstance(origem, (str, Path)):
+            return Path(origem).stem
+        url = urlsplit(str(template.get("url", "")))
+        return f"{str(template.get('method', 'GET')).upper()} {url.netloc}{url.path}"
     
     def _carregar_template(
         self, 
@@ -123,8 +153,7 @@ class RequestExecutor(BaseService):
         """
         try:
             if isinstance(template_path_or_dict, (str, Path)):
-                with open(template_path_or_dict, encoding="utf-8") as f:
-                    return json.load(f)
+                return json_codec.load_file(template_path_or_dict)
             else:
                 return dict(template_path_or_dict)
         except FileNotFoundError as e:
@@ -133,7 +162,7 @@ class RequestExecutor(BaseService):
                 "Template não encontrado",
                 template=str(template_path_or_dict)
             )
-        except json.JSONDecodeError as e:
+        except json_codec.JSONDecodeError as e:
             raise wrap_exception(
                 e, SessionException,
                 "Template JSON inválido",
@@ -6,6 +6,7 @@ import time
 
 from raxy.models.proxy import ProxyItem
 from raxy.models.accounts import Conta
+from raxy.models.execution import EconomiaRecursos
 from raxy.interfaces.webdrivers import IBrowserDriver
 from raxy.core.exceptions import (
     SessionException,
@@ -71,6 +72,7 @@ class SessionManager(BaseService, ISessionManager):
         self._user_agent: str = ""
         self._token_antifalsificacao: Optional[str] = None
         self._session_start_time: Optional[float] = None
+        self.economia_recursos: Optional[EconomiaRecursos] = None
         
         # Serviços externos
         self._proxy_service = proxy_service
@@ -228,6 +230,7 @@ class SessionManager(BaseService, ISessionManager):
         self.cookies = resultado.get("cookies", {})
         self.user_agent = resultado.get("ua", "")
         self.token_antifalsificacao = resultado.get("token")
+        self.economia_recursos = resultado.get("economia_recursos")
     
     def _tratar_rotacao_proxy(self, e: ProxyRotationRequiredException, tentativas: int) -> None:
         """
@@ -5,26 +5,43 @@ Contém funções auxiliares usadas no gerenciamento de sessões.
 """
 
 from __future__ import annotations
+import re
 from typing import Any, Mapping
 from botasaurus.soupify import soupify
+from raxy.core.html_scan import HTMLFieldScanner, input_value_field
 from raxy.core.logging import get_logger
 
 log = get_logger()
 
+# Varredura direta do HTML cru; o soup só entra quando o input não é achado
+_TOKEN_SCANNER = HTMLFieldScanner(
+    {"token": input_value_field("__RequestVerificationToken")},
+    flags=re.IGNORECASE,
+)
 
-def extract_request_verification_token(html: str | None) -> str | None:
+
+def extract_request_verification_token(html: Any) -> str | None:
     """
     Extrai o token de verificação do HTML.
     
+    Para HTML em texto faz uma única varredura por regex; recorre ao
+    BeautifulSoup apenas se o input não for encontrado (ou se receber
+    um objeto já parseado/driver).
+    
     Args:
-        html: HTML da página
+        html: HTML da página (texto, soup ou driver)
         
     Returns:
         Token de verificação ou None se não encontrado
     """
-    if not html:
+    if html is None or (isinstance(html, str) and not html):
         return None
     
+    if isinstance(html, str):
+        token = _TOKEN_SCANNER.scan(html).get("token")
+        if token is not None:
+            return token.strip() or None
+    
     try:
         soup = soupify(html)
         campo = soup.find("input", {"name": "__RequestVerificationToken"})
@@ -6,8 +6,8 @@ permitindo trocar a implementação sem impactar o código cliente.
 """
 
 from __future__ import annotations
-from typing import Any, Callable, Dict, Optional
-from botasaurus.browser import Driver
+from typing import Any, Callable, Dict, List, Optional
+from botasaurus.browser import Driver, cdp
 
 from raxy.core.logging import get_logger
 
@@ -105,6 +105,37 @@ class BotasaurusDriver(IBrowserDriver):
         """Registra callback para respostas de rede."""
         self._driver.after_response_received(callback)
     
+    # ========== Bloqueio de Recursos ==========
+    
+    def block_urls(self, patterns: List[str]) -> bool:
+        """Aplica Network.setBlockedURLs (substitui a lista anterior)."""
+        self._driver.block_urls(list(patterns))
+        return True
+    
+    def _add_cdp_handler(self, event_type: Any, handler: Callable) -> bool:
+        """Registra handler de evento CDP na aba atual."""
+        tab = getattr(self._driver, "_tab", None)
+        if tab is None or not hasattr(tab, "add_handler"):
+            return False
+        tab.add_handler(event_type, handler)
+        return True
+    
+    def after_request_blocked(self, callback: Callable[[str, Optional[str]], None]) -> bool:
+        """Registra callback para Network.loadingFailed com motivo de bloqueio."""
+        def handle(event: cdp.network.LoadingFailed) -> None:
+            if event.blocked_reason is not None:
+                tipo = event.type_.value if event.type_ is not None else None
+                callback(str(event.request_id), tipo)
+        
+        return self._add_cdp_handler(cdp.network.LoadingFailed, handle)
+    
+    def after_loading_finished(self, callback: Callable[[str, float], None]) -> bool:
+        """Registra callback para Network.loadingFinished."""
+        def handle(event: cdp.network.LoadingFinished) -> None:
+            callback(str(event.request_id), float(event.encoded_data_length or 0))
+        
+        return self._add_cdp_handler(cdp.network.LoadingFinished, handle)
+    
     # ========== Lifecycle ==========
     
     def quit(self) -> None:
@@ -6,7 +6,7 @@ componentes sem necessidade de navegador real.
 """
 
 from __future__ import annotations
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 from unittest.mock import MagicMock
 
 from raxy.interfaces.webdrivers import IBrowserDriver
@@ -58,7 +58,9 @@ class MockDriver(IBrowserDriver):
             "click": [],
             "type": [],
             "run_js": [],
+            "block_urls": [],
         }
+        self.blocked_urls: List[str] = []
     
     # ========== Navegação ==========
     
@@ -128,6 +130,14 @@ class MockDriver(IBrowserDriver):
         """Simula registro de callback."""
         pass
     
+    # ========== Bloqueio de Recursos ==========
+    
+    def block_urls(self, patterns: List[str]) -> bool:
+        """Registra os padrões bloqueados para assertions."""
+        self.blocked_urls = list(patterns)
+        self.calls["block_urls"].append(list(patterns))
+        return True
+    
     # ========== Lifecycle ==========
     
     def quit(self) -> None:
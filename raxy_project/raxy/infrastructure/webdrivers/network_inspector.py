@@ -1,18 +1,177 @@
 """Utilitário para inspecionar respostas de rede emitidas pelo botasaurus."""
 
 from __future__ import annotations
+import queue
 import re
-from typing import Optional
+import threading
+from collections import deque
+from itertools import count
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
 from botasaurus.browser import Driver, cdp
 from raxy.core.exceptions import BrowserException, wrap_exception
 
+Matcher = Callable[[str], bool]
+# (seq, resposta, host, prefixo)
+Entrada = Tuple[int, dict, str, str]
+
+
+def _host_e_prefixo(url: str) -> Tuple[str, str]:
+    """Retorna (host, primeiro segmento do path) usados como chaves de índice."""
+    try:
+        partes = urlsplit(url)
+    except ValueError:
+        return "", "/"
+    segmentos = partes.path.split("/", 2)
+    return (partes.hostname or "").lower(), "/" + (segmentos[1] if len(segmentos) > 1 else "")
+
+
+class ResponseStore:
+    """
+    Buffer circular de respostas de rede com índices por host e prefixo de path.
+
+    Cada resposta recebe um número de sequência; os índices guardam apenas
+    referências e descartam de forma preguiçosa o que já saiu do buffer.
+    A sequência decide qual resposta é a mais recente entre índice e buffer.
+    """
+
+    def __init__(self, capacidade: int = 500):
+        if capacidade < 1:
+            raise ValueError("capacidade deve ser >= 1")
+        self.capacidade = capacidade
+        self._itens: Deque[Entrada] = deque(maxlen=capacidade)
+        self._por_host: Dict[str, Deque[Entrada]] = {}
+        self._por_prefixo: Dict[Tuple[str, str], Deque[Entrada]] = {}
+        self._seq = count()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def __bool__(self) -> bool:
+        return bool(self._itens)
+
+    def __iter__(self):
+        return (entrada[1] for entrada in list(self._itens))
+
+    def __reversed__(self):
+        return (entrada[1] for entrada in reversed(list(self._itens)))
+
+    def adicionar(self, resposta: dict) -> None:
+        """Adiciona uma resposta, descartando a mais antiga se o buffer estiver cheio."""
+        host, prefixo = _host_e_prefixo(resposta.get("url") or "")
+        entrada = (next(self._seq), resposta, host, prefixo)
+        with self._lock:
+            self._itens.append(entrada)
+            self._indexar(self._por_host, host, entrada)
+            self._indexar(self._por_prefixo, (host, prefixo), entrada)
+            if entrada[0] % self.capacidade == 0:
+                self._podar_indices()
+
+    def _indexar(self, indice: Dict[Any, Deque], chave: Any, entrada: Entrada) -> None:
+        bucket = indice.get(chave)
+        if bucket is None:
+            bucket = indice[chave] = deque(maxlen=self.capacidade)
+        bucket.append(entrada)
+
+    def _podar_indices(self) -> None:
+        """Remove buckets cujas entradas já saíram todas do buffer."""
+        minimo = self._seq_minimo()
+        for indice in (self._por_host, self._por_prefixo):
+            for chave in [k for k, bucket in indice.items() if bucket[-1][0] < minimo]:
+                del indice[chave]
+
+    def _seq_minimo(self) -> int:
+        return self._itens[0][0] if self._itens else 0
+
+    def recentes(self, host: Optional[str] = None, prefixo: Optional[str] = None) -> Iterable[dict]:
+        """
+        Itera respostas da mais recente para a mais antiga.
+
+        Args:
+            host: Restringe ao host informado (usa o índice)
+            prefixo: Restringe ao primeiro segmento do path (exige host)
+        """
+        with self._lock:
+            if host is None:
+                entradas = list(self._itens)
+            elif prefixo is not None:
+                entradas = list(self._por_prefixo.get((host, prefixo), ()))
+            else:
+                entradas = list(self._por_host.get(host, ()))
+            minimo = self._seq_minimo()
+
+        for seq, resp, _, _ in reversed(entradas):
+            if seq < minimo:
+                break
+            yield resp
+
+    def mais_recente(
+        self, matcher: Matcher, host: Optional[str] = None, prefixo: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Resposta mais recente cuja URL satisfaz ``matcher``.
+
+        Com ``host``, o índice é consultado primeiro. O buffer só é varrido
+        nas entradas mais novas que o acerto do índice (todas, se não houve
+        acerto), pulando as que o índice já testou: o resultado é o mesmo
+        de uma varredura completa.
+
+        Args:
+            matcher: Teste aplicado à URL
+            host: Host do índice a consultar primeiro
+            prefixo: Primeiro segmento do path (exige host)
+        """
+        with self._lock:
+            minimo = self._seq_minimo()
+            limite = minimo - 1
+            achado: Optional[dict] = None
+            if host is not None:
+                bucket = self._por_host.get(host, ()) if prefixo is None else self._por_prefixo.get((host, prefixo), ())
+                for seq, resp, _, _ in reversed(bucket):
+                    if seq < minimo:
+                        break
+                    url = resp.get("url")
+                    if url and matcher(url):
+                        achado, limite = resp, seq
+                        break
+
+            for seq, resp, host_item, prefixo_item in reversed(self._itens):
+                if seq <= limite:
+                    break
+                if host is not None and host_item == host and (prefixo is None or prefixo_item == prefixo):
+                    continue  # já testada pelo índice
+                url = resp.get("url")
+                if url and matcher(url):
+                    return resp
+            return achado
+
+    def limpar(self) -> None:
+        """Remove todas as respostas e índices."""
+        with self._lock:
+            self._itens.clear()
+            self._por_host.clear()
+            self._por_prefixo.clear()
+
+
 class NetWork:
     """Captura e permite a inspeção de respostas de rede de uma instância de Driver com tratamento de erros."""
-    def __init__(self, driver: Optional[Driver] = None):
-        self.respostas: list[dict] = []
+    def __init__(self, driver: Optional[Driver] = None, capacidade: Optional[int] = None):
+        if capacidade is None:
+            from raxy.core.config import get_config
+            capacidade = get_config().session.network_capture_capacity
+        self.respostas = ResponseStore(capacidade)
         self.driver: Optional[Driver] = None
         self._handler_registrado = False
-        self._regex_cache: dict[str, re.Pattern] = {}
+        self._matcher_cache: dict[Any, Tuple[Matcher, Optional[str], Optional[str]]] = {}
+
+        # Eventos CDP são só enfileirados no callback do driver e convertidos
+        # por uma thread própria (ou na hora da consulta, o que vier primeiro)
+        self._pendentes: "queue.SimpleQueue[Tuple[Any, Any]]" = queue.SimpleQueue()
+        self._sinal = threading.Event()
+        self._processamento_lock = threading.Lock()
+        self._worker_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
 
         if driver:
             try:
@@ -28,7 +187,7 @@ class NetWork:
                 self._handler_registrado = False
 
             self.driver = driver
-            self.respostas.clear()
+            self.limpar_respostas()
 
             if not self._handler_registrado and self.driver:
                 self.driver.after_response_received(self.registrar_resposta)
@@ -39,70 +198,118 @@ class NetWork:
                 "Erro ao inicializar capturador de rede"
             )
 
+    def _matcher(self, url_pattern: str | re.Pattern) -> Tuple[Matcher, Optional[str], Optional[str]]:
+        """
+        Compila (uma vez) o teste de URL para o padrão informado.
+
+        Returns:
+            Tupla (matcher, host, prefixo). Host/prefixo são preenchidos quando o
+            padrão é uma URL absoluta, permitindo consultar só o índice correspondente.
+        """
+        cached = self._matcher_cache.get(url_pattern)
+        if cached is not None:
+            return cached
+
+        host: Optional[str] = None
+        prefixo: Optional[str] = None
+        if isinstance(url_pattern, re.Pattern):
+            search = url_pattern.search
+            matcher: Matcher = lambda url: search(url) is not None
+        else:
+            texto = str(url_pattern)
+            try:
+                search = re.compile(texto).search
+            except re.error:
+                search = None
+            if search is None:
+                matcher = lambda url: texto in url
+            else:
+                matcher = lambda url: texto in url or search(url) is not None
+            if texto.startswith(("http://", "https://")):
+                host, prefixo = _host_e_prefixo(texto)
+                # Só usa o índice de prefixo quando o primeiro segmento está completo
+                if urlsplit(texto).path.count("/") < 2:
+                    prefixo = None
+
+        resultado = (matcher, host, prefixo)
+        self._matcher_cache[url_pattern] = resultado
+        return resultado
+
     def get_status(self, url_pattern: Optional[str | re.Pattern] = None) -> Optional[int]:
         """Obtém o status HTTP com tratamento seguro de erros."""
         try:
+            self._processar_pendentes()
             if not self.respostas:
                 return None
 
-            for resp in reversed(self.respostas):
-                if not isinstance(resp, dict):
-                    continue
-                
-                url = resp.get("url")
-                if not url:
-                    continue
-
-                if url_pattern is None:
-                    return resp.get("status")
-
-                if isinstance(url_pattern, re.Pattern):
-                    try:
-                        if url_pattern.search(url):
-                            return resp.get("status")
-                    except Exception:
-                        continue
-                    continue
-
-                if isinstance(url_pattern, str) and url_pattern in url:
-                    return resp.get("status")
-
-                try:
-                    regex = self._regex_cache.get(url_pattern)
-                    if regex is None:
-                        regex = re.compile(str(url_pattern))
-                        self._regex_cache[str(url_pattern)] = regex
-                    if regex.search(url):
-                        return resp.get("status")
-                except (re.error, TypeError):
-                    continue
+            if url_pattern is None:
+                resp = self.respostas.mais_recente(lambda url: True)
+            else:
+                # URLs absolutas consultam primeiro o índice; o buffer ainda é conferido
+                # (o padrão pode aparecer, p.ex., na query string de outro host)
+                matcher, host, prefixo = self._matcher(url_pattern)
+                resp = self.respostas.mais_recente(matcher, host, prefixo)
+            return resp.get("status") if resp else None
         except Exception:
             # Retorna None em caso de qualquer erro
             return None
-        return None
 
     def limpar_respostas(self) -> None:
         """Limpa todas as respostas capturadas."""
+        self._processar_pendentes()
+        self.respostas.limpar()
+
+    def registrar_resposta(self, request_id, response: cdp.network.Response, event: cdp.network.ResponseReceived) -> None:
+        """Registra uma resposta de rede capturada (processada fora da thread do driver)."""
         try:
-            self.respostas.clear()
+            self._pendentes.put((response, event))
+            self._sinal.set()
+            self._garantir_worker()
         except Exception:
-            # Recria lista se houver erro
-            self.respostas = []
+            # Silenciosamente ignora erros ao registrar respostas
+            pass
 
-    def registrar_resposta(self, request_id, response: cdp.network.Response, event: cdp.network.ResponseReceived) -> None:
-        """Registra uma resposta de rede capturada."""
+    def _garantir_worker(self) -> None:
+        """Inicia a thread de processamento de eventos se ainda não estiver ativa."""
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._loop_worker, name="raxy-network-inspector", daemon=True
+                )
+                self._worker.start()
+
+    def _loop_worker(self) -> None:
+        """Converte eventos pendentes; encerra após ficar ocioso."""
+        while self._sinal.wait(timeout=5.0):
+            self._sinal.clear()
+            self._processar_pendentes()
+
+    def _processar_pendentes(self) -> None:
+        """Drena a fila de eventos em ordem, garantindo que consultas vejam tudo já recebido."""
+        with self._processamento_lock:
+            while True:
+                try:
+                    response, event = self._pendentes.get_nowait()
+                except queue.Empty:
+                    return
+                self._registrar(response, event)
+
+    def _registrar(self, response: Any, event: Any) -> None:
+        """Converte o evento CDP em registro e armazena."""
         try:
-            self.respostas.append(
+            self.respostas.adicionar(
                 {
-                    "url": response.url if hasattr(response, 'url') else None,
-                    "status": response.status if hasattr(response, 'status') else None,
-                    "timestamp": event.timestamp if hasattr(event, 'timestamp') else None,
-                    "type": event.type_ if hasattr(event, 'type_') else None,
-                    "headers": response.headers if hasattr(response, 'headers') else {},
+                    "url": getattr(response, "url", None),
+                    "status": getattr(response, "status", None),
+                    "timestamp": getattr(event, "timestamp", None),
+                    "type": getattr(event, "type_", None),
+                    "headers": getattr(response, "headers", {}),
                 }
             )
         except Exception:
-            # Silenciosamente ignora erros ao registrar respostas
             pass
 
-__all__ = ["NetWork"]
\ No newline at end of file
+__all__ = ["NetWork", "ResponseStore"]
@@ -0,0 +1,145 @@
+"""
+Bloqueio de recursos para os navegadores de login.
+
+Traduz a política de tipos de recurso (imagens, fontes, mídia, ...) em padrões
+para ``Network.setBlockedURLs`` e aplica através do IBrowserDriver, contando o
+que foi bloqueado para estimar bytes e tempo de carregamento economizados.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional
+
+from raxy.core.config import ResourceBlockingConfig
+from raxy.interfaces.webdrivers import IBrowserDriver
+from raxy.models.execution import EconomiaRecursos
+
+# Padrões de URL por tipo de recurso (ResourceType do CDP em minúsculas).
+# setBlockedURLs só filtra por URL, então o tipo é aproximado pela extensão.
+RESOURCE_TYPE_PATTERNS: Dict[str, List[str]] = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*", "*.bmp*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.m4a*", "*.ogg*", "*.wav*", "*.m3u8*"],
+    "stylesheet": ["*.css*"],
+}
+
+_PAGE_LOAD_JS = (
+    "const n = performance.getEntriesByType('navigation')[0];"
+    "return n ? n.duration : null;"
+)
+
+
+class ResourceBlocker:
+    """
+    Aplica a política de bloqueio em um driver e acumula estatísticas.
+
+    Uma instância por navegador/conta. Os callbacks de rede podem chegar de
+    outra thread, por isso os contadores são protegidos por lock.
+    """
+
+    def __init__(self, config: Optional[ResourceBlockingConfig] = None):
+        """
+        Args:
+            config: Política de bloqueio (padrão: ``session.resource_blocking``)
+        """
+        if config is None:
+            from raxy.core.config import get_config
+            config = get_config().session.resource_blocking
+        self.config = config
+        self._lock = threading.Lock()
+        self._bloqueadas_por_tipo: Dict[str, int] = {}
+        self._bytes_transferidos = 0.0
+        self._tempo_carregamento_ms = 0.0
+        self.ativo = False
+
+    @property
+    def tipos_bloqueados(self) -> List[str]:
+        """Tipos efetivamente bloqueados (deny menos allow)."""
+        permitidos = set(self.config.tipos_permitidos)
+        return [t for t in self.config.tipos_bloqueados if t not in permitidos]
+
+    def padroes(self) -> List[str]:
+        """Lista final de padrões de URL enviada ao navegador."""
+        padroes: List[str] = []
+        for tipo in self.tipos_bloqueados:
+            padroes.extend(RESOURCE_TYPE_PATTERNS.get(tipo, ()))
+        padroes.extend(self.config.urls_bloqueadas)
+        # Remove duplicados preservando a ordem
+        return list(dict.fromkeys(padroes))
+
+    def aplicar(self, driver: IBrowserDriver) -> bool:
+        """
+        Aplica o bloqueio e registra os contadores no driver.
+
+        Args:
+            driver: Driver de navegador (adapter)
+
+        Returns:
+            bool: True se o driver aplicou o bloqueio
+        """
+        if not self.config.enabled:
+            return False
+
+        padroes = self.padroes()
+        if not padroes:
+            return False
+
+        self.ativo = driver.block_urls(padroes)
+        if self.ativo:
+            driver.after_request_blocked(self._registrar_bloqueio)
+            driver.after_loading_finished(self._registrar_transferencia)
+        return self.ativo
+
+    def medir_pagina(self, driver: IBrowserDriver) -> None:
+        """Soma a duração da navegação atual (Navigation Timing) ao tempo de carregamento."""
+        try:
+            duracao = driver.run_js(_PAGE_LOAD_JS)
+        except Exception:
+            return
+        if isinstance(duracao, (int, float)) and duracao > 0:
+            with self._lock:
+                self._tempo_carregamento_ms += float(duracao)
+
+    def _registrar_bloqueio(self, request_id: str, tipo: Optional[str]) -> None:
+        chave = (tipo or "other").lower()
+        with self._lock:
+            self._bloqueadas_por_tipo[chave] = self._bloqueadas_por_tipo.get(chave, 0) + 1
+
+    def _registrar_transferencia(self, request_id: str, tamanho: float) -> None:
+        with self._lock:
+            self._bytes_transferidos += tamanho
+
+    def economia(self) -> EconomiaRecursos:
+        """
+        Calcula a economia estimada até o momento.
+
+        Bytes economizados usam o tamanho médio configurado por tipo; o tempo
+        economizado assume a vazão observada (bytes transferidos / tempo de
+        carregamento medido) para os bytes que deixaram de ser baixados.
+
+        Returns:
+            EconomiaRecursos: Estatísticas da conta
+        """
+        with self._lock:
+            por_tipo = dict(self._bloqueadas_por_tipo)
+            transferidos = int(self._bytes_transferidos)
+            tempo_ms = self._tempo_carregamento_ms
+
+        tamanhos = self.config.tamanho_medio_kb
+        economizados = sum(qtd * tamanhos.get(tipo, 0) * 1024 for tipo, qtd in por_tipo.items())
+        tempo_economizado = 0.0
+        if transferidos > 0 and tempo_ms > 0:
+            tempo_economizado = economizados / (transferidos / tempo_ms)
+
+        return EconomiaRecursos(
+            requisicoes_bloqueadas=sum(por_tipo.values()),
+            bloqueadas_por_tipo=por_tipo,
+            bytes_transferidos=transferidos,
+            bytes_economizados=int(economizados),
+            tempo_carregamento_ms=tempo_ms,
+            tempo_economizado_ms=tempo_economizado,
+        )
+
+
+__all__ = ["ResourceBlocker", "RESOURCE_TYPE_PATTERNS"]
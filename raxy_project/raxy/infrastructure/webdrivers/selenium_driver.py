@@ -258,6 +258,29 @@ class SeleniumDriver(IBrowserDriver):
         """
         self._callbacks.append(callback)
     
+    # ========== Bloqueio de Recursos ==========
+    
+    def block_urls(self, patterns: List[str]) -> bool:
+        """
+        Bloqueia URLs via CDP quando o driver é baseado em Chromium.
+        
+        Args:
+            patterns: Padrões de URL com curinga ``*``
+            
+        Returns:
+            bool: True se aplicado (Chrome/Edge), False caso contrário
+        """
+        execute_cdp = getattr(self._driver, "execute_cdp_cmd", None)
+        if execute_cdp is None:
+            return False
+        try:
+            execute_cdp("Network.enable", {})
+            execute_cdp("Network.setBlockedURLs", {"urls": list(patterns)})
+            return True
+        except Exception as e:
+            self.logger.debug(f"Falha ao bloquear URLs via CDP: {e}")
+            return False
+    
     # ========== Lifecycle ==========
     
     def quit(self) -> None:
@@ -7,11 +7,12 @@ deve seguir para garantir desacoplamento completo.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List, Optional, TYPE_CHECKING
+from typing import Iterator, List, Optional, TYPE_CHECKING
 from pathlib import Path
 
 if TYPE_CHECKING:
     from raxy.models import Conta
+    from raxy.infrastructure.database.importacao import LinhaImportada
 
 
 class IFileSystem(ABC):
@@ -264,6 +265,19 @@ class IFileSystem(ABC):
 
     # ========== Negócio (Helpers) ==========
 
+    @abstractmethod
+    def iter_accounts_from_file(self, path: str | Path) -> Iterator["LinhaImportada"]:
+        """
+        Lê um arquivo de contas linha a linha (sem carregá-lo inteiro).
+
+        Args:
+            path: Caminho do arquivo a ser importado.
+
+        Yields:
+            LinhaImportada: Conta ou erro de cada linha, com a posição em bytes.
+        """
+        pass
+
     @abstractmethod
     def import_accounts_from_file(self, path: str | Path) -> List["Conta"]:
         """
@@ -42,6 +42,10 @@ class ILoggingService(ABC):
     def etapa(self, titulo: str, **dados: Any) -> AbstractContextManager[None]:
         """Cria um contexto de execução para agrupar logs."""
 
+    def is_enabled_for(self, nivel: str) -> bool:
+        """Indica se mensagens do nível seriam registradas (padrão: sempre)."""
+        return True
+
     def mute_console(self) -> None:
         """Desativa saída para console (stdout/stderr)."""
         pass
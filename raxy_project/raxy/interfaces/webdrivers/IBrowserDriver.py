@@ -7,7 +7,7 @@ Playwright, etc.) deve seguir para garantir desacoplamento.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 
 class IBrowserDriver(ABC):
@@ -173,6 +173,46 @@ class IBrowserDriver(ABC):
         """
         pass
     
+    # ========== Bloqueio de Recursos ==========
+    
+    def block_urls(self, patterns: List[str]) -> bool:
+        """
+        Bloqueia requisições cujas URLs casem com os padrões (``Network.setBlockedURLs``).
+        
+        Implementação opcional: drivers sem suporte retornam False.
+        
+        Args:
+            patterns: Padrões de URL com curinga ``*``
+            
+        Returns:
+            bool: True se o bloqueio foi aplicado
+        """
+        return False
+    
+    def after_request_blocked(self, callback: Callable[[str, Optional[str]], None]) -> bool:
+        """
+        Registra callback para requisições bloqueadas pelo navegador.
+        
+        Args:
+            callback: Função chamada com (request_id, tipo_do_recurso)
+            
+        Returns:
+            bool: True se o driver suporta o evento
+        """
+        return False
+    
+    def after_loading_finished(self, callback: Callable[[str, float], None]) -> bool:
+        """
+        Registra callback para requisições concluídas.
+        
+        Args:
+            callback: Função chamada com (request_id, bytes_transferidos)
+            
+        Returns:
+            bool: True se o driver suporta o evento
+        """
+        return False
+    
     # ========== Lifecycle ==========
     
     @abstractmethod
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Any, Optional
+from typing import Dict, List, Any, Optional
 from .accounts import Conta
 
 # Re-exporting ContaResult from executor_service if it moves here or defining a new one if it remains there.
@@ -21,6 +21,26 @@ class EtapaResult:
     erro: Optional[str] = None
     dados: Optional[dict[str, Any]] = None
 
+@dataclass
+class EconomiaRecursos:
+    """Resources blocked in the login browser and the estimated savings."""
+    requisicoes_bloqueadas: int = 0
+    bloqueadas_por_tipo: Dict[str, int] = field(default_factory=dict)
+    bytes_transferidos: int = 0
+    bytes_economizados: int = 0
+    tempo_carregamento_ms: float = 0.0
+    tempo_economizado_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requisicoes_bloqueadas": self.requisicoes_bloqueadas,
+            "bloqueadas_por_tipo": dict(self.bloqueadas_por_tipo),
+            "bytes_transferidos": self.bytes_transferidos,
+            "bytes_economizados": self.bytes_economizados,
+            "tempo_carregamento_ms": round(self.tempo_carregamento_ms, 1),
+            "tempo_economizado_ms": round(self.tempo_economizado_ms, 1),
+        }
+
 @dataclass
 class ContaResult:
     """Detailed result of processing a single account."""
@@ -32,6 +52,7 @@ class ContaResult:
     etapas: List[EtapaResult] = field(default_factory=list)
     erro_fatal: Optional[str] = None
     proxy_usado: Optional[str] = None
+    economia_recursos: Optional[EconomiaRecursos] = None
 
     def adicionar_etapa(self, nome: str, sucesso: bool, erro: Optional[str] = None, dados: Optional[dict[str, Any]] = None) -> None:
         self.etapas.append(EtapaResult(nome, sucesso, erro, dados))
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from raxy.interfaces.database import IContaRepository, IDatabaseRepository
+from typing import Optional
+from raxy.interfaces.database import IContaRepository, IDatabaseRepository, IHistoricoPontuacaoRepository
 from raxy.interfaces.services import (
     ILoggingService,
     IRewardsDataService,
@@ -22,4 +23,5 @@ class InfraServices:
     logger: ILoggingService
     mail_tm_service: IMailTmService
     dashboard: IDashboardService
+    historico_pontos: Optional[IHistoricoPontuacaoRepository] = None
 
@@ -8,7 +8,6 @@ seguindo padrões SOLID e arquitetura limpa.
 from __future__ import annotations
 
 import random
-import re
 from pathlib import Path
 from typing import Dict, Mapping, Optional, Any
 from raxy.models.flyout import FlyoutResult
@@ -27,6 +26,7 @@ from raxy.core.exceptions import (
     wrap_exception,
 )
 from raxy.core.config import get_config
+from raxy.core.html_scan import HTMLFieldScanner, json_string_field
 from raxy.core.logging import debug_log, get_logger
 from .base_service import BaseService
 
@@ -47,17 +47,61 @@ BROWSER_OPTIONS = {
 class FlyoutDataExtractor:
     """Extrator de dados do HTML do flyout."""
     
+    FIELDS = ("userId", "offerId", "hash", "sku")
+    
+    # Uma regex combinada para os quatro campos, aplicada ao conteúdo dos scripts
+    _scanner = HTMLFieldScanner({key: json_string_field(key) for key in FIELDS})
+    
     @staticmethod
-    def extract(html: str) -> Dict[str, str]:
+    def extract(html: str) -> FlyoutResult:
         """
         Extrai dados relevantes do HTML do flyout.
         
+        Varre o conteúdo dos ``<script>`` direto no HTML cru; o
+        BeautifulSoup só é usado quando algum campo não é encontrado.
+        Campos ausentes nos dois ficam vazios.
+        
         Args:
             html: HTML da página do flyout
             
         Returns:
             FlyoutResult: Dados extraídos (user_id, offer_id, auth_key, sku)
             
+        Raises:
+            HTMLParsingException: Se erro ao fazer parse do HTML
+        """
+        logger = get_logger()
+        dados = FlyoutDataExtractor._scanner.scan_scripts(html)
+        
+        faltando = [key for key in FlyoutDataExtractor.FIELDS if key not in dados]
+        if faltando:
+            logger.debug(f"Campos ausentes na varredura direta, usando soup: {faltando}")
+            dados.update(FlyoutDataExtractor._extract_from_scripts(html, faltando))
+        
+        logger.debug(
+            "Extração do flyout concluída", 
+            extra={
+                "found_user": bool(dados.get("userId")), 
+                "found_offer": bool(dados.get("offerId")), 
+                "found_auth": bool(dados.get("hash"))
+            }
+        )
+        
+        return FlyoutResult(
+            user_id=dados.get("userId") or "",
+            offer_id=dados.get("offerId") or "",
+            auth_key=dados.get("hash") or "",
+            sku=dados.get("sku") or "",
+        )
+    
+    @staticmethod
+    def _extract_from_scripts(html: str, campos: list[str]) -> Dict[str, str]:
+        """
+        Fallback: procura os campos no texto de cada ``<script>`` via BeautifulSoup.
+        
+        Cobre scripts que a regex não delimita (marcação malformada que o
+        parser corrige).
+        
         Raises:
             HTMLParsingException: Se erro ao fazer parse do HTML
         """
@@ -71,54 +115,23 @@ class FlyoutDataExtractor:
                 "Erro ao fazer parse do HTML do flyout"
             )
         
-        # Extrai dados dos scripts
-        user_id, offer_id, auth_key, sku = None, None, None, None
-        
+        encontrados: Dict[str, str] = {}
         try:
             scripts = soup.find_all("script")
             logger.debug(f"Analisando {len(scripts)} scripts para extração de dados")
             
             for script in scripts:
                 txt = script.string or ""
-                
-                if "userId" in txt and not user_id:
-                    m = re.search(r'"userId"\s*:\s*"([^"]+)"', txt)
-                    if m:
-                        user_id = m.group(1)
-                
-                if "offerId" in txt and not offer_id:
-                    m = re.search(r'"offerId"\s*:\s*"([^"]+)"', txt)
-                    if m:
-                        offer_id = m.group(1)
-                
-                if "hash" in txt and not auth_key:
-                    m = re.search(r'"hash"\s*:\s*"([^"]+)"', txt)
-                    if m:
-                        auth_key = m.group(1)
-                
-                if "sku" in txt and not sku:
-                    m = re.search(r'"sku"\s*:\s*"([^"]+)"', txt)
-                    if m:
-                        sku = m.group(1)
+                encontrados.update({
+                    k: v for k, v in FlyoutDataExtractor._scanner.scan(txt, campos).items()
+                    if k not in encontrados
+                })
+                if len(encontrados) == len(campos):
+                    break
         except Exception as e:
             logger.aviso("Erro durante iteração dos scripts para extração", exception=e)
-            pass
         
-        logger.debug(
-            "Extração do flyout concluída", 
-            extra={
-                "found_user": bool(user_id), 
-                "found_offer": bool(offer_id), 
-                "found_auth": bool(auth_key)
-            }
-        )
-        
-        return FlyoutResult(
-            user_id=user_id or "",
-            offer_id=offer_id or "",
-            auth_key=auth_key or "",
-            sku=sku or "",
-        )
+        return encontrados
 
 
 class BingFlyoutService(BaseService, IBingFlyoutService):
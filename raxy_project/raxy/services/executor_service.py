@@ -21,6 +21,7 @@ from raxy.models import Conta, InfraServices
 from raxy.models.execution import BatchExecutionResult, ContaResult, EtapaResult
 from raxy.models.proxy import ProxyItem
 from raxy.infrastructure.session.session_manager import SessionManager
+from raxy.infrastructure.session.profile_store import ProfileStore
 from raxy.core.config import ExecutorConfig, ProxyConfig
 from raxy.core.exceptions import (
     InvalidCredentialsException,
@@ -32,7 +33,10 @@ from raxy.core.exceptions import (
     wrap_exception,
 )
 from raxy.core.logging import debug_log
+from raxy.core.metrics import get_metrics, serve_metrics
 from raxy.interfaces.services import IExecutorEmLoteService, ILoggingService, IDashboardService
+from raxy.interfaces.database import IHistoricoPontuacaoRepository
+from raxy.infrastructure.database.consulta import listar_para_execucao
 from .base_service import BaseService
 import time
 
@@ -40,6 +44,14 @@ import time
 # Local definitions of EtapaResult and ContaResult removed in favor of raxy.models.execution
 # Using imported classes instead.
 
+# Métricas do pipeline de contas (ver raxy.core.metrics)
+STAGE_DURATION_METRIC = "conta.etapa.duracao"  # histograma, segundos, rótulo etapa
+STAGE_COUNT_METRIC = "conta.etapa.total"       # contador, rótulos etapa e status (ok/erro)
+ACTIVE_ACCOUNTS_METRIC = "executor.contas_ativas"  # gauge
+
+# Endpoint /metrics do processo (um por porta, mantido entre execuções)
+_metrics_servers: Dict[int, Any] = {}
+
 
 class ExecutionStats:
     """Estatísticas de execução."""
@@ -86,7 +98,8 @@ class AccountProcessor:
         db_repository,
         logger: ILoggingService,
         dashboard_service: Optional[IDashboardService] = None,
-        debug: bool = False
+        debug: bool = False,
+        historico_pontos: Optional[IHistoricoPontuacaoRepository] = None
     ):
         """
         Inicializa o processador com dependências específicas.
@@ -101,6 +114,7 @@ class AccountProcessor:
             logger: Serviço de logging
             dashboard_service: Serviço de dashboard (IDashboardService)
             debug: Se está em modo debug
+            historico_pontos: Histórico de pontuação (IHistoricoPontuacaoRepository)
         """
         # Dependências específicas - melhor desacoplamento
         self.rewards_service = rewards_service
@@ -112,6 +126,7 @@ class AccountProcessor:
         self.logger = logger
         self.dashboard = dashboard_service
         self.debug = debug
+        self.historico_pontos = historico_pontos
 
     
     @debug_log(log_args=False, log_result=False, log_duration=True)
@@ -157,13 +172,17 @@ class AccountProcessor:
                 self.dashboard.update_worker(conta.email, conta.email, "Iniciando...")
 
             # Etapa 1: Login/Criar sessão
+            inicio_login = time.perf_counter()
             try:
                 if self.dashboard:
                     self.dashboard.update_worker(conta.email, conta.email, "Login")
                     
                 sessao = self._criar_sessao(conta, proxy, logger)
+                self._registrar_etapa("login", inicio_login, True)
+                resultado.economia_recursos = sessao.economia_recursos
                 resultado.adicionar_etapa("login", True, dados={"email": conta.email})
             except (InvalidCredentialsException, LoginException) as e:
+                self._registrar_etapa("login", inicio_login, False)
                 erro_msg = f"Credenciais inválidas: {str(e)}"
                 resultado.adicionar_etapa("login", False, erro=erro_msg)
                 resultado.erro_fatal = f"Falha no login: {str(e)}"
@@ -174,6 +193,7 @@ class AccountProcessor:
                     self.dashboard.worker_done(conta.email)
                 return resultado
             except SessionException as e:
+                self._registrar_etapa("login", inicio_login, False)
                 erro_msg = f"Erro de sessão: {str(e)}"
                 resultado.adicionar_etapa("login", False, erro=erro_msg)
                 resultado.erro_fatal = f"Falha na sessão: {str(e)}"
@@ -184,14 +204,18 @@ class AccountProcessor:
                     self.dashboard.worker_done(conta.email)
                 return resultado
             except Exception as e:
+                self._registrar_etapa("login", inicio_login, False)
                 erro_msg = f"Erro inesperado: {str(e)}"
                 resultado.adicionar_etapa("login", False, erro=erro_msg)
                 resultado.erro_fatal = erro_msg
                 logger.erro(f"Erro inesperado no login", error=erro_msg, exception=e)
                 return resultado
             
-            # Etapa 2: Obter pontos iniciais
-            resultado.pontos_iniciais = self._obter_pontos(sessao, logger)
+            # Etapa 2: Obter pontos iniciais (último total do histórico se a API falhar)
+            pontos_iniciais = self._obter_pontos(sessao, logger)
+            if pontos_iniciais is None:
+                pontos_iniciais = self._ultimo_total(conta, logger)
+            resultado.pontos_iniciais = pontos_iniciais
             resultado.adicionar_etapa(
                 "obter_pontos_iniciais",
                 True,
@@ -206,7 +230,9 @@ class AccountProcessor:
                 if self.dashboard:
                     self.dashboard.update_worker(conta.email, conta.email, f"Executando {acao}...")
                     
+                inicio_acao = time.perf_counter()
                 sucesso_acao, erro_acao = self._executar_acao_com_resultado(acao, sessao, logger)
+                self._registrar_etapa(acao, inicio_acao, sucesso_acao)
                 
                 if sucesso_acao:
                     logger.debug(f"Ação '{acao}' concluída com sucesso")
@@ -219,7 +245,9 @@ class AccountProcessor:
             if self.dashboard:
                 self.dashboard.update_worker(conta.email, conta.email, "Finalizando...")
                 
-            resultado.pontos_finais = self._obter_pontos(sessao, logger)
+            # Se a leitura falhar, mantém os iniciais (um 0 seria gravado como queda)
+            pontos_finais = self._obter_pontos(sessao, logger)
+            resultado.pontos_finais = resultado.pontos_iniciais if pontos_finais is None else pontos_finais
             resultado.pontos_ganhos = resultado.pontos_finais - resultado.pontos_iniciais
             resultado.adicionar_etapa(
                 "obter_pontos_finais",
@@ -238,6 +266,9 @@ class AccountProcessor:
                 resultado.adicionar_etapa("salvar_banco", True)
             except Exception as e:
                 resultado.adicionar_etapa("salvar_banco", False, erro=str(e))
+            # Só leituras reais entram no histórico
+            if pontos_finais is not None:
+                self._registrar_historico(conta, pontos_finais, logger)
             
             # Marca como sucesso geral
             resultado.sucesso_geral = True
@@ -277,14 +308,43 @@ class AccountProcessor:
         sessao.start()
         return sessao
     
-    def _obter_pontos(self, sessao: SessionManager, logger: ILoggingService) -> int:
-        """Obtém pontos da conta."""
+    def _obter_pontos(self, sessao: SessionManager, logger: ILoggingService) -> Optional[int]:
+        """Obtém pontos da conta (``None`` se a consulta falhar)."""
+        inicio = time.perf_counter()
         try:
             pontos = self.rewards_service.obter_pontos(sessao)
+            self._registrar_etapa("obter_pontos", inicio, True)
             return pontos
         except Exception as e:
+            self._registrar_etapa("obter_pontos", inicio, False)
+            return None
+    
+    def _ultimo_total(self, conta: Conta, logger: ILoggingService) -> int:
+        """Último total conhecido da conta no histórico (0 se não houver)."""
+        if not self.historico_pontos:
+            return 0
+        try:
+            return self.historico_pontos.obter_ultimo_total(conta) or 0
+        except Exception as e:
+            logger.aviso("Histórico de pontos indisponível", erro=str(e))
             return 0
     
+    def _registrar_historico(self, conta: Conta, pontos: int, logger: ILoggingService) -> None:
+        """Acrescenta o total final ao histórico de pontuação."""
+        if not self.historico_pontos:
+            return
+        try:
+            self.historico_pontos.registrar_pontos(conta, pontos)
+        except Exception as e:
+            logger.aviso("Falha ao registrar histórico de pontos", erro=str(e))
+    
+    @staticmethod
+    def _registrar_etapa(etapa: str, inicio: float, sucesso: bool) -> None:
+        """Registra duração e resultado de uma etapa no registro de métricas."""
+        metrics = get_metrics()
+        metrics.observe(STAGE_DURATION_METRIC, time.perf_counter() - inicio, etapa=etapa)
+        metrics.inc(STAGE_COUNT_METRIC, etapa=etapa, status="ok" if sucesso else "erro")
+    
     def _executar_acao_com_resultado(
         self,
         acao: str,
@@ -334,10 +394,13 @@ class AccountProcessor:
         logger: ILoggingService
     ) -> None:
         """Salva registro no banco de dados."""
+        inicio = time.perf_counter()
         try:
             if self.db_repository:
                 self.db_repository.adicionar_registro_farm(email, pontos)
+            self._registrar_etapa("salvar_banco", inicio, True)
         except Exception as e:
+            self._registrar_etapa("salvar_banco", inicio, False)
             if logger:
                 logger.erro(f"Erro ao salvar no banco: {str(e)}", exception=e)
             pass
@@ -381,7 +444,8 @@ class ExecutorEmLote(BaseService, IExecutorEmLoteService):
             db_repository=services.db_repository,
             logger=self.logger,
             dashboard_service=services.dashboard,
-            debug=self._config.debug
+            debug=self._config.debug,
+            historico_pontos=services.historico_pontos
         )
         self._stats = ExecutionStats()
     
@@ -404,6 +468,7 @@ class ExecutorEmLote(BaseService, IExecutorEmLoteService):
         Raises:
             ExecutionException: Se erro crítico na execução
         """
+        self._iniciar_endpoint_metricas()
         
         try:
             with self.logger.etapa("Execução em Lote"):
@@ -444,6 +509,39 @@ class ExecutorEmLote(BaseService, IExecutorEmLoteService):
             # Garante que dashboard pare em caso de erro
             if self._services.dashboard:
                 self._services.dashboard.stop()
+            # Grava perfis ainda pendentes no flusher em lote
+            try:
+                ProfileStore.flush_instance()
+            except Exception as e:
+                self.logger.aviso(f"Falha ao gravar perfis pendentes: {e}")
+            # Grava resultados de farm ainda na fila de gravação em lote
+            flush_banco = getattr(self._services.db_repository, "flush", None)
+            if flush_banco:
+                try:
+                    flush_banco()
+                except Exception as e:
+                    self.logger.aviso(f"Falha ao gravar resultados de farm pendentes: {e}")
+            self._exportar_metricas()
+    
+    def _iniciar_endpoint_metricas(self) -> None:
+        """Sobe o endpoint /metrics configurado, se ainda não estiver no ar."""
+        porta = self._config.metrics_port
+        if not porta or porta in _metrics_servers:
+            return
+        try:
+            _metrics_servers[porta] = serve_metrics(porta)
+            self.logger.info(f"Métricas disponíveis em http://127.0.0.1:{porta}/metrics")
+        except OSError as e:
+            self.logger.aviso(f"Não foi possível abrir o endpoint de métricas na porta {porta}: {e}")
+    
+    def _exportar_metricas(self) -> None:
+        """Grava as métricas no arquivo configurado (formato Prometheus)."""
+        if not self._config.metrics_file:
+            return
+        try:
+            get_metrics().write_prometheus(self._config.metrics_file)
+        except Exception as e:
+            self.logger.aviso(f"Falha ao gravar métricas em {self._config.metrics_file}: {e}")
     
     def _preparar_acoes(self, acoes: Optional[Iterable[str]]) -> List[str]:
         """
@@ -475,7 +573,7 @@ class ExecutorEmLote(BaseService, IExecutorEmLoteService):
             if contas is not None:
                 return list(contas)
             
-            return self._services.conta_repository.listar()
+            return listar_para_execucao(self._services.conta_repository)
         except Exception as e:
             self.handle_error(e, {"context": "carregamento de contas"})
     
@@ -583,6 +681,8 @@ class ExecutorEmLote(BaseService, IExecutorEmLoteService):
         Returns:
             ContaResult: Resultado do processamento
         """
+        ativas = get_metrics().gauge(ACTIVE_ACCOUNTS_METRIC)
+        ativas.inc()
         try:
             return self._processor.process(conta, acoes, proxy)
         except Exception as e:
@@ -592,6 +692,8 @@ class ExecutorEmLote(BaseService, IExecutorEmLoteService):
                 erro_fatal=f"Erro no wrapper: {str(e)}",
                 proxy_usado=proxy.tag if proxy else None
             )
+        finally:
+            ativas.dec()
     
     def _log_resumo(self, resumo: BatchExecutionResult) -> None:
         """
@@ -615,9 +717,32 @@ class ExecutorEmLote(BaseService, IExecutorEmLoteService):
         taxa = (resumo.contas_sucesso / resumo.total_contas * 100) if resumo.total_contas > 0 else 0
         tabela_geral.add_row("Taxa de Sucesso", f"[bold]{taxa:.1f}%[/bold]")
         
+        economias = [r.economia_recursos for r in resumo.resultados_detalhados if r.economia_recursos]
+        if economias:
+            bytes_total = sum(e.bytes_economizados for e in economias)
+            ms_total = sum(e.tempo_economizado_ms for e in economias)
+            tabela_geral.add_row("Economia (bloqueio)", f"~{self._formatar_bytes(bytes_total)} / ~{ms_total:.0f} ms")
+        
         console.print("\n")
         console.print(tabela_geral)
         
+        # Latência por etapa (todas as execuções do processo)
+        latencias = get_metrics().snapshot(STAGE_DURATION_METRIC)[STAGE_DURATION_METRIC]
+        if latencias:
+            console.print("\n")
+            tabela_etapas = Table(title="⏱️ Latência por Etapa", box=box.ROUNDED, show_header=True, header_style="bold magenta")
+            tabela_etapas.add_column("Etapa", style="cyan", width=20)
+            tabela_etapas.add_column("Execuções", justify="right")
+            for coluna in ("p50", "p95", "p99", "Máx"):
+                tabela_etapas.add_column(coluna, justify="right", style="yellow")
+            for rotulos, dados in sorted(latencias.items(), key=lambda item: -item[1]["total"]):
+                tabela_etapas.add_row(
+                    dict(rotulos).get("etapa", "-"),
+                    str(dados["count"]),
+                    *(self._formatar_duracao(dados[chave]) for chave in ("p50", "p95", "p99", "max")),
+                )
+            console.print(tabela_etapas)
+        
         # Tabela detalhada de contas
         if resumo.resultados_detalhados:
             console.print("\n")
@@ -633,6 +758,8 @@ class ExecutorEmLote(BaseService, IExecutorEmLoteService):
             tabela_contas.add_column("Pts Ganhos", justify="right", style="green bold", width=11)
             tabela_contas.add_column("Etapas ✓", justify="center", style="green", width=9)
             tabela_contas.add_column("Etapas ✗", justify="center", style="red", width=9)
+            if economias:
+                tabela_contas.add_column("Economia", justify="right", style="blue", width=22)
             
             if self._config.debug:
                 tabela_contas.add_column("Erro", style="red dim", width=40)
@@ -653,6 +780,13 @@ class ExecutorEmLote(BaseService, IExecutorEmLoteService):
                     str(etapas_falha)
                 ]
                 
+                if economias:
+                    eco = resultado.economia_recursos
+                    row_data.append(
+                        f"{self._formatar_bytes(eco.bytes_economizados)} / {eco.tempo_economizado_ms:.0f} ms"
+                        if eco else "-"
+                    )
+                
                 if self._config.debug:
                     erro = resultado.erro_fatal or "-"
                     if erro and len(erro) > 40:
@@ -680,6 +814,20 @@ class ExecutorEmLote(BaseService, IExecutorEmLoteService):
         console.print("\n")
 
 
+    @staticmethod
+    def _formatar_duracao(segundos: float) -> str:
+        """Formata duração em ms ou s."""
+        return f"{segundos * 1000:.0f} ms" if segundos < 1 else f"{segundos:.2f} s"
+
+    @staticmethod
+    def _formatar_bytes(valor: float) -> str:
+        """Formata quantidade de bytes em unidade legível."""
+        for unidade in ("B", "KB", "MB"):
+            if abs(valor) < 1024:
+                return f"{valor:.0f} {unidade}" if unidade == "B" else f"{valor:.1f} {unidade}"
+            valor /= 1024
+        return f"{valor:.1f} GB"
+
     @staticmethod
     def _normalizar_acoes(acoes: Iterable[str]) -> List[str]:
         """
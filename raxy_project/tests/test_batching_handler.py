@@ -0,0 +1,187 @@
+"""Testes do BatchingHandler: escrita em lote e políticas de backpressure."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from raxy.core.config import LEVEL_VALUES
+from raxy.core.exceptions import InvalidConfigException
+from raxy.core.logging.handlers import BatchingHandler, LogHandler
+
+DEBUG = LEVEL_VALUES["DEBUG"]
+INFO = LEVEL_VALUES["INFO"]
+WARNING = LEVEL_VALUES["WARNING"]
+
+
+class Destino(LogHandler):
+    """Grava os lotes em memória; ``liberado`` segura a escrita para encher a fila."""
+
+    def __init__(self):
+        super().__init__()
+        self.lotes = []
+        self.liberado = threading.Event()
+        self.liberado.set()
+        self.escrevendo = threading.Event()
+        self.fechado = False
+
+    def emit(self, record):
+        self.emit_batch([record])
+
+    def emit_batch(self, records):
+        self.escrevendo.set()
+        self.liberado.wait(5)
+        self.lotes.append([r["message"] for r in records])
+
+    def close(self):
+        self.fechado = True
+
+    @property
+    def mensagens(self):
+        return [m for lote in self.lotes for m in lote]
+
+
+def _registro(mensagem, nivel=INFO):
+    return {"level": nivel, "message": mensagem, "timestamp": datetime.now(), "context": {}}
+
+
+@pytest.fixture
+def destino():
+    return Destino()
+
+
+def _ocupar_escritor(handler, destino):
+    """Prende a thread escritora num lote de um registro; a fila fica livre para encher."""
+    destino.liberado.clear()
+    handler.emit(_registro("ocupando"))
+    assert destino.escrevendo.wait(5)
+
+
+def _em_espera(alvo):
+    """Roda ``alvo`` numa thread e confirma que ela ficou bloqueada."""
+    thread = threading.Thread(target=alvo)
+    thread.start()
+    thread.join(0.1)
+    assert thread.is_alive()
+    return thread
+
+
+def test_politica_invalida(destino):
+    with pytest.raises(InvalidConfigException):
+        BatchingHandler(destino, policy="descartar_tudo")
+
+
+def test_grava_em_lotes_na_ordem(destino):
+    handler = BatchingHandler(destino, batch_size=50, flush_interval=0.05)
+    for i in range(120):
+        handler.emit(_registro(f"m{i}"))
+    handler.flush()
+    assert destino.mensagens == [f"m{i}" for i in range(120)]
+    assert len(destino.lotes) < 120
+    stats = handler.stats()
+    assert (stats["enqueued"], stats["written"], stats["dropped"], stats["pending"]) == (120, 120, 0, 0)
+    handler.close()
+    assert destino.fechado
+
+
+def test_block_espera_espaco_sem_perder_registros(destino):
+    handler = BatchingHandler(destino, batch_size=1, flush_interval=0, capacity=2, policy="block")
+    _ocupar_escritor(handler, destino)
+    handler.emit(_registro("a", DEBUG))
+    handler.emit(_registro("b", DEBUG))
+
+    produtor = _em_espera(lambda: handler.emit(_registro("c", DEBUG)))
+    destino.liberado.set()
+    produtor.join(5)
+    handler.flush()
+    assert destino.mensagens == ["ocupando", "a", "b", "c"]
+    assert handler.stats()["dropped"] == 0
+    handler.close()
+
+
+def test_drop_debug_descarta_debug_e_informa(destino):
+    handler = BatchingHandler(destino, batch_size=1, flush_interval=0, capacity=2, policy="drop_debug")
+    _ocupar_escritor(handler, destino)
+    handler.emit(_registro("debug antigo", DEBUG))
+    handler.emit(_registro("info", INFO))
+
+    # Fila cheia: DEBUG novo é descartado na hora
+    handler.emit(_registro("debug novo", DEBUG))
+    # INFO abre espaço descartando o DEBUG mais antigo da fila
+    handler.emit(_registro("info 2", INFO))
+    assert handler.stats()["dropped"] == 2
+
+    destino.liberado.set()
+    handler.flush()
+    assert destino.mensagens[:3] == ["ocupando", "info", "info 2"]
+    assert destino.mensagens[3] == "2 registro(s) de log descartado(s) por backpressure (drop_debug)"
+    handler.close()
+
+
+def test_drop_debug_sem_debug_na_fila_espera(destino):
+    handler = BatchingHandler(destino, batch_size=1, flush_interval=0, capacity=2, policy="drop_debug")
+    _ocupar_escritor(handler, destino)
+    handler.emit(_registro("i1"))
+    handler.emit(_registro("i2"))
+
+    produtor = _em_espera(lambda: handler.emit(_registro("aviso", WARNING)))
+    destino.liberado.set()
+    produtor.join(5)
+    handler.flush()
+    assert destino.mensagens == ["ocupando", "i1", "i2", "aviso"]
+    handler.close()
+
+
+def test_sample_mantem_um_a_cada_n_abaixo_de_warning(destino):
+    handler = BatchingHandler(destino, batch_size=1, flush_interval=0, capacity=2, policy="sample", sample_every=2)
+    _ocupar_escritor(handler, destino)
+    handler.emit(_registro("i1"))
+    handler.emit(_registro("i2"))
+
+    # 1º registro com a fila cheia: fora da amostra
+    handler.emit(_registro("descartado"))
+    assert handler.stats()["dropped"] == 1
+    # 2º: amostrado, espera espaço como em block
+    amostrado = _em_espera(lambda: handler.emit(_registro("amostrado")))
+    destino.liberado.set()
+    amostrado.join(5)
+    handler.flush()
+    # O aviso de descarte sai no lote que esvaziou a fila; o amostrado entra depois
+    assert destino.mensagens == [
+        "ocupando", "i1", "i2",
+        "1 registro(s) de log descartado(s) por backpressure (sample)",
+        "amostrado",
+    ]
+    handler.close()
+
+
+def test_sample_nunca_descarta_warning(destino):
+    handler = BatchingHandler(destino, batch_size=1, flush_interval=0, capacity=2, policy="sample", sample_every=1000)
+    _ocupar_escritor(handler, destino)
+    handler.emit(_registro("i1"))
+    handler.emit(_registro("i2"))
+
+    avisos = _em_espera(lambda: [handler.emit(_registro(f"aviso {i}", WARNING)) for i in range(3)])
+    destino.liberado.set()
+    avisos.join(5)
+    handler.flush()
+    assert destino.mensagens == ["ocupando", "i1", "i2", "aviso 0", "aviso 1", "aviso 2"]
+    assert handler.stats()["dropped"] == 0
+    handler.close()
+
+
+def test_close_drena_e_descarta_depois(destino):
+    handler = BatchingHandler(destino, batch_size=1000, flush_interval=10)
+    for i in range(10):
+        handler.emit(_registro(f"m{i}"))
+    inicio = time.perf_counter()
+    handler.close()
+    # Não espera o intervalo de agrupamento para drenar
+    assert time.perf_counter() - inicio < 5
+    assert destino.mensagens == [f"m{i}" for i in range(10)] and destino.fechado
+
+    handler.emit(_registro("tarde"))
+    assert handler.stats()["dropped"] == 1 and "tarde" not in destino.mensagens
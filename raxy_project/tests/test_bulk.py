@@ -0,0 +1,169 @@
+"""Testes das operações em massa (database.bulk) sobre o MockDatabaseClient."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from raxy.core.exceptions import DatabaseException
+from raxy.infrastructure.database import bulk as bulk_mod
+from raxy.infrastructure.database.bulk import IN_CHUNK_SIZE, BulkConfig, com_retentativa, em_blocos
+from raxy.infrastructure.database.mock_database import MockDatabaseClient, PerfilLatencia
+
+
+def _linhas(n, prefixo="u"):
+    return [{"email": f"{prefixo}{i:05d}@x.com", "pontos": i} for i in range(n)]
+
+
+class MockConcorrencia(MockDatabaseClient):
+    """Mede quantos upserts em massa rodam ao mesmo tempo."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.em_curso = 0
+        self.pico = 0
+        self._contador = threading.Lock()
+
+    def upsert_rows(self, table, rows, on_conflict):
+        with self._contador:
+            self.em_curso += 1
+            self.pico = max(self.pico, self.em_curso)
+        try:
+            return super().upsert_rows(table, rows, on_conflict)
+        finally:
+            with self._contador:
+                self.em_curso -= 1
+
+
+def test_em_blocos():
+    assert list(em_blocos(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(em_blocos([], 3)) == []
+
+
+def test_upsert_many_divide_em_blocos():
+    cliente = MockDatabaseClient(bulk=BulkConfig(chunk_size=100, max_workers=1))
+    assert cliente.upsert_many("contas", _linhas(1050), "email") == 1050
+    assert cliente.requisicoes == 11
+    assert cliente.get_table_count("contas") == 1050
+
+    # Segundo envio atualiza pela coluna de conflito, sem duplicar
+    cliente.upsert_many("contas", [{**r, "pontos": -1} for r in _linhas(1050)], "email")
+    assert cliente.get_table_count("contas") == 1050
+    assert cliente.select("contas", filters={"email": "u00042@x.com"})[0]["pontos"] == -1
+    assert cliente.upsert_many("contas", [], "email") == 0
+
+
+def test_upsert_many_paralelo():
+    # Latência fixa (p50 == p99): os blocos só se sobrepõem se rodarem em paralelo
+    perfil = PerfilLatencia(p50=0.02, p99=0.02, semente=1)
+    cliente = MockConcorrencia(bulk=BulkConfig(chunk_size=50, max_workers=4), perfil=perfil)
+    inicio = time.perf_counter()
+    assert cliente.upsert_many("contas", _linhas(400), "email") == 400
+    decorrido = time.perf_counter() - inicio
+    assert cliente.pico > 1
+    assert decorrido < 8 * 0.02
+    assert cliente.get_table_count("contas") == 400
+
+
+def test_upsert_many_paralelo_com_falhas_injetadas():
+    perfil = PerfilLatencia(taxa_erro=0.2, semente=7)
+    config = BulkConfig(chunk_size=50, max_workers=4, max_retries=10, backoff_base=0.0001, backoff_max=0.001)
+    cliente = MockDatabaseClient(bulk=config, perfil=perfil)
+    assert cliente.upsert_many("contas", _linhas(1000), "email") == 1000
+    assert cliente.get_table_count("contas") == 1000
+    assert cliente.falhas_injetadas > 0
+    # Cada falha custou exatamente uma requisição extra
+    assert cliente.requisicoes == 20 + cliente.falhas_injetadas
+
+
+def test_upsert_many_propaga_falha_apos_retentativas():
+    perfil = PerfilLatencia(taxa_erro=1.0, semente=3)
+    cliente = MockDatabaseClient(bulk=BulkConfig(max_retries=2, backoff_base=0.0001), perfil=perfil)
+    with pytest.raises(DatabaseException):
+        cliente.upsert_many("contas", _linhas(10), "email")
+    assert cliente.requisicoes == 3
+
+
+@pytest.mark.parametrize("total, paginas", [(2500, 3), (2000, 3), (0, 1)])
+def test_iter_select_pagina_por_chave(total, paginas):
+    cliente = MockDatabaseClient(bulk=BulkConfig(page_size=1000))
+    cliente.upsert_many("contas", _linhas(total), "email")
+    antes = cliente.requisicoes
+
+    lidas = list(cliente.iter_select("contas", columns="pontos"))
+    assert [r["email"] for r in lidas] == sorted(r["email"] for r in _linhas(total))
+    # A coluna de ordenação entra na projeção
+    assert all(set(r) == {"email", "pontos"} for r in lidas)
+    assert cliente.requisicoes - antes == paginas
+
+
+def test_iter_select_retoma_e_filtra():
+    cliente = MockDatabaseClient(bulk=BulkConfig(page_size=7))
+    cliente.upsert_many("contas", _linhas(30), "email")
+    retomadas = list(cliente.iter_select("contas", after="u00019@x.com"))
+    assert [r["email"] for r in retomadas] == [f"u{i:05d}@x.com" for i in range(20, 30)]
+
+    maiores = list(cliente.iter_select("contas", greater_than={"pontos": 25}))
+    assert [r["pontos"] for r in maiores] == [26, 27, 28, 29]
+
+
+def test_iter_select_com_falhas_injetadas_le_tudo():
+    perfil = PerfilLatencia(taxa_erro=0.3, semente=11)
+    config = BulkConfig(page_size=100, max_retries=10, backoff_base=0.0001, backoff_max=0.001)
+    cliente = MockDatabaseClient(bulk=config)
+    cliente.upsert_many("contas", _linhas(1000), "email")
+    cliente.definir_perfil(perfil)
+    assert len(list(cliente.iter_select("contas"))) == 1000
+    assert cliente.falhas_injetadas > 0
+
+
+def test_select_many_em_blocos():
+    cliente = MockDatabaseClient()
+    cliente.upsert_many("contas", _linhas(500), "email")
+    antes = cliente.requisicoes
+    procurados = [f"u{i:05d}@x.com" for i in range(0, 900, 2)]  # 450 valores, metade existe
+    encontrados = cliente.select_many("contas", "email", procurados, columns="email")
+    assert len(encontrados) == 250
+    assert cliente.requisicoes - antes == -(-len(procurados) // IN_CHUNK_SIZE)
+
+
+class Falhas:
+    """Operação que falha ``n`` vezes antes de dar certo."""
+
+    def __init__(self, n):
+        self.n = n
+        self.chamadas = 0
+
+    def __call__(self):
+        self.chamadas += 1
+        if self.chamadas <= self.n:
+            raise ConnectionError("timeout")
+        return "ok"
+
+
+def test_com_retentativa_backoff_exponencial(monkeypatch):
+    # Jitter no teto: espera = min(maximo, base * 2 ** tentativa)
+    monkeypatch.setattr(bulk_mod.random, "uniform", lambda a, b: b)
+    esperas = []
+    func = Falhas(4)
+    assert com_retentativa(func, tentativas=5, base=0.5, maximo=3.0, sleep=esperas.append) == "ok"
+    assert esperas == [0.5, 1.0, 2.0, 3.0]
+    assert func.chamadas == 5
+
+
+def test_com_retentativa_jitter_dentro_do_teto():
+    esperas = []
+    com_retentativa(Falhas(6), tentativas=6, base=0.1, maximo=1.0, sleep=esperas.append)
+    tetos = [min(1.0, 0.1 * 2 ** i) for i in range(6)]
+    assert all(0 <= espera <= teto for espera, teto in zip(esperas, tetos))
+
+
+def test_com_retentativa_esgota():
+    esperas = []
+    func = Falhas(10)
+    with pytest.raises(DatabaseException) as erro:
+        com_retentativa(func, tentativas=2, base=0.1, maximo=1.0, descricao="upsert em contas", sleep=esperas.append)
+    assert func.chamadas == 3 and len(esperas) == 2
+    assert "upsert em contas" in str(erro.value)
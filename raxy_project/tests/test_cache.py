@@ -0,0 +1,135 @@
+"""Testes do cache de consultas de conta (CachedContaRepository)."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from raxy.infrastructure.database import cache as cache_mod
+from raxy.infrastructure.database.cache import CachedContaRepository
+from raxy.infrastructure.database.sqlite import SQLiteRepository
+from raxy.infrastructure.database.write_behind import RegistroFarm
+from raxy.models import Conta
+
+
+class RepositorioContador:
+    """Repositório em memória que conta as consultas."""
+
+    def __init__(self):
+        self.contas = {}
+        self.consultas = 0
+
+    def consultar_conta(self, email):
+        self.consultas += 1
+        conta = self.contas.get(email)
+        return dict(conta) if conta else None
+
+    def adicionar_registro_farm(self, email, pontos):
+        self.contas.setdefault(email, {"email": email})["pontos"] = pontos
+        return self.contas[email]
+
+    def salvar(self, conta):
+        self.contas[conta.email] = {"email": conta.email, "pontos": 0}
+        return conta
+
+    def remover(self, conta):
+        self.contas.pop(conta.email, None)
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 100.0
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(cache_mod.time, "monotonic", relogio)
+    return relogio
+
+
+@pytest.fixture
+def base():
+    repo = RepositorioContador()
+    repo.contas["a@x.com"] = {"email": "a@x.com", "pontos": 10}
+    return repo
+
+
+def test_segunda_consulta_vem_da_memoria(base, relogio):
+    repo = CachedContaRepository(base, ttl=60)
+    assert repo.consultar_conta("a@x.com")["pontos"] == 10
+    assert repo.consultar_conta("a@x.com")["pontos"] == 10
+    assert base.consultas == 1
+    assert repo.stats.acertos == 1 and repo.stats.falhas == 1 and repo.stats.taxa_acerto == 0.5
+
+
+def test_copia_protege_o_cache(base, relogio):
+    repo = CachedContaRepository(base)
+    repo.consultar_conta("a@x.com")["pontos"] = -1
+    assert repo.consultar_conta("a@x.com")["pontos"] == 10
+
+
+def test_ttl_expira(base, relogio):
+    repo = CachedContaRepository(base, ttl=60)
+    repo.consultar_conta("a@x.com")
+    relogio.agora += 61
+    repo.consultar_conta("a@x.com")
+    assert base.consultas == 2 and repo.stats.expirados == 1
+
+
+def test_ausentes_nao_sao_guardados(base, relogio):
+    repo = CachedContaRepository(base)
+    assert repo.consultar_conta("z@x.com") is None
+    assert repo.consultar_conta("z@x.com") is None
+    assert base.consultas == 2
+
+
+def test_lru_descarta_a_menos_usada(base, relogio):
+    for email in ("b@x.com", "c@x.com"):
+        base.contas[email] = {"email": email, "pontos": 0}
+    repo = CachedContaRepository(base, max_itens=2)
+    repo.consultar_conta("a@x.com")
+    repo.consultar_conta("b@x.com")
+    repo.consultar_conta("a@x.com")  # a@ passa a ser a mais recente
+    repo.consultar_conta("c@x.com")  # descarta b@
+    base.consultas = 0
+    repo.consultar_conta("a@x.com")
+    repo.consultar_conta("b@x.com")
+    assert base.consultas == 1 and repo.stats.descartados >= 1
+
+
+@pytest.mark.parametrize("escrever", [
+    lambda repo: repo.adicionar_registro_farm("a@x.com", 50),
+    lambda repo: repo.adicionar_registros_farm([RegistroFarm("a@x.com", 50, datetime.now(timezone.utc))]),
+    lambda repo: repo.salvar(Conta(email="a@x.com", senha="s")),
+    lambda repo: repo.remover(Conta(email="a@x.com", senha="s")),
+    lambda repo: repo.invalidar(),
+])
+def test_escritas_pelo_wrapper_invalidam(base, relogio, escrever):
+    repo = CachedContaRepository(base)
+    repo.consultar_conta("a@x.com")
+    escrever(repo)
+    repo.consultar_conta("a@x.com")
+    assert base.consultas == 2
+
+
+def test_lote_sem_suporte_grava_por_registro(base, relogio):
+    # RepositorioContador não tem adicionar_registros_farm
+    repo = CachedContaRepository(base)
+    agora = datetime.now(timezone.utc)
+    gravados = repo.adicionar_registros_farm([RegistroFarm("a@x.com", 1, agora), RegistroFarm("b@x.com", 2, agora)])
+    assert gravados == 2 and base.contas["b@x.com"]["pontos"] == 2
+
+
+def test_sqlite_ve_resultado_de_farm_apos_invalidacao(tmp_path):
+    sqlite = SQLiteRepository(tmp_path / "raxy.db")
+    sqlite.salvar(Conta(email="a@x.com", senha="s"))
+    repo = CachedContaRepository(sqlite)
+    assert repo.consultar_conta("a@x.com")["pontos"] == 0
+    repo.adicionar_registros_farm([RegistroFarm("a@x.com", 1500, datetime.now(timezone.utc))])
+    assert repo.consultar_conta("a@x.com")["pontos"] == 1500
+    sqlite.close()
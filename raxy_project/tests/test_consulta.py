@@ -0,0 +1,103 @@
+"""Testes dos filtros e da paginação de contas (database.consulta)."""
+
+from __future__ import annotations
+
+import pytest
+
+from raxy.core.exceptions import ValidationException
+from raxy.infrastructure.database.consulta import (
+    Condicao,
+    FiltroContas,
+    listar_para_execucao,
+    parse_condicao,
+    validar_colunas,
+)
+from raxy.infrastructure.database.sqlite import SQLiteRepository
+from raxy.models import Conta
+
+
+@pytest.mark.parametrize("expressao, esperado", [
+    ("status=active", Condicao("status", "=", "active")),
+    (" pontos >= 5000 ", Condicao("pontos", ">=", 5000)),
+    ("pontos<10", Condicao("pontos", "<", 10)),
+    ("ultima_farm<2026-10-01", Condicao("ultima_farm", "<", "2026-10-01")),
+    ("ultima_farm=null", Condicao("ultima_farm", "=", None)),
+    ("status!=NULL", Condicao("status", "!=", None)),
+    ("email=a=b@x.com", Condicao("email", "=", "a=b@x.com")),
+])
+def test_parse_condicao(expressao, esperado):
+    assert parse_condicao(expressao) == esperado
+
+
+@pytest.mark.parametrize("expressao", [
+    "status",
+    "senha=abc",
+    "pontos>=muitos",
+    "pontos>null",
+    "Status=active",
+])
+def test_parse_condicao_invalida(expressao):
+    with pytest.raises(ValidationException):
+        parse_condicao(expressao)
+
+
+def test_filtro_para_sql():
+    filtro = FiltroContas.de_expressoes(["status=active", "pontos>=1000", "ultima_farm=null"])
+    assert filtro.para_sql() == ("status = ? AND pontos >= ? AND ultima_farm IS NULL", ["active", 1000])
+    assert FiltroContas.de_expressoes(["ultima_farm!=null"]).para_sql() == ("ultima_farm IS NOT NULL", [])
+    assert not FiltroContas()
+
+
+def test_filtro_de_atalhos():
+    filtro = FiltroContas.de(status="active", pontos_min=1, pontos_max=9, farm_desde="a", farm_antes="b")
+    assert [(c.campo, c.operador) for c in filtro.condicoes] == [
+        ("status", "="), ("pontos", ">="), ("pontos", "<="), ("ultima_farm", ">="), ("ultima_farm", "<"),
+    ]
+
+
+def test_validar_colunas():
+    disponiveis = ["email", "senha", "pontos"]
+    assert validar_colunas("pontos", disponiveis) == ["email", "pontos"]
+    assert validar_colunas("*", disponiveis) == disponiveis
+    with pytest.raises(ValidationException):
+        validar_colunas("pontos,cor", disponiveis)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = SQLiteRepository(tmp_path / "raxy.db")
+    repo.salvar_varias([Conta(email=f"u{i:02d}@x.com", senha="s") for i in range(25)])
+    with repo._connection() as conn:
+        conn.execute("UPDATE contas SET pontos = CAST(substr(email, 2, 2) AS INTEGER) * 100")
+        conn.execute("UPDATE contas SET status = 'banned' WHERE email IN ('u03@x.com', 'u07@x.com')")
+        conn.execute("UPDATE contas SET ultima_farm = '2026-10-01' WHERE email < 'u10@x.com'")
+    yield repo
+    repo.close()
+
+
+def test_paginacao_por_cursor(repo):
+    emails, cursor, paginas = [], None, 0
+    while True:
+        pagina = repo.consultar_contas(limite=10, cursor=cursor, colunas="email")
+        paginas += 1
+        emails.extend(item["email"] for item in pagina.itens)
+        assert all(set(item) == {"email"} for item in pagina.itens)
+        cursor = pagina.proximo_cursor
+        if cursor is None:
+            break
+    assert paginas == 3
+    assert emails == sorted(emails) and len(emails) == 25
+
+
+def test_consulta_filtrada(repo):
+    filtro = FiltroContas.de_expressoes(["status=active", "pontos>=500", "ultima_farm!=null"])
+    pagina = repo.consultar_contas(filtro, colunas="email,pontos", limite=100)
+    assert [i["email"] for i in pagina.itens] == ["u05@x.com", "u06@x.com", "u08@x.com", "u09@x.com"]
+    nunca = repo.consultar_contas(FiltroContas.de_expressoes(["ultima_farm=null"]), limite=100)
+    assert len(nunca.itens) == 15
+
+
+def test_listar_para_execucao_projeta_colunas_de_conta(repo):
+    contas = listar_para_execucao(repo)
+    assert len(contas) == 25 and all(isinstance(c, Conta) for c in contas)
+    assert contas[5].pontos == 500
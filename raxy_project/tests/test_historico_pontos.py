@@ -0,0 +1,144 @@
+"""Testes do histórico de pontuação e dos agregados diário/semanal."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date, datetime, timezone
+
+import pytest
+
+from raxy.infrastructure.database.historico_pontos import (
+    MIGRACOES_HISTORICO,
+    SQLiteHistoricoPontuacaoRepository,
+)
+from raxy.infrastructure.database.migracoes import migrar
+from raxy.infrastructure.database.write_behind import RegistroFarm
+from raxy.models import Conta
+
+
+def _registro(email, pontos, dia, hora):
+    return RegistroFarm(email, pontos, datetime(2026, 10, dia, hora, tzinfo=timezone.utc))
+
+
+@pytest.fixture
+def historico(tmp_path):
+    repo = SQLiteHistoricoPontuacaoRepository(tmp_path / "raxy.db")
+    # 12/10/2026 é segunda-feira: 12 e 13 caem na mesma semana, 19 na seguinte
+    repo.registrar_varios([
+        _registro("a@x.com", 100, 12, 8),
+        _registro("a@x.com", 150, 12, 12),
+        _registro("a@x.com", 120, 13, 8),   # resgate: queda não desconta
+        _registro("a@x.com", 200, 13, 12),
+        _registro("a@x.com", 260, 19, 8),
+        _registro("b@x.com", 1000, 13, 9),
+        _registro("b@x.com", 1010, 13, 10),
+    ])
+    yield repo
+    repo.close()
+
+
+def _por_periodo(itens):
+    return {item["periodo"]: item for item in itens}
+
+
+def test_agregados_diarios(historico):
+    dias = _por_periodo(historico.agregados("diario"))
+    assert list(dias) == ["2026-10-12", "2026-10-13", "2026-10-19"]
+    assert dias["2026-10-12"] == {"periodo": "2026-10-12", "contas": 1, "registros": 2, "ganhos": 50, "pontos_fim": 150}
+    assert dias["2026-10-13"]["contas"] == 2
+    assert dias["2026-10-13"]["ganhos"] == 80 + 10
+    assert dias["2026-10-13"]["pontos_fim"] == 200 + 1010
+
+
+def test_agregados_semanais(historico):
+    semanas = _por_periodo(historico.agregados("semanal", email="a@x.com"))
+    assert semanas["2026-10-12"]["registros"] == 4 and semanas["2026-10-12"]["ganhos"] == 130
+    assert semanas["2026-10-19"]["ganhos"] == 60 and semanas["2026-10-19"]["pontos_fim"] == 260
+    # desde no meio da semana inclui a semana inteira
+    assert [s["periodo"] for s in historico.agregados("semanal", desde=date(2026, 10, 14))] == [
+        "2026-10-12", "2026-10-19",
+    ]
+
+
+def test_filtro_de_periodo_e_periodo_invalido(historico):
+    dias = historico.agregados("diario", desde=date(2026, 10, 13), ate=date(2026, 10, 13))
+    assert [d["periodo"] for d in dias] == ["2026-10-13"]
+    with pytest.raises(ValueError):
+        historico.agregados("mensal")
+
+
+def test_ultimo_total(historico):
+    assert historico.obter_ultimo_total(Conta(email="a@x.com", senha="s")) == 260
+    assert historico.obter_ultimo_total(Conta(email="z@x.com", senha="s")) is None
+
+
+def test_fora_de_ordem_e_repetido_nao_movem_agregados(historico):
+    antes = historico.agregados("diario", email="a@x.com")
+    assert historico.registrar_varios([
+        _registro("a@x.com", 50, 12, 10),    # anterior ao último total
+        _registro("a@x.com", 260, 19, 8),    # mesmo registro de novo
+    ]) == 0
+    assert historico.agregados("diario", email="a@x.com") == antes
+    assert historico.obter_ultimo_total(Conta(email="a@x.com", senha="s")) == 260
+    assert len(historico.historico("a@x.com")) == 6
+
+
+def test_historico_por_conta_e_poda(historico):
+    registros = historico.historico("a@x.com", desde=date(2026, 10, 13), ate=date(2026, 10, 13))
+    assert [(r["pontos"], r["ganhos"]) for r in registros] == [(120, 0), (200, 80)]
+
+    assert historico.podar(date(2026, 10, 19)) == 6
+    assert [r["pontos"] for r in historico.historico("a@x.com")] == [260]
+    # Agregados e último total sobrevivem à poda
+    assert len(historico.agregados("diario")) == 3
+
+
+def test_registrar_pontos_usa_o_instante_atual(tmp_path):
+    repo = SQLiteHistoricoPontuacaoRepository(tmp_path / "raxy.db")
+    conta = Conta(email="a@x.com", senha="s")
+    repo.registrar_pontos(conta, 10)
+    repo.registrar_pontos(conta, 25)
+    hoje = repo.agregados("diario", desde=datetime.now(timezone.utc).date())
+    assert hoje[0]["ganhos"] == 15 and hoje[0]["registros"] == 2
+    repo.close()
+
+
+def test_historico_filtra_pelo_dia_utc(tmp_path):
+    repo = SQLiteHistoricoPontuacaoRepository(tmp_path / "raxy.db")
+    repo.registrar_varios([
+        RegistroFarm("a@x.com", 10, datetime(2026, 10, 12, 23, 59, 59, 999999, tzinfo=timezone.utc)),
+        RegistroFarm("a@x.com", 20, datetime(2026, 10, 13, 0, 0, tzinfo=timezone.utc)),
+        RegistroFarm("a@x.com", 30, datetime(2026, 10, 13, 23, 59, 59, 999999, tzinfo=timezone.utc)),
+        RegistroFarm("a@x.com", 40, datetime(2026, 10, 14, 0, 0, tzinfo=timezone.utc)),
+    ])
+    assert [r["pontos"] for r in repo.historico("a@x.com", desde=date(2026, 10, 13), ate=date(2026, 10, 13))] == [20, 30]
+    assert [r["pontos"] for r in repo.historico("a@x.com", desde=date(2026, 10, 13))] == [20, 30, 40]
+    assert [r["pontos"] for r in repo.historico("a@x.com", ate=date(2026, 10, 12))] == [10]
+
+    # Busca no índice por conta e dia, sem etapa de ordenação
+    with repo._connections.connection() as conn:
+        plano = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT dia, registrado_em FROM pontos_historico "
+            "WHERE email = ? AND dia >= ? AND dia <= ? ORDER BY dia, registrado_em",
+            ("a@x.com", "2026-10-13", "2026-10-13"),
+        ))
+    assert "idx_pontos_historico_email_dia (email=? AND dia>? AND dia<?)" in plano
+    assert "TEMP B-TREE" not in plano
+    repo.close()
+
+
+def test_migracao_troca_o_indice_por_email(tmp_path):
+    caminho = tmp_path / "raxy.db"
+    conn = sqlite3.connect(caminho, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    # Banco criado antes da migração 2, com o índice antigo (email, registrado_em)
+    migrar(conn, "historico_pontos", MIGRACOES_HISTORICO[:1])
+    conn.close()
+
+    repo = SQLiteHistoricoPontuacaoRepository(caminho)
+    with repo._connections.connection() as conn:
+        indices = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'pontos_historico'"
+        ) if not row[0].startswith("sqlite_autoindex")}
+    assert indices == {"idx_pontos_historico_email_dia"}
+    repo.close()
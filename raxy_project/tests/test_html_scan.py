@@ -0,0 +1,74 @@
+"""Testes do varredor de campos em HTML (raxy.core.html_scan)."""
+
+from __future__ import annotations
+
+import pytest
+
+from raxy.core.html_scan import HTMLFieldScanner, input_value_field, json_string_field
+
+HTML = """
+<html><body>
+<form>
+  <input type="hidden" value="tok-123" name="__RequestVerificationToken">
+  <input name="outro" value="x">
+</form>
+<script>var cfg = {"userId" : "u-1", "offerId":"o-9", "userId":"u-2"};</script>
+</body></html>
+"""
+
+
+def test_campos_em_uma_varredura():
+    scanner = HTMLFieldScanner({
+        "userId": json_string_field("userId"),
+        "offerId": json_string_field("offerId"),
+        "token": input_value_field("__RequestVerificationToken"),
+    })
+    assert scanner.scan(HTML) == {"token": "tok-123", "userId": "u-1", "offerId": "o-9"}
+
+
+def test_primeira_ocorrencia_vence():
+    scanner = HTMLFieldScanner({"userId": json_string_field("userId")})
+    assert scanner.scan(HTML) == {"userId": "u-1"}
+
+
+def test_input_em_qualquer_ordem_de_atributos():
+    scanner = HTMLFieldScanner({"v": input_value_field("campo")})
+    assert scanner.scan('<input name="campo" value="a">') == {"v": "a"}
+    assert scanner.scan("<input value='b' type=hidden name='campo'>") == {"v": "b"}
+
+
+def test_subconjunto_e_ausentes():
+    scanner = HTMLFieldScanner({"userId": json_string_field("userId"), "sku": json_string_field("sku")})
+    assert scanner.scan(HTML, ["sku"]) == {}
+    assert scanner.scan(HTML) == {"userId": "u-1"}
+    assert scanner.scan("") == {}
+    assert scanner.scan(None) == {}
+
+
+def test_chave_com_caracteres_especiais_e_escapada():
+    scanner = HTMLFieldScanner({"k": json_string_field("a.b")})
+    assert scanner.scan('{"aXb":"nao", "a.b":"sim"}') == {"k": "sim"}
+
+
+@pytest.mark.parametrize("fields", [{}, {"x": r"sem grupo"}, {"x": r"(a)(b)"}])
+def test_padroes_invalidos(fields):
+    with pytest.raises(ValueError):
+        HTMLFieldScanner(fields)
+
+
+def test_input_ignora_atributos_data():
+    scanner = HTMLFieldScanner({"v": input_value_field("campo")})
+    assert scanner.scan('<input data-name="campo" value="errado"><input name="campo" value="certo">') == {"v": "certo"}
+    assert scanner.scan('<input name="campo" data-value="errado" value="certo">') == {"v": "certo"}
+
+
+def test_scan_scripts_ignora_ocorrencias_fora_de_scripts():
+    scanner = HTMLFieldScanner({"userId": json_string_field("userId"), "sku": json_string_field("sku")})
+    html = (
+        '<div data-cfg=\'{"userId":"atributo"}\'></div><!-- {"sku":"comentario"} -->'
+        '<SCRIPT type="text/javascript">{"userId":"u-1"}</SCRIPT><script>{"sku":"s-1"}</script >'
+    )
+    assert scanner.scan(html) == {"userId": "atributo", "sku": "comentario"}
+    assert scanner.scan_scripts(html) == {"userId": "u-1", "sku": "s-1"}
+    assert scanner.scan_scripts(html, ["sku"]) == {"sku": "s-1"}
+    assert scanner.scan_scripts("<p>sem scripts</p>") == {}
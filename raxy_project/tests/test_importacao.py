@@ -0,0 +1,119 @@
+"""Testes da importação de contas em fluxo (database.importacao)."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from raxy.core.exceptions import DataValidationException
+from raxy.infrastructure.database.importacao import (
+    ImportadorContas,
+    _chave_email,
+    gerar_id_perfil,
+    ler_contas,
+    parse_linha_conta,
+)
+from raxy.infrastructure.database.sqlite import SQLiteRepository
+from raxy.models import Conta
+
+
+class RepositorioFalho(SQLiteRepository):
+    """Falha ao salvar blocos que contenham ``falha@x.com``."""
+
+    def salvar_varias(self, contas):
+        if any(c.email == "falha@x.com" for c in contas):
+            raise RuntimeError("disco cheio")
+        return super().salvar_varias(contas)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = SQLiteRepository(tmp_path / "raxy.db")
+    yield repo
+    repo.close()
+
+
+def _arquivo(*linhas: str, encoding="utf-8") -> io.BytesIO:
+    return io.BytesIO("".join(f"{linha}\n" for linha in linhas).encode(encoding))
+
+
+def test_parse_linha_conta():
+    conta = parse_linha_conta("  Fulano.Silva@Outlook.com : s3nh4:com:dois-pontos ")
+    assert (conta.email, conta.senha) == ("Fulano.Silva@Outlook.com", "s3nh4:com:dois-pontos")
+    assert conta.id_perfil == gerar_id_perfil(conta.email) == "fulano.silva_at_outlook.com"
+
+
+@pytest.mark.parametrize("linha, motivo", [
+    ("semseparador", "Formato inválido"),
+    ("semarroba:senha", "Email inválido"),
+    ("a@x.com:   ", "Senha vazia"),
+])
+def test_parse_linha_conta_invalida(linha, motivo):
+    with pytest.raises(DataValidationException, match=motivo):
+        parse_linha_conta(linha)
+
+
+def test_ler_contas_reporta_erros_por_linha():
+    arquivo = io.BytesIO(b"# comentario\na@x.com:s\n\nruim\nb@x.com:s\n\xff\xfe:s\n")
+    linhas = list(ler_contas(arquivo))
+    assert [(l.numero, l.conta.email if l.conta else None) for l in linhas] == [
+        (2, "a@x.com"), (4, None), (5, "b@x.com"), (6, None),
+    ]
+    assert "Formato inválido" in linhas[1].erro
+    assert "Codificação inválida" in linhas[3].erro
+    # Posição: bytes lidos até o fim de cada linha
+    assert [l.posicao for l in linhas] == [23, 29, 39, 44]
+
+
+def test_chave_email_exata():
+    assert _chave_email("a@x.com") == _chave_email("a@x.com")
+    assert _chave_email("a@x.com") != _chave_email("A@x.com")
+    assert len(_chave_email("x" * 500 + "@x.com")) == 16
+
+
+def test_importacao_descarta_repetidas_no_arquivo(repo):
+    arquivo = _arquivo("a@x.com:1", "b@x.com:1", "a@x.com:2", "A@x.com:3", "b@x.com:1")
+    resultado = ImportadorContas(repo, lote=2).importar(ler_contas(arquivo))
+    assert (resultado.linhas, resultado.importadas, resultado.duplicadas_arquivo) == (5, 3, 2)
+    # Vale a primeira ocorrência; emails diferem por maiúsculas como na chave primária
+    assert repo.consultar_conta("a@x.com")["senha"] == "1"
+    assert repo.consultar_conta("A@x.com") is not None
+
+
+@pytest.mark.parametrize("atualizar, senha_final, existentes", [(False, "antiga", 1), (True, "nova", 0)])
+def test_importacao_contra_o_banco(repo, atualizar, senha_final, existentes):
+    repo.salvar(Conta(email="velha@x.com", senha="antiga"))
+    arquivo = _arquivo("velha@x.com:nova", "nova@x.com:s")
+    resultado = ImportadorContas(repo, atualizar_existentes=atualizar).importar(ler_contas(arquivo))
+    assert resultado.existentes == existentes
+    assert resultado.importadas == 2 - existentes
+    assert repo.consultar_conta("velha@x.com")["senha"] == senha_final
+    assert len(repo.listar()) == 2
+
+
+def test_importacao_registra_linhas_invalidas_ate_o_limite(repo):
+    arquivo = _arquivo(*[f"ruim{i}" for i in range(5)], "ok@x.com:s")
+    resultado = ImportadorContas(repo, max_erros=3).importar(ler_contas(arquivo))
+    assert (resultado.invalidas, resultado.importadas) == (5, 1)
+    assert [erro.numero for erro in resultado.erros] == [1, 2, 3]
+
+
+def test_falha_de_um_bloco_nao_interrompe_os_demais(tmp_path):
+    repo = RepositorioFalho(tmp_path / "raxy.db")
+    arquivo = _arquivo("a@x.com:s", "falha@x.com:s", "b@x.com:s", "c@x.com:s")
+    resultado = ImportadorContas(repo, lote=2).importar(ler_contas(arquivo))
+    assert (resultado.falhas, resultado.importadas) == (2, 2)
+    assert {c.email for c in repo.listar()} == {"b@x.com", "c@x.com"}
+    repo.close()
+
+
+def test_progresso_em_bytes(repo):
+    linhas = [f"conta{i:03d}@x.com:senha" for i in range(10)]
+    conteudo = _arquivo(*linhas)
+    tamanho = len(conteudo.getvalue())
+    posicoes = []
+    ImportadorContas(repo, lote=3).importar(ler_contas(conteudo), progresso=posicoes.append)
+    por_linha = tamanho // len(linhas)
+    # Um aviso por bloco, na posição da última linha do bloco
+    assert posicoes == [3 * por_linha, 6 * por_linha, 9 * por_linha, tamanho]
@@ -0,0 +1,120 @@
+"""Testes da camada de serialização JSON (raxy.core.json_codec)."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import pytest
+
+from raxy.core import json_codec
+
+
+def _backends():
+    nomes = []
+    for nome, classe in json_codec._CODEC_CLASSES.items():
+        try:
+            classe()
+        except ImportError:
+            continue
+        nomes.append(nome)
+    return nomes
+
+
+@pytest.fixture(params=_backends())
+def codec(request):
+    return json_codec._CODEC_CLASSES[request.param]()
+
+
+DOCUMENTO = {
+    "email": "usuário@exemplo.com",
+    "pontos": 12345,
+    "ativo": True,
+    "meta": None,
+    "taxa": 0.25,
+    "tags": ["a", "b"],
+    "aninhado": {"lista": [1, 2, {"x": "y"}]},
+}
+
+
+def test_round_trip_texto_e_bytes(codec):
+    assert codec.loads(codec.dumps(DOCUMENTO)) == DOCUMENTO
+    assert codec.loads(codec.dumps_bytes(DOCUMENTO)) == DOCUMENTO
+    assert codec.loads(memoryview(codec.dumps_bytes(DOCUMENTO))) == DOCUMENTO
+
+
+def test_nao_escapa_nao_ascii(codec):
+    assert "usuário" in codec.dumps({"e": "usuário"})
+
+
+def test_indentacao_preserva_conteudo(codec):
+    texto = codec.dumps(DOCUMENTO, indent=True)
+    assert "\n  " in texto
+    assert json.loads(texto) == DOCUMENTO
+
+
+def test_default_converte_tipos_desconhecidos(codec):
+    class Objeto:
+        pass
+
+    assert codec.loads(codec.dumps({"o": Objeto()}, default=lambda v: "convertido")) == {"o": "convertido"}
+
+
+def test_default_formata_datetime_exceto_msgspec(codec):
+    momento = datetime(2026, 1, 31, 8, 0, 0)
+    resultado = codec.loads(codec.dumps({"t": momento}, default=str))["t"]
+    if codec.name == "msgspec":
+        assert resultado == "2026-01-31T08:00:00"
+    else:
+        assert resultado == "2026-01-31 08:00:00"
+
+
+def test_erro_de_decodificacao_e_json_decode_error(codec):
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b"{invalido")
+
+
+def test_arquivo_round_trip(tmp_path, codec, monkeypatch):
+    monkeypatch.setattr(json_codec, "_codec", codec)
+    caminho = tmp_path / "dados.json"
+    json_codec.dump_file(caminho, DOCUMENTO)
+    assert json_codec.load_file(caminho) == DOCUMENTO
+
+
+def test_set_codec_por_nome(monkeypatch):
+    monkeypatch.setattr(json_codec, "_codec", None)
+    assert json_codec.set_codec("stdlib").name == "stdlib"
+    assert json_codec.get_codec().name == "stdlib"
+    with pytest.raises(ValueError):
+        json_codec.set_codec("inexistente")
+
+
+def test_typed_decoder_constroi_modelo():
+    decoder = json_codec.TypedDecoder(lambda dados: dados["n"] * 2, codec=json_codec.StdlibJSONCodec())
+    assert decoder.decode(b'{"n": 21}') == 42
+    assert decoder.build({"n": 1}) == 2
+
+
+@pytest.mark.parametrize("obj", [
+    {"grande": 2 ** 70, "negativo": -(2 ** 64)},
+    {"valores": [float("nan"), float("inf"), -float("inf")], "nulo": None},
+    {"aninhado": {"lista": [1, (2, float("nan"))]}},
+])
+def test_orjson_recai_no_stdlib_onde_diverge(obj):
+    pytest.importorskip("orjson")
+    codec = json_codec.OrjsonCodec()
+    stdlib = json_codec.StdlibJSONCodec()
+    assert codec.dumps(obj) == stdlib.dumps(obj)
+    assert codec.dumps(obj, indent=True) == stdlib.dumps(obj, indent=True)
+    assert codec.dumps({"nulo": None, "texto": "null"}) == '{"nulo":null,"texto":"null"}'
+
+
+def test_orjson_le_literais_que_so_o_stdlib_aceita():
+    pytest.importorskip("orjson")
+    codec = json_codec.OrjsonCodec()
+    assert codec.loads(b'{"infinito": Infinity, "grande": 1e400}') == {"infinito": float("inf"), "grande": float("inf")}
+    assert codec.loads("[NaN]")[0] != codec.loads("[NaN]")[0]
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b"{invalido")
+    with pytest.raises(TypeError):
+        codec.dumps({"x": object()})
@@ -0,0 +1,156 @@
+"""Testes da localização do chamador dos logs (cache por code object)."""
+
+from __future__ import annotations
+
+import inspect
+
+import pytest
+
+from raxy.core.config import LoggerConfig
+from raxy.core.logging import context
+from raxy.core.logging.context import _CODE_INFO_CACHE, call_site, find_caller
+from raxy.core.logging.handlers import LogHandler
+from raxy.core.logging.logger import RaxyLogger
+
+
+class Coletor(LogHandler):
+    def __init__(self, include_caller=None):
+        super().__init__(include_caller=include_caller)
+        self.registros = []
+
+    def emit(self, record):
+        self.registros.append(record)
+
+
+@pytest.fixture
+def coletor():
+    return Coletor(include_caller=True)
+
+
+@pytest.fixture
+def logger(coletor):
+    logger = RaxyLogger(LoggerConfig(arquivo_log=None))
+    for handler in list(logger.handlers):
+        logger.remove_handler(handler)
+    logger.add_handler(coletor)
+    yield logger
+    logger.close()
+
+
+def _linha_atual():
+    return inspect.currentframe().f_back.f_lineno
+
+
+class Servico:
+    def processar(self, logger):
+        logger.info("processando")
+        return _linha_atual() - 1
+
+    @classmethod
+    def criar(cls, logger):
+        logger.info("criando")
+        return _linha_atual() - 1
+
+
+def test_localiza_chamador_direto(logger, coletor):
+    linha = _linha_atual() + 1
+    logger.info("oi")
+    ctx = coletor.registros[-1]["context"]
+    assert (ctx["file"], ctx["line"], ctx["function"]) == ("test_log_caller.py", linha, "test_localiza_chamador_direto")
+    assert ctx["module"] == __name__ and ctx["class"] is None
+    assert ctx["path"] == __file__
+
+
+def test_localiza_metodo_e_classe(logger, coletor):
+    linha = Servico().processar(logger)
+    ctx = coletor.registros[-1]["context"]
+    assert (ctx["class"], ctx["function"], ctx["line"]) == ("Servico", "processar", linha)
+
+    linha = Servico.criar(logger)
+    ctx = coletor.registros[-1]["context"]
+    assert (ctx["class"], ctx["function"], ctx["line"]) == ("Servico", "criar", linha)
+
+
+def test_funcao_aninhada_nao_tem_classe(logger, coletor):
+    def interna():
+        logger.info("aninhada")
+
+    interna()
+    assert coletor.registros[-1]["context"]["class"] is None
+    assert coletor.registros[-1]["context"]["function"] == "interna"
+
+
+def test_logger_com_contexto_aponta_o_mesmo_chamador(logger, coletor):
+    escopo = logger.com_contexto(conta="a@x.com").com_contexto(etapa="login")
+    linha = _linha_atual() + 1
+    escopo.aviso("via escopo")
+    ctx = coletor.registros[-1]["context"]
+    assert ctx["line"] == linha and ctx["file"] == "test_log_caller.py"
+    assert ctx["conta"] == "a@x.com" and ctx["etapa"] == "login"
+
+
+def test_sem_localizacao_nao_percorre_a_pilha(monkeypatch):
+    coletor = Coletor(include_caller=False)
+    logger = RaxyLogger(LoggerConfig(arquivo_log=None))
+    for handler in list(logger.handlers):
+        logger.remove_handler(handler)
+    logger.add_handler(coletor)
+    chamadas = []
+    monkeypatch.setattr("raxy.core.logging.logger.find_caller", lambda: chamadas.append(1) or {})
+    logger.info("sem local")
+    assert chamadas == [] and "line" not in coletor.registros[-1]["context"]
+    logger.close()
+
+
+def test_cache_por_code_object(logger, coletor):
+    def registrar():
+        logger.info("x")
+        return _linha_atual() - 1
+
+    codigo = registrar.__code__
+    _CODE_INFO_CACHE.pop(codigo, None)
+    registrar()
+    info = _CODE_INFO_CACHE[codigo]
+    assert info.function == "registrar" and not info.internal
+
+    # Segunda chamada reaproveita a entrada; só a linha é lida do frame
+    registrar()
+    assert _CODE_INFO_CACHE[codigo] is info
+    assert [r["context"]["line"] for r in coletor.registros] == [registrar.__code__.co_firstlineno + 1] * 2
+
+
+def _frame_em(modulo):
+    """Frame de uma função definida num módulo de nome ``modulo``."""
+    namespace = {"__name__": modulo, "inspect": inspect}
+    exec(compile("def f():\n    return inspect.currentframe()", f"<{modulo}>", "exec"), namespace)
+    return namespace["f"]()
+
+
+@pytest.mark.parametrize("modulo, interno", [
+    ("raxy.core.logging", True),
+    ("raxy.core.logging.logger", True),
+    ("raxy.core.logging_extra", False),
+    ("raxy.services.executor_service", False),
+])
+def test_frames_do_pacote_de_logging_sao_internos(modulo, interno):
+    assert context._code_info(_frame_em(modulo)).internal is interno
+
+
+def test_funcoes_identicas_em_arquivos_diferentes():
+    # Code objects iguais (mesmo corpo e linha) de arquivos distintos
+    primeiro = _frame_em("raxy.services.a")
+    segundo = _frame_em("raxy.services.b")
+    assert primeiro.f_code == segundo.f_code
+    assert context.frame_info(primeiro)["module"] == "raxy.services.a"
+    assert context.frame_info(segundo)["module"] == "raxy.services.b"
+    assert context.frame_info(primeiro)["path"] == "<raxy.services.a>"
+
+
+def test_find_caller_e_call_site():
+    linha = _linha_atual() + 1
+    ctx = find_caller(skip=0)
+    assert ctx["line"] == linha and ctx["function"] == "test_find_caller_e_call_site"
+    linha = _linha_atual() + 1
+    assert call_site(skip=0) == (__file__, linha)
+    # Pular além da pilha não quebra
+    assert find_caller(skip=10_000) == {} and call_site(skip=10_000) == ("", 0)
@@ -0,0 +1,143 @@
+"""Testes da rotação de logs (FileHandler e raxy.core.logging.rotation)."""
+
+from __future__ import annotations
+
+import gzip
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from raxy.core.logging.formatters import LogFormatter
+from raxy.core.logging.handlers import FileHandler
+from raxy.core.logging.rotation import (
+    RotationPolicy,
+    active_since,
+    list_rotated,
+    maintain,
+    remove_stale_tmp,
+)
+
+# Onde o sistema informa a data de criação, ela prevalece sobre o mtime
+sem_birthtime = pytest.mark.skipif(
+    hasattr(os.stat("."), "st_birthtime"), reason="sistema informa a data de criação"
+)
+
+
+class Cru(LogFormatter):
+    """Só a mensagem, para contar bytes com facilidade."""
+
+    uses_location = False
+
+    def format(self, level, message, timestamp, context=None, exception=None):
+        return message
+
+
+def _registro(mensagem="ok"):
+    return {"level": 20, "message": mensagem, "timestamp": datetime.now(), "context": {}}
+
+
+def _envelhecer(caminho, segundos):
+    antes = time.time() - segundos
+    os.utime(caminho, (antes, antes))
+
+
+def _rotacionado(ativo, idade):
+    """Cria um rotacionado cujo carimbo está ``idade`` segundos no passado."""
+    carimbo = (datetime.now() - timedelta(seconds=idade)).strftime("%Y%m%d-%H%M%S")
+    caminho = ativo.with_name(f"{ativo.stem}.{carimbo}{ativo.suffix}.gz")
+    caminho.write_bytes(b"antigo")
+    return caminho
+
+
+@sem_birthtime
+def test_intervalo_conta_do_inicio_do_arquivo(tmp_path):
+    ativo = tmp_path / "raxy.log"
+    ativo.write_text("de outra execução\n")
+    _envelhecer(ativo, 3600)
+
+    handler = FileHandler(ativo, formatter=Cru(), rotate_interval=60)
+    handler.emit(_registro("novo"))
+    handler.close()
+
+    rotacionados = [p.name for p, _ in list_rotated(ativo)]
+    assert len(rotacionados) == 1
+    assert ativo.read_text() == "novo\n"
+
+
+@sem_birthtime
+def test_reabertura_dentro_do_intervalo_nao_rotaciona(tmp_path):
+    ativo = tmp_path / "raxy.log"
+    ativo.write_text("linha\n")
+    _envelhecer(ativo, 3600)
+    # O ativo nasceu na rotação de 10 s atrás, não no mtime antigo
+    _rotacionado(ativo, 10)
+
+    assert active_since(ativo) == pytest.approx(time.time() - 10, abs=2)
+    handler = FileHandler(ativo, formatter=Cru(), rotate_interval=60)
+    handler.emit(_registro("novo"))
+    handler.close()
+    assert len(list_rotated(ativo)) == 1
+    assert ativo.read_text() == "linha\nnovo\n"
+
+
+def test_arquivo_vazio_conta_da_abertura(tmp_path):
+    ativo = tmp_path / "raxy.log"
+    handler = FileHandler(ativo, formatter=Cru(), rotate_interval=60)
+    assert handler._next_rollover == pytest.approx(time.time() + 60, abs=2)
+    handler.emit(_registro())
+    handler.close()
+    assert list_rotated(ativo) == []
+    assert active_since(tmp_path / "ausente.log") is None
+
+
+def test_tamanho_conta_os_bytes_gravados(tmp_path):
+    ativo = tmp_path / "raxy.log"
+    ativo.write_bytes(b"existente\n")
+    handler = FileHandler(ativo, formatter=Cru())
+    handler.emit(_registro("ação concluída"))
+    handler.emit_batch([_registro("çã"), _registro("ü")])
+    assert handler._size == ativo.stat().st_size
+    handler.close()
+
+
+def test_rotacao_por_tamanho_com_texto_acentuado(tmp_path):
+    ativo = tmp_path / "raxy.log"
+    handler = FileHandler(ativo, formatter=Cru(), max_bytes=20)
+    # 11 caracteres com a quebra de linha, 21 bytes em UTF-8
+    handler.emit(_registro("ã" * 10))
+    handler.emit(_registro("depois"))
+    handler.close()
+    assert len(list_rotated(ativo)) == 1
+    assert ativo.read_text(encoding="utf-8") == "depois\n"
+
+
+def test_remove_apenas_temporarios_abandonados(tmp_path):
+    ativo = tmp_path / "raxy.log"
+    abandonado = tmp_path / "raxy.20260101-000000.log.gz.tmp"
+    em_curso = tmp_path / "raxy.20260101-000001.log.gz.tmp"
+    alheio = tmp_path / "outro.20260101-000000.log.gz.tmp"
+    for caminho in (abandonado, em_curso, alheio):
+        caminho.write_bytes(b"parcial")
+    _envelhecer(abandonado, 3600)
+    _envelhecer(alheio, 3600)
+
+    assert remove_stale_tmp(ativo) == [abandonado]
+    assert em_curso.exists() and alheio.exists()
+
+
+def test_manutencao_refaz_compressao_interrompida(tmp_path):
+    ativo = tmp_path / "raxy.log"
+    ativo.write_text("")
+    rotacionado = tmp_path / "raxy.20260101-000000.log"
+    rotacionado.write_text("registro\n")
+    tmp = tmp_path / "raxy.20260101-000000.log.gz.tmp"
+    tmp.write_bytes(b"truncado")
+    _envelhecer(tmp, 3600)
+
+    maintain(ativo, RotationPolicy(compression="gzip"))
+
+    assert not tmp.exists() and not rotacionado.exists()
+    comprimido = tmp_path / "raxy.20260101-000000.log.gz"
+    assert gzip.decompress(comprimido.read_bytes()) == b"registro\n"
@@ -0,0 +1,101 @@
+"""Testes do registro de métricas e dos percentis do Histogram."""
+
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from raxy.core.metrics import Histogram, MetricsRegistry
+
+# Bucket log-linear com 64 sub-buckets por potência de 2
+ERRO_RELATIVO = 1 / 64
+
+
+def _percentil_exato(valores, q):
+    ordenados = sorted(valores)
+    return ordenados[max(1, math.ceil(q * len(ordenados))) - 1]
+
+
+def test_sem_observacoes():
+    h = Histogram()
+    assert h.percentile(0.5) == 0.0
+    assert h.to_dict()["min"] == 0.0 and h.media == 0.0
+
+
+@pytest.mark.parametrize("q", [0.01, 0.5, 0.9, 0.95, 0.99, 1.0])
+def test_percentis_dentro_do_erro_do_bucket(q):
+    aleatorio = random.Random(q)
+    valores = [aleatorio.lognormvariate(math.log(0.05), 1.2) for _ in range(20000)]
+    h = Histogram()
+    for v in valores:
+        h.observe(v)
+    exato = _percentil_exato(valores, q)
+    assert h.percentile(q) == pytest.approx(exato, rel=ERRO_RELATIVO)
+
+
+def test_percentis_limitados_por_minimo_e_maximo():
+    h = Histogram()
+    for v in (3.0, 3.0, 3.0):
+        h.observe(v)
+    assert h.percentile(0.0) == 3.0 and h.percentile(0.5) == 3.0 and h.percentile(1.0) == 3.0
+
+
+def test_zeros_e_totais():
+    h = Histogram()
+    for v in (0, 0, 0, 10):
+        h.observe(v)
+    assert h.percentile(0.5) == 0.0
+    assert h.percentile(1.0) == pytest.approx(10, rel=ERRO_RELATIVO)
+    dados = h.to_dict()
+    assert dados["count"] == 4 and dados["total"] == 10 and dados["mean"] == 2.5
+    assert dados["min"] == 0 and dados["max"] == 10
+    assert {"p50", "p95", "p99"} <= set(dados)
+
+
+def test_registro_por_rotulos():
+    registro = MetricsRegistry()
+    registro.observe("etapa.duracao", 1.0, etapa="login")
+    registro.observe("etapa.duracao", 2.0, etapa="login")
+    registro.observe("etapa.duracao", 5.0, etapa="pesquisa")
+    registro.inc("contas", status="ok")
+    registro.inc("contas", 2, status="ok")
+    registro.set_gauge("fila", 7)
+
+    serie = registro.snapshot("etapa.duracao")["etapa.duracao"]
+    assert serie[(("etapa", "login"),)]["count"] == 2
+    assert serie[(("etapa", "pesquisa"),)]["max"] == 5.0
+    assert registro.values("contas") == {(("status", "ok"),): 3.0}
+    assert registro.values("fila") == {(): 7.0}
+
+    texto = registro.to_prometheus()
+    assert '# TYPE raxy_etapa_duracao summary' in texto
+    assert 'raxy_etapa_duracao_count{etapa="login"} 2' in texto
+    assert 'raxy_contas{status="ok"} 3.0' in texto
+
+    registro.reset()
+    assert registro.snapshot() == {}
+
+
+def test_debug_log_continua_medindo_apos_reset(tmp_path, monkeypatch):
+    # O decorator carrega a configuração (que cria config.yaml no diretório atual)
+    monkeypatch.chdir(tmp_path)
+    from raxy.core.logging.debug_decorator import DURATION_METRIC, debug_log
+    from raxy.core.metrics import get_metrics
+
+    @debug_log(log_args=False, log_result=False)
+    def tarefa():
+        return 1
+
+    registro = get_metrics()
+    rotulos = (("function", tarefa.__qualname__),)
+    try:
+        tarefa()
+        assert registro.snapshot(DURATION_METRIC)[DURATION_METRIC][rotulos]["count"] == 1
+        registro.reset()
+        tarefa()
+        tarefa()
+        assert registro.snapshot(DURATION_METRIC)[DURATION_METRIC][rotulos]["count"] == 2
+    finally:
+        registro.reset()
@@ -0,0 +1,108 @@
+"""Testes das migrações versionadas do SQLite (database.migracoes)."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import pytest
+
+from raxy.core.exceptions import DatabaseException
+from raxy.infrastructure.database.migracoes import Migracao, colunas_tabela, migrar, versao_atual
+from raxy.infrastructure.database.sqlite import MIGRACOES_CONTAS, SQLiteRepository
+
+# Esquema criado antes do controle de versão (sem email_backup, sem colunas de sync)
+_CONTAS_LEGADO = """
+CREATE TABLE contas (
+    email TEXT PRIMARY KEY,
+    senha TEXT NOT NULL,
+    id_perfil TEXT,
+    proxy TEXT,
+    pontos INTEGER DEFAULT 0,
+    ultima_farm TIMESTAMP,
+    meta_diaria INTEGER DEFAULT 0,
+    status TEXT DEFAULT 'active',
+    dados_extras JSON
+)
+"""
+
+
+@pytest.fixture
+def banco_legado(tmp_path):
+    caminho = tmp_path / "legado.db"
+    conn = sqlite3.connect(caminho)
+    conn.execute(_CONTAS_LEGADO)
+    conn.executemany("INSERT INTO contas (email, senha, pontos) VALUES (?, ?, ?)",
+                     [("a@x.com", "s", 10), ("b@x.com", "s", 20)])
+    conn.commit()
+    conn.close()
+    return caminho
+
+
+def _conectar(caminho):
+    return sqlite3.connect(caminho, isolation_level=None)
+
+
+def test_banco_legado_recebe_todas_as_migracoes(banco_legado):
+    repo = SQLiteRepository(banco_legado)
+    conn = repo._get_connection()
+    assert versao_atual(conn, "contas") == MIGRACOES_CONTAS[-1].versao
+    colunas = colunas_tabela(conn, "contas")
+    assert {"email_backup", "senha_email_backup", "updated_at", "versao"} <= set(colunas)
+    assert [c.pontos for c in repo.listar()] == [10, 20]
+    assert conn.execute("SELECT COUNT(*) FROM contas WHERE updated_at IS NULL").fetchone()[0] == 0
+    # Sem sincronização configurada, o log fica vazio
+    assert conn.execute("SELECT COUNT(*) FROM contas_alteracoes").fetchone()[0] == 0
+    repo.close()
+
+
+def test_migrar_e_idempotente(banco_legado):
+    conn = _conectar(banco_legado)
+    assert migrar(conn, "contas", MIGRACOES_CONTAS) == len(MIGRACOES_CONTAS)
+    assert migrar(conn, "contas", MIGRACOES_CONTAS) == 0
+    # Reaplicar todos os passos sobre o esquema atual não falha nem duplica nada
+    conn.execute("DELETE FROM schema_version")
+    assert migrar(conn, "contas", MIGRACOES_CONTAS) == len(MIGRACOES_CONTAS)
+    assert conn.execute("SELECT COUNT(*) FROM contas").fetchone()[0] == 2
+    conn.close()
+
+
+def test_processos_concorrentes_migram_uma_vez(banco_legado):
+    aplicadas, erros = [], []
+    barreira = threading.Barrier(6)
+
+    def abrir():
+        conn = sqlite3.connect(banco_legado, isolation_level=None, timeout=30)
+        try:
+            barreira.wait()
+            aplicadas.append(migrar(conn, "contas", MIGRACOES_CONTAS))
+        except Exception as e:  # pragma: no cover - falha do teste
+            erros.append(e)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=abrir) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not erros
+    assert sorted(aplicadas) == [0] * 5 + [len(MIGRACOES_CONTAS)]
+
+
+def test_falha_desfaz_o_lote(tmp_path):
+    conn = _conectar(tmp_path / "x.db")
+
+    def falhar(c):
+        raise RuntimeError("passo quebrado")
+
+    migracoes = (
+        Migracao(1, "tabela", lambda c: c.execute("CREATE TABLE t (x)")),
+        Migracao(2, "quebrada", falhar),
+    )
+    with pytest.raises(DatabaseException):
+        migrar(conn, "teste", migracoes)
+    assert versao_atual(conn, "teste") == 0
+    assert "t" not in {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+    conn.close()
+
@@ -0,0 +1,143 @@
+"""Testes do MockDatabaseClient: índices hash, latência e falhas injetadas."""
+
+from __future__ import annotations
+
+import random
+import statistics
+
+import pytest
+
+from raxy.core.exceptions import DatabaseException, ValidationException
+from raxy.infrastructure.database.mock_database import MockDatabaseClient, PerfilLatencia
+
+
+def _varredura(cliente, filtros):
+    """Resultado esperado sem índice: varre a tabela inteira."""
+    return sorted(
+        r["email"] for r in cliente.get_all_tables()["contas"].values()
+        if all(r.get(k) == v for k, v in filtros.items())
+    )
+
+
+def _consulta(cliente, filtros):
+    return sorted(r["email"] for r in cliente.select("contas", filters=filtros))
+
+
+def _indice_reconstruido(cliente, coluna):
+    indice = {}
+    for record_id, record in cliente.get_all_tables()["contas"].items():
+        if coluna in record:
+            indice.setdefault(record[coluna], set()).add(record_id)
+    return indice
+
+
+@pytest.fixture
+def cliente():
+    cliente = MockDatabaseClient()
+    for i in range(50):
+        cliente.upsert("contas", {"email": f"u{i}@x.com", "status": "ativa" if i % 2 else "nova", "lote": i % 5}, "email")
+    # Cria os índices antes das escritas que vão mantê-los
+    cliente.criar_indice("contas", "status")
+    cliente.criar_indice("contas", "lote")
+    return cliente
+
+
+def test_indice_acompanha_update(cliente):
+    cliente.update("contas", {"status": "banida", "lote": 9}, {"lote": 3})
+    cliente.upsert("contas", {"email": "u0@x.com", "status": "banida"}, "email")
+
+    for filtros in ({"status": "banida"}, {"status": "nova"}, {"lote": 3}, {"lote": 9}, {"status": "ativa", "lote": 1}):
+        assert _consulta(cliente, filtros) == _varredura(cliente, filtros)
+    assert _consulta(cliente, {"lote": 3}) == []
+    for coluna in ("status", "lote", "email"):
+        assert cliente._indices["contas"][coluna] == _indice_reconstruido(cliente, coluna)
+
+
+def test_indice_acompanha_delete(cliente):
+    assert cliente.delete("contas", {"status": "nova", "lote": 0}) is True
+    assert cliente.delete("contas", {"email": "u1@x.com"}) is True
+    assert cliente.delete("contas", {"email": "u1@x.com"}) is False
+
+    for filtros in ({"status": "nova"}, {"lote": 0}, {"email": "u1@x.com"}, {"status": "ativa"}):
+        assert _consulta(cliente, filtros) == _varredura(cliente, filtros)
+    for coluna in ("status", "lote", "email"):
+        assert cliente._indices["contas"][coluna] == _indice_reconstruido(cliente, coluna)
+
+
+def test_indice_em_sequencia_aleatoria_de_escritas(cliente):
+    aleatorio = random.Random(2026)
+    for _ in range(500):
+        email = f"u{aleatorio.randrange(80)}@x.com"
+        operacao = aleatorio.random()
+        if operacao < 0.4:
+            cliente.upsert("contas", {"email": email, "status": aleatorio.choice(["nova", "ativa", "banida"])}, "email")
+        elif operacao < 0.7:
+            cliente.update("contas", {"lote": aleatorio.randrange(5)}, {"email": email})
+        else:
+            cliente.delete("contas", {"email": email})
+    for status in ("nova", "ativa", "banida"):
+        assert _consulta(cliente, {"status": status}) == _varredura(cliente, {"status": status})
+    for coluna in ("status", "lote", "email"):
+        assert cliente._indices["contas"][coluna] == _indice_reconstruido(cliente, coluna)
+
+
+def test_valor_nao_hashable_cai_na_varredura(cliente):
+    cliente.upsert("contas", {"email": "lista@x.com", "status": ["a", "b"]}, "email")
+    assert _consulta(cliente, {"status": ["a", "b"]}) == ["lista@x.com"]
+
+
+def test_amostrar_sem_latencia_e_fixa():
+    rng = random.Random(1)
+    assert PerfilLatencia().amostrar(rng) == 0.0
+    assert PerfilLatencia(p50=0.01, p99=0.01).amostrar(rng) == 0.01
+
+
+def test_amostrar_respeita_p50_e_p99():
+    perfil = PerfilLatencia(p50=0.040, p99=0.250, semente=42)
+    rng = perfil.sorteador()
+    amostras = sorted(perfil.amostrar(rng) for _ in range(20000))
+    assert statistics.median(amostras) == pytest.approx(0.040, rel=0.05)
+    assert amostras[int(0.99 * len(amostras))] == pytest.approx(0.250, rel=0.10)
+    # Mesma semente, mesma sequência
+    a, b = perfil.sorteador(), perfil.sorteador()
+    assert [perfil.amostrar(a) for _ in range(5)] == [perfil.amostrar(b) for _ in range(5)]
+
+
+@pytest.mark.parametrize("kwargs", [{"p50": -1.0}, {"p50": 0.2, "p99": 0.1}, {"taxa_erro": 1.5}])
+def test_perfil_invalido(kwargs):
+    with pytest.raises(ValidationException):
+        PerfilLatencia(**kwargs)
+
+
+def _falhas(semente, requisicoes=2000):
+    cliente = MockDatabaseClient(perfil=PerfilLatencia(taxa_erro=0.25, semente=semente))
+    for _ in range(requisicoes):
+        cliente.select("contas")
+    return cliente
+
+
+def test_taxa_de_erro_com_semente():
+    cliente = _falhas(5)
+    assert cliente.requisicoes == 2000
+    assert cliente.falhas_injetadas / cliente.requisicoes == pytest.approx(0.25, abs=0.03)
+    # Determinístico pela semente
+    assert _falhas(5).falhas_injetadas == cliente.falhas_injetadas
+
+
+def test_falha_injetada_por_tipo_de_operacao():
+    cliente = MockDatabaseClient(perfil=PerfilLatencia(taxa_erro=1.0, semente=1))
+    # Operações por registro engolem a falha, como o SupabaseDatabaseClient
+    assert cliente.upsert("contas", {"email": "a@x.com"}, "email") is None
+    assert cliente.select("contas") == []
+    assert cliente.update("contas", {"x": 1}, {"email": "a@x.com"}) is None
+    assert cliente.delete("contas", {"email": "a@x.com"}) is False
+    # Primitivas em massa propagam para a retentativa
+    with pytest.raises(DatabaseException) as erro:
+        cliente.upsert_rows("contas", [{"email": "a@x.com"}], "email")
+    assert erro.value.details["status"] == 503
+    with pytest.raises(DatabaseException):
+        cliente.select_page("contas", "*", None, "email", None, 10)
+    assert cliente.falhas_injetadas == cliente.requisicoes == 6
+
+    cliente.definir_perfil(None)
+    assert cliente.upsert("contas", {"email": "a@x.com"}, "email") is not None
@@ -0,0 +1,86 @@
+"""Testes do buffer de respostas de rede (ResponseStore e NetWork.get_status)."""
+
+from __future__ import annotations
+
+import random
+import re
+
+import pytest
+
+from raxy.infrastructure.webdrivers.network_inspector import NetWork, ResponseStore
+
+
+@pytest.fixture
+def rede():
+    return NetWork(capacidade=50)
+
+
+def _resposta(url, status):
+    return {"url": url, "status": status}
+
+
+def test_buffer_circular_descarta_as_mais_antigas():
+    store = ResponseStore(3)
+    for i in range(5):
+        store.adicionar(_resposta(f"https://a.com/{i}", i))
+    assert [r["status"] for r in store] == [2, 3, 4]
+    assert [r["status"] for r in store.recentes()] == [4, 3, 2]
+
+
+def test_recentes_por_host_e_prefixo():
+    store = ResponseStore(10)
+    store.adicionar(_resposta("https://a.com/api/1", 1))
+    store.adicionar(_resposta("https://b.com/api/2", 2))
+    store.adicionar(_resposta("https://A.com/web/3", 3))
+    assert [r["status"] for r in store.recentes("a.com")] == [3, 1]
+    assert [r["status"] for r in store.recentes("a.com", "/api")] == [1]
+    assert list(store.recentes("c.com")) == []
+
+
+def test_indices_ignoram_entradas_fora_do_buffer():
+    store = ResponseStore(2)
+    store.adicionar(_resposta("https://a.com/x", 1))
+    store.adicionar(_resposta("https://b.com/x", 2))
+    store.adicionar(_resposta("https://b.com/x", 3))
+    assert list(store.recentes("a.com")) == []
+
+
+def test_capacidade_invalida():
+    with pytest.raises(ValueError):
+        ResponseStore(0)
+
+
+def test_get_status_mais_recente(rede):
+    assert rede.get_status() is None
+    rede.respostas.adicionar(_resposta("https://a.com/api/x", 200))
+    rede.respostas.adicionar(_resposta("https://b.com/y", 404))
+    assert rede.get_status() == 404
+    assert rede.get_status("https://a.com/api/x") == 200
+    assert rede.get_status(re.compile(r"b\.com/y$")) == 404
+    assert rede.get_status("a.com/api") == 200
+    assert rede.get_status("https://c.com/") is None
+
+
+def test_get_status_compara_recencia_fora_do_indice(rede):
+    rede.respostas.adicionar(_resposta("https://a.com/api/x", 200))
+    # O padrão aparece na query string de outro host, numa resposta mais nova
+    rede.respostas.adicionar(_resposta("https://b.com/r?next=https://a.com/api/x", 302))
+    assert rede.get_status("https://a.com/api/x") == 302
+    rede.respostas.adicionar(_resposta("https://a.com/api/x", 201))
+    assert rede.get_status("https://a.com/api/x") == 201
+
+
+def test_mais_recente_equivale_a_varredura_completa(rede):
+    aleatorio = random.Random(7)
+    hosts, segmentos = ["a.com", "b.com", "c.com"], ["api", "x", "y"]
+    for _ in range(200):
+        store = ResponseStore(30)
+        for i in range(aleatorio.randint(0, 80)):
+            url = f"https://{aleatorio.choice(hosts)}/{aleatorio.choice(segmentos)}/{i % 3}"
+            if aleatorio.random() < 0.2:
+                url += f"?n=https://{aleatorio.choice(hosts)}/{aleatorio.choice(segmentos)}/1"
+            store.adicionar(_resposta(url, i))
+        padrao = f"https://{aleatorio.choice(hosts)}/{aleatorio.choice(segmentos)}/1"
+        matcher, host, prefixo = rede._matcher(padrao)
+        esperado = next((r for r in reversed(store) if matcher(r["url"])), None)
+        assert store.mais_recente(matcher, host, prefixo) is esperado
@@ -0,0 +1,172 @@
+"""Testes do índice de perfis em memória (session.profile_store)."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from raxy.core import json_codec
+from raxy.core.exceptions import ProfileException
+from raxy.infrastructure.session.profile_store import ProfileStore
+
+
+class StoreFalho(ProfileStore):
+    """Falha as ``falhas`` primeiras gravações em disco."""
+
+    def __init__(self, *args, falhas=1, **kwargs):
+        self.falhas = falhas
+        self.tentativas = 0
+        super().__init__(*args, **kwargs)
+
+    def _escrever_atomico(self, dados):
+        self.tentativas += 1
+        if self.tentativas <= self.falhas:
+            raise OSError("disco cheio")
+        super()._escrever_atomico(dados)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "profiles.json"
+
+
+@pytest.fixture
+def store(path):
+    store = ProfileStore(path, intervalo_flush=0.01)
+    yield store
+    store.close()
+
+
+def _em_disco(path):
+    return json_codec.load_file(path)
+
+
+def test_set_get_e_persistencia(store, path):
+    assert store.get("p1") is None
+    ticket = store.set("p1", {"UA": "desktop"})
+    assert store.aguardar_persistencia(ticket, timeout=5)
+
+    gravado = _em_disco(path)["p1"]
+    assert gravado["profile_id"] == "p1" and gravado["UA"] == "desktop"
+    # get devolve cópia: alterá-la não muda o índice
+    store.get("p1")["UA"] = "outro"
+    assert store.get("p1")["UA"] == "desktop"
+    assert "p1" in store and len(store) == 1
+
+
+def test_set_preserva_created_at(store):
+    store.set("p1", {"UA": "a"})
+    criado = store.get("p1")["created_at"]
+    store.set("p1", {**store.get("p1"), "UA": "b"})
+    assert store.get("p1")["created_at"] == criado
+    assert store.get("p1")["UA"] == "b"
+
+
+def test_carrega_arquivo_existente(path):
+    json_codec.dump_file(path, {"antigo": {"profile_id": "antigo", "UA": "x"}})
+    store = ProfileStore(path)
+    assert store.get("antigo")["UA"] == "x"
+    store.close()
+
+
+def test_arquivo_invalido(path):
+    path.write_text("{quebrado")
+    with pytest.raises(ProfileException):
+        ProfileStore(path)
+
+
+def test_lock_serializa_leitura_modificacao_escrita(store):
+    store.set("p1", {"contador": 0})
+
+    def incrementar():
+        for _ in range(200):
+            with store.lock("p1"):
+                atual = store.get("p1")
+                store.set("p1", {**atual, "contador": atual["contador"] + 1})
+
+    threads = [threading.Thread(target=incrementar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.get("p1")["contador"] == 1600
+
+
+def test_escritas_concorrentes_agrupadas(path):
+    store = ProfileStore(path, intervalo_flush=0.2)
+    tickets = [store.set(f"p{i}", {"UA": "x"}) for i in range(50)]
+    assert store.aguardar_persistencia(tickets[-1], timeout=5)
+    # Tickets anteriores são cobertos pelo mesmo lote
+    assert all(store.aguardar_persistencia(t, timeout=0) for t in tickets)
+    assert store.stats.flushes < 5 and store.stats.media_lote > 10
+    assert len(_em_disco(path)) == 50
+    store.close()
+
+
+def test_mescla_com_alteracoes_externas(store, path):
+    store.aguardar_persistencia(store.set("p1", {"UA": "a"}), timeout=5)
+    # Outro processo (ex.: o próprio Botasaurus) grava um perfil no arquivo
+    externo = _em_disco(path)
+    externo["externo"] = {"profile_id": "externo"}
+    json_codec.dump_file(path, externo)
+
+    store.aguardar_persistencia(store.set("p2", {"UA": "b"}), timeout=5)
+    assert set(_em_disco(path)) == {"p1", "p2", "externo"}
+
+
+def test_remove(store, path):
+    store.aguardar_persistencia(store.set("p1", {}), timeout=5)
+    assert store.aguardar_persistencia(store.remove("p1"), timeout=5)
+    assert store.get("p1") is None
+    assert _em_disco(path) == {}
+
+
+def test_aguardar_persistencia_expira(path):
+    store = StoreFalho(path, intervalo_flush=0.01, falhas=10_000)
+    assert store.aguardar_persistencia(store.set("p1", {}), timeout=0.1) is False
+    store.falhas = 0
+    store.close()
+
+
+def test_flush_falho_devolve_pendencias(path):
+    store = StoreFalho(path, intervalo_flush=60, falhas=1)
+    store.set("p1", {"UA": "a"})
+    store.remove("p2")
+    with pytest.raises(OSError):
+        store.flush()
+    assert set(store._sujos) == {"p1"} and set(store._removidos) == {"p2"}
+    assert store.stats.flushes == 0
+
+    store.flush()
+    assert set(_em_disco(path)) == {"p1"}
+    assert store._sujos == {} and store._removidos == {}
+    store.close()
+
+
+def test_flusher_retenta_apos_falha(path):
+    store = StoreFalho(path, intervalo_flush=0.01, falhas=2)
+    ticket = store.set("p1", {"UA": "a"})
+    assert store.aguardar_persistencia(ticket, timeout=5)
+    assert store.tentativas == 3
+    assert _em_disco(path)["p1"]["UA"] == "a"
+    store.close()
+
+
+def test_flush_falho_nao_ressuscita_perfil_removido(path):
+    store = StoreFalho(path, intervalo_flush=60, falhas=1)
+    store.set("p1", {})
+    with pytest.raises(OSError):
+        store.flush()
+    # Removido depois da falha: a devolução do lote não pode trazê-lo de volta
+    store.remove("p1")
+    store.flush()
+    assert _em_disco(path) == {}
+    store.close()
+
+
+def test_close_grava_pendencias(path):
+    store = ProfileStore(path, intervalo_flush=60)
+    store.set("p1", {"UA": "a"})
+    store.close()
+    assert _em_disco(path)["p1"]["UA"] == "a"
@@ -0,0 +1,149 @@
+"""Testes do filtro de limitação de logs (raxy.core.logging.filters)."""
+
+from __future__ import annotations
+
+import pytest
+
+from raxy.core.config import LEVEL_VALUES, LoggerConfig
+from raxy.core.logging import filters
+from raxy.core.logging.filters import RateLimitFilter
+from raxy.core.logging.handlers import LogHandler, MultiHandler
+from raxy.core.logging.logger import RaxyLogger
+
+INFO = LEVEL_VALUES["INFO"]
+DEBUG = LEVEL_VALUES["DEBUG"]
+ERROR = LEVEL_VALUES["ERROR"]
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(filters.time, "monotonic", relogio)
+    return relogio
+
+
+def _registro(mensagem="tentando", nivel=INFO, linha=10):
+    return {"level": nivel, "message": mensagem, "context": {"path": "modulo.py", "line": linha}}
+
+
+def test_inativo_deixa_tudo_passar(relogio):
+    filtro = RateLimitFilter()
+    assert not filtro.active
+    assert all(filtro(_registro()) is True for _ in range(100))
+
+
+def test_token_bucket_por_ponto_de_chamada(relogio):
+    filtro = RateLimitFilter(rate=1.0, burst=3)
+    resultados = [filtro(_registro()) for _ in range(5)]
+    assert resultados == [True, True, True, False, False]
+    # Outro ponto de chamada tem seu próprio bucket
+    assert filtro(_registro(linha=20)) is True
+
+    relogio.agora += 1.0
+    anotado = filtro(_registro())
+    assert anotado["message"] == "tentando (mensagem anterior repetida 2 vezes)"
+    assert anotado["context"]["suprimidas"] == 2
+    stats = filtro.stats()
+    assert stats["rate_limited"] == 2 and stats["summarized"] == 1 and stats["sites"] == 2
+
+
+def test_anotacao_nao_altera_registro_original(relogio):
+    filtro = RateLimitFilter(rate=1.0, burst=1)
+    filtro(_registro())
+    filtro(_registro())
+    relogio.agora += 1.0
+    original = _registro()
+    anotado = filtro(original)
+    assert anotado is not original
+    assert original["message"] == "tentando" and "suprimidas" not in original["context"]
+
+
+def test_deduplicacao_na_janela(relogio):
+    filtro = RateLimitFilter(dedup_window=5.0)
+    assert filtro(_registro("a")) is True
+    assert filtro(_registro("a")) is False
+    assert filtro(_registro("b"))["context"]["suprimidas"] == 1
+    relogio.agora += 6.0
+    assert filtro(_registro("b")) is True
+    assert filtro.stats()["duplicates"] == 1
+
+
+def test_amostragem_por_nivel(relogio):
+    filtro = RateLimitFilter(sample={"DEBUG": 0.25})
+    passaram = [filtro(_registro(nivel=DEBUG)) is not False for _ in range(8)]
+    assert passaram == [True, False, False, False, True, False, False, False]
+    assert filtro.stats()["sampled_out"] == 6
+    assert filtro.pending() == {"modulo.py:10": 3}
+
+
+def test_erros_nao_sao_limitados_nem_amostrados(relogio):
+    filtro = RateLimitFilter(rate=1.0, burst=1, sample={"ERROR": 0.1})
+    assert all(filtro(_registro(f"falha {i}", nivel=ERROR)) is True for i in range(20))
+
+
+def test_limite_de_pontos_descarta_o_mais_antigo(relogio):
+    filtro = RateLimitFilter(rate=1.0, burst=1, max_sites=2)
+    for linha in (1, 2, 3):
+        filtro(_registro(linha=linha))
+    assert filtro.stats()["sites"] == 2
+    # O ponto 1 foi descartado: volta com o bucket cheio
+    assert filtro(_registro(linha=1)) is True
+
+
+def test_reset(relogio):
+    filtro = RateLimitFilter(rate=1.0, burst=1)
+    filtro(_registro())
+    filtro(_registro())
+    filtro.reset()
+    assert filtro.stats()["suppressed"] == 0
+    assert filtro(_registro()) is True
+
+
+def test_resumo_pendente_de_ponto_que_silenciou(relogio):
+    filtro = RateLimitFilter(rate=1.0, burst=1)
+    filtro(_registro("tentando 1"))
+    filtro(_registro("tentando 2"))
+    filtro(_registro("tentando 3"))
+
+    [resumo] = filtro.drain_summaries()
+    assert resumo["message"] == "tentando 3 (mensagem repetida mais 2 vezes)"
+    assert resumo["level"] == INFO
+    assert resumo["context"] == {"suprimidas": 2, "path": "modulo.py", "line": 10}
+    assert filtro.pending() == {} and filtro.stats()["summarized"] == 1
+    # Já resumido: nem de novo no flush, nem anotado no próximo registro
+    assert filtro.drain_summaries() == []
+    relogio.agora += 1.0
+    assert filtro(_registro("tentando 4")) is True
+
+
+class Coletor(LogHandler):
+    def __init__(self, filters):
+        super().__init__(filters=filters)
+        self.emitidos = []
+
+    def emit(self, record):
+        self.emitidos.append(record["message"])
+
+
+def test_handler_emite_resumos_no_flush_do_logger(relogio):
+    filtro = RateLimitFilter(rate=1.0, burst=1)
+    coletor = Coletor([filtro])
+    for _ in range(4):
+        coletor.handle(_registro())
+    assert coletor.emitidos == ["tentando"]
+
+    logger = RaxyLogger(LoggerConfig(arquivo_log=None))
+    logger.close()
+    logger.add_handler(MultiHandler([coletor]))
+    logger.flush()
+    assert coletor.emitidos == ["tentando", "tentando (mensagem repetida mais 3 vezes)"]
+    logger.close()
+    assert len(coletor.emitidos) == 2
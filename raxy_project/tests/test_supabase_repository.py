@@ -0,0 +1,97 @@
+"""Testes do SupabaseRepository sobre o MockDatabaseClient (database.supabase)."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+from postgrest.exceptions import APIError
+
+from raxy.core.exceptions import DatabaseException
+from raxy.infrastructure.database.bulk import BulkConfig
+from raxy.infrastructure.database.importacao import ImportadorContas, ler_contas
+from raxy.infrastructure.database.mock_database import MockDatabaseClient
+from raxy.infrastructure.database.supabase import SupabaseRepository
+
+
+class RemotoSemSync(MockDatabaseClient):
+    """Tabela sem as colunas da sincronização: o PostgREST rejeita ``removido_em``."""
+
+    def __init__(self):
+        super().__init__(bulk=BulkConfig(max_retries=0))
+
+    @staticmethod
+    def _checar(columns):
+        if "removido_em" in columns:
+            raise APIError({"code": "42703", "message": "column contas.removido_em does not exist"})
+
+    def select_page(self, table, columns, *args, **kwargs):
+        self._checar(columns)
+        return super().select_page(table, columns, *args, **kwargs)
+
+    def select_in(self, table, columns, column, values):
+        self._checar(columns)
+        return super().select_in(table, columns, column, values)
+
+
+def _popular(cliente, removida=False):
+    for i in range(3):
+        linha = {"email": f"u{i}@x.com", "senha": "s", "pontos": i}
+        if removida:
+            linha["removido_em"] = "2026-10-17T00:00:00.000000Z" if i == 1 else None
+        cliente.upsert("contas", linha, "email")
+
+
+@pytest.mark.parametrize("sync", [False, True])
+def test_emails_existentes(sync):
+    cliente = MockDatabaseClient(bulk=BulkConfig(max_retries=0)) if sync else RemotoSemSync()
+    _popular(cliente, removida=sync)
+    repo = SupabaseRepository(db_client=cliente)
+    esperado = {"u0@x.com", "u2@x.com"} if sync else {"u0@x.com", "u1@x.com", "u2@x.com"}
+    assert repo.emails_existentes(["u0@x.com", "u1@x.com", "u2@x.com", "novo@x.com"]) == esperado
+
+
+class RemotoForaDoAr(MockDatabaseClient):
+    def select_page(self, *args, **kwargs):
+        raise ConnectionError("timeout")
+
+
+def test_verificacao_de_colunas_propaga_outras_falhas():
+    repo = SupabaseRepository(db_client=RemotoForaDoAr())
+    with pytest.raises(DatabaseException):
+        repo.emails_existentes(["u0@x.com"])
+    # Falha transitória não fica registrada como "sem tombstones"
+    assert repo._tem_tombstones is None
+
+
+def test_importacao_para_tabela_sem_sync():
+    cliente = RemotoSemSync()
+    _popular(cliente)
+    arquivo = io.BytesIO(b"u0@x.com:s\nnovo@x.com:s\n")
+    resultado = ImportadorContas(SupabaseRepository(db_client=cliente)).importar(ler_contas(arquivo))
+    assert (resultado.importadas, resultado.existentes) == (1, 1)
+    assert cliente.get_table_count("contas") == 4
+
+
+@pytest.mark.parametrize("sync", [False, True])
+def test_consultar_contas_com_projecao(sync):
+    cliente = MockDatabaseClient(bulk=BulkConfig(max_retries=0)) if sync else RemotoSemSync()
+    _popular(cliente, removida=sync)
+    repo = SupabaseRepository(db_client=cliente)
+
+    pagina = repo.consultar_contas(colunas="email,pontos", limite=10)
+    esperados = ["u0@x.com", "u2@x.com"] if sync else ["u0@x.com", "u1@x.com", "u2@x.com"]
+    assert [row["email"] for row in pagina.itens] == esperados
+    # A coluna de tombstone só aparece se pedida
+    assert all(set(row) == {"email", "pontos"} for row in pagina.itens)
+    assert pagina.proximo_cursor is None
+
+
+def test_consultar_contas_pagina_por_email():
+    cliente = RemotoSemSync()
+    _popular(cliente)
+    repo = SupabaseRepository(db_client=cliente)
+    primeira = repo.consultar_contas(colunas="pontos", limite=2)
+    assert [row["email"] for row in primeira.itens] == ["u0@x.com", "u1@x.com"]
+    segunda = repo.consultar_contas(colunas="pontos", limite=2, cursor=primeira.proximo_cursor)
+    assert [row["email"] for row in segunda.itens] == ["u2@x.com"]
@@ -0,0 +1,226 @@
+"""Testes da sincronização incremental SQLite <-> remoto (database.sync)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from raxy.core.exceptions import DatabaseException, ValidationException
+from raxy.infrastructure.database.bulk import BulkConfig
+from raxy.infrastructure.database.migracoes import migrar
+from raxy.infrastructure.database.mock_database import MockDatabaseClient
+from raxy.infrastructure.database.sqlite import MIGRACOES_CONTAS, SQLiteRepository
+from raxy.infrastructure.database.sync import SincronizadorContas
+from raxy.models import Conta
+
+FUTURO = "2999-01-01T00:00:00.000000Z"
+PASSADO = "2000-01-01T00:00:00.000000Z"
+
+
+class RemotoInstavel(MockDatabaseClient):
+    """Mock que passa a falhar depois de ``limite`` requisições em massa."""
+
+    def __init__(self, limite):
+        super().__init__(bulk=BulkConfig(max_retries=0, chunk_size=1000), carimbo="updated_at")
+        self.limite = limite
+
+    def _simular_requisicao(self, operacao, em_massa=False):
+        super()._simular_requisicao(operacao, em_massa)
+        if em_massa:
+            self.limite -= 1
+            if self.limite < 0:
+                raise DatabaseException(f"Erro 503 simulado em {operacao}")
+
+
+@pytest.fixture
+def local(tmp_path):
+    repo = SQLiteRepository(tmp_path / "raxy.db")
+    repo.salvar_varias([Conta(email=f"u{i}@x.com", senha="s") for i in range(3)])
+    yield repo
+    repo.close()
+
+
+@pytest.fixture
+def remoto():
+    return MockDatabaseClient(bulk=BulkConfig(max_retries=0), carimbo="updated_at")
+
+
+def _remota(remoto, email):
+    linhas = remoto.select("contas", filters={"email": email})
+    return linhas[0] if linhas else None
+
+
+def _editar_remota(remoto, email, updated_at=FUTURO, **dados):
+    remoto.upsert("contas", {"email": email, "updated_at": updated_at, "removido_em": None, **dados}, "email")
+
+
+def test_primeira_sincronizacao_envia_todas_as_contas(local, remoto):
+    assert local.ler_estado_sync("log_ativo") is None
+    resultado = SincronizadorContas(local, remoto).sincronizar()
+    assert resultado.enviadas == 3
+    assert remoto.get_table_count("contas") == 3
+    assert local.ler_estado_sync("log_ativo") is not None
+
+    # A segunda passada só vê o eco do envio; a terceira não vê nada
+    segunda = SincronizadorContas(local, remoto).sincronizar()
+    assert (segunda.recebidas, segunda.enviadas, segunda.ignoradas) == (0, 0, 3)
+    terceira = SincronizadorContas(local, remoto).sincronizar()
+    assert (terceira.recebidas, terceira.enviadas, terceira.ignoradas) == (0, 0, 0)
+
+
+def test_envio_grava_carimbo_do_servidor(local, remoto):
+    conn = local._get_connection()
+    # Relógio local atrasado: o carimbo enviado seria anterior a marcas de outros clientes
+    conn.execute("UPDATE contas SET updated_at = ?", (PASSADO,))
+    sync = SincronizadorContas(local, remoto)
+    sync.enviar()
+
+    remota = _remota(remoto, "u0@x.com")
+    assert remota["updated_at"] > PASSADO
+    assert local.consultar_conta("u0@x.com")["updated_at"] == remota["updated_at"]
+    assert sync.pendentes() == 0
+    assert sync.receber().ignoradas == 3
+
+
+def test_envio_e_incremental(local, remoto):
+    sync = SincronizadorContas(local, remoto)
+    sync.sincronizar()
+    local.salvar(Conta(email="u1@x.com", senha="nova"))
+    assert sync.pendentes() == 1
+    resultado = sync.enviar()
+    assert resultado.enviadas == 1 and sync.pendentes() == 0
+    assert _remota(remoto, "u1@x.com")["senha"] == "nova"
+
+
+def test_alteracoes_remotas_sao_aplicadas_sem_voltar_ao_remoto(local, remoto):
+    sync = SincronizadorContas(local, remoto)
+    sync.sincronizar()
+    _editar_remota(remoto, "u0@x.com", senha="remota", pontos=900)
+    _editar_remota(remoto, "novo@x.com", senha="n")
+    resultado = sync.receber()
+    assert resultado.recebidas == 2
+    assert local.consultar_conta("u0@x.com")["senha"] == "remota"
+    assert local.consultar_conta("novo@x.com") is not None
+    assert local.consultar_conta("u0@x.com")["updated_at"] == FUTURO
+    assert sync.pendentes() == 0
+
+
+@pytest.mark.parametrize("politica, remoto_ts, senha_final", [
+    ("recente", FUTURO, "remota"),
+    ("recente", PASSADO, "local"),
+    ("local", FUTURO, "local"),
+    ("remoto", PASSADO, "remota"),
+])
+def test_conflitos(local, remoto, politica, remoto_ts, senha_final):
+    sync = SincronizadorContas(local, remoto, politica=politica)
+    sync.sincronizar()
+    local.salvar(Conta(email="u2@x.com", senha="local"))
+    _editar_remota(remoto, "u2@x.com", updated_at=remoto_ts, senha="remota")
+
+    resultado = sync.sincronizar()
+    if politica != "remoto":
+        assert resultado.conflitos == 1
+    assert local.consultar_conta("u2@x.com")["senha"] == senha_final
+    assert _remota(remoto, "u2@x.com")["senha"] == senha_final
+
+
+@pytest.mark.parametrize("local_ts", ["2026-10-16T00:00:00.000Z", None])
+def test_primeira_sincronizacao_nao_sobrescreve_remota_mais_nova(local, remoto, local_ts):
+    conn = local._get_connection()
+    local.salvar(Conta(email="u0@x.com", senha="velha"))
+    conn.execute("UPDATE contas SET updated_at = ? WHERE email = 'u0@x.com'", (local_ts,))
+    _editar_remota(remoto, "u0@x.com", updated_at="2026-10-17T00:00:00.000000Z", senha="nova")
+
+    resultado = SincronizadorContas(local, remoto).sincronizar()
+    assert resultado.conflitos == 1
+    assert local.consultar_conta("u0@x.com")["senha"] == "nova"
+    assert _remota(remoto, "u0@x.com")["senha"] == "nova"
+
+
+def test_politica_invalida(local, remoto):
+    with pytest.raises(ValidationException):
+        SincronizadorContas(local, remoto, politica="aleatoria")
+
+
+def test_remocoes_viajam_como_tombstones(local, remoto):
+    sync = SincronizadorContas(local, remoto)
+    sync.sincronizar()
+
+    local.remover(Conta(email="u0@x.com", senha="s"))
+    resultado = sync.enviar()
+    assert resultado.removidas_remoto == 1
+    assert _remota(remoto, "u0@x.com")["removido_em"]
+
+    _editar_remota(remoto, "u1@x.com", removido_em=FUTURO)
+    resultado = sync.receber()
+    assert resultado.removidas_local == 1
+    assert local.consultar_conta("u1@x.com") is None
+    # A remoção aplicada não volta ao remoto como alteração local
+    assert sync.pendentes() == 0
+
+
+def test_envio_interrompido_continua_de_onde_parou(local):
+    local.salvar_varias([Conta(email=f"v{i}@x.com", senha="s") for i in range(5)])  # 8 contas
+    # Cada lote: upsert + leitura dos carimbos do servidor
+    remoto = RemotoInstavel(limite=4)
+    sync = SincronizadorContas(local, remoto, lote=3)
+    with pytest.raises(DatabaseException):
+        sync.enviar()
+    assert remoto.get_table_count("contas") == 6
+
+    remoto.limite = 100
+    resultado = sync.enviar()
+    assert resultado.enviadas == 2
+    assert remoto.get_table_count("contas") == 8
+
+
+def test_recebimento_interrompido_continua_de_onde_parou(local):
+    remoto = RemotoInstavel(limite=100)
+    for i in range(7):
+        _editar_remota(remoto, f"r{i}@x.com", senha="s", updated_at=f"2026-01-0{i + 1}T00:00:00.000000Z")
+    remoto.limite = 2
+    sync = SincronizadorContas(local, remoto, lote=3)
+    with pytest.raises(DatabaseException):
+        sync.receber()
+    assert local.ler_estado_sync("pull_cursor") == "r5@x.com"
+
+    remoto.limite = 100
+    resultado = sync.receber()
+    assert resultado.recebidas == 1
+    assert local.ler_estado_sync("pull_cursor") is None
+    assert local.ler_estado_sync("pull_marca") == "2026-01-07T00:00:00.000000Z"
+    assert len(local.listar()) == 3 + 7
+
+
+def test_log_desligado_sem_sincronizacao(local):
+    conn = local._get_connection()
+    local.salvar(Conta(email="u0@x.com", senha="outra"))
+    local.adicionar_registro_farm("u1@x.com", 100)
+    assert conn.execute("SELECT COUNT(*) FROM contas_alteracoes").fetchone()[0] == 0
+
+    assert local.ativar_log_alteracoes() is True
+    assert local.ativar_log_alteracoes() is False
+    assert conn.execute("SELECT COUNT(*) FROM contas_alteracoes").fetchone()[0] == 3
+    local.adicionar_registro_farm("u1@x.com", 200)
+    assert conn.execute("SELECT COUNT(*) FROM contas_alteracoes").fetchone()[0] == 4
+
+
+def test_banco_legado_migra_com_log_desligado(tmp_path):
+    caminho = tmp_path / "legado.db"
+    conn = sqlite3.connect(caminho, isolation_level=None)
+    # Banco anterior ao log de alterações (até a v3)
+    migrar(conn, "contas", MIGRACOES_CONTAS[:3])
+    conn.execute("INSERT INTO contas (email, senha) VALUES ('a@x.com', 's')")
+    conn.close()
+
+    repo = SQLiteRepository(caminho)
+    repo.salvar(Conta(email="b@x.com", senha="s"))
+    conn = repo._get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM contas_alteracoes").fetchone()[0] == 0
+    assert repo.ler_estado_sync("log_ativo") is None
+
+    repo.ativar_log_alteracoes()
+    log = [r["email"] for r in conn.execute("SELECT email FROM contas_alteracoes ORDER BY seq")]
+    assert sorted(log) == ["a@x.com", "b@x.com"]
+    repo.close()
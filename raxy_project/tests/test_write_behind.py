@@ -0,0 +1,145 @@
+"""Testes da fila de gravação em lote dos resultados de farm."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from raxy.infrastructure.database.write_behind import WriteBehindFarmRepository, gravar_registros
+
+
+class RepositorioMemoria:
+    """Repositório mínimo com gravação por registro."""
+
+    def __init__(self):
+        self.contas = {}
+        self.chamadas = 0
+        self.falhas_restantes = 0
+        self.gravou = threading.Event()
+
+    def adicionar_registro_farm(self, email, pontos):
+        self.chamadas += 1
+        if self.falhas_restantes:
+            self.falhas_restantes -= 1
+            raise ConnectionError("banco indisponível")
+        self.contas[email] = {"email": email, "pontos": pontos}
+        self.gravou.set()
+        return self.contas[email]
+
+    def consultar_conta(self, email):
+        return self.contas.get(email)
+
+    def listar_contas(self):
+        return list(self.contas.values())
+
+
+class RepositorioEmLote(RepositorioMemoria):
+    def __init__(self):
+        super().__init__()
+        self.lotes = []
+
+    def adicionar_registros_farm(self, registros):
+        self.lotes.append([r.email for r in registros])
+        for r in registros:
+            self.contas[r.email] = {"email": r.email, "pontos": r.pontos}
+        self.gravou.set()
+        return len(registros)
+
+
+@pytest.fixture
+def fila():
+    filas = []
+
+    def criar(repositorio, **kwargs):
+        kwargs.setdefault("intervalo_flush", 60.0)
+        kwargs.setdefault("max_lote", 1000)
+        f = WriteBehindFarmRepository(repositorio, **kwargs)
+        filas.append(f)
+        return f
+
+    yield criar
+    for f in filas:
+        f.close()
+
+
+def test_agrupa_registros_da_mesma_conta(fila):
+    repo = RepositorioEmLote()
+    f = fila(repo)
+    f.adicionar_registro_farm("a@x.com", 10)
+    f.adicionar_registro_farm("b@x.com", 20)
+    f.adicionar_registro_farm("a@x.com", 30)
+    assert f.pendentes == 2 and repo.contas == {}
+    assert f.flush() == 2
+    assert repo.lotes == [["a@x.com", "b@x.com"]]
+    assert repo.contas["a@x.com"]["pontos"] == 30
+    assert f.stats.agrupados == 1 and f.stats.enfileirados == 3 and f.stats.lotes == 1
+
+
+def test_leitura_sobrepoe_pendentes(fila):
+    repo = RepositorioEmLote()
+    repo.contas["a@x.com"] = {"email": "a@x.com", "pontos": 1, "status": "active"}
+    f = fila(repo)
+    f.adicionar_registro_farm("a@x.com", 99)
+    dados = f.consultar_conta("a@x.com")
+    assert dados["pontos"] == 99 and dados["status"] == "active"
+    assert f.consultar_conta("z@x.com") is None
+    # listar_contas grava os pendentes antes de ler
+    assert f.listar_contas() == [{"email": "a@x.com", "pontos": 99}]
+
+
+def test_lote_cheio_dispara_gravacao(fila):
+    repo = RepositorioEmLote()
+    f = fila(repo, max_lote=3)
+    for i in range(3):
+        f.adicionar_registro_farm(f"u{i}@x.com", i)
+    assert repo.gravou.wait(5.0)
+    assert len(repo.contas) == 3
+
+
+def test_intervalo_dispara_gravacao(fila):
+    repo = RepositorioEmLote()
+    f = fila(repo, intervalo_flush=0.05)
+    f.adicionar_registro_farm("a@x.com", 1)
+    assert repo.gravou.wait(5.0)
+
+
+def test_falha_devolve_a_fila_sem_sobrescrever_mais_novos(fila):
+    repo = RepositorioMemoria()
+    repo.falhas_restantes = 1
+    f = fila(repo)
+    f.adicionar_registro_farm("a@x.com", 1)
+    f.adicionar_registro_farm("b@x.com", 2)
+    with pytest.raises(ConnectionError):
+        f.flush()
+    assert f.pendentes == 2 and f.stats.falhas == 1
+    f.adicionar_registro_farm("a@x.com", 5)
+    assert f.flush() == 2
+    assert repo.contas["a@x.com"]["pontos"] == 5 and repo.contas["b@x.com"]["pontos"] == 2
+
+
+def test_close_grava_pendentes_e_depois_grava_direto():
+    repo = RepositorioMemoria()
+    f = WriteBehindFarmRepository(repo, intervalo_flush=60.0, max_lote=1000)
+    f.adicionar_registro_farm("a@x.com", 1)
+    f.close()
+    assert repo.contas["a@x.com"]["pontos"] == 1
+    f.adicionar_registro_farm("b@x.com", 2)
+    assert repo.contas["b@x.com"]["pontos"] == 2 and f.pendentes == 0
+    f.close()  # idempotente
+
+
+def test_ler_apos_gravar_e_sincrono(fila):
+    repo = RepositorioMemoria()
+    f = fila(repo, ler_apos_gravar=True)
+    assert f.adicionar_registro_farm("a@x.com", 7) == {"email": "a@x.com", "pontos": 7}
+
+
+def test_gravar_registros_sem_suporte_a_lote(fila):
+    repo = RepositorioEmLote()
+    f = fila(repo)
+    f.adicionar_registro_farm("a@x.com", 1)
+    f.adicionar_registro_farm("b@x.com", 2)
+    registros = list(f._pendentes.values())
+    simples = RepositorioMemoria()
+    assert gravar_registros(simples, registros) == 2 and simples.chamadas == 2